@@ -0,0 +1,43 @@
+#
+# Measure the time and memory needed to import pyomo.environ, with
+# and without lazy plugin registration (PYOMO_LAZY_PLUGINS=1).
+#
+# Each measurement is made in a new Python process, so the results
+# are not affected by modules that are already loaded.
+#
+#   python import_environ.py [repeat]
+#
+
+import os
+import sys
+import subprocess
+
+script = """
+import resource, sys, time
+start = time.time()
+import pyomo.environ
+elapsed = time.time() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss /= 1024
+print('%f %d %d' % (elapsed, rss, len(sys.modules)))
+"""
+
+def measure(lazy, repeat):
+    env = dict(os.environ)
+    env['PYOMO_LAZY_PLUGINS'] = '1' if lazy else '0'
+    results = []
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=env)
+        elapsed, rss, modules = output.decode().split()
+        results.append((float(elapsed), int(rss), int(modules)))
+    return min(results)
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("%-8s %10s %10s %10s" % ('mode', 'time (s)', 'RSS (MB)', 'modules'))
+    for lazy in (False, True):
+        elapsed, rss, modules = measure(lazy, repeat)
+        print("%-8s %10.3f %10.1f %10d"
+              % ('lazy' if lazy else 'eager', elapsed, rss/1024.0, modules))
@@ -423,22 +423,25 @@ class ModelSolutions(object):
             for name in ['problem', 'objective', 'variable', 'constraint']:
                 tmp = soln._entry[name]
                 for symb, val in iteritems(getattr(solution, name)):
-                    if symb in smap.bySymbol:
-                        obj = smap.bySymbol[symb]
-                    elif symb in smap.aliases:
-                        obj = smap.aliases[symb]
-                    elif ignore_missing_symbols:
-                        continue
-                    else:                                   #pragma:nocover
-                        #
-                        # This should never happen ...
-                        #
+                    # Note: getObjectRef() lets a NumericSymbolMap
+                    # resolve the symbol by position instead of
+                    # through the bySymbol dictionary
+                    ref = smap.getObjectRef(symb)
+                    if ref is SymbolMap.UnknownSymbol:
+                        obj = None
+                    else:
+                        obj = ref()
+                    # Symbols whose object has been deleted are
+                    # treated as missing
+                    if obj is None:
+                        if ignore_missing_symbols:
+                            continue
                         raise RuntimeError(
                             "ERROR: Symbol %s is missing from "
                             "model %s when loading with a symbol map!"
                             % (symb, instance.name))
 
-                    tmp[id(obj())] = (obj, val)
+                    tmp[id(obj)] = (ref, val)
             #
             # Wrap up
             #
@@ -21,12 +21,15 @@ from operator import itemgetter, attrgetter
 from six import iteritems, iterkeys, itervalues, StringIO, string_types, \
     advance_iterator, PY3
 
+from pyutilib.misc import PauseGC
+
 from pyomo.common.timing import ConstructionTimer
 from pyomo.core.base.plugin import *  # ModelComponentFactory
 from pyomo.core.base.component import Component, ActiveComponentData, \
-    ComponentUID
+    ComponentUID, _model_structure_changed
 from pyomo.core.base.sets import Set,  _SetDataBase
 from pyomo.core.base.var import Var
+from pyomo.core.base.param import Param
 from pyomo.core.base.misc import apply_indexed_rule
 from pyomo.core.base.suffix import ComponentMap
 from pyomo.core.base.indexed_component import IndexedComponent, \
@@ -469,12 +472,54 @@ if PY3:
     PseudoMap.items = PseudoMap.iteritems
 
 
+def _drop_model_caches(block):
+    """
+    Discard the names and traversals cached by a block when it was
+    the top-level block of a model.
+    """
+    for key in ('_name_buffer_cache', '_component_data_cache'):
+        if key in block.__dict__:
+            del block.__dict__[key]
+
+
+def _component_data_cache_key(ctype, active, sort, descend_into,
+                               descent_order):
+    """
+    Return the key used to cache a traversal by
+    _BlockData.component_data_objects(), or None if the traversal
+    cannot be cached.  Only traversals of specific component types are
+    cached.  Immutable Param values and Set members can change without
+    any change to the model structure, so Param and Set data are never
+    cached.
+    """
+    if isclass(ctype):
+        ctype = (ctype,)
+    elif type(ctype) is not tuple:
+        return None
+    if descend_into is True:
+        descend_into = (Block,)
+    elif isclass(descend_into):
+        descend_into = (descend_into,)
+    elif type(descend_into) is not tuple:
+        return None
+    for x in ctype + descend_into:
+        if not isclass(x) or issubclass(x, (Param, Set)):
+            return None
+    if type(sort) is set:
+        # e.g., SortComponents.deterministic
+        sort = frozenset(sort)
+    return (ctype, active, sort, descend_into, descent_order)
+
+
 class _BlockData(ActiveComponentData):
     """
     This class holds the fundamental block data.
     """
     _Block_reserved_words = set()
 
+    # See enable_component_data_cache()
+    _component_data_cache_enabled = False
+
     def __init__(self, component):
         #
         # BLOCK DATA ELEMENTS
@@ -530,6 +575,11 @@ class _BlockData(ActiveComponentData):
         # Note sure why we are deleting these...
         if '_repn' in ans:
             del ans['_repn']
+        # Cached traversals and names refer to the components of
+        # this block
+        for key in ('_component_data_cache', '_name_buffer_cache'):
+            if key in ans:
+                del ans[key]
         return ans
 
     #
@@ -703,6 +753,7 @@ class _BlockData(ActiveComponentData):
     def set_value(self, val):
         for k in list(getattr(self, '_decl', {})):
             self.del_component(k)
+        _model_structure_changed(self, names=True)
         self._ctypes = {}
         self._decl = {}
         self._decl_order = []
@@ -912,6 +963,15 @@ component, use the block del_component() and add_component() methods.
         _new_idx = len(self._decl_order)
         self._decl[name] = _new_idx
         self._decl_order.append((val, None))
+        _model_structure_changed(self, names=True)
+        # The component may have been (or contain blocks that were)
+        # a model of its own: its names and traversals are now those
+        # of this model.
+        if isinstance(val, _BlockData):
+            _drop_model_caches(val)
+        elif isinstance(val, Block) and val.is_indexed():
+            for _block in itervalues(val._data):
+                _drop_model_caches(_block)
         #
         # Add the component as an attribute.  Note that
         #
@@ -1042,6 +1102,7 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         idx = self._decl[name]
         del self._decl[name]
         self._decl_order[idx] = (None, self._decl_order[idx][1])
+        _model_structure_changed(self, names=True)
 
         # Update the ctype linked lists
         ctype_info = self._ctypes[obj.type()]
@@ -1086,6 +1147,7 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
             return
 
         idx = self._decl[name]
+        _model_structure_changed(self)
 
         # Update the ctype linked lists
         ctype_info = self._ctypes[obj.type()]
@@ -1151,19 +1213,37 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         # NonNegativeReals, etc) that are not "owned" by any blocks and
         # should be preserved as singletons.
         #
+        # We first attempt a "structural" clone, which shares immutable
+        # data (numbers, strings, index tuples and subexpressions that
+        # do not refer to components within this block) between the
+        # original and the copy.  If that fails, we fall back on
+        # deepcopy.
+        #
         save_parent, self._parent = self._parent, None
         try:
-            new_block = copy.deepcopy(
-                self, {
-                    '__block_scope__': {id(self): True, id(None): False},
-                    '__paranoid__': False,
-                    })
-        except:
-            new_block = copy.deepcopy(
-                self, {
-                    '__block_scope__': {id(self): True, id(None): False},
-                    '__paranoid__': True,
-                    })
+            try:
+                with PauseGC():
+                    new_block = copy.deepcopy(
+                        self, {
+                            '__block_scope__': {id(self): True,
+                                                id(None): False},
+                            '__structural__': True,
+                            })
+            except:
+                try:
+                    new_block = copy.deepcopy(
+                        self, {
+                            '__block_scope__': {id(self): True,
+                                                id(None): False},
+                            '__paranoid__': False,
+                            })
+                except:
+                    new_block = copy.deepcopy(
+                        self, {
+                            '__block_scope__': {id(self): True,
+                                                id(None): False},
+                            '__paranoid__': True,
+                            })
         finally:
             self._parent = save_parent
 
@@ -1326,7 +1406,23 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
         component data objects for all components in a
         block.  By default, this generator recursively
         descends into sub-blocks.
-        """
+
+        If enable_component_data_cache() was called on this block,
+        recursive traversals of specific component types (other than
+        Param and Set) are cached as flat lists, which are reused
+        until the model structure changes (see
+        _cached_component_data).
+        """
+        if descend_into and self._component_data_cache_enabled:
+            key = _component_data_cache_key(
+                ctype, active, sort, descend_into, descent_order)
+            if key is not None:
+                return self._cached_component_data(key)
+        return self._component_data_objects(
+            ctype, active, sort, descend_into, descent_order)
+
+    def _component_data_objects(self, ctype, active, sort, descend_into,
+                                descent_order):
         if descend_into:
             block_generator = self.block_data_objects(
                 active=active,
@@ -1342,6 +1438,103 @@ Components must now specify their rules explicitly using 'rule=' keywords.""" %
                                                  sort=sort):
                 yield x[1]
 
+    def _name_buffer(self):
+        """
+        Return the buffer of fully qualified component names (a dict
+        mapping id(obj) to the name) for the model rooted at this
+        block.  The buffer is shared by the name property and by the
+        labelers used by the problem writers, so names are generated
+        once and reused across writes.  It is discarded when a
+        component is added to, removed from or renamed in the model
+        (see component._model_structure_changed).
+        """
+        name_buffer = self.__dict__.get('_name_buffer_cache')
+        if name_buffer is None:
+            name_buffer = {}
+            super(_BlockData, self).__setattr__(
+                '_name_buffer_cache', name_buffer)
+        return name_buffer
+
+    def enable_component_data_cache(self, enable=True):
+        """
+        Enable (or disable) caching of the recursive traversals made
+        by component_data_objects() on this block.  This is useful
+        when the same traversal is repeated many times (e.g., by
+        repeated solves of a model that does not change).  The
+        cached traversals are stored on the model that owns this
+        block and are discarded whenever the structure of that model
+        changes.
+        """
+        super(_BlockData, self).__setattr__(
+            '_component_data_cache_enabled', bool(enable))
+        if not enable:
+            model = self.model()
+            if '_component_data_cache' in model.__dict__:
+                del model.__dict__['_component_data_cache']
+
+    def _cached_component_data(self, key):
+        """
+        Generator that returns the component data objects for a
+        traversal from the cache kept by the model that owns this
+        block.
+
+        The first traversal records its results as a flat list, along
+        with the number of data objects in each component that it
+        visited.  Later traversals reuse the list, provided that no
+        component has gained or lost data objects.  The model discards
+        the cache whenever its structure changes (e.g., a component is
+        added, removed, activated or deactivated; see
+        component._model_structure_changed).  If that happens while
+        the list is being returned, the remaining data objects are
+        found with a normal traversal.
+        """
+        model = self.model()
+        cache = model.__dict__.get('_component_data_cache')
+        if cache is None:
+            cache = {}
+            super(_BlockData, model).__setattr__(
+                '_component_data_cache', cache)
+        model_state = model.__dict__
+        cache_key = (id(self),) + key
+        entry = cache.get(cache_key)
+        if entry is not None:
+            if all(len(comp._data) == n for comp, n in entry[0]):
+                data = entry[1]
+                for i, obj in enumerate(data):
+                    # The block itself is stored as None, so that the
+                    # cache does not refer to the block that owns it
+                    yield self if obj is None else obj
+                    if model_state.get('_component_data_cache') \
+                       is not cache:
+                        seen = set(id(x) for x in data[:i+1])
+                        seen.add(id(self))
+                        for obj in self._component_data_objects(*key):
+                            if id(obj) not in seen:
+                                yield obj
+                        return
+                return
+            del cache[cache_key]
+        # Record the size of every component whose data may appear in
+        # the traversal, including the blocks that it descends into
+        ctype, active, sort, descend_into, descent_order = key
+        sizes = []
+        data = []
+        for _block in self.block_data_objects(
+                active=active, sort=sort, descend_into=descend_into,
+                descent_order=descent_order):
+            for comp in _block.component_map(
+                    ctype + descend_into, active).itervalues():
+                if hasattr(comp, '_data'):
+                    sizes.append((comp, len(comp._data)))
+            for x in _block._component_data_iter(ctype=ctype,
+                                                 active=active,
+                                                 sort=sort):
+                obj = x[1]
+                data.append(None if obj is self else obj)
+                yield obj
+        if model_state.get('_component_data_cache') is cache:
+            cache[cache_key] = (sizes, data)
+
     def component_data_iterindex(self,
                                  ctype=None,
                                  active=None,
@@ -12,38 +12,135 @@ __all__ = ['Component', 'ComponentUID', 'name']
 
 import logging
 import six
+import types
 from weakref import ref as weakref_ref
 import sys
-from copy import deepcopy
+from copy import deepcopy, _keep_alive
 from pickle import PickleError
 
 import pyomo.common
+from pyomo.core.expr import current as EXPR
+from pyomo.core.expr.numvalue import NumericConstant
+from pyomo.core.kernel.set_types import _VirtualSet
 from pyomo.core.base.misc import tabular_writer
 
 from six import iteritems, string_types
 
 logger = logging.getLogger('pyomo.core')
 
+# Index values whose string representation never needs to be escaped
+_unescaped_index_types = set(six.integer_types) | set([float])
+
+def _escape_index(x):
+    # We need to quote set members (because people put things like
+    # spaces - or worse commas - in their set names).  Our plan is to
+    # put the strings in single quotes... but that requires escaping
+    # any single quotes in the string... which in turn requires
+    # escaping the escape character.
+    x = x.replace("\\", "\\\\").replace("'", "\\'")
+    if ',' in x or "'" in x:
+        return "'"+x+"'"
+    else:
+        return x
+
 def _name_index_generator(idx):
     """
     Return a string representation of an index.
     """
-    def _escape(x):
-        # We need to quote set members (because people put things like
-        # spaces - or worse commas - in their set names).  Our plan is to
-        # put the strings in single quotes... but that requires escaping
-        # any single quotes in the string... which in turn requires
-        # escaping the escape character.
-        x = x.replace("\\", "\\\\").replace("'", "\\'")
-        if ',' in x or "'" in x:
-            return "'"+x+"'"
-        else:
-            return x
-
     if idx.__class__ is tuple:
-        return "[" + ",".join(_escape(str(i)) for i in idx) + "]"
+        return "[" + ",".join(
+            str(i) if i.__class__ in _unescaped_index_types
+            else _escape_index(str(i)) for i in idx) + "]"
+    elif idx.__class__ in _unescaped_index_types:
+        return "[" + str(idx) + "]"
+    else:
+        return "[" + _escape_index(str(idx)) + "]"
+
+def _model_structure_changed(obj, names=False, removed=()):
+    """
+    Discard the caches kept by the model that owns obj after its
+    structure changed (a component was added, removed, renamed,
+    reclassified, activated or deactivated, or component data was
+    deleted).  The cached component_data_objects() traversals (see
+    _BlockData._cached_component_data) are always discarded.  The
+    buffer of fully qualified names (see _BlockData._name_buffer) is
+    only discarded when names is True, i.e., when the names of
+    existing components may have changed, or when a removed data
+    object is a block (whose components are removed with it).
+    Otherwise, only the names of the removed data objects are
+    dropped, as their ids may be reused.
+    """
+    try:
+        model = obj.model()
+    except AttributeError:
+        # Components added while a block is still being initialized
+        # (the block is not yet attached to a model)
+        return
+    if model is None:
+        return
+    state = model.__dict__
+    if '_component_data_cache' in state:
+        del state['_component_data_cache']
+    name_buffer = state.get('_name_buffer_cache')
+    if name_buffer is None:
+        return
+    if names or any(hasattr(data, 'component_map') for data in removed):
+        del state['_name_buffer_cache']
     else:
-        return "[" + _escape(str(idx)) + "]"
+        for data in removed:
+            name_buffer.pop(id(data), None)
+
+def _buffered_name(obj, name_buffer):
+    """
+    Return the fully qualified name of obj, using (and adding it to)
+    the name buffer shared by its model.  Unlike getname(), this only
+    names obj and the blocks that contain it, and not every data
+    object of the same component.
+    """
+    try:
+        return name_buffer[id(obj)]
+    except KeyError:
+        pass
+    c = obj.parent_component()
+    if c is obj:
+        pb = obj.parent_block()
+        if pb is None or pb.parent_block() is None:
+            ans = obj._name
+        else:
+            ans = _buffered_name(pb, name_buffer) + "." + obj._name
+    elif six.get_unbound_function(obj.__class__.getname) is not \
+         six.get_unbound_function(ComponentData.getname):
+        # Data objects may define their own names (e.g., the rows of
+        # a MatrixConstraint)
+        ans = obj.getname(fully_qualified=True)
+    else:
+        if c._data.__class__ is dict:
+            items = iteritems(c._data)
+        else:
+            items = iteritems(c)
+        for idx, data in items:
+            if data is obj:
+                break
+        else:
+            raise RuntimeError(
+                "Fatal error: cannot find the component data in "
+                "the owning component's _data dictionary.")
+        ans = _buffered_name(c, name_buffer) + _name_index_generator(idx)
+    name_buffer[id(obj)] = ans
+    return ans
+
+def _shared_name_buffer(obj):
+    """
+    Return the buffer of fully qualified names shared by the model
+    that owns obj (see _BlockData._name_buffer), or None if obj is not
+    part of a model or is the model itself.  The name of the model is
+    not part of the fully qualified names, and it is not buffered
+    because models are often renamed by assigning to _name directly.
+    """
+    model = obj.model()
+    if model is None or model is obj:
+        return None
+    return model._name_buffer()
 
 
 def name(component, index=None, fully_qualified=False, relative_to=None):
@@ -65,6 +162,180 @@ def cname(*args, **kwds):
         "DEPRECATED: The cname() function has been renamed to name()" )
     return name(*args, **kwds)
 
+#
+# Support for structural clones (see Block.clone()).  Values that
+# cannot refer to a component (numbers, strings, NumericConstants,
+# virtual sets like Reals and tuples of these) are shared between the
+# original and the clone, lists, dicts and sets are rebuilt directly,
+# and expression trees are copied with an iterative walker that shares
+# every subexpression that does not refer to a cloned component.
+# Slot-ized ComponentData classes that set _structural_clone_slots are
+# copied slot by slot.  Everything else is passed to deepcopy().
+#
+_shared_types = set([
+    bool, float, complex, type(None), type, NumericConstant,
+    types.FunctionType, types.BuiltinFunctionType,
+    six.binary_type, six.text_type])
+_shared_types.update(six.integer_types)
+_shared_types.update(six.string_types)
+
+# Expression classes that are completely described by their arguments
+# (see create_node_with_local_data())
+_copied_expression_types = set([
+    EXPR.NegationExpression, EXPR.NPV_NegationExpression,
+    EXPR.PowExpression, EXPR.NPV_PowExpression,
+    EXPR.ProductExpression, EXPR.NPV_ProductExpression,
+    EXPR.MonomialTermExpression,
+    EXPR.ReciprocalExpression, EXPR.NPV_ReciprocalExpression,
+    EXPR.RangedExpression, EXPR.InequalityExpression,
+    EXPR.EqualityExpression,
+    EXPR.SumExpression, EXPR.NPV_SumExpression,
+    EXPR.Expr_ifExpression,
+    EXPR.UnaryFunctionExpression, EXPR.NPV_UnaryFunctionExpression,
+    EXPR.AbsExpression, EXPR.NPV_AbsExpression,
+    EXPR.LinearExpression])
+
+def _expression_args(node):
+    if node.__class__ is EXPR.LinearExpression:
+        return [node.constant] + list(node.linear_coefs) \
+            + list(node.linear_vars)
+    return node._args_[:node.nargs()]
+
+def _create_expression(node, args):
+    if node.__class__ is EXPR.LinearExpression:
+        # Note: the LinearExpression constructor stores the
+        # coefficients and variables as slices of the argument tuple,
+        # so we build the lists here.
+        ans = EXPR.LinearExpression()
+        n = (len(args)-1) // 2
+        ans.constant = args[0]
+        ans.linear_coefs = args[1:n+1]
+        ans.linear_vars = args[n+1:]
+        return ans
+    return node.create_node_with_local_data(tuple(args))
+
+def _structural_copy_expression(expr, memo):
+    """Copy an expression tree without recursion."""
+    _stack = []
+    node = expr
+    args = _expression_args(node)
+    idx = 0
+    result = []
+    while 1:
+        if idx < len(args):
+            arg = args[idx]
+            idx += 1
+            if arg.__class__ in _shared_types:
+                result.append(arg)
+            elif id(arg) in memo:
+                result.append(memo[id(arg)])
+            elif arg.__class__ in _copied_expression_types:
+                _stack.append((node, args, idx, result))
+                node = arg
+                args = _expression_args(node)
+                idx = 0
+                result = []
+            else:
+                result.append(_structural_copy(arg, memo))
+            continue
+        ans = node
+        for i, arg in enumerate(args):
+            if result[i] is not arg:
+                ans = _create_expression(node, result)
+                break
+        memo[id(node)] = ans
+        if not _stack:
+            return ans
+        node, args, idx, result = _stack.pop()
+        result.append(ans)
+
+_structural_slots = {}
+
+def _get_structural_slots(cls):
+    """Return the slots (other than _component) of a ComponentData
+    class that sets _structural_clone_slots, or None."""
+    try:
+        return _structural_slots[cls]
+    except KeyError:
+        pass
+    ans = None
+    if cls.__dict__.get('_structural_clone_slots', False):
+        ans = []
+        for base in reversed(cls.__mro__):
+            slots = base.__dict__.get('__slots__', ())
+            if isinstance(slots, six.string_types):
+                slots = (slots,)
+            ans.extend(x for x in slots if x not in (
+                '_component', '__weakref__', '__dict__'))
+        ans = tuple(ans)
+    _structural_slots[cls] = ans
+    return ans
+
+def _structural_copy_slots(obj, slots, memo):
+    ans = memo[id(obj)] = obj.__class__.__new__(obj.__class__)
+    _component = obj._component
+    if _component is not None:
+        _component = weakref_ref(_structural_copy(_component(), memo))
+    ans._component = _component
+    for name in slots:
+        setattr(ans, name, _structural_copy(getattr(obj, name), memo))
+    return ans
+
+def _structural_copy(obj, memo):
+    """Copy a value stored on a component for a structural clone."""
+    cls = obj.__class__
+    if cls in _shared_types:
+        return obj
+    _id = id(obj)
+    if _id in memo:
+        return memo[_id]
+    if cls is tuple:
+        for x in obj:
+            if x.__class__ not in _shared_types:
+                break
+        else:
+            return obj
+        ans = tuple([_structural_copy(x, memo) for x in obj])
+        for x, y in zip(ans, obj):
+            if x is not y:
+                memo[_id] = ans
+                _keep_alive(obj, memo)
+                return ans
+        return obj
+    if cls is list:
+        ans = memo[_id] = []
+        _keep_alive(obj, memo)
+        ans.extend([_structural_copy(x, memo) for x in obj])
+        return ans
+    if cls is dict:
+        ans = memo[_id] = {}
+        _keep_alive(obj, memo)
+        for key, val in iteritems(obj):
+            ans[_structural_copy(key, memo)] = _structural_copy(val, memo)
+        return ans
+    if cls is set:
+        ans = memo[_id] = set()
+        _keep_alive(obj, memo)
+        ans.update([_structural_copy(x, memo) for x in obj])
+        return ans
+    if cls in _copied_expression_types:
+        return _structural_copy_expression(obj, memo)
+    if isinstance(obj, _VirtualSet):
+        memo[_id] = obj
+        return obj
+    slots = _get_structural_slots(cls)
+    if slots is not None and obj._component is not None:
+        # If the owning component has already been copied (or was
+        # found to be out of scope), we know whether this data object
+        # is in scope without searching up the block hierarchy.
+        _component = obj._component()
+        if id(_component) in memo:
+            if memo[id(_component)] is _component:
+                memo[_id] = obj
+                return obj
+            return _structural_copy_slots(obj, slots, memo)
+    return deepcopy(obj, memo)
+
 
 class _ComponentBase(object):
     """An abstract base class for Component and ComponentData
@@ -146,6 +417,21 @@ class _ComponentBase(object):
         # which case Block.clone() will switch over to the more
         # "paranoid" mode.
         #
+        if memo.get('__structural__', False):
+            # Block.clone() first attempts a structural clone.  Any
+            # exception aborts it, and the clone is repeated with
+            # deepcopy().
+            slots = _get_structural_slots(self.__class__)
+            if slots is not None:
+                # Copy the slots directly, skipping the construction of
+                # the state dictionary
+                return _structural_copy_slots(self, slots, memo)
+            ans = memo[id(self)] = self.__class__.__new__(self.__class__)
+            ans.__setstate__(
+                dict((k, _structural_copy(v, memo))
+                     for k, v in iteritems(self.__getstate__())))
+            return ans
+
         paranoid = memo.get('__paranoid__', None)
 
         ans = memo[id(self)] = self.__class__.__new__(self.__class__)
@@ -225,7 +511,10 @@ context of the immediate parent container.""")
     @property
     def name(self):
         """Get the fully qualifed component name."""
-        return self.getname(fully_qualified=True)
+        name_buffer = _shared_name_buffer(self)
+        if name_buffer is None:
+            return self.getname(fully_qualified=True)
+        return _buffered_name(self, name_buffer)
 
     # Adding a setter here to help users adapt to the new
     # setting. The .name attribute is now ._name. It should
@@ -472,7 +761,10 @@ class Component(_ComponentBase):
     @property
     def name(self):
         """Get the fully qualifed component name."""
-        return self.getname(fully_qualified=True)
+        name_buffer = _shared_name_buffer(self)
+        if name_buffer is None:
+            return self.getname(fully_qualified=True)
+        return _buffered_name(self, name_buffer)
 
     # Allow setting a componet's name if it is not owned by a parent
     # block (this supports, e.g., naming a model)
@@ -480,6 +772,7 @@ class Component(_ComponentBase):
     def name(self, val):
         if self.parent_block() is None:
             self._name = val
+            _model_structure_changed(self, names=True)
         else:
             raise ValueError(
                 "The .name attribute is not settable when the component "
@@ -554,10 +847,12 @@ class ActiveComponent(Component):
     def activate(self):
         """Set the active attribute to True"""
         self._active=True
+        _model_structure_changed(self)
 
     def deactivate(self):
         """Set the active attribute to False"""
         self._active=False
+        _model_structure_changed(self)
 
 
 class ComponentData(_ComponentBase):
@@ -581,6 +876,12 @@ class ComponentData(_ComponentBase):
     __pickle_slots__ = ('_component',)
     __slots__ = __pickle_slots__ + ('__weakref__',)
 
+    # Slot-ized derived classes whose __getstate__ / __setstate__ only
+    # save and restore their slots may set this to True so that
+    # Block.clone() copies the slots directly.  The flag is only
+    # honored on the class that declares it (it is not inherited).
+    _structural_clone_slots = False
+
     def __init__(self, component):
         #
         # ComponentData objects are typically *private* objects for
@@ -764,7 +1065,13 @@ class ComponentData(_ComponentBase):
         base = c.getname(fully_qualified, name_buffer, relative_to)
         if name_buffer is not None:
             # Iterate through the dictionary and generate all names in the buffer
-            for idx, obj in iteritems(c):
+            if c._data.__class__ is dict:
+                # Skip the index checks made when iterating over the
+                # component
+                items = iteritems(c._data)
+            else:
+                items = iteritems(c)
+            for idx, obj in items:
                 name_buffer[id(obj)] = base + _name_index_generator(idx)
             if id(self) in name_buffer:
                 # Return the name if it is in the buffer
@@ -877,10 +1184,12 @@ class ActiveComponentData(ComponentData):
     def activate(self):
         """Set the active attribute to True"""
         self._active = self.parent_component()._active = True
+        _model_structure_changed(self)
 
     def deactivate(self):
         """Set the active attribute to False"""
         self._active = False
+        _model_structure_changed(self)
 
 
 class ComponentUID(object):
@@ -312,6 +312,7 @@ class _GeneralConstraintData(_ConstraintData):
     """
 
     __slots__ = ('_body', '_lower', '_upper', '_equality')
+    _structural_clone_slots = True
 
     def __init__(self,  expr=None, component=None):
         #
@@ -14,7 +14,8 @@ import pyutilib.misc
 
 from pyomo.core.expr.expr_errors import TemplateExpressionError
 from pyomo.core.base.indexed_component_slice import _IndexedComponent_slice
-from pyomo.core.base.component import Component, ActiveComponent
+from pyomo.core.base.component import (Component, ActiveComponent,
+                                       _model_structure_changed)
 from pyomo.core.base.config import PyomoOptions
 from pyomo.common import DeveloperError
 
@@ -191,7 +192,9 @@ class IndexedComponent(Component):
     def clear(self):
         """Clear the data in this component"""
         if self.is_indexed():
+            removed = list(itervalues(self._data))
             self._data = {}
+            _model_structure_changed(self, removed=removed)
         else:
             raise DeveloperError(
                 "Derived scalar component %s failed to define clear()."
@@ -429,10 +432,12 @@ You can silence this warning by one of three ways:
                 del self[idx]
         else:
             # Handle the normal deletion operation
+            obj = self._data[index]
             if self.is_indexed():
                 # Remove reference to this object
-                self._data[index]._component = None
+                obj._component = None
             del self._data[index]
+            _model_structure_changed(self, removed=(obj,))
 
     def _not_constructed_error(self, idx):
         # Generate an error because the component is not constructed
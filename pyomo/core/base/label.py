@@ -19,7 +19,8 @@ else:
     import string
     _translate = string.translate
 
-from pyomo.core.base.component import ComponentUID
+from pyomo.core.base.component import (ComponentUID, ComponentData,
+                                       _shared_name_buffer)
 
 # This module provides some basic functionality for generating labels
 # from pyomo names, which often contain characters such as "[" and "]"
@@ -121,36 +122,64 @@ class NumericLabeler(object):
 # (particularly PySP), and I don't know how much depends on the labels
 # actually being LP-compliant.
 #
-class CNameLabeler(object):
-    def __init__(self):
-        self.name_buffer = {}
-
-    def __call__(self, obj):
-        return obj.getname(True, self.name_buffer)
+class _FullNameLabeler(object):
+    """
+    Base class for labelers that derive labels from fully qualified
+    names.  The first time a component data object is labeled, the
+    labels for all data of its component are generated at once.  The
+    names are taken from the name buffer shared by the model (see
+    _BlockData._name_buffer), so names generated for one write are
+    reused by the next.
+    """
 
-class TextLabeler(object):
     def __init__(self):
+        # Names of objects that are not part of a model
         self.name_buffer = {}
+        self.labels = {}
+
+    def _label(self, name):
+        return name
 
     def __call__(self, obj):
-        return cpxlp_label_from_name(obj.getname(True, self.name_buffer))
+        try:
+            return self.labels[id(obj)]
+        except KeyError:
+            pass
+        if not isinstance(obj, ComponentData):
+            return self._label(obj.getname(True, self.name_buffer))
+        name_buffer = _shared_name_buffer(obj)
+        if name_buffer is None:
+            name_buffer = self.name_buffer
+        name = obj.getname(True, name_buffer)
+        component = obj.parent_component()
+        if component is obj or component._data.__class__ is not dict:
+            ans = self.labels[id(obj)] = self._label(name)
+            return ans
+        _label = self._label
+        labels = self.labels
+        for data in six.itervalues(component._data):
+            _id = id(data)
+            if _id in name_buffer:
+                labels[_id] = _label(name_buffer[_id])
+        return labels[id(obj)]
 
     def remove_obj(self, obj):
-        self.name_buffer.pop(id(obj))
+        self.labels.pop(id(obj), None)
+        self.name_buffer.pop(id(obj), None)
 
-class AlphaNumericTextLabeler(object):
-    def __init__(self):
-        self.name_buffer = {}
+class CNameLabeler(_FullNameLabeler):
+    pass
 
-    def __call__(self, obj):
-        return alphanum_label_from_name(obj.getname(True, self.name_buffer))
+class TextLabeler(_FullNameLabeler):
+    def _label(self, name):
+        return cpxlp_label_from_name(name)
 
-class NameLabeler(object):
-    def __init__(self):
-        self.name_buffer = {}
+class AlphaNumericTextLabeler(_FullNameLabeler):
+    def _label(self, name):
+        return alphanum_label_from_name(name)
 
-    def __call__(self, obj):
-        return obj.getname(True, self.name_buffer)
+class NameLabeler(_FullNameLabeler):
+    pass
 
 class ShortNameLabeler(object):
     def __init__(self, limit, prefix, start=0, labeler=None):
@@ -23,6 +23,16 @@ from pyomo.core.base.indexed_component import IndexedComponent, \
 from pyomo.core.base.misc import apply_indexed_rule, apply_parameterized_indexed_rule
 from pyomo.core.base.numvalue import NumericValue, native_types, value
 from pyomo.core.base.set_types import Any
+from pyomo.core.base.sets import SparseIndexSet
+from pyomo.core.kernel.set_types import (RealSet,
+                                         IntegerSet,
+                                         BooleanSet,
+                                         _validate_interval,
+                                         validate_PositiveValues,
+                                         validate_NonPositiveValues,
+                                         validate_NegativeValues,
+                                         validate_NonNegativeValues,
+                                         validate_PercentFraction)
 
 from six import iteritems, iterkeys, next, itervalues
 
@@ -52,6 +62,87 @@ class _NoArgument(object):
     pass
 
 
+def _bulk_param_data(data):
+    """
+    Return the contents of a NumPy array or a pandas Series or
+    DataFrame as a tuple (keys, values, array), or None if the data
+    is not one of these types.
+
+    The values are returned as a list of native Python values, and
+    the array holds the same values as a NumPy array (for vectorized
+    validation).  The keys are None for NumPy arrays, which are
+    aligned with the index set of the Param.  A DataFrame with a
+    single column is treated like a Series; otherwise, each entry is
+    indexed by its row index followed by its column label.
+
+    NumPy and pandas objects are recognized by their attributes, so
+    neither package is imported here.
+    """
+    if hasattr(data, 'itertuples') and hasattr(data, 'columns'):
+        if len(data.columns) == 1:
+            return _bulk_param_data(data[data.columns[0]])
+        rows = data.index.tolist()
+        cols = data.columns.tolist()
+        keys = [ r+(c,) if r.__class__ is tuple else (r,c)
+                 for r in rows for c in cols ]
+        array = data.values.ravel()
+        return keys, array.tolist(), array
+    if hasattr(data, 'index') and hasattr(data, 'tolist') \
+            and hasattr(data, 'dtype'):
+        return data.index.tolist(), data.tolist(), data.values
+    if hasattr(data, 'tolist') and hasattr(data, 'dtype') \
+            and getattr(data, 'ndim', 0) > 0:
+        return None, data.ravel().tolist(), data
+    return None
+
+def _vectorized_domain_check(domain, array):
+    """
+    Check all values in a NumPy array against a Param domain.
+
+    Returns True if all values are in the domain, False if any value
+    is not, and None if the domain (or the array type) cannot be
+    checked without testing the values one at a time.  Only Any and
+    the standard real, integer and boolean sets (including intervals)
+    are checked here.
+    """
+    if domain is Any:
+        return True
+    kind = array.dtype.kind
+    if kind == 'O':
+        return None
+    if isinstance(domain, BooleanSet):
+        if kind not in 'biuf':
+            return False
+        return bool(((array == 0) | (array == 1)).all())
+    if isinstance(domain, IntegerSet):
+        if kind not in 'biu':
+            return False
+    elif isinstance(domain, RealSet):
+        if kind not in 'biuf':
+            return False
+    else:
+        return None
+    validate = domain.validate
+    if validate in (validate_PositiveValues,
+                    validate_NonPositiveValues,
+                    validate_NegativeValues,
+                    validate_NonNegativeValues):
+        if not validate(array).all():
+            return False
+    elif validate is not None \
+            and validate is not validate_PercentFraction \
+            and not isinstance(validate, _validate_interval):
+        # validate_PercentFraction and interval validation only
+        # check the set bounds (below)
+        return None
+    lb, ub = domain.bounds()
+    if lb is not None and not (array >= lb).all():
+        return False
+    if ub is not None and not (array <= ub).all():
+        return False
+    return True
+
+
 class _ParamData(ComponentData, NumericValue):
     """
     This class defines the data for a mutable parameter.
@@ -65,6 +156,7 @@ class _ParamData(ComponentData, NumericValue):
     """
 
     __slots__ = ('_value',)
+    _structural_clone_slots = True
 
     def __init__(self, component):
         #
@@ -200,7 +292,11 @@ class Param(IndexedComponent):
             this parameter
         initialize  
             A dictionary or rule for setting up this parameter with existing 
-            model data
+            model data.  NumPy arrays (aligned with the ordered index
+            set) and pandas Series or DataFrames are also accepted.
+        validate_domain
+            If False, parameter values are not checked against the
+            domain.  The default is True.
     """
 
     DefaultMutable = False
@@ -222,6 +318,7 @@ class Param(IndexedComponent):
         self._mutable       = kwd.pop('mutable', Param.DefaultMutable )
         self._default_val   = kwd.pop('default', _NotValid )
         self._dense_initialize = kwd.pop('initialize_as_dense', False)
+        self._validate_domain = kwd.pop('validate_domain', True)
         #
         if 'repn' in kwd:
             logger.error(
@@ -361,6 +458,9 @@ class Param(IndexedComponent):
     def store_values(self, new_values, check=True):
         """
         A utility to update a Param with a dictionary or scalar.
+        The values of an indexed Param can also be updated from a
+        NumPy array (aligned with the ordered index set) or a pandas
+        Series or DataFrame.
 
         If check=True, then both the index and value
         are checked through the __getitem__ method.  Using check=False
@@ -369,6 +469,12 @@ class Param(IndexedComponent):
         if not self._mutable:
             _raise_modifying_immutable_error(self, '*')
         #
+        if self.is_indexed():
+            bulk = _bulk_param_data(new_values)
+            if bulk is not None:
+                self._store_bulk(*bulk, check=check)
+                return
+        #
         _srcType = type(new_values)
         _isDict = _srcType is dict or ( \
             hasattr(_srcType, '__getitem__')
@@ -607,6 +713,73 @@ class Param(IndexedComponent):
             del self._data[index]
 
 
+    def _store_bulk(self, keys, values, array, check=True):
+        """
+        Store values obtained from a NumPy array or a pandas object
+        (see _bulk_param_data).  If keys is None, the values are
+        aligned with the iteration order of the index set.
+
+        With check=True, the keys are validated against the index set
+        and the values are checked against the domain and validation
+        rule.  The domain check is vectorized for the standard
+        numeric domains and falls back to checking the values one at
+        a time otherwise.
+        """
+        if keys is None:
+            if not (self._index.ordered or
+                    isinstance(self._index, SparseIndexSet)):
+                raise ValueError(
+                    "Cannot initialize Param %s from an array: the index "
+                    "set %s is not ordered"
+                    % (self.name, self._index.name))
+            if len(values) != len(self._index):
+                raise ValueError(
+                    "Cannot initialize Param %s from an array with %s "
+                    "values: the index set %s has %s members"
+                    % (self.name, len(values), self._index.name,
+                       len(self._index)))
+            if array.ndim > 1:
+                _set_tuple = getattr(self._index, 'set_tuple', None)
+                if _set_tuple is not None and array.shape != \
+                        tuple(len(s) for s in _set_tuple):
+                    raise ValueError(
+                        "Cannot initialize Param %s from an array with "
+                        "shape %s: the index set %s has shape %s"
+                        % (self.name, array.shape, self._index.name,
+                           tuple(len(s) for s in _set_tuple)))
+            keys = self._index
+        elif check:
+            keys = [self._validate_index(key) for key in keys]
+
+        check_domain = check and self._validate_domain
+        if check_domain and values:
+            check_domain = not _vectorized_domain_check(self.domain, array)
+        _data = self._data
+        if check_domain or (check and self._validate):
+            #
+            # Validate the values one at a time.  The domain check is
+            # skipped if all values were validated above.
+            #
+            for key, val in zip(keys, values):
+                if self._mutable:
+                    if key in _data:
+                        _data[key]._value = val
+                    else:
+                        _data[key] = _ParamData(self)
+                        _data[key]._value = val
+                else:
+                    _data[key] = val
+                self._validate_value(key, val, check_domain)
+        elif self._mutable:
+            for key, val in zip(keys, values):
+                if key in _data:
+                    _data[key]._value = val
+                else:
+                    p = _data[key] = _ParamData(self)
+                    p._value = val
+        else:
+            _data.update(zip(keys, values))
+
     def _validate_value(self, index, value, validate_domain=True):
         """
         Validate a given input/value pair.
@@ -614,7 +787,8 @@ class Param(IndexedComponent):
         #
         # Check if the value is valid within the current domain
         #
-        if validate_domain and not value in self.domain:
+        if validate_domain and self._validate_domain \
+                and not value in self.domain:
             raise ValueError(
                 "Invalid parameter value: %s[%s] = '%s', value type=%s.\n"
                 "\tValue not in parameter domain %s" %
@@ -764,6 +938,16 @@ This has resulted in the conversion of the source to dense form.
             _init = tmp
             _isDict = True
 
+        elif self.is_indexed():
+            #
+            # Initializing from a NumPy array or a pandas object, which
+            # is stored and validated in bulk
+            #
+            bulk = _bulk_param_data(_init)
+            if bulk is not None:
+                self._store_bulk(*bulk)
+                return
+
         #
         # If the _init is not a native dictionary, but it
         # behaves like one (that is, it could be converted to a
@@ -871,6 +1055,11 @@ This has resulted in the conversion of the source to dense form.
         # Step #2: allow any user-specified (external) data to override
         # the initialization
         #
+        if data is not None and self.is_indexed():
+            bulk = _bulk_param_data(data)
+            if bulk is not None:
+                self._store_bulk(*bulk)
+                data = None
         if data is not None:
             try:
                 for key, val in iteritems(data):
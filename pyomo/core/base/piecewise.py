@@ -47,6 +47,12 @@ import types
 from pyutilib.enum import Enum
 from pyutilib.misc import flatten_tuple
 
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 from pyomo.common.timing import ConstructionTimer
 from pyomo.core.base.plugin import ModelComponentFactory
 from pyomo.core.base.block import Block, _BlockData
@@ -54,9 +60,10 @@ from pyomo.core.base.constraint import Constraint, ConstraintList
 from pyomo.core.base.sos import SOSConstraint
 from pyomo.core.base.var import Var, _VarData, IndexedVar
 from pyomo.core.base.set_types import PositiveReals, NonNegativeReals, Binary
-from pyomo.core.base.numvalue import value
+from pyomo.core.base.numvalue import value, native_numeric_types
+from pyomo.core.expr import current as EXPR
 
-from six import iterkeys, advance_iterator
+from six import iterkeys, itervalues, advance_iterator
 from six.moves import xrange, zip
 
 logger = logging.getLogger('pyomo.core')
@@ -160,6 +167,19 @@ def _characterize_function(name, tol, f_rule, model, points, *index):
     # expression generation errors in the checks below
     values = [value(_p) for _p in values]
 
+    character, step, warn = _characterize_values(tol, points, values)
+    if warn:
+        _print_slope_warning(name, tol, index)
+    return character, values, step
+
+def _characterize_values(tol, points, values):
+    """
+    Returns a tuple (character, step, warn) for the range values of a
+    function, where character is 1 for a convex function, -1 for a
+    concave function and 0 otherwise, step indicates a step function
+    and warn indicates that the slopes of consecutive segments are
+    within tol of one another.
+    """
     step = False
     try:
         slopes = [(values[i]-values[i-1])/(points[i]-points[i-1])
@@ -176,23 +196,96 @@ def _characterize_function(name, tol, f_rule, model, points, *index):
     #       *** This is already done below but there
     #           is probably a more correct way
     #           to send this warning through Pyomo
-    if not all(itertools.starmap(lambda x1,x2: (True) if ((x1 is None) or (x2 is None)) else (abs(x1-x2) > tol), zip(slopes, itertools.islice(slopes, 1, None)))):
-        msg = "**WARNING: Piecewise component '%s[%s]' has detected slopes of consecutive piecewise "\
-              "segments to be within "+str(tol)+" of one another. Refer to the Piecewise help "\
-              "documentation for information on how to disable this warning."
-        if index == ():
-            index = None
-        print(msg % (name, flatten_tuple(index)))
+    warn = not all(itertools.starmap(lambda x1,x2: (True) if ((x1 is None) or (x2 is None)) else (abs(x1-x2) > tol), zip(slopes, itertools.islice(slopes, 1, None))))
 
     if step is True:
-        return 0,values,True
+        return 0,True,warn
     if _isNonDecreasing(slopes):
         # convex
-        return 1,values,False
+        return 1,False,warn
     if _isNonIncreasing(slopes):
         # concave
-        return -1,values,False
-    return 0,values,False
+        return -1,False,warn
+    return 0,False,warn
+
+def _print_slope_warning(name, tol, index):
+    msg = "**WARNING: Piecewise component '%s[%s]' has detected slopes of consecutive piecewise "\
+          "segments to be within "+str(tol)+" of one another. Refer to the Piecewise help "\
+          "documentation for information on how to disable this warning."
+    if index == ():
+        index = None
+    print(msg % (name, flatten_tuple(index)))
+
+def _characterize_functions(tol, f_rule, model, points, indices):
+    """
+    Generates the range values and characterizes the functions for
+    a list of indices that share the list of domain points. The
+    slopes of all functions are computed with a single NumPy array
+    operation. Returns a dictionary mapping each index to a tuple
+    (character, values, step, warn) (see _characterize_values), or
+    None if the functions must be characterized one at a time.
+    """
+    points = [value(_p) for _p in points]
+    if isinstance(f_rule,types.FunctionType):
+        values = [[f_rule(model,*flatten_tuple((index,x))) for x in points]
+                  for index in indices]
+    elif f_rule.__class__ is dict:
+        values = [f_rule[index] for index in indices]
+    else: # a list or tuple
+        values = [f_rule]*len(indices)
+    values = [[value(_p) for _p in vals] for vals in values]
+    npoints = len(points)
+    if npoints < 2 or any(len(vals) != npoints for vals in values):
+        return None
+
+    try:
+        X = numpy.array(points, dtype=float)
+        Y = numpy.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return None
+    # The slopes are only identical to those computed with Python
+    # numbers if the integer values are exactly representable
+    if not (numpy.abs(X).max() < 2**52 and numpy.abs(Y).max() < 2**52):
+        return None
+
+    dX = numpy.diff(X)
+    step = bool((dX == 0).any())
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        slopes = numpy.diff(Y, axis=1) / dX
+        close = ~(numpy.abs(numpy.diff(slopes, axis=1)) > tol)
+        if step:
+            # segments of zero width have no slope
+            flat = (dX == 0)
+            close &= ~(flat[1:] | flat[:-1])
+            character = numpy.zeros(len(indices), dtype=int)
+        else:
+            convex = (slopes[:,1:] >= slopes[:,:-1]).all(axis=1)
+            concave = (slopes[:,1:] <= slopes[:,:-1]).all(axis=1)
+            character = numpy.where(convex, 1, numpy.where(concave, -1, 0))
+    warn = close.any(axis=1)
+    return dict((index, (int(character[i]), values[i], step, bool(warn[i])))
+                for i, index in enumerate(indices))
+
+def _linear_sum(coefs, variables):
+    """
+    Returns the expression sum(c*v for c,v in zip(coefs,variables))
+    without generating the intermediate sums.
+    """
+    terms = []
+    for c, v in zip(coefs, variables):
+        if c.__class__ not in native_numeric_types:
+            return sum(c*v for c, v in zip(coefs, variables))
+        if c == 0:
+            continue
+        elif c == 1:
+            terms.append(v)
+        else:
+            terms.append(EXPR.MonomialTermExpression((c, v)))
+    if len(terms) == 0:
+        return 0
+    if len(terms) == 1:
+        return terms[0]
+    return EXPR.SumExpression(terms)
 
 
 class _PiecewiseData(_BlockData):
@@ -349,12 +442,14 @@ class _SOS2Piecewise(object):
         # create vars
         sos2_y = pblock.SOS2_y = Var(sos2_index,within=NonNegativeReals)
 
+        sos2_vars = [sos2_y[i] for i in sos2_index]
+
         # create piecewise constraints
         conlist = pblock.SOS2_constraint = ConstraintList()
-        conlist.add( (x_var-sum(sos2_y[i]*x_pts[i] for i in sos2_index),0) )
+        conlist.add( (x_var-_linear_sum(x_pts, sos2_vars),0) )
 
         LHS = y_var
-        RHS = sum(sos2_y[i]*y_pts[i] for i in sos2_index)
+        RHS = _linear_sum(y_pts, sos2_vars)
         expr = None
         if bound_type == Bound.Upper:
             conlist.add( (None,LHS-RHS,0) )
@@ -364,7 +459,7 @@ class _SOS2Piecewise(object):
             conlist.add( (LHS-RHS,0) )
         else:
             raise ValueError("Invalid Bound for _SOS2Piecewise object")
-        conlist.add( (sum(sos2_y[j] for j in sos2_index),1) )
+        conlist.add( (_linear_sum([1]*len_x_pts, sos2_vars),1) )
         def SOS2_rule(model):
             return [sos2_y[i] for i in sos2_index]
         pblock.SOS2_sosconstraint = SOSConstraint(initialize=SOS2_rule, sos=2)
@@ -397,12 +492,13 @@ class _DCCPiecewise(object):
         bin_y = pblock.DCC_bin_y
 
         # create piecewise constraints
-        pblock.DCC_constraint1 = Constraint(expr=x_var==sum(lmda[p,v]*x_pts[v-1] \
-                                                         for p in polytopes \
-                                                         for v in polytope_verts(p)))
+        lmda_vars = [lmda[p,v] for p in polytopes for v in polytope_verts(p)]
+        lmda_verts = [v-1 for p in polytopes for v in polytope_verts(p)]
+        pblock.DCC_constraint1 = Constraint(expr=x_var==_linear_sum(
+            [x_pts[v] for v in lmda_verts], lmda_vars))
 
         LHS = y_var
-        RHS = sum(lmda[p,v]*y_pts[v-1] for p in polytopes for v in polytope_verts(p))
+        RHS = _linear_sum([y_pts[v] for v in lmda_verts], lmda_vars)
         expr = None
         if bound_type == Bound.Upper:
             expr= LHS <= RHS
@@ -417,8 +513,8 @@ class _DCCPiecewise(object):
         def con3_rule(model,p):
             return bin_y[p] == sum(lmda[p,v] for v in polytope_verts(p))
         pblock.DCC_constraint3 = Constraint(polytopes,rule=con3_rule)
-        pblock.DCC_constraint4 = Constraint(expr=sum(bin_y[p] \
-                                                  for p in polytopes) == 1)
+        pblock.DCC_constraint4 = Constraint(expr=_linear_sum(
+            [1]*len(polytopes), [bin_y[p] for p in polytopes]) == 1)
 
 
 class _DLOGPiecewise(object):
@@ -426,6 +522,10 @@ class _DLOGPiecewise(object):
     Called to generate Piecewise constraint using the DLOG formulation
     """
 
+    # The branching schemes only depend on the number of polytopes,
+    # so they are shared by all Piecewise components
+    _branching_schemes = {}
+
     def _Branching_Scheme(self,L):
         """
         Branching scheme for DLOG
@@ -466,7 +566,9 @@ class _DLOGPiecewise(object):
 
         # create branching schemes
         L_i = int(math.log(len_x_pts-1,2))
-        B_ZERO,B_ONE = self._Branching_Scheme(L_i)
+        if L_i not in self._branching_schemes:
+            self._branching_schemes[L_i] = self._Branching_Scheme(L_i)
+        B_ZERO,B_ONE = self._branching_schemes[L_i]
 
         # create indexers
         polytopes = range(1,len_x_pts)
@@ -481,12 +583,13 @@ class _DLOGPiecewise(object):
         pblock.DLOG_bin_y = Var(bin_y_index,within=Binary)
         bin_y = pblock.DLOG_bin_y
         # create piecewise constraints
-        pblock.DLOG_constraint1 = Constraint(expr=x_var==sum(lmda[p,v]*x_pts[v-1] \
-                                                         for p in polytopes \
-                                                         for v in polytope_verts(p)))
+        lmda_vars = [lmda[p,v] for p in polytopes for v in polytope_verts(p)]
+        lmda_verts = [v-1 for p in polytopes for v in polytope_verts(p)]
+        pblock.DLOG_constraint1 = Constraint(expr=x_var==_linear_sum(
+            [x_pts[v] for v in lmda_verts], lmda_vars))
 
         LHS = y_var
-        RHS = sum(lmda[p,v]*y_pts[v-1] for p in polytopes for v in polytope_verts(p))
+        RHS = _linear_sum([y_pts[v] for v in lmda_verts], lmda_vars)
         expr = None
         if bound_type == Bound.Upper:
             expr= LHS <= RHS
@@ -497,18 +600,15 @@ class _DLOGPiecewise(object):
         else:
             raise ValueError("Invalid Bound for _DLOGPiecewise object")
         pblock.DLOG_constraint2 = Constraint(expr=expr)
-        pblock.DLOG_constraint3 = Constraint(expr=sum(lmda[p,v] \
-                                                  for p in polytopes \
-                                                  for v in polytope_verts(p)) == 1)
+        pblock.DLOG_constraint3 = Constraint(expr=_linear_sum(
+            [1]*len(lmda_vars), lmda_vars) == 1)
         def con4_rule(model,l):
-            return sum(lmda[p,v] for p in B_ZERO[l] \
-                                 for v in polytope_verts(p)) \
-                   <= bin_y[l]
+            lmda_l = [lmda[p,v] for p in B_ZERO[l] for v in polytope_verts(p)]
+            return _linear_sum([1]*len(lmda_l), lmda_l) <= bin_y[l]
         pblock.DLOG_constraint4 = Constraint(bin_y_index,rule=con4_rule)
         def con5_rule(model,l):
-            return sum(lmda[p,v] for p in B_ONE[l] \
-                                 for v in polytope_verts(p)) \
-                   <= (1-bin_y[l])
+            lmda_l = [lmda[p,v] for p in B_ONE[l] for v in polytope_verts(p)]
+            return _linear_sum([1]*len(lmda_l), lmda_l) <= (1-bin_y[l])
         pblock.DLOG_constraint5 = Constraint(bin_y_index,rule=con5_rule)
 
 
@@ -543,11 +643,11 @@ class _CCPiecewise(object):
         pblock.CC_bin_y = Var(polytopes,within=Binary)
         bin_y = pblock.CC_bin_y
         # create piecewise constraints
-        pblock.CC_constraint1 = Constraint(expr=x_var==sum(lmda[v]*x_pts[v-1] \
-                                                         for v in vertices))
+        lmda_vars = [lmda[v] for v in vertices]
+        pblock.CC_constraint1 = Constraint(expr=x_var==_linear_sum(x_pts, lmda_vars))
 
         LHS = y_var
-        RHS = sum(lmda[v]*y_pts[v-1] for v in vertices)
+        RHS = _linear_sum(y_pts, lmda_vars)
         expr = None
         if bound_type == Bound.Upper:
             expr= LHS <= RHS
@@ -558,13 +658,13 @@ class _CCPiecewise(object):
         else:
             raise ValueError("Invalid Bound for _CCPiecewise object")
         pblock.CC_constraint2 = Constraint(expr=expr)
-        pblock.CC_constraint3 = Constraint(expr=sum(lmda[v] \
-                                                  for v in vertices) == 1)
+        pblock.CC_constraint3 = Constraint(expr=_linear_sum(
+            [1]*len_x_pts, lmda_vars) == 1)
         def con4_rule(model,v):
             return lmda[v] <= sum(bin_y[p] for p in vertex_polys(v))
         pblock.CC_constraint4 = Constraint(vertices,rule=con4_rule)
-        pblock.CC_constraint5 = Constraint(expr=sum(bin_y[p] \
-                                                  for p in polytopes) == 1)
+        pblock.CC_constraint5 = Constraint(expr=_linear_sum(
+            [1]*len(polytopes), [bin_y[p] for p in polytopes]) == 1)
 
 
 class _LOGPiecewise(object):
@@ -572,6 +672,10 @@ class _LOGPiecewise(object):
     Called to generate Piecewise constraint using the LOG formulation
     """
 
+    # The branching schemes only depend on the number of polytopes,
+    # so they are shared by all Piecewise components
+    _branching_schemes = {}
+
     def _Branching_Scheme(self,n):
         """
         Branching scheme for LOG, requires a gray code
@@ -606,7 +710,9 @@ class _LOGPiecewise(object):
 
         # create branching schemes
         L_i = int(math.log(len_x_pts-1,2))
-        S_i,B_LEFT,B_RIGHT = self._Branching_Scheme(L_i)
+        if L_i not in self._branching_schemes:
+            self._branching_schemes[L_i] = self._Branching_Scheme(L_i)
+        S_i,B_LEFT,B_RIGHT = self._branching_schemes[L_i]
 
         # create indexers
         polytopes = range(1,len_x_pts)
@@ -619,11 +725,11 @@ class _LOGPiecewise(object):
         pblock.LOG_bin_y = Var(bin_y_index,within=Binary)
         bin_y = pblock.LOG_bin_y
         # create piecewise constraints
-        pblock.LOG_constraint1 = Constraint(expr=x_var==sum(lmda[v]*x_pts[v-1] \
-                                                         for v in vertices))
+        lmda_vars = [lmda[v] for v in vertices]
+        pblock.LOG_constraint1 = Constraint(expr=x_var==_linear_sum(x_pts, lmda_vars))
 
         LHS = y_var
-        RHS = sum(lmda[v]*y_pts[v-1] for v in vertices)
+        RHS = _linear_sum(y_pts, lmda_vars)
         expr = None
         if bound_type == Bound.Upper:
             expr= LHS <= RHS
@@ -634,13 +740,15 @@ class _LOGPiecewise(object):
         else:
             raise ValueError("Invalid Bound for _LOGPiecewise object")
         pblock.LOG_constraint2 = Constraint(expr=expr)
-        pblock.LOG_constraint3 = Constraint(expr=sum(lmda[v] \
-                                                  for v in vertices) == 1)
+        pblock.LOG_constraint3 = Constraint(expr=_linear_sum(
+            [1]*len_x_pts, lmda_vars) == 1)
         def con4_rule(model,s):
-            return sum(lmda[v] for v in B_LEFT[s]) <= bin_y[s]
+            return _linear_sum([1]*len(B_LEFT[s]),
+                               [lmda[v] for v in B_LEFT[s]]) <= bin_y[s]
         pblock.LOG_constraint4 = Constraint(bin_y_index,rule=con4_rule)
         def con5_rule(model,s):
-            return sum(lmda[v] for v in B_RIGHT[s]) <= (1-bin_y[s])
+            return _linear_sum([1]*len(B_RIGHT[s]),
+                               [lmda[v] for v in B_RIGHT[s]]) <= (1-bin_y[s])
         pblock.LOG_constraint5 = Constraint(bin_y_index,rule=con5_rule)
 
 
@@ -672,8 +780,8 @@ class _MCPiecewise(object):
         pblock.MC_bin_y = Var(polytopes,within=Binary)
         bin_y = pblock.MC_bin_y
         # create piecewise constraints
-        pblock.MC_constraint1 = Constraint(expr=x_var==sum(poly_x[p] \
-                                                         for p in polytopes))
+        pblock.MC_constraint1 = Constraint(expr=x_var==_linear_sum(
+            [1]*len(polytopes), [poly_x[p] for p in polytopes]))
 
         LHS = y_var
         RHS = sum(poly_x[p]*SLOPE[p]+bin_y[p]*INTERSEPT[p] for p in polytopes)
@@ -693,8 +801,8 @@ class _MCPiecewise(object):
         def con4_rule(model,p):
             return poly_x[p]  <= bin_y[p]*x_pts[p]
         pblock.MC_constraint4 = Constraint(polytopes,rule=con4_rule)
-        pblock.MC_constraint5 = Constraint(expr=sum(bin_y[p] \
-                                                  for p in polytopes) == 1)
+        pblock.MC_constraint5 = Constraint(expr=_linear_sum(
+            [1]*len(polytopes), [bin_y[p] for p in polytopes]) == 1)
 
 class _INCPiecewise(object):
     """
@@ -722,12 +830,15 @@ class _INCPiecewise(object):
         pblock.INC_bin_y = Var(bin_y_index,within=Binary)
         bin_y = pblock.INC_bin_y
         # create piecewise constraints
+        delta_vars = [delta[p] for p in polytopes]
         pblock.INC_constraint1 = Constraint(expr=x_var==x_pts[0] + \
-                                                  sum(delta[p]*(x_pts[p]-x_pts[p-1]) \
-                                                  for p in polytopes))
+                                            _linear_sum([x_pts[p]-x_pts[p-1] \
+                                                         for p in polytopes],
+                                                        delta_vars))
 
         LHS = y_var
-        RHS = y_pts[0] + sum(delta[p]*(y_pts[p]-y_pts[p-1]) for p in polytopes)
+        RHS = y_pts[0] + _linear_sum([y_pts[p]-y_pts[p-1] for p in polytopes],
+                                     delta_vars)
         expr = None
         if bound_type == Bound.Upper:
             expr= LHS <= RHS
@@ -874,6 +985,11 @@ class _BIGMPiecewise(object):
         len_x_pts = len(x_pts)
         _self_M_func = self._M_func
 
+        if numpy_available:
+            M_final = self._find_M_array(x_pts,y_pts,bound_type)
+            if M_final is not None:
+                return M_final
+
         M_final = {}
         for j in xrange(1,len_x_pts):
             index = j
@@ -893,6 +1009,35 @@ class _BIGMPiecewise(object):
                 del M_final[index]
         return M_final
 
+    def _find_M_array(self,x_pts,y_pts,bound_type):
+        """
+        Computes the same values as _find_M, evaluating _M_func for
+        all pairs of points with NumPy. Returns None if the points
+        are not plain numbers.
+        """
+        if bound_type not in (Bound.Lower, Bound.Upper):
+            raise ValueError("Invalid Bound passed to _find_M function")
+        try:
+            X = numpy.array(x_pts, dtype=float)
+            Y = numpy.array(y_pts, dtype=float)
+        except (TypeError, ValueError):
+            return None
+        if X.ndim != 1 or X.shape != Y.shape or \
+           not (numpy.abs(X).max() < 2**52 and numpy.abs(Y).max() < 2**52):
+            return None
+        # M[k,j-1] = _M_func(x[k],y[k],x[j-1],y[j-1],x[j],y[j])
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            slopes = (Y[1:]-Y[:-1]) / (X[1:]-X[:-1])
+            M = Y[:,None] - Y[None,:-1] - \
+                ((X[:,None] - X[None,:-1]) * slopes[None,:])
+        if numpy.isnan(M).any():
+            return None
+        if bound_type == Bound.Lower:
+            M = numpy.minimum(M.min(axis=0), 0.0)
+        else:
+            M = numpy.maximum(M.max(axis=0), 0.0)
+        return dict((j+1, float(m)) for j, m in enumerate(M) if m != 0.0)
+
 
 @ModelComponentFactory.register("Constraints that contain piecewise linear expressions.")
 class Piecewise(Block):
@@ -1138,6 +1283,7 @@ class Piecewise(Block):
                   "keyword 'unbounded_domain_var', which must be True or False"
             raise ValueError(msg)
 
+        self._characterized = {}
         self._pw_rep = pw_rep
         self._bound_type = bound_type
         self._f_rule = f_rule
@@ -1189,12 +1335,53 @@ class Piecewise(Block):
                 logger.debug("  Constructing single Piecewise component (index=None)")
             self.add(None, _is_indexed=is_indexed)
         else:
-            for index in self._index:
-                if generate_debug_messages:
-                    logger.debug("  Constructing Piecewise index "+str(index))
-                self.add(index, _is_indexed=is_indexed)
+            self._characterized = self._characterize_all()
+            try:
+                for index in self._index:
+                    if generate_debug_messages:
+                        logger.debug("  Constructing Piecewise index "+str(index))
+                    self.add(index, _is_indexed=is_indexed)
+            finally:
+                self._characterized = {}
         timer.report()
 
+    def _characterize_all(self):
+        """
+        Characterizes the functions for all indices at once, grouping
+        the indices that share the same list of domain points.
+        """
+        if not numpy_available:
+            return {}
+        groups = {}
+        for index in self._index:
+            points = self._domain_points.get(index, None)
+            if points is None:
+                points = self._domain_points.get(None, None)
+                if points is None:
+                    continue
+            # Group by value so that equal lists of points built
+            # separately for each index still share a group
+            key = tuple(points)
+            group = groups.get(key, None)
+            if group is None:
+                group = groups[key] = (points, [])
+            group[1].append(index)
+        characterized = {}
+        for points, indices in itervalues(groups):
+            if len(indices) > 1:
+                try:
+                    result = _characterize_functions(self._warning_tol,
+                                                     self._f_rule,
+                                                     self._parent(),
+                                                     points,
+                                                     indices)
+                except (KeyError, TypeError, ValueError):
+                    # Report errors for the index that fails
+                    result = None
+                if result is not None:
+                    characterized.update(result)
+        return characterized
+
     def _getitem_when_not_present(self, idx):
         return self._data.setdefault(idx, _PiecewiseData(self))
 
@@ -1284,7 +1471,11 @@ class Piecewise(Block):
         # generate the list of range values using the function rule
         # check if convexity or concavity holds as well
         force_simple = False
-        if not _is_indexed:
+        if index in self._characterized:
+            character,range_pts,isStep,warn = self._characterized[index]
+            if warn:
+                _print_slope_warning(self.name, self._warning_tol, (index,))
+        elif not _is_indexed:
             character,range_pts,isStep=_characterize_function(self.name,
                                                               self._warning_tol,
                                                               self._f_rule,
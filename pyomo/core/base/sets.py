@@ -12,7 +12,8 @@
 # . rename 'filter' to something else
 # . confirm that filtering is efficient
 
-__all__ = ['Set', 'set_options', 'simple_set_rule', 'SetOf']
+__all__ = ['Set', 'set_options', 'simple_set_rule', 'SetOf',
+           'SparseIndexSet']
 
 import logging
 import sys
@@ -30,7 +31,8 @@ from pyomo.core.base.plugin import ModelComponentFactory
 from pyomo.core.base.component import Component, ComponentData
 from pyomo.core.base.indexed_component import IndexedComponent, \
     UnindexedComponent_set
-from pyomo.core.base.numvalue import native_numeric_types
+from pyomo.core.base.numvalue import native_numeric_types, \
+    native_integer_types
 
 from six import itervalues, iteritems, string_types
 from six.moves import xrange
@@ -53,6 +55,10 @@ def process_setarg(arg):
         # Argument is some other component
         raise TypeError("Cannot index a component with a non-set "
                         "component: %s" % (arg.name))
+    elif getattr(arg, 'ndim', 1) > 1 and hasattr(arg, 'tolist'):
+        # Argument is a multi-dimensional (NumPy) array, where
+        # each row is an index
+        return SparseIndexSet(arg)
     else:
         try:
             #
@@ -254,6 +260,103 @@ class _SetData(_SetDataBase):
         return val in self.value
 
 
+class _ArithmeticOrderIndex(object):
+    """
+    A compact replacement for the order_dict of an ordered set whose
+    members are the integers start, start+step, start+2*step, ...
+    (e.g., time periods). The position of a member is computed
+    arithmetically, so no per-member storage is required.
+
+    This object supports the subset of the dict API used by
+    _OrderedSetData. The set replaces it with a dict (see
+    to_dict()) as soon as a member breaks the progression.
+    """
+
+    __slots__ = ('start', 'step', 'size')
+
+    def __init__(self, start=None, step=None, size=0):
+        self.start = start
+        self.step = step
+        self.size = size
+
+    def __getstate__(self):
+        return dict((i, getattr(self, i)) for i in self.__slots__)
+
+    def __setstate__(self, state):
+        for key, val in iteritems(state):
+            setattr(self, key, val)
+
+    def __len__(self):
+        return self.size
+
+    def _position(self, val):
+        size = self.size
+        if size > 1:
+            try:
+                pos, rem = divmod(val - self.start, self.step)
+            except TypeError:
+                return None
+            if rem or (pos < 0) or (pos >= size):
+                return None
+            return int(pos)
+        if size and val == self.start:
+            return 0
+        return None
+
+    def __contains__(self, val):
+        size = self.size
+        if size > 1:
+            try:
+                pos, rem = divmod(val - self.start, self.step)
+            except TypeError:
+                return False
+            return not rem and (0 <= pos < size)
+        return size == 1 and val == self.start
+
+    def __getitem__(self, val):
+        pos = self._position(val)
+        if pos is None:
+            raise KeyError(val)
+        return pos
+
+    def append(self, val):
+        """Extend the progression with val. Returns False
+        (leaving the index unchanged) if val does not extend
+        it."""
+        size = self.size
+        if size > 1:
+            # the start and step are integers, so any value
+            # equal to the next member is an equivalent key
+            if val != self.start + size*self.step:
+                return False
+        elif type(val) not in native_integer_types or \
+             type(val) is bool:
+            return False
+        elif size == 0:
+            self.start = val
+        elif val == self.start:
+            return False
+        else:
+            self.step = val - self.start
+        self.size = size + 1
+        return True
+
+    def to_dict(self):
+        if self.size == 1:
+            return {self.start: 0}
+        return dict((self.start + i*self.step, i)
+                    for i in xrange(self.size))
+
+    @staticmethod
+    def from_values(values):
+        """Return an index for a list of values, or None if
+        the values are not an integer progression."""
+        ans = _ArithmeticOrderIndex()
+        for val in values:
+            if not ans.append(val):
+                return None
+        return ans
+
 class _OrderedSetData(_SetDataBase):
     """
     This class defines the data for an ordered set.
@@ -267,6 +370,9 @@ class _OrderedSetData(_SetDataBase):
         _bounds     The tuple of bound values
         order_dict  A dictionary that maps from element value to element id.
                         Indices in this dictionary start with 1 (not 0).
+                        While the set members are an integer progression
+                        (e.g., 1, 2, ..., T), this is a compact
+                        _ArithmeticOrderIndex instead.
 
     The ordering supported in this class depends on the 'ordered' attribute
     of the owning component:
@@ -333,7 +439,9 @@ class _OrderedSetData(_SetDataBase):
         """
         _sorter = self.parent_component().ordered
         self.value = sorted(self.value, key=None if _sorter is Set.SortedOrder else _sorter)
-        self.order_dict = dict((j,i) for i,j in enumerate(self.value))
+        self.order_dict = _ArithmeticOrderIndex.from_values(self.value)
+        if self.order_dict is None:
+            self.order_dict = dict((j,i) for i,j in enumerate(self.value))
         self._is_sorted = 1
 
     def _clear(self):
@@ -341,7 +449,7 @@ class _OrderedSetData(_SetDataBase):
         Reset the set data
         """
         self.value = []
-        self.order_dict = {}
+        self.order_dict = _ArithmeticOrderIndex()
         if self._is_sorted:
             self._is_sorted = 1
 
@@ -353,7 +461,12 @@ class _OrderedSetData(_SetDataBase):
         """
         if verify:
             self._component()._verify(val)
-        self.order_dict[val] = len(self.value)
+        if self.order_dict.__class__ is _ArithmeticOrderIndex:
+            if not self.order_dict.append(val):
+                self.order_dict = self.order_dict.to_dict()
+                self.order_dict[val] = len(self.value)
+        else:
+            self.order_dict[val] = len(self.value)
         self.value.append(val)
         if self._is_sorted:
             self._is_sorted = 2
@@ -363,6 +476,15 @@ class _OrderedSetData(_SetDataBase):
         Discard an element of this set.  This does not return an error
         if the element does not already exist.
         """
+        if self.order_dict.__class__ is _ArithmeticOrderIndex:
+            if val not in self.order_dict:
+                return
+            if self.order_dict[val] == len(self.value)-1:
+                # removing the last member keeps the progression
+                self.order_dict.size -= 1
+                self.value.pop()
+                return
+            self.order_dict = self.order_dict.to_dict()
         try:
             _id = self.order_dict.pop(val)
         except KeyError:
@@ -480,7 +602,7 @@ class _OrderedSetData(_SetDataBase):
         except KeyError:
             raise KeyError("Cannot obtain nextw() member of set="+self.name+"; input element="+str(match_element)+" is not a member of the set!")
         #
-        return self[(element_position+k-1) % len(self.value) + 1]
+        return self[(element_position+k-1) % len(self) + 1]
 
     def prev(self, match_element, k=1):
         """
@@ -1399,6 +1521,80 @@ class SetOf(SimpleSet):
         return set(self)
 
 
+def _sparse_index_list(data):
+    """
+    Return a list of the indices stored in a pandas DataFrame
+    (one index per row), a NumPy array (one index per row for
+    multi-dimensional arrays) or an iterable of indices.
+    """
+    if hasattr(data, 'itertuples') and hasattr(data, 'columns'):
+        columns = [data[col].tolist() for col in data.columns]
+        if len(columns) == 1:
+            return columns[0]
+        return list(zip(*columns))
+    if hasattr(data, 'tolist'):
+        data = data.tolist()
+    return [tuple(idx) if idx.__class__ is list else idx for idx in data]
+
+@ModelComponentFactory.register("Define a Pyomo Set component over a sparse collection of indices.")
+class SparseIndexSet(SetOf):
+    """
+    A derived SetOf object for declaring components over an explicit,
+    sparse collection of indices.  The indices may be given as a list
+    of tuples, the rows of a NumPy array, or the rows of a pandas
+    DataFrame.
+
+    The indices are stored with a hash index, so membership tests do
+    not depend on the size of the set, and components declared over
+    this set only construct (and call their rules for) the listed
+    indices.  Unlike SetOf, the indices are copied when the set is
+    declared.
+    """
+
+    def __init__(self, *args, **kwds):
+        if len(args) > 1:
+            raise TypeError("Only one set data argument can be specified")
+        if len(args) == 1:
+            args = (_sparse_index_list(args[0]),)
+        else:
+            kwds['initialize'] = _sparse_index_list(
+                kwds.get('initialize', ()))
+        SetOf.__init__(self, *args, **kwds)
+        if 'dimen' not in kwds:
+            dimens = set(len(idx) if idx.__class__ is tuple else 1
+                         for idx in self._elements)
+            if len(dimens) == 1:
+                self.dimen = dimens.pop()
+            elif len(dimens) > 1:
+                self.dimen = None
+        self._hash_index = frozenset(self._elements)
+        if len(self._hash_index) != len(self._elements):
+            raise ValueError("Cannot create a SparseIndexSet with "
+                             "duplicate indices")
+        self._bounds = None
+
+    def __len__(self):
+        """
+        The number of items in the set.
+        """
+        return len(self._elements)
+
+    def _set_contains(self, element):
+        """
+        Test if the element is in the hash index.
+        """
+        try:
+            return element in self._hash_index
+        except TypeError:
+            return False
+
+    def data(self):
+        """
+        Return the underlying set data.
+        """
+        return set(self._hash_index)
+
+
 class _SetOperator(SimpleSet):
     """A derived SimpleSet object that contains a concrete virtual single set."""
 
@@ -1460,6 +1656,117 @@ class _SetOperator(SimpleSet):
         """The underlying set data."""
         return set(self)
 
+    #
+    # The ordered set API. Set operations never store their
+    # members, so the default implementations below walk the
+    # (lazy) set iterator. Derived classes override
+    # __getitem__ and ord when the position of an element can
+    # be computed directly from the operand sets.
+    #
+
+    def _check_ordered(self):
+        if not self.ordered:
+            raise ValueError("Cannot index an unordered set '%s'" % self.name)
+
+    def _normalize_position(self, idx):
+        """Map a 1-based (or negative) position to a 1-based
+        position, raising IndexError if it is out of range."""
+        if idx >= 1:
+            if idx > len(self):
+                raise IndexError("Cannot index a set past the last element")
+            return idx
+        elif idx < 0:
+            if len(self)+idx < 0:
+                raise IndexError("Cannot index a set past the first element")
+            return len(self)+idx+1
+        else:
+            raise IndexError("Valid index values for sets are 1 .. len(set) or -1 .. -len(set)")
+
+    def __getitem__(self, idx):
+        """
+        Return the specified member of the set.  Valid index
+        values are 1 .. len(set), or -1 .. -len(set).
+        """
+        self._check_ordered()
+        idx = self._normalize_position(idx)
+        for i, elt in enumerate(self, 1):
+            if i == idx:
+                return elt
+        raise IndexError("Cannot index a set past the last element")
+
+    def ord(self, match_element):
+        """
+        Return the position index of the input value.  The
+        position indices start at 1.
+        """
+        self._check_ordered()
+        for i, elt in enumerate(self, 1):
+            if elt == match_element:
+                return i
+        raise IndexError("Unknown input element="+str(match_element)+" provided as input to ord() method for set="+self.name)
+
+    def first(self):
+        """Return the first element of the set."""
+        return self[1]
+
+    def last(self):
+        """Return the last element of the set."""
+        return self[-1]
+
+    def next(self, match_element, k=1):
+        """
+        Return the next element in the set. The k option can
+        specify how many steps are taken to get the next
+        element. If the next element is beyond the end of the
+        set, then an exception is raised.
+        """
+        try:
+            element_position = self.ord(match_element)
+        except IndexError:
+            raise KeyError("Cannot obtain next() member of set="+self.name+"; input element="+str(match_element)+" is not a member of the set!")
+        if not (1 <= element_position+k <= len(self)):
+            raise IndexError("Cannot obtain next() member of set="+self.name+"; failed to access item in position="+str(element_position+k))
+        return self[element_position+k]
+
+    def nextw(self, match_element, k=1):
+        """
+        Return the next element in the set. If the next element
+        goes beyond the end of the set, then this wraps around
+        to the beginning of the set.
+        """
+        try:
+            element_position = self.ord(match_element)
+        except IndexError:
+            raise KeyError("Cannot obtain nextw() member of set="+self.name+"; input element="+str(match_element)+" is not a member of the set!")
+        return self[(element_position+k-1) % len(self) + 1]
+
+    def prev(self, match_element, k=1):
+        """
+        Return the previous element in the set. If the previous
+        element is before the start of the set, then an
+        exception is raised.
+        """
+        return self.next(match_element, k=-k)
+
+    def prevw(self, match_element, k=1):
+        """
+        Return the previous element in the set. If the previous
+        element is before the start of the set, then this wraps
+        around to the end of the set.
+        """
+        return self.nextw(match_element, k=-k)
+
+def _count_common(setA, setB):
+    """Count the members shared by two sets by iterating
+    over the smaller one."""
+    if len(setB) < len(setA):
+        setA, setB = setB, setA
+    ctr = 0
+    for elt in setA:
+        if elt in setB:
+            ctr += 1
+    return ctr
+
 class _SetUnion(_SetOperator):
 
     def __init__(self, *args, **kwds):
@@ -1475,6 +1782,39 @@ class _SetUnion(_SetOperator):
     def _set_contains(self, elt):
         return elt in self._setA or elt in self._setB
 
+    def __len__(self):
+        ctr = len(self._setA)
+        for elt in self._setB:
+            if not elt in self._setA:
+                ctr += 1
+        return ctr
+
+    def __getitem__(self, idx):
+        self._check_ordered()
+        idx = self._normalize_position(idx)
+        lenA = len(self._setA)
+        if idx <= lenA:
+            return self._setA[idx]
+        ctr = lenA
+        for elt in self._setB:
+            if not elt in self._setA:
+                ctr += 1
+                if ctr == idx:
+                    return elt
+        raise IndexError("Cannot index a set past the last element")
+
+    def ord(self, match_element):
+        self._check_ordered()
+        if match_element in self._setA:
+            return self._setA.ord(match_element)
+        ctr = len(self._setA)
+        for elt in self._setB:
+            if not elt in self._setA:
+                ctr += 1
+                if elt == match_element:
+                    return ctr
+        raise IndexError("Unknown input element="+str(match_element)+" provided as input to ord() method for set="+self.name)
+
 class _SetIntersection(_SetOperator):
 
     def __init__(self, *args, **kwds):
@@ -1488,6 +1828,9 @@ class _SetIntersection(_SetOperator):
     def _set_contains(self, elt):
         return elt in self._setA and elt in self._setB
 
+    def __len__(self):
+        return _count_common(self._setA, self._setB)
+
 class _SetDifference(_SetOperator):
 
     def __init__(self, *args, **kwds):
@@ -1501,6 +1844,9 @@ class _SetDifference(_SetOperator):
     def _set_contains(self, elt):
         return elt in self._setA and not elt in self._setB
 
+    def __len__(self):
+        return len(self._setA) - _count_common(self._setA, self._setB)
+
 class _SetSymmetricDifference(_SetOperator):
 
     def __init__(self, *args, **kwds):
@@ -1536,8 +1882,10 @@ class _SetProduct(_SetOperator):
 
         _SetOperator.__init__(self, *args, **kwd)
         # the individual index sets definining the product set.
+        # (copy the operand lists so nested products do not
+        # share them)
         if isinstance(self._setA,_SetProduct):
-            self.set_tuple = self._setA.set_tuple
+            self.set_tuple = list(self._setA.set_tuple)
         else:
             self.set_tuple = [self._setA]
         if isinstance(self._setB,_SetProduct):
@@ -1593,6 +1941,51 @@ class _SetProduct(_SetOperator):
             ans *= len(_set)
         return ans
 
+    def __getitem__(self, idx):
+        """
+        Return the specified member of the set. The member is
+        computed from the positions in the operand sets, so
+        the product is never iterated.
+        """
+        self._check_ordered()
+        pos = self._normalize_position(idx) - 1
+        ans = []
+        for _set in reversed(self.set_tuple):
+            pos, offset = divmod(pos, len(_set))
+            ans.append(_set[offset+1])
+        ans.reverse()
+        if self.is_flat_product():
+            return tuple(ans)
+        return pyutilib_misc_flatten_tuple(tuple(ans))
+
+    def ord(self, match_element):
+        """
+        Return the position index of the input value,
+        computed from the positions in the operand sets.
+        """
+        self._check_ordered()
+        if self.dimen is None:
+            # we can not split the element among the operand
+            # sets without searching
+            return _SetOperator.ord(self, match_element)
+        if type(match_element) is not tuple or \
+           len(match_element) != self.dimen:
+            raise IndexError("Unknown input element="+str(match_element)+" provided as input to ord() method for set="+self.name)
+        pos = 0
+        ctr = 0
+        for _set in self.set_tuple:
+            d = _set.dimen
+            if d == 1:
+                sub_element = match_element[ctr]
+            else:
+                sub_element = match_element[ctr:ctr+d]
+            try:
+                pos = pos*len(_set) + _set.ord(sub_element) - 1
+            except (IndexError, KeyError):
+                raise IndexError("Unknown input element="+str(match_element)+" provided as input to ord() method for set="+self.name)
+            ctr += d
+        return pos + 1
+
     def _compute_dimen(self):
         ans=0
         for _set in self.set_tuple:
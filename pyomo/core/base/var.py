@@ -308,6 +308,7 @@ class _GeneralVarData(_VarData):
     """
 
     __slots__ = ('_value', '_lb', '_ub', '_domain', 'fixed', 'stale')
+    _structural_clone_slots = True
 
     def __init__(self, domain=Reals, component=None):
         #
@@ -169,13 +169,161 @@ class SymbolMap(object):
         """
         Return the object corresponding to a symbol
         """
+        ref = self.getObjectRef(symbol)
+        if ref is SymbolMap.UnknownSymbol:
+            return ref
+        return ref()
+
+    def getObjectRef(self, symbol):
+        """
+        Return the weakref to the object corresponding to a symbol
+        """
         if symbol in self.bySymbol:
-            return self.bySymbol[symbol]()
+            return self.bySymbol[symbol]
         elif symbol in self.aliases:
-            return self.aliases[symbol]()
+            return self.aliases[symbol]
         else:
             return SymbolMap.UnknownSymbol
 
     def removeSymbol(self, obj):
         symb = self.byObject.pop(id(obj))
         self.bySymbol.pop(symb)
+
+
+class NumericSymbolMap(SymbolMap):
+    """
+    A symbol map for symbols that are a prefix followed by a dense
+    integer id (e.g., 'v0', 'v1', ...), like the symbols used in NL
+    files.
+
+    The objects for each prefix are stored in a list, so the id in a
+    symbol is the position of the object in that list.  Symbols are
+    resolved by indexing the list, and the string symbols and the
+    byObject and bySymbol dictionaries are only created if they are
+    used.
+
+    Attributes:
+        arrays (dict):  maps (prefix) to (list of object weakrefs)
+        byObject (dict):  maps (object id) to (string label)
+        bySymbol (dict):  maps (string label) to (object weakref)
+        alias (dict):  maps (string label) to (object weakref)
+        default_labeler: used to compute a string label from an object
+    """
+
+    def __init__(self, labeler=None):
+        self.arrays = {}
+        self.aliases = {}
+        self.default_labeler = labeler
+        self._byObject = None
+        self._bySymbol = None
+
+    def __getstate__(self):
+        return {
+            'arrays': tuple(
+                (prefix, tuple(None if ref is None else ref()
+                               for ref in array))
+                for prefix, array in iteritems(self.arrays) ),
+            'bySymbol': None if self._bySymbol is None else tuple(
+                (key, obj()) for key, obj in iteritems(self._bySymbol) ),
+            'aliases': tuple(
+                (key, obj()) for key, obj in iteritems(self.aliases) ),
+        }
+
+    def __setstate__(self, state):
+        self.arrays = dict(
+            (prefix, [None if obj is None else weakref_ref(obj)
+                      for obj in array])
+            for prefix, array in state['arrays'] )
+        self.aliases = dict(
+            (key, weakref_ref(obj)) for key, obj in state['aliases'] )
+        self.default_labeler = None
+        self._byObject = None
+        self._bySymbol = None
+        if state['bySymbol'] is not None:
+            self._byObject = dict(
+                (id(obj), key) for key, obj in state['bySymbol'] )
+            self._bySymbol = dict(
+                (key, weakref_ref(obj)) for key, obj in state['bySymbol'] )
+
+    def _create_dicts(self):
+        self._byObject = {}
+        self._bySymbol = {}
+        for prefix, array in iteritems(self.arrays):
+            self._add_to_dicts(prefix, 0, array)
+
+    def _add_to_dicts(self, prefix, start, refs):
+        for i, ref in enumerate(refs, start):
+            if ref is None:
+                continue
+            symb = "%s%d" % (prefix, i)
+            self._bySymbol[symb] = ref
+            self._byObject[id(ref())] = symb
+
+    @property
+    def byObject(self):
+        if self._byObject is None:
+            self._create_dicts()
+        return self._byObject
+
+    @property
+    def bySymbol(self):
+        if self._bySymbol is None:
+            self._create_dicts()
+        return self._bySymbol
+
+    def addSymbolArray(self, prefix, objs):
+        """
+        Add symbols for an iterable of objects.  The objects are
+        assigned the symbols prefix+N, prefix+(N+1), ..., where N is
+        the number of objects already added with this prefix.
+        """
+        refs = [weakref_ref(obj) for obj in objs]
+        array = self.arrays.setdefault(prefix, [])
+        if self._bySymbol is not None:
+            self._add_to_dicts(prefix, len(array), refs)
+        array.extend(refs)
+
+    def getObjectArray(self, prefix):
+        """
+        Return the list of objects with a given symbol prefix, ordered
+        by their integer ids.  Removed or deleted objects are None.
+        """
+        return [None if ref is None else ref()
+                for ref in self.arrays.get(prefix, ())]
+
+    def _array_ref(self, symbol):
+        """
+        Return the weakref stored in the arrays for a symbol, or None
+        if the symbol does not have the form prefix+id.
+        """
+        try:
+            prefix = symbol.rstrip('0123456789')
+            n = len(prefix)
+            # Reject ids with leading zeros (e.g., 'v01')
+            if symbol[n] == '0' and len(symbol) != n + 1:
+                return None
+            return self.arrays[prefix][int(symbol[n:])]
+        except (AttributeError, KeyError, IndexError):
+            return None
+
+    def getObjectRef(self, symbol):
+        """
+        Return the weakref to the object corresponding to a symbol
+        """
+        ref = self._array_ref(symbol)
+        if ref is None:
+            if self._bySymbol is not None:
+                ref = self._bySymbol.get(symbol)
+            if ref is None:
+                ref = self.aliases.get(symbol)
+                if ref is None:
+                    return SymbolMap.UnknownSymbol
+        return ref
+
+    def removeSymbol(self, obj):
+        symb = self.byObject[id(obj)]
+        ref = self._array_ref(symb)
+        if ref is not None:
+            prefix = symb.rstrip('0123456789')
+            self.arrays[prefix][int(symb[len(prefix):])] = None
+        super(NumericSymbolMap, self).removeSymbol(obj)
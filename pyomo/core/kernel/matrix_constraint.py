@@ -422,6 +422,56 @@ class matrix_constraint(constraint_tuple):
         assert not equality
         self._equality.fill(False)
 
+    def canonical_forms(self, compute_values=True):
+        """Build canonical representations of the bodies of
+        all constraints in this container. Returns a list
+        with one representation per row, equal to those
+        returned by the canonical_form() method of each
+        row, but computed in a single pass over the stored
+        matrix."""
+        from pyomo.repn.standard_repn import StandardRepn
+        x = self.x
+        if x is None:
+            raise ValueError(
+                "No variable order has been assigned")
+        m, n = self._A.shape
+        if self._sparse:
+            indptr = self._A.indptr.tolist()
+            indices = self._A.indices.tolist()
+            data = self._A.data.tolist()
+        else:
+            indptr = list(xrange(0, m*n+1, n))
+            indices = list(xrange(n)) * m
+            data = self._A.ravel().tolist()
+        fixed = [v.fixed for v in x]
+        any_fixed = any(fixed)
+        repns = []
+        for i in xrange(m):
+            start = indptr[i]
+            stop = indptr[i+1]
+            repn = StandardRepn()
+            if not any_fixed:
+                repn.linear_vars = tuple(x[j] for j in indices[start:stop])
+                repn.linear_coefs = tuple(data[start:stop])
+                repn.constant = 0
+            else:
+                variables = []
+                coefficients = []
+                constant = 0
+                for j, c in zip(indices[start:stop], data[start:stop]):
+                    if not fixed[j]:
+                        variables.append(x[j])
+                        coefficients.append(c)
+                    elif compute_values:
+                        constant += c * x[j]()
+                    else:
+                        constant += c * x[j]
+                repn.linear_vars = tuple(variables)
+                repn.linear_coefs = tuple(coefficients)
+                repn.constant = constant
+            repns.append(repn)
+        return repns
+
     def __call__(self, exception=True):
         """Compute the value of the body of this constraint"""
         if self.x is None:
@@ -19,3 +19,4 @@ import pyomo.core.plugins.transform.discrete_vars
 # import pyomo.core.plugins.transform.util
 import pyomo.core.plugins.transform.add_slack_vars
 import pyomo.core.plugins.transform.scaling
+import pyomo.core.plugins.transform.compile_linear
@@ -1,19 +1,13 @@
-import pyomo.environ
+from six import iterkeys
+
 from pyomo.core import *
-from pyomo.gdp import *
-from pyomo.opt import SolverFactory
 
 from pyomo.common.modeling import unique_component_name
 from pyomo.core.plugins.transform.hierarchy import NonIsomorphicTransformation
 
-from random import randint
-
 import logging
 logger = logging.getLogger('pyomo.core')
 
-# DEBUG
-from nose.tools import set_trace
-
 
 @TransformationFactory.register('core.add_slack_variables', \
           doc="Create a model where we add slack variables to every constraint "
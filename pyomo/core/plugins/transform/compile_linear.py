@@ -0,0 +1,78 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+import logging
+
+from six import iterkeys
+
+from pyomo.common.modeling import unique_component_name
+from pyomo.core.base import TransformationFactory
+from pyomo.core.plugins.transform.hierarchy import NonIsomorphicTransformation
+
+logger = logging.getLogger('pyomo.core')
+
+
+@TransformationFactory.register('core.compile_linear',
+          doc="Compile the linear constraints of a model into a single "
+          "constraint matrix stored in compressed sparse row format.")
+class CompileLinearConstraints(NonIsomorphicTransformation):
+    """
+    This plugin removes the active linear constraints of a block (and
+    its sub-blocks) and stores them as the rows of a MatrixConstraint
+    component that is added to the block.  The rows keep the names of
+    the constraints they replace (see MatrixConstraint.find_row) and
+    are written by the problem writers and the persistent solvers
+    without building their expressions.
+
+    Coefficients and bounds that depend on mutable parameters are
+    stored with their current values.  Call the refresh() method of
+    the MatrixConstraint after changing the parameters.
+
+    Keyword arguments:
+        constraint_name           The name of the MatrixConstraint
+                                      component (a unique name
+                                      is chosen by default)
+        skip_trivial_constraints  Drop constraints without variables
+        single_precision_storage  Store coefficients and bounds in
+                                      single precision
+        descend_into              Also compile the constraints on
+                                      sub-blocks (default: True)
+        preserve_names            Keep the names of the compiled
+                                      constraints (default: True)
+        verbose                   Print timing and storage statistics
+    """
+
+    def __init__(self, **kwds):
+        kwds['name'] = "compile_linear"
+        super(CompileLinearConstraints, self).__init__(**kwds)
+
+    def _apply_to(self, instance, **kwds):
+        from pyomo.repn.beta.matrix import compile_block_linear_constraints
+
+        constraint_name = kwds.pop('constraint_name', None)
+        if constraint_name is None:
+            constraint_name = unique_component_name(
+                instance, "_core_compile_linear")
+        options = {}
+        for key in ('skip_trivial_constraints',
+                    'single_precision_storage',
+                    'descend_into',
+                    'preserve_names',
+                    'verbose'):
+            if key in kwds:
+                options[key] = kwds.pop(key)
+        if kwds:
+            logger.warning("Unrecognized keyword arguments in compile "
+                           "linear transformation:\n%s"
+                           % ('\n'.join(iterkeys(kwds)),))
+
+        compile_block_linear_constraints(instance,
+                                         constraint_name,
+                                         **options)
@@ -0,0 +1,130 @@
+import os
+import tempfile
+
+import pyutilib.th as unittest
+
+from pyomo.environ import *
+from pyomo.repn.beta.matrix import (MatrixConstraint,
+                                    _LinearMatrixConstraintData)
+from pyomo.repn.util import LinearCanonicalForms
+
+
+class TestCompileLinear(unittest.TestCase):
+
+    @staticmethod
+    def makeModel():
+        model = ConcreteModel()
+        model.p = Param(mutable=True, initialize=2)
+        model.x = Var([1, 2, 3], bounds=(0, 10))
+        model.c = Constraint([1, 2], rule=lambda m, i:
+                             m.p*m.x[i] + m.x[3] >= i)
+        model.d = Constraint(expr=model.x[1] + model.x[2] <= model.p)
+        model.b = Block()
+        model.b.e = Constraint(expr=model.x[1] - model.x[3] == 1)
+        model.n = Constraint(expr=model.x[1]**2 <= 4)
+        model.obj = Objective(expr=sum(model.x.values()))
+        return model
+
+    def _write_lp(self, model):
+        fd, fname = tempfile.mkstemp(suffix='.lp')
+        os.close(fd)
+        try:
+            model.write(fname,
+                        io_options={'symbolic_solver_labels': True})
+            with open(fname) as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(fname)
+        rows = {}
+        for i, line in enumerate(lines):
+            if line.startswith('c_'):
+                end = lines.index('', i)
+                rows[line] = lines[i+1:end]
+        return rows
+
+    def test_compile(self):
+        m = self.makeModel()
+        TransformationFactory('core.compile_linear').apply_to(m)
+        self.assertEqual(
+            [c.name for c in m.component_objects(Constraint,
+                                                 descend_into=True)],
+            ['n', '_core_compile_linear'])
+        A = m._core_compile_linear
+        self.assertIs(type(A), MatrixConstraint)
+        self.assertEqual(len(A), 4)
+        for row in A.values():
+            self.assertIs(type(row), _LinearMatrixConstraintData)
+            self.assertTrue(row._linear_canonical_form)
+
+    def test_constraint_name(self):
+        m = self.makeModel()
+        TransformationFactory('core.compile_linear').apply_to(
+            m, constraint_name='A', descend_into=False)
+        self.assertEqual(len(m.A), 3)
+        self.assertIsNot(m.b.component('e'), None)
+
+    def test_names(self):
+        m = self.makeModel()
+        TransformationFactory('core.compile_linear').apply_to(m)
+        A = m._core_compile_linear
+        self.assertEqual([row.name for row in A.values()],
+                         ['c[1]', 'c[2]', 'd', 'b.e'])
+        self.assertIs(A.find_row('b.e'), A[3])
+        self.assertEqual(A.find_row('c[2]').lower, 2)
+        self.assertRaises(KeyError, A.find_row, 'c[3]')
+
+        m = self.makeModel()
+        TransformationFactory('core.compile_linear').apply_to(
+            m, preserve_names=False)
+        A = m._core_compile_linear
+        self.assertEqual(A[3].name, '_core_compile_linear[3]')
+        self.assertRaises(KeyError, A.find_row, 'b.e')
+
+    def test_refresh(self):
+        m = self.makeModel()
+        TransformationFactory('core.compile_linear').apply_to(m)
+        A = m._core_compile_linear
+        self.assertEqual(A.find_row('c[1]').coefficients, (2, 1))
+        self.assertEqual(A.find_row('d').upper, 2)
+        m.p = 5
+        self.assertEqual(A.find_row('c[1]').coefficients, (2, 1))
+        A.refresh()
+        self.assertEqual(A.find_row('c[1]').coefficients, (5, 1))
+        self.assertEqual(A.find_row('d').upper, 5)
+        self.assertEqual(A.find_row('b.e').upper, 1)
+
+    def test_canonical_form(self):
+        m = self.makeModel()
+        TransformationFactory('core.compile_linear').apply_to(m)
+        A = m._core_compile_linear
+        m.x[3].fix(4)
+        for compute_values in (True, False):
+            repns = A.canonical_forms(compute_values=compute_values)
+            for row, repn in zip(A.values(), repns):
+                row_repn = row.canonical_form(
+                    compute_values=compute_values)
+                self.assertEqual(repn.linear_vars, row_repn.linear_vars)
+                self.assertEqual(
+                    [value(c) for c in repn.linear_coefs],
+                    [value(c) for c in row_repn.linear_coefs])
+                self.assertEqual(value(repn.constant),
+                                 value(row_repn.constant))
+        repn = A.find_row('c[1]').canonical_form()
+        self.assertEqual(repn.linear_vars, (m.x[1],))
+        self.assertEqual(repn.linear_coefs, (2,))
+        self.assertEqual(repn.constant, 4)
+        repn = A.find_row('c[1]').canonical_form(compute_values=False)
+        self.assertIs(repn.linear_coefs[0], m.p)
+        canonical_form = LinearCanonicalForms()
+        repn = canonical_form(A[0])
+        self.assertIs(canonical_form(A[0]), repn)
+
+    def test_write_lp(self):
+        m = self.makeModel()
+        rows = self._write_lp(m)
+        TransformationFactory('core.compile_linear').apply_to(m)
+        self.assertEqual(self._write_lp(m), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
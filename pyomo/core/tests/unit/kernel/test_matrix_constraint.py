@@ -1136,6 +1136,92 @@ class Test_matrix_constraint(unittest.TestCase):
         self.assertEqual(repn.linear_coefs, ())
         self.assertEqual(repn.constant(), 4)
 
+    def _check_canonical_forms(self, ctuple, compute_values):
+        repns = ctuple.canonical_forms(compute_values=compute_values)
+        self.assertEqual(len(repns), len(ctuple))
+        for c, repn in zip(ctuple, repns):
+            row = c.canonical_form(compute_values=compute_values)
+            self.assertEqual(len(repn.linear_vars), len(row.linear_vars))
+            for v1, v2 in zip(repn.linear_vars, row.linear_vars):
+                self.assertIs(v1, v2)
+            self.assertEqual(repn.linear_coefs, row.linear_coefs)
+            for coef in repn.linear_coefs:
+                self.assertIs(type(coef), float)
+            if compute_values:
+                self.assertEqual(repn.constant, row.constant)
+            else:
+                self.assertEqual(pmo.value(repn.constant),
+                                 pmo.value(row.constant))
+
+    def test_canonical_forms(self):
+        A = numpy.array([[0, 2, 0],
+                         [1, 0, -1],
+                         [0, 0, 0],
+                         [3, 4, 5]])
+        for sparse in (True, False):
+            vlist = _create_variable_list(3)
+            ctuple = matrix_constraint(A, x=vlist, sparse=sparse)
+            self._check_canonical_forms(ctuple, True)
+            vlist[0].fix(1)
+            self._check_canonical_forms(ctuple, True)
+            self._check_canonical_forms(ctuple, False)
+            vlist[1].fix(2)
+            vlist[2].fix(3)
+            self._check_canonical_forms(ctuple, True)
+            self._check_canonical_forms(ctuple, False)
+            ctuple.x = None
+            with self.assertRaises(ValueError):
+                ctuple.canonical_forms()
+
+    def test_linear_canonical_forms(self):
+        from pyomo.repn.util import LinearCanonicalForms
+        A = numpy.array([[1, 2],
+                         [0, 3]])
+        vlist = _create_variable_list(2)
+        b = block()
+        b.x = vlist
+        b.c = matrix_constraint(A, x=vlist, lb=0)
+        b.d = linear_constraint(variables=vlist, coefficients=[1, 1],
+                                ub=1)
+        canonical_form = LinearCanonicalForms()
+        repn = canonical_form(b.c[1])
+        self.assertEqual(repn.linear_coefs, (3.0,))
+        self.assertIs(repn.linear_vars[0], vlist[1])
+        # the rows are computed once for the entire matrix
+        self.assertIs(canonical_form(b.c[1]), repn)
+        repn = canonical_form(b.d)
+        self.assertEqual(repn.linear_coefs, (1, 1))
+
+    def test_write_lp(self):
+        import os
+        import tempfile
+        A = numpy.array([[1, 2],
+                         [4, 3]])
+        b = block()
+        b.x = _create_variable_list(2, lb=0)
+        b.c = matrix_constraint(A, x=b.x, lb=1)
+        b.d = constraint_list()
+        for i in range(2):
+            b.d.append(linear_constraint(variables=b.x,
+                                         coefficients=A[i].tolist(),
+                                         lb=1))
+        b.o = pmo.objective(b.x[0] + b.x[1])
+        fd, fname = tempfile.mkstemp(suffix='.lp')
+        os.close(fd)
+        try:
+            b.write(fname, symbolic_solver_labels=True)
+            with open(fname) as f:
+                lines = f.read().splitlines()
+        finally:
+            os.remove(fname)
+        rows = {}
+        for i, line in enumerate(lines):
+            if line.startswith(('c_l_c', 'c_l_d')):
+                rows[line] = lines[i+1:i+4]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows['c_l_c(0)_:'], rows['c_l_d(0)_:'])
+        self.assertEqual(rows['c_l_c(1)_:'], rows['c_l_d(1)_:'])
+
     def test_preorder_traversal(self):
         A = numpy.ones((3,3))
 
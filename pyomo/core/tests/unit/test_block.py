@@ -11,9 +11,11 @@
 # Unit Tests for Elements of a Block
 #
 
+import gc
 import os
 import sys
 import six
+import weakref
 
 from six import StringIO
 
@@ -1699,6 +1701,85 @@ class TestBlock(unittest.TestCase):
         self.assertEqual(test, ref)
 
 
+    def test_component_data_objects_cache(self):
+        def def_con(b, i):
+            b.x = Var([1,2])
+            b.c = Constraint([1,2], rule=lambda b, j: b.x[j] >= i)
+        m = ConcreteModel()
+        m.b = Block([1,2], rule=def_con)
+        m.l = ConstraintList()
+
+        # The cache is disabled by default
+        list(m.component_data_objects(Constraint))
+        self.assertNotIn('_component_data_cache', m.__dict__)
+        m.enable_component_data_cache()
+
+        def check(**kwds):
+            ref = list(m._component_data_objects(
+                Constraint, kwds.get('active', None), False, True, None))
+            for i in range(2):
+                self.assertEqual(
+                    [c.name for c in m.component_data_objects(
+                        Constraint, **kwds)],
+                    [c.name for c in ref])
+
+        check()
+        check(active=True)
+        self.assertIn('_component_data_cache', m.__dict__)
+        m.b[1].c[2].deactivate()
+        check(active=True)
+        m.b[2].deactivate()
+        check(active=True)
+        m.b[2].activate()
+        m.l.add(m.b[1].x[1] <= 5)
+        check()
+        m.b[1].y = Constraint(expr=m.b[1].x[2] <= 5)
+        check()
+        del m.b[1].c[1]
+        check()
+        m.b[2].del_component('c')
+        check()
+
+        # The model changes while the cached list is returned
+        ref = [c.name for c in m.component_data_objects(Constraint)]
+        test = []
+        for c in m.component_data_objects(Constraint):
+            test.append(c.name)
+            if c is m.b[1].c[2]:
+                m.b[2].z = Constraint(expr=m.b[2].x[1] == 0)
+        self.assertEqual(test, ref + ['b[2].z'])
+
+        # The cache is not copied
+        self.assertNotIn('_component_data_cache', m.clone().__dict__)
+
+        # Traversals of sub-blocks are cached on the model, which is
+        # not affected by changes to other models
+        m.b[1].enable_component_data_cache()
+        self.assertEqual(
+            [c.name for c in m.b[1].component_data_objects(Constraint)],
+            ['b[1].c[2]', 'b[1].y'])
+        cache = m.__dict__['_component_data_cache']
+        self.assertEqual(len(cache), 1)
+        n = ConcreteModel()
+        n.x = Var()
+        n.c = Constraint(expr=n.x >= 0)
+        n.c.deactivate()
+        self.assertIs(m.__dict__['_component_data_cache'], cache)
+
+        # The cache does not keep deleted components alive
+        m.d = Block([1,2], rule=def_con)
+        self.assertIn(
+            'd[2]', [d.name for d in m.component_data_objects(Block)])
+        ref = weakref.ref(m.d[2])
+        del m.d[2]
+        gc.collect()
+        self.assertIsNone(ref())
+
+        m.enable_component_data_cache(False)
+        self.assertNotIn('_component_data_cache', m.__dict__)
+        list(m.component_data_objects(Constraint))
+        self.assertNotIn('_component_data_cache', m.__dict__)
+
     def test_deepcopy(self):
         m = ConcreteModel()
         m.x = Var()
@@ -1885,6 +1966,50 @@ class TestBlock(unittest.TestCase):
             sorted(id(x) for x in (m.x, m.y[1], nb.x, nb.y[1])),
         )
 
+    def test_clone_shared_data(self):
+        m = ConcreteModel()
+        m.I = Set(initialize=[(1,'a'), (2,'b')])
+        m.p = Param(m.I, initialize={(1,'a'): 1.5, (2,'b'): 2.5})
+        m.q = Param(mutable=True, initialize=3)
+        m.x = Var(m.I, bounds=(0, 10))
+        m.y = Var()
+        m.c = Constraint(m.I, rule=lambda m, i, j: m.p[i,j]*m.x[i,j] <= m.q)
+        m.b = Block()
+        m.b.z = Var()
+        m.b.c = Constraint(expr=m.b.z + m.y**2 + m.q*m.y >= 1)
+
+        n = m.clone()
+        # Containers are copied...
+        self.assertIsNot(n.I, m.I)
+        self.assertIsNot(n.p._data, m.p._data)
+        self.assertIsNot(n.q, m.q)
+        self.assertIs(n.x[1,'a'].parent_component(), n.x)
+        self.assertIs(n.x[1,'a'].domain, m.x[1,'a'].domain)
+        # ...but immutable data is shared
+        key = next(iter(m.x._data))
+        self.assertIs(next(iter(n.x._data)), key)
+        self.assertIs(n.p[key], m.p[key])
+        self.assertEqual(
+            sorted(id(x) for x in EXPR.identify_variables(n.c[key].body)),
+            [id(n.x[key])])
+        n.I.add((3,'c'))
+        self.assertEqual(len(m.I), 2)
+        n.q = 5
+        n.x[key].setub(7)
+        self.assertEqual(value(m.q), 3)
+        self.assertEqual(m.x[key].ub, 10)
+        self.assertEqual(value(n.c[key].upper), 5)
+        self.assertEqual(value(m.c[key].upper), 3)
+
+        # Subexpressions that only refer to components outside the
+        # cloned block are shared
+        nb = m.b.clone()
+        self.assertIs(nb.c.body.arg(1), m.b.c.body.arg(1))
+        self.assertIs(nb.c.body.arg(2), m.b.c.body.arg(2))
+        self.assertIsNot(nb.c.body, m.b.c.body)
+        self.assertIs(nb.c.body.arg(0), nb.z)
+        self.assertEqual(str(nb.c.body), 'z + y**2 + q*y')
+
     def test_clone_unclonable_attribute(self):
         class foo(object):
             def __deepcopy__(bogus):
@@ -151,6 +151,59 @@ class LabelerTests(unittest.TestCase):
         self.assertEqual(lbl(m.ind[10]), 'ind_10_')
         self.assertEqual(lbl(m.ind[1]), 'ind_1_')
 
+    def test_shared_name_buffer(self):
+        m = self.m
+        lbl = TextLabeler()
+        self.assertEqual(lbl(m.ind[3]), 'ind(3)')
+        # The labels (and names) for all data of the component are
+        # generated at once
+        self.assertIn(id(m.ind[7]), lbl.labels)
+        name_buffer = m._name_buffer()
+        self.assertEqual(name_buffer[id(m.ind[7])], 'ind[7]')
+        self.assertIs(m._name_buffer(), name_buffer)
+        self.assertEqual(m.ind[7].name, 'ind[7]')
+
+        # The name property only names the requested object
+        del m._name_buffer_cache
+        self.assertEqual(m.ind[3].name, 'ind[3]')
+        name_buffer = m._name_buffer()
+        self.assertIn(id(m.ind[3]), name_buffer)
+        self.assertNotIn(id(m.ind[7]), name_buffer)
+
+        # Names are kept when components are (de)activated or
+        # component data is deleted
+        m.myblock.deactivate()
+        m.myblock.activate()
+        self.assertIs(m._name_buffer(), name_buffer)
+        data = m.ind[3]
+        del m.ind[3]
+        self.assertIs(m._name_buffer(), name_buffer)
+        self.assertNotIn(id(data), name_buffer)
+
+        # Names are discarded when the model changes
+        b = m.myblock
+        self.assertEqual(b.mystreet.name, 'myblock.mystreet')
+        m.del_component(b)
+        self.assertIsNot(m._name_buffer(), name_buffer)
+        m.newblock = b
+        self.assertEqual(b.mystreet.name, 'newblock.mystreet')
+        self.assertEqual(TextLabeler()(b.mystreet), 'newblock_mystreet')
+        m.name = 'renamed'
+        self.assertEqual(m.name, 'renamed')
+        # Models are also renamed through _name (e.g., by PySP)
+        m._name = 'renamed_again'
+        self.assertEqual(m.name, 'renamed_again')
+
+        # Names are not shared with copies of the model
+        self.assertNotIn('_name_buffer_cache', m.clone().__dict__)
+
+    def test_name_index_escape(self):
+        m = ConcreteModel()
+        m.x = Var([(1, "a,b"), (2.5, "it's"), (3, 'c')])
+        self.assertEqual(m.x[1, "a,b"].name, "x[1,'a,b']")
+        self.assertEqual(m.x[2.5, "it's"].name, "x[2.5,'it\\'s']")
+        self.assertEqual(m.x[3, 'c'].name, "x[3,c]")
+
 
 if __name__ == "__main__":
     unittest.main()
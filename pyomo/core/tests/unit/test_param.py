@@ -30,6 +30,20 @@ from pyomo.core.base.param import _NotValid
 
 from six import iteritems, itervalues, StringIO
 
+_has_numpy = False
+try:
+    import numpy
+    _has_numpy = True
+except:
+    pass
+
+_has_pandas = False
+try:
+    import pandas
+    _has_pandas = True
+except:
+    pass
+
 class ParamTester(object):
 
     def setUp(self, **kwds):
@@ -1938,5 +1952,140 @@ class MiscIndexedParamBehaviorTests(unittest.TestCase):
 assignTestsIndexedParamTests(MiscIndexedParamBehaviorTests,instrinsic_test_list)
 
 
+@unittest.skipIf(not _has_numpy, "Numpy is not installed")
+class TestBulkParamData(unittest.TestCase):
+
+    def test_numpy_init(self):
+        m = ConcreteModel()
+        m.A = RangeSet(3)
+        m.p = Param(m.A, initialize=numpy.array([1.5, 2.5, 3.5]),
+                    within=NonNegativeReals)
+        self.assertEqual(m.p.extract_values(), {1:1.5, 2:2.5, 3:3.5})
+        self.assertIs(type(m.p[1]), float)
+
+    def test_numpy_init_product(self):
+        m = ConcreteModel()
+        m.A = RangeSet(3)
+        m.B = Set(initialize=['a','b'], ordered=True)
+        m.p = Param(m.A, m.B, initialize=numpy.arange(6).reshape(3,2),
+                    within=Integers)
+        self.assertEqual(m.p[1,'a'], 0)
+        self.assertEqual(m.p[2,'b'], 3)
+        self.assertEqual(m.p[3,'b'], 5)
+        self.assertRaisesRegexp(
+            ValueError, "from an array with shape \(2, 3\)",
+            m.add_component, 'q',
+            Param(m.A, m.B, initialize=numpy.arange(6).reshape(2,3)))
+
+    def test_numpy_init_errors(self):
+        m = ConcreteModel()
+        m.A = RangeSet(3)
+        m.U = Set(initialize=[1,2,3])
+        self.assertRaisesRegexp(
+            ValueError, "from an array with 2 values",
+            m.add_component, 'q1', Param(m.A, initialize=numpy.array([1,2])))
+        self.assertRaisesRegexp(
+            ValueError, "the index set U is not ordered",
+            m.add_component, 'q2', Param(m.U, initialize=numpy.array([1,2,3])))
+        self.assertRaisesRegexp(
+            ValueError, "Value not in parameter domain NonNegativeReals",
+            m.add_component, 'q3',
+            Param(m.A, initialize=numpy.array([1.,-2.,3.]),
+                  within=NonNegativeReals))
+        self.assertRaisesRegexp(
+            ValueError, "Value not in parameter domain PositiveIntegers",
+            m.add_component, 'q4',
+            Param(m.A, initialize=numpy.array([1.,2.,3.]),
+                  within=PositiveIntegers))
+        self.assertRaisesRegexp(
+            ValueError, "Value not in parameter domain Binary",
+            m.add_component, 'q5',
+            Param(m.A, initialize=numpy.array([0,1,2]), within=Binary))
+
+    def test_numpy_validate(self):
+        m = ConcreteModel()
+        m.A = RangeSet(3)
+        self.assertRaisesRegexp(
+            ValueError, "Value failed parameter validation rule",
+            m.add_component, 'q',
+            Param(m.A, initialize=numpy.array([1,2,3]),
+                  validate=lambda m, v, i: v < 3))
+        m.p = Param(m.A, initialize=numpy.array(['a','b','c']),
+                    within=Any)
+        self.assertEqual(m.p[2], 'b')
+
+    def test_skip_domain_validation(self):
+        m = ConcreteModel()
+        m.A = RangeSet(3)
+        m.p = Param(m.A, initialize=numpy.array([-1.,2.,3.]),
+                    within=NonNegativeReals, validate_domain=False)
+        self.assertEqual(m.p[1], -1.0)
+
+    def test_store_values(self):
+        m = ConcreteModel()
+        m.A = RangeSet(3)
+        m.p = Param(m.A, initialize=0, mutable=True,
+                    within=NonNegativeReals)
+        p1 = m.p[1]
+        m.p.store_values(numpy.array([4.,5.,6.]))
+        self.assertIs(m.p[1], p1)
+        self.assertEqual(value(m.p[1]), 4.0)
+        self.assertEqual(value(m.p[3]), 6.0)
+        self.assertRaisesRegexp(
+            ValueError, "Value not in parameter domain NonNegativeReals",
+            m.p.store_values, numpy.array([4.,-5.,6.]))
+        m.p.store_values(numpy.array([4.,-5.,6.]), check=False)
+        self.assertEqual(value(m.p[2]), -5.0)
+
+    @unittest.skipIf(not _has_pandas, "Pandas is not installed")
+    def test_pandas_series(self):
+        m = ConcreteModel()
+        m.A = Set(initialize=[1,2,3])
+        m.p = Param(m.A, initialize=pandas.Series([1.,2.], index=[3,1]),
+                    mutable=True)
+        self.assertEqual(len(m.p), 2)
+        self.assertEqual(value(m.p[3]), 1.0)
+        self.assertEqual(value(m.p[1]), 2.0)
+        m.p.store_values(pandas.Series([5.], index=[2]))
+        self.assertEqual(value(m.p[2]), 5.0)
+        self.assertRaisesRegexp(
+            KeyError, "Index '7' is not valid",
+            m.add_component, 'q',
+            Param(m.A, initialize=pandas.Series([1.], index=[7])))
+
+    @unittest.skipIf(not _has_pandas, "Pandas is not installed")
+    def test_pandas_multiindex(self):
+        m = ConcreteModel()
+        m.A = Set(initialize=[1,2])
+        m.B = Set(initialize=['a','b'])
+        index = pandas.MultiIndex.from_tuples([(1,'a'), (2,'b')])
+        m.p = Param(m.A, m.B, initialize=pandas.Series([1,2], index=index),
+                    default=0)
+        self.assertEqual(m.p[1,'a'], 1)
+        self.assertEqual(m.p[2,'b'], 2)
+        self.assertEqual(m.p[1,'b'], 0)
+
+    @unittest.skipIf(not _has_pandas, "Pandas is not installed")
+    def test_pandas_dataframe(self):
+        m = ConcreteModel()
+        m.A = Set(initialize=[1,2])
+        m.B = Set(initialize=['a','b'])
+        df = pandas.DataFrame({'a':[1.,2.], 'b':[3.,4.]}, index=[1,2])
+        m.p = Param(m.A, m.B, initialize=df)
+        self.assertEqual(m.p.extract_values(),
+                         {(1,'a'):1., (2,'a'):2., (1,'b'):3., (2,'b'):4.})
+        m.q = Param(m.A, initialize=df[['b']])
+        self.assertEqual(m.q.extract_values(), {1:3., 2:4.})
+
+    @unittest.skipIf(not _has_pandas, "Pandas is not installed")
+    def test_pandas_construct_data(self):
+        model = AbstractModel()
+        model.A = Set(initialize=[1,2])
+        model.p = Param(model.A)
+        instance = model.create_instance(
+            data={None: {'p': pandas.Series([3,4], index=[1,2])}})
+        self.assertEqual(instance.p[2], 4)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -15,9 +15,12 @@ import os
 from os.path import abspath, dirname
 currdir = dirname(abspath(__file__))+os.sep
 
+import pyutilib.misc
 import pyutilib.th as unittest
 
 from pyomo.environ import *
+from pyomo.core.base import piecewise
+from pyomo.core.base.piecewise import numpy_available
 
 class TestMiscPiecewise(unittest.TestCase):
 
@@ -456,6 +459,119 @@ class TestInvalidPiecewise(unittest.TestCase):
 
 
 
+class TestBulkPiecewise(unittest.TestCase):
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_characterize_functions(self):
+        # The bulk path returns the same values as characterizing one
+        # function at a time
+        pts = [-2, -1, 0.5, 1, 3]
+        f_rule = {1: [4, 1, 0.25, 1, 9],        # convex
+                  2: [-4, -1, -0.25, -1, -9],   # concave
+                  3: [0, 1, 0, 1, 0],           # neither
+                  4: [1, 2, 3, 4, 5]}           # close slopes
+        result = piecewise._characterize_functions(
+            0.5, f_rule, None, pts, [1, 2, 3, 4])
+        for i in f_rule:
+            pyutilib.misc.setup_redirect(currdir+'piecewise.out')
+            try:
+                character, values, step = piecewise._characterize_function(
+                    'c', 0.5, f_rule, None, pts, i)
+            finally:
+                pyutilib.misc.reset_redirect()
+            with open(currdir+'piecewise.out') as INPUT:
+                warn = bool(INPUT.read())
+            os.remove(currdir+'piecewise.out')
+            self.assertEqual(result[i], (character, values, step, warn))
+        self.assertEqual([result[i][0] for i in f_rule], [1, -1, 0, 0])
+        self.assertEqual([result[i][3] for i in f_rule],
+                         [False, False, False, True])
+
+        # step functions
+        result = piecewise._characterize_functions(
+            1e-8, [0, 0, 1, 1], None, [0, 1, 1, 2], [1, 2])
+        self.assertEqual(result[1], (0, [0, 0, 1, 1], True, False))
+        # lists of values that do not match the points
+        self.assertIsNone(piecewise._characterize_functions(
+            1e-8, {1: [0, 1], 2: [0, 1, 2]}, None, [0, 1], [1, 2]))
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_characterize_all_equal_points(self):
+        # Equal lists of points built separately for each index are
+        # characterized together
+        model = ConcreteModel()
+        model.x = Var([1, 2, 3], bounds=(-1, 1))
+        model.y = Var([1, 2, 3])
+        model.con = Piecewise([1, 2, 3], model.y, model.x,
+                              pw_pts={i: [-1, 0, 1] for i in [1, 2, 3]},
+                              pw_constr_type='EQ',
+                              f_rule=lambda model, i, x: i*x**2)
+        characterized = model.con._characterize_all()
+        self.assertEqual(sorted(characterized), [1, 2, 3])
+        for i in [1, 2, 3]:
+            self.assertEqual(characterized[i][0], 1)
+            self.assertEqual(list(characterized[i][1]), [i, 0, i])
+
+    def test_linear_sum(self):
+        model = ConcreteModel()
+        model.x = Var(range(4))
+        xs = [model.x[i] for i in range(4)]
+        for coefs in ([1, 2, 0, 3.5], [0, 0, 0, 0], [0, 2, 0, 0],
+                      [1, 1, 1, 1], [0, 1, 0, 0]):
+            expected = sum(c*v for c, v in zip(coefs, xs))
+            expr = piecewise._linear_sum(coefs, xs)
+            self.assertIs(type(expr), type(expected))
+            self.assertEqual(str(expr), str(expected))
+        model.p = Param(mutable=True, initialize=2)
+        expr = piecewise._linear_sum([1, model.p], xs[:2])
+        self.assertEqual(str(expr), "x[0] + p*x[1]")
+
+    @unittest.skipIf(not numpy_available, "NumPy is not available")
+    def test_find_M(self):
+        bigm = piecewise._BIGMPiecewise()
+        x_pts = [-2, -1, 0.5, 1, 3]
+        y_pts = [0, 1, 0, 1.5, -2]
+        for bound in (piecewise.Bound.Lower, piecewise.Bound.Upper):
+            M = bigm._find_M_array(x_pts, y_pts, bound)
+            expected = {}
+            for j in range(1, len(x_pts)):
+                vals = [bigm._M_func(x_pts[k], y_pts[k], x_pts[j-1],
+                                     y_pts[j-1], x_pts[j], y_pts[j])
+                        for k in range(len(x_pts))]
+                if bound == piecewise.Bound.Lower:
+                    m = min([0.0, min(vals)])
+                else:
+                    m = max([0.0, max(vals)])
+                if m != 0.0:
+                    expected[j] = m
+            self.assertEqual(M, expected)
+
+    def test_indexed_matches_single(self):
+        # An indexed Piecewise component generates the same
+        # constraints as a Piecewise component for each index
+        pts = [0, 1, 2, 4]
+        f_rule = {1: [0, 1, 4, 16], 2: [0, 2, 1, 3]}
+        for repn in ('SOS2', 'CC', 'DCC', 'MC', 'INC', 'BIGM_BIN'):
+            model = ConcreteModel()
+            model.x = Var([1,2], bounds=(0,4))
+            model.y = Var([1,2])
+            model.c = Piecewise([1,2], model.y, model.x, pw_pts=pts,
+                                pw_constr_type='EQ', f_rule=f_rule,
+                                pw_repn=repn)
+            for i in (1, 2):
+                model.add_component(
+                    'c%d' % i,
+                    Piecewise(model.y[i], model.x[i], pw_pts=pts,
+                              pw_constr_type='EQ', f_rule=f_rule[i],
+                              pw_repn=repn))
+                single = model.component('c%d' % i)
+                for con in model.c[i].component_data_objects(Constraint):
+                    other = single.find_component(con.local_name)
+                    self.assertEqual(
+                        str(con.body).replace('c[%d].' % i, 'c%d.' % i),
+                        str(other.body))
+
+
 if __name__ == "__main__":
     unittest.main()
      
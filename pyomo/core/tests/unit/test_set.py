@@ -29,6 +29,7 @@
 import copy
 import itertools
 import os
+import pickle
 from os.path import abspath, dirname
 from six import StringIO, iterkeys
 
@@ -49,6 +50,13 @@ try:
 except:
     pass
 
+_has_pandas = False
+try:
+    import pandas
+    _has_pandas = True
+except:
+    pass
+
 class PyomoModel(unittest.TestCase):
 
     def setUp(self):
@@ -671,6 +679,162 @@ class TestRangeSetMisc(unittest.TestCase):
         self.assertEqual(tmp, list(range(1,11,2)))
         self.assertEqual( instance.d.bounds(), (1,9))
 
+    def test_ord(self):
+        a=RangeSet(0,10,2)
+        a.construct()
+        self.assertEqual([a.ord(i) for i in a], [1,2,3,4,5,6])
+        self.assertEqual(a.ord(4.0), 3)
+        self.assertRaises(IndexError, a.ord, 3)
+        self.assertRaises(IndexError, a.ord, 12)
+        self.assertEqual(a.next(4), 6)
+        self.assertEqual(a.prev(4), 2)
+        self.assertEqual(a.nextw(10), 0)
+        self.assertEqual(a.prevw(0), 10)
+        self.assertRaises(KeyError, a.next, 3)
+
+    def test_ord_filter(self):
+        model=ConcreteModel()
+        model.a=RangeSet(1,10,filter=lambda m,i: i % 3 != 0)
+        self.assertEqual(list(model.a), [1,2,4,5,7,8,10])
+        self.assertEqual([model.a[i] for i in range(1,8)],
+                         [1,2,4,5,7,8,10])
+        self.assertEqual(model.a[-1], 10)
+        self.assertEqual([model.a.ord(i) for i in model.a],
+                         list(range(1,8)))
+        self.assertRaises(IndexError, model.a.ord, 3)
+
+class TestOrderedSetStorage(unittest.TestCase):
+
+    def test_integer_progression(self):
+        model=ConcreteModel()
+        model.a=Set(initialize=range(1,6), ordered=True)
+        self.assertIs(type(model.a.order_dict),
+                      pyomo.core.base.sets._ArithmeticOrderIndex)
+        self.assertEqual(model.a.ord(3), 3)
+        self.assertTrue(3 in model.a)
+        self.assertTrue(3.0 in model.a)
+        self.assertFalse(3.5 in model.a)
+        self.assertFalse(6 in model.a)
+        self.assertFalse('a' in model.a)
+        self.assertEqual(model.a.next(3), 4)
+        self.assertEqual(model.a.nextw(5), 1)
+        model.a.add(6)
+        self.assertIs(type(model.a.order_dict),
+                      pyomo.core.base.sets._ArithmeticOrderIndex)
+        model.a.discard(6)
+        self.assertIs(type(model.a.order_dict),
+                      pyomo.core.base.sets._ArithmeticOrderIndex)
+        self.assertEqual(list(model.a), [1,2,3,4,5])
+        model.a.add(8)
+        self.assertIs(type(model.a.order_dict), dict)
+        self.assertEqual(model.a.ord(8), 6)
+        self.assertEqual(model.a.ord(5), 5)
+        model.a.discard(1)
+        self.assertEqual(model.a.ord(2), 1)
+        self.assertEqual(list(model.a), [2,3,4,5,8])
+
+    def test_sorted_progression(self):
+        model=ConcreteModel()
+        model.a=Set(initialize=[7,1,3,5], ordered=Set.SortedOrder)
+        self.assertEqual(model.a.first(), 1)
+        self.assertIs(type(model.a.order_dict),
+                      pyomo.core.base.sets._ArithmeticOrderIndex)
+        self.assertEqual([model.a.ord(i) for i in (1,3,5,7)],
+                         [1,2,3,4])
+
+    def test_non_integer_members(self):
+        model=ConcreteModel()
+        model.a=Set(initialize=[0.5,1.0,1.5], ordered=True)
+        self.assertIs(type(model.a.order_dict), dict)
+        model.b=Set(initialize=['a','b'], ordered=True)
+        self.assertIs(type(model.b.order_dict), dict)
+        self.assertEqual(model.b.ord('b'), 2)
+
+    def test_clone_and_pickle(self):
+        model=ConcreteModel()
+        model.a=Set(initialize=range(3,12,3), ordered=True)
+        for inst in (model.clone(),
+                     pickle.loads(pickle.dumps(model))):
+            self.assertIs(type(inst.a.order_dict),
+                          pyomo.core.base.sets._ArithmeticOrderIndex)
+            self.assertEqual(list(inst.a), [3,6,9])
+            self.assertEqual(inst.a.ord(9), 3)
+
+class TestSparseIndexSet(unittest.TestCase):
+
+    def test_tuples(self):
+        model=ConcreteModel()
+        model.s=SparseIndexSet([(1,'a'),(2,'b'),(4,'a')])
+        self.assertEqual(model.s.dimen, 2)
+        self.assertEqual(len(model.s), 3)
+        self.assertEqual(list(model.s), [(1,'a'),(2,'b'),(4,'a')])
+        self.assertTrue((2,'b') in model.s)
+        self.assertFalse((2,'a') in model.s)
+        self.assertFalse([2,'b'] in model.s)
+        self.assertEqual(model.s.data(), set([(1,'a'),(2,'b'),(4,'a')]))
+
+        calls = []
+        def rule(m, i, j):
+            calls.append((i,j))
+            return i
+        model.p=Param(model.s, initialize=rule)
+        self.assertEqual(sorted(calls), [(1,'a'),(2,'b'),(4,'a')])
+        self.assertEqual(model.p[4,'a'], 4)
+
+        model.x=Var(model.s, dense=False)
+        self.assertEqual(len(model.x), 0)
+        model.x[2,'b'].value = 1
+        self.assertEqual(len(model.x), 1)
+        self.assertRaises(KeyError, model.x.__getitem__, (2,'a'))
+
+        model.y=Var(model.s, [1,2])
+        self.assertEqual(len(model.y), 6)
+        self.assertTrue((4,'a',2) in model.y)
+
+    def test_mixed_dimen(self):
+        s=SparseIndexSet([1,(1,2)])
+        self.assertIs(s.dimen, None)
+        s=SparseIndexSet([1,2,3])
+        self.assertEqual(s.dimen, 1)
+
+    def test_duplicates(self):
+        self.assertRaises(ValueError, SparseIndexSet, [(1,2),(1,2)])
+
+    def test_clone(self):
+        model=ConcreteModel()
+        model.s=SparseIndexSet([(1,2),(3,4)])
+        model.x=Var(model.s)
+        inst=model.clone()
+        self.assertTrue((3,4) in inst.s)
+        self.assertEqual(list(inst.x.keys()), [(1,2),(3,4)])
+
+    @unittest.skipIf(not _has_numpy, "Numpy is not installed")
+    def test_numpy(self):
+        model=ConcreteModel()
+        data=numpy.array([[1,2],[3,4],[5,6]])
+        model.s=SparseIndexSet(data)
+        self.assertEqual(list(model.s), [(1,2),(3,4),(5,6)])
+        self.assertIs(type(list(model.s)[0][0]), int)
+        # multi-dimensional arrays can be used directly as an index
+        model.x=Var(data)
+        self.assertIs(type(model.x.index_set()), SparseIndexSet)
+        self.assertEqual(model.x.index_set().dimen, 2)
+        self.assertEqual(list(model.x.keys()), [(1,2),(3,4),(5,6)])
+
+    @unittest.skipIf(not _has_pandas, "Pandas is not installed")
+    def test_pandas(self):
+        model=ConcreteModel()
+        data=pandas.DataFrame({'i':[1,2], 'j':['a','b']},
+                              columns=['i','j'])
+        model.s=SparseIndexSet(data)
+        self.assertEqual(list(model.s), [(1,'a'),(2,'b')])
+        self.assertEqual(model.s.dimen, 2)
+        model.t=SparseIndexSet(data[['i']])
+        self.assertEqual(list(model.t), [1,2])
+        self.assertEqual(model.t.dimen, 1)
+        model.u=SparseIndexSet(data.set_index(['i','j']).index)
+        self.assertEqual(list(model.u), [(1,'a'),(2,'b')])
+
 class SimpleSetB(SimpleSetA):
 
     def setUp(self):
@@ -3431,5 +3595,77 @@ class TestNestedSetOperations(unittest.TestCase):
         self.assertEqual(sorted(inst.product3),
                          sorted(prod3))
 
+    def test_product_set_tuple(self):
+        model = ConcreteModel()
+        model.s1 = Set(initialize=[1,2])
+        model.s2 = Set(initialize=[3,4])
+        model.s3 = Set(initialize=[5,6])
+        prod12 = model.s1 * model.s2
+        prod123 = prod12 * model.s3
+        self.assertEqual(len(prod12.set_tuple), 2)
+        self.assertEqual(len(prod123.set_tuple), 3)
+        self.assertEqual(len(prod12), 4)
+        self.assertEqual(len(prod123), 8)
+
+    def test_ordered_product(self):
+        model = ConcreteModel()
+        model.s1 = Set(initialize=[3,1,2], ordered=True)
+        model.s2 = Set(initialize=['b','a'], ordered=True)
+        model.s3 = Set(initialize=[(1,2),(0,1)], ordered=True)
+        prod = model.s1 * model.s2 * model.s3
+        self.assertTrue(prod.ordered)
+        members = list(prod)
+        self.assertEqual(len(prod), 12)
+        self.assertEqual([prod[i] for i in range(1, len(prod)+1)],
+                         members)
+        self.assertEqual([prod.ord(x) for x in members],
+                         list(range(1, len(prod)+1)))
+        self.assertEqual(prod[-1], members[-1])
+        self.assertEqual(prod.first(), (3,'b',1,2))
+        self.assertEqual(prod.last(), (2,'a',0,1))
+        self.assertEqual(prod.next((3,'b',1,2)), (3,'b',0,1))
+        self.assertEqual(prod.prev((3,'b',0,1)), (3,'b',1,2))
+        self.assertEqual(prod.nextw((2,'a',0,1)), (3,'b',1,2))
+        self.assertEqual(prod.prevw((3,'b',1,2)), (2,'a',0,1))
+        self.assertRaises(IndexError, prod.__getitem__, 13)
+        self.assertRaises(IndexError, prod.__getitem__, 0)
+        self.assertRaises(IndexError, prod.ord, (4,'b',1,2))
+        self.assertRaises(KeyError, prod.next, (4,'b',1,2))
+        self.assertRaises(IndexError, prod.next, (2,'a',0,1))
+
+        model.s4 = Set(initialize=[1,2])
+        unordered = model.s1 * model.s4
+        self.assertFalse(unordered.ordered)
+        self.assertRaises(ValueError, unordered.__getitem__, 1)
+        self.assertRaises(ValueError, unordered.ord, (3,1))
+
+    def test_ordered_set_operators(self):
+        model = ConcreteModel()
+        model.s1 = Set(initialize=[3,1,2], ordered=True)
+        model.s2 = Set(initialize=[5,1,7], ordered=True)
+        union = model.s1 | model.s2
+        self.assertEqual(len(union), 5)
+        self.assertEqual([union[i] for i in range(1, 6)], [3,1,2,5,7])
+        self.assertEqual(union.ord(2), 3)
+        self.assertEqual(union.ord(7), 5)
+        self.assertEqual(union.last(), 7)
+        self.assertEqual(union.next(2), 5)
+        self.assertRaises(IndexError, union.ord, 4)
+
+        intersection = model.s1 & model.s2
+        self.assertEqual(len(intersection), 1)
+        self.assertEqual(intersection.first(), 1)
+
+        difference = model.s1 - model.s2
+        self.assertEqual(len(difference), 2)
+        self.assertEqual(list(difference), [3,2])
+        self.assertEqual(difference[-1], 2)
+        self.assertEqual(difference.ord(2), 2)
+
+        symmetric_difference = model.s1 ^ model.s2
+        self.assertEqual(len(symmetric_difference), 4)
+        self.assertEqual(list(symmetric_difference), [3,2,5,7])
+        self.assertEqual(symmetric_difference[3], 5)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,13 @@
+import os
 import pickle
+import tempfile
 
 import pyutilib.th as unittest
 import pyomo.environ
-from pyomo.core.expr.symbol_map import SymbolMap
+from pyomo.core.base import ConcreteModel, Var, Constraint, Objective
+from pyomo.core.expr.symbol_map import SymbolMap, NumericSymbolMap
 from pyomo.core.kernel.variable import variable
+from pyomo.opt import SolverResults
 
 class TestSymbolMap(unittest.TestCase):
 
@@ -27,5 +31,92 @@ class TestSymbolMap(unittest.TestCase):
         self.assertIs(s.aliases["v"](), v1)
         self.assertIs(s.aliases["A"](), v1)
 
+class TestNumericSymbolMap(unittest.TestCase):
+
+    def test_arrays(self):
+        s = NumericSymbolMap()
+        x = [variable() for i in range(3)]
+        y = variable()
+        s.addSymbolArray('v', x[:2])
+        s.addSymbolArray('v', x[2:])
+        s.addSymbolArray('o', [y])
+        s.alias(y, '__default_objective__')
+        self.assertIs(s.getObject('v0'), x[0])
+        self.assertIs(s.getObject('v2'), x[2])
+        self.assertIs(s.getObject('o0'), y)
+        self.assertIs(s.getObject('__default_objective__'), y)
+        for symb in ('v3', 'v', 'v01', 'c0', 'x1', 3):
+            self.assertIs(s.getObject(symb), SymbolMap.UnknownSymbol)
+        self.assertEqual(s.getObjectArray('v'), x)
+        # The dictionaries are only created when they are used
+        self.assertIsNone(s._bySymbol)
+        self.assertEqual(s.getSymbol(x[1]), 'v1')
+        self.assertEqual(sorted(s.bySymbol), ['o0', 'v0', 'v1', 'v2'])
+        s.addSymbolArray('v', [variable()])
+        self.assertIs(s.bySymbol['v3'](), s.getObject('v3'))
+        s.removeSymbol(x[1])
+        self.assertIs(s.getObject('v1'), SymbolMap.UnknownSymbol)
+        self.assertNotIn('v1', s.bySymbol)
+        self.assertIsNone(s.getObjectArray('v')[1])
+
+    def test_pickle(self):
+        s = NumericSymbolMap()
+        x = [variable() for i in range(3)]
+        s.addSymbolArray('v', x)
+        x_, t = pickle.loads(pickle.dumps((x, s)))
+        self.assertIs(t.getObject('v1'), x_[1])
+        self.assertIsNone(t._bySymbol)
+        x.append(variable())
+        s.addSymbol(x[3], 'other')
+        x_, t = pickle.loads(pickle.dumps((x, s)))
+        self.assertIs(t.getObject('v2'), x_[2])
+        self.assertEqual(sorted(t.bySymbol), ['other', 'v0', 'v1', 'v2'])
+
+    def test_load_nl_solution(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2])
+        m.c = Constraint(expr=m.x[1] + m.x[2] >= 1)
+        m.o = Objective(expr=m.x[1]**2 + m.x[2])
+        fd, fname = tempfile.mkstemp(suffix='.nl')
+        os.close(fd)
+        try:
+            fname, smap_id = m.write(fname)
+        finally:
+            os.remove(fname)
+        smap = m.solutions.symbol_map[smap_id]
+        self.assertIs(type(smap), NumericSymbolMap)
+        results = SolverResults()
+        soln = results.solution.add()
+        soln.variable['v0'] = {'Value': 2}
+        soln.variable['v1'] = {'Value': 3}
+        soln.constraint['c0'] = {'Dual': 4}
+        m.solutions.add_solution(soln, smap_id)
+        m.solutions.select(0)
+        self.assertIsNone(smap._bySymbol)
+        self.assertEqual((m.x[1].value, m.x[2].value), (2, 3))
+
+    def test_load_deleted_object(self):
+        # Symbols for objects that have been deleted are treated as
+        # missing symbols
+        m = ConcreteModel()
+        m.x = Var()
+        v = variable()
+        smap = NumericSymbolMap()
+        smap.addSymbolArray('v', [m.x, v])
+        del v
+        m.solutions.add_symbol_map(smap)
+        results = SolverResults()
+        soln = results.solution.add()
+        soln.variable['v0'] = {'Value': 2}
+        soln.variable['v1'] = {'Value': 3}
+        m.solutions.add_solution(soln, id(smap), delete_symbol_map=False)
+        entry = m.solutions[0]._entry['variable']
+        self.assertEqual(list(entry), [id(m.x)])
+        self.assertIs(entry[id(m.x)][0], smap.arrays['v'][0])
+        with self.assertRaisesRegexp(RuntimeError,
+                                     "Symbol v1 is missing"):
+            m.solutions.add_solution(soln, id(smap),
+                                     ignore_missing_symbols=False)
+
 if __name__ == "__main__":
     unittest.main()
@@ -39,6 +39,18 @@ class DataPortal(object):
             is :const:`None`.
         data_dict (dict): A dictionary used to initialize the data 
             in this object.  Default is :const:`None`.
+        base (DataPortal): A DataPortal whose data is shared by this
+            object.  Data that is loaded into this object is layered
+            on top of the base data: the data for a symbol is copied
+            from the base only when it is modified, and the loaded
+            values replace the base values index by index.  The base
+            should not be modified after this object is created.
+            Default is :const:`None`.
+        pool_connections (bool): If :const:`True`, the database
+            connections opened by data managers are kept open and
+            reused by later calls to :func:`load()` until
+            :func:`close_connections()` is called.  Default is
+            :const:`False`.
     """
 
     def __init__(self, *args, **kwds):
@@ -51,14 +63,33 @@ class DataPortal(object):
         # Initialize this object with no data manager
         self._data_manager = None
 
+        # Database connections that are reused by data managers,
+        # keyed by the connection options (or None if connections are
+        # not pooled)
+        if kwds.pop('pool_connections', False):
+            self._connection_pool = {}
+        else:
+            self._connection_pool = None
+
         # Map initialization data as follows: _data[namespace][symbol] -> data
         self._data={}
 
         # This is the data that is imported from various sources
         self._default={}
 
+        # Share the data in the base DataPortal.  The namespace
+        # dictionaries are copied, but the data for each symbol is
+        # shared until it is modified.
+        self._base = kwds.pop('base', None)
+        if self._base is not None:
+            for namespace, symbols in self._base._data.items():
+                self._data[namespace] = dict(symbols)
+            self._default.update(self._base._default)
+
         # Get the model for which this data is associated.
         self._model = kwds.pop('model', None)
+        if self._model is None and self._base is not None:
+            self._model = self._base._model
 
         # Load data from a file ...
         if 'filename' in kwds:
@@ -103,6 +134,9 @@ class DataPortal(object):
         self._data_manager = DataManagerFactory(tmp)
         if type(self._data_manager) is UnknownDataManager:
             raise IOError("Unknown file format '%s'" % tmp)
+        if self._connection_pool is not None and \
+                hasattr(self._data_manager, 'connection_pool'):
+            self._data_manager.connection_pool = self._connection_pool
         self._data_manager.initialize(**kwds)
         self._data_manager.open()
 
@@ -114,6 +148,25 @@ class DataPortal(object):
         self._data_manager.close()
         self._data_manager = None
 
+    def __getstate__(self):
+        # Database connections cannot be pickled
+        state = dict(self.__dict__)
+        if self._connection_pool is not None:
+            state['_connection_pool'] = {}
+        return state
+
+    def close_connections(self):
+        """
+        Close the database connections that have been opened by
+        data managers and reused by subsequent calls to
+        :func:`load()`.
+        """
+        if self._connection_pool is None:
+            return
+        for connection in self._connection_pool.values():
+            connection.close()
+        self._connection_pool.clear()
+
     def load(self, **kwds):
         """
         Import data from an external data source.
@@ -161,7 +214,10 @@ class DataPortal(object):
         if __debug__ and logger.isEnabledFor(logging.DEBUG):        #pragma:nocover
             logger.debug("Processing data ...")
         self._data_manager.read()
-        status = self._data_manager.process(self._model, self._data, self._default)
+        if self._base is None:
+            status = self._data_manager.process(self._model, self._data, self._default)
+        else:
+            self._process_overlay()
         self._data_manager.clear()
         #
         # Disconnect
@@ -358,6 +414,30 @@ class DataPortal(object):
             else:
                 yield key, ans
 
+    def _process_overlay(self):
+        """
+        Process the data from the data manager without modifying the
+        data that is shared with the base DataPortal.
+        """
+        data = {}
+        default = {}
+        self._data_manager.process(self._model, data, default)
+        for namespace, symbols in data.items():
+            base = self._base._data.get(namespace, {})
+            current = self._data.setdefault(namespace, {})
+            for name, value in symbols.items():
+                old = current.get(name, None)
+                if type(old) is not dict or type(value) is not dict:
+                    current[name] = value
+                elif old is base.get(name, None):
+                    # Copy the shared data before updating it
+                    old = dict(old)
+                    old.update(value)
+                    current[name] = old
+                else:
+                    old.update(value)
+        self._default.update(default)
+
     def _preprocess_options(self):
         """
         Preprocess the options for a data manager.
@@ -13,7 +13,7 @@ __all__ = ['TableData']
 from six.moves import xrange
 
 from pyutilib.misc import Options
-from pyomo.dataportal.process_data import _process_data
+from pyomo.dataportal.process_data import _process_data, _process_token
 
 
 class TableData(object):
@@ -28,6 +28,7 @@ class TableData(object):
         """
         self._info=None
         self._data=None
+        self._streamed=None
         self.options = Options()
         self.options.ncolumns = 1
 
@@ -88,6 +89,18 @@ class TableData(object):
             model = self.options.model
         if not self.options.namespace in data:
             data[self.options.namespace] = {}
+        if self._streamed is not None:
+            #
+            # The data was converted while it was read (see
+            # _stream_data)
+            #
+            _data = data[self.options.namespace]
+            for kind, name, vals in self._streamed:
+                if kind == 'set':
+                    _data[name] = {None: vals}
+                else:
+                    _data.setdefault(name, {}).update(vals)
+            return True
         return _process_data(
           self._info,
           model,
@@ -104,8 +117,14 @@ class TableData(object):
         Clear the data that was extracted from this table
         """
         self._info = None
+        self._streamed = None
 
-    def _set_data(self, headers, rows):
+    def _process_options(self, headers):
+        """
+        Normalize the set, param and index options for a table with
+        the given column headers, and return the indices of the
+        selected columns.
+        """
         from pyomo.core.base.sets import Set
         from pyomo.core.base.param import Param
 
@@ -162,6 +181,10 @@ class TableData(object):
         elif self.options.set is None and self.options.param is None:
             msg = "Must specify the set or parameter option for data"
             raise IOError(msg)
+        return header_index
+
+    def _set_data(self, headers, rows):
+        header_index = self._process_options(headers)
 
         if self.options.format == 'set':
             if not self.options.index is None:
@@ -217,6 +240,82 @@ class TableData(object):
             msg = "Unknown parameter format: '%s'"
             raise ValueError(msg % self.options.format)
 
+    def _stream_data(self, headers, chunks):
+        """
+        Convert rows of data into set members and parameter values as
+        they are read.  The chunks argument is an iterator over lists
+        of rows, so only one chunk of raw rows is held in memory.
+
+        The 'set' and 'table' formats are converted directly into the
+        data that process() returns.  The rows for other formats are
+        collected and processed with _set_data().
+        """
+        header_index = self._process_options(headers)
+        format = self.options.format
+        if format == 'table' and \
+                len(header_index) > len(self.options.param):
+            self._streamed = self._stream_table(header_index, chunks)
+        elif format == 'set':
+            if not self.options.index is None:
+                msg = "Cannot specify index for data with the 'set' format: %s"
+                raise IOError(msg % str(self.options.index))
+            self._streamed = self._stream_set(len(headers), chunks)
+        else:
+            self._set_data(headers, [row for rows in chunks for row in rows])
+
+    def _stream_set(self, ncolumns, chunks):
+        members = []
+        if ncolumns > 1:
+            for rows in chunks:
+                for row in rows:
+                    members.append(tuple(_process_token(i) for i in row))
+        else:
+            for rows in chunks:
+                for row in rows:
+                    members.extend(_process_token(i) for i in row)
+        return [('set', self.options.set, members)]
+
+    def _stream_table(self, header_index, chunks):
+        params = self.options.param
+        d = len(header_index) - len(params)
+        index_cols = header_index[:d]
+        param_cols = header_index[d:]
+        values = [{} for p in params]
+        if self.options.index is None:
+            members = None
+        else:
+            members = []
+        #
+        # Index values are typically repeated many times, so we cache
+        # the converted tokens.  This also lets repeated members share
+        # a single object.
+        #
+        cache = {}
+        def _index_token(token):
+            val = cache.get(token)
+            if val is None:
+                val = cache[token] = _process_token(token)
+            return val
+
+        for rows in chunks:
+            for row in rows:
+                if d > 1:
+                    key = tuple(_index_token(row[i]) for i in index_cols)
+                else:
+                    key = _index_token(row[index_cols[0]])
+                if members is not None:
+                    members.append(key)
+                for vals, i in zip(values, param_cols):
+                    token = row[i]
+                    if token != '.':
+                        vals[key] = _process_token(token)
+        ans = []
+        if members is not None:
+            ans.append(('set', self.options.index, members))
+        for pname, vals in zip(params, values):
+            ans.append(('param', pname, vals))
+        return ans
+
     def _get_table(self):
         from pyomo.core.expr import value
 
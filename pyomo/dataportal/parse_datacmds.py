@@ -13,10 +13,14 @@ __all__ = ['parse_data_commands']
 import sys
 import os
 import os.path
+import re
+import hashlib
+import tempfile
 import ply.lex as lex
 import ply.yacc as yacc
 from inspect import getfile, currentframe
-from six.moves import xrange
+import six
+from six.moves import xrange, cPickle as pickle
 
 from pyutilib.misc import flatten_list
 from pyutilib.ply import t_newline, t_ignore, _find_column, p_error, ply_init
@@ -425,11 +429,7 @@ tabmodule = 'parse_table_datacmds'
 dat_lexer = None
 dat_yaccer = None
 
-#
-# The function that performs the parsing
-#
-def parse_data_commands(data=None, filename=None, debug=0, outputdir=None):
-
+def _init_parser(debug, outputdir):
     global debugging
     global dat_lexer
     global dat_yaccer
@@ -471,43 +471,208 @@ def parse_data_commands(data=None, filename=None, debug=0, outputdir=None):
                                     optimize=True)
         sys.path = tmpsyspath
 
+def _ply_parse(data, debug=0, outputdir=None):
+    """
+    Parse data commands with the PLY lexer and parser.
+    """
+    global debugging
+    _init_parser(debug, outputdir)
     #
     # Initialize parse object
     #
     global _parse_info
     _parse_info = {}
     _parse_info[None] = []
-
     #
-    # Parse the file
+    # Parse the data
     #
     global _parsedata
-    if not data is None:
-        _parsedata=data
-        ply_init(_parsedata)
-        dat_yaccer.parse(data, lexer=dat_lexer, debug=debug)
-    elif not filename is None:
-        f = open(filename, 'r')
-        try:
-            data = f.read()
-        except Exception:
-            e = sys.exc_info()[1]
-            f.close()
-            del f
-            raise e
-        f.close()
-        del f
-        _parsedata=data
-        ply_init(_parsedata)
+    _parsedata=data
+    ply_init(_parsedata)
+    try:
         dat_yaccer.parse(data, lexer=dat_lexer, debug=debug)
-    else:
-        _parse_info = None
-    #
-    # Disable parsing I/O
-    #
-    debugging=False
-    #print(_parse_info)
+    finally:
+        #
+        # Disable parsing I/O
+        #
+        debugging=False
     return _parse_info
 
+
+## -----------------------------------------------------------
+##
+## Fast path for simple set and param statements
+##
+## Most of the text in large data files is in statements like
+##
+##   param p := 1 2.5 2 3.5 ;
+##   set A := a b c ;
+##   param : x y := 1 2 3 ;
+##
+## which only contain words, numbers, ':' and a single ':='.  These
+## statements are tokenized with a regular expression, which returns
+## the same token lists as the PLY parser.  The remaining statements
+## are parsed with PLY.
+##
+## -----------------------------------------------------------
+
+# Comments, quoted strings and semicolons.  Semicolons in comments
+# and quoted strings do not terminate a statement.
+_segment_re = re.compile(r'''\#[^\n]*|"(?:[^"]|"")*"|'(?:[^']|'')*'|;''')
+_comment_re = re.compile(r'\#[^\n]*')
+_nonsimple_re = re.compile(r'[^\sA-Za-z0-9_.+\-:=]')
+_simple_token_re = re.compile(r':=|:|[A-Za-z0-9_.+\-]+')
+_reserved_words = frozenset(reserved)
+
+def _simple_statement(text):
+    """
+    Return the tokens in a simple set or param statement, an empty
+    list for the 'data' and 'end' statements, or None if the
+    statement needs to be parsed with PLY.
+    """
+    if '#' in text:
+        text = _comment_re.sub('', text)
+    if _nonsimple_re.search(text) is not None:
+        return None
+    tokens = _simple_token_re.findall(text)
+    if len(tokens) == 1 and tokens[0] in ('data', 'end'):
+        return []
+    if len(tokens) < 3 or tokens[1] == ':=' or \
+       text.count('=') != 1 or tokens.count(':=') != 1:
+        return None
+    if tokens[0] == 'set':
+        if tokens[1] == ':' or tokens[2] not in (':', ':='):
+            return None
+    elif tokens[0] != 'param':
+        return None
+    if ':' in tokens[tokens.index(':=')+1:] or \
+       not _reserved_words.isdisjoint(tokens[1:]):
+        return None
+    return tokens
+
+def _fast_parse(data, outputdir=None):
+    """
+    Parse data commands, tokenizing simple statements directly and
+    parsing the other statements with PLY.  Returns None if the data
+    must be parsed with PLY (e.g. it contains namespaces or
+    multi-line comments, or it has syntax errors).
+    """
+    if '{' in data or '/*' in data:
+        return None
+    statements = []
+    pending = []
+    start = 0
+    for match in _segment_re.finditer(data):
+        if match.group() != ';':
+            continue
+        end = match.end()
+        tokens = _simple_statement(data[start:end-1])
+        if tokens is None:
+            pending.append(data[start:end])
+            statements.append(None)
+        elif tokens:
+            statements.append(tokens)
+        start = end
+    if _comment_re.sub('', data[start:]).strip():
+        return None
+    if pending:
+        try:
+            parsed = _ply_parse(''.join(pending), outputdir=outputdir)
+        except IOError:
+            # Parse the whole file to report the error
+            return None
+        if list(parsed.keys()) != [None] or \
+           len(parsed[None]) != len(pending):
+            return None
+        parsed = iter(parsed[None])
+        statements = [next(parsed) if stmt is None else stmt
+                      for stmt in statements]
+    return {None: statements}
+
+
+## -----------------------------------------------------------
+##
+## On-disk cache of parsed data commands
+##
+## -----------------------------------------------------------
+
+# Increment this when the format of the parsed data changes
+_cache_version = 1
+
+def _cache_filename(cache_dir, data):
+    """
+    The name of the cache file for the given data.  The file is
+    identified by a hash of the data, so it is reused for identical
+    data files at different locations and a modified file never
+    uses a stale cache entry.
+    """
+    key = hashlib.sha1(('%d:%d:' % (_cache_version, sys.version_info[0])).encode())
+    if isinstance(data, six.text_type):
+        data = data.encode('utf-8')
+    key.update(data)
+    return os.path.join(cache_dir, 'dat-%s.pickle' % key.hexdigest())
+
+def _load_cached(cache_file):
+    try:
+        with open(cache_file, 'rb') as INPUT:
+            return pickle.load(INPUT)
+    except Exception:
+        return None
+
+def _store_cached(cache_file, info):
+    cache_dir = os.path.dirname(cache_file)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        # Write to a temporary file and rename it, so concurrent
+        # processes never read a partially written file
+        fd, tmpname = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as OUTPUT:
+            pickle.dump(info, OUTPUT, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            os.rename(tmpname, cache_file)
+        except OSError:
+            # The cache file exists (on Windows)
+            os.remove(tmpname)
+    except (IOError, OSError):
+        pass
+
+#
+# The function that performs the parsing
+#
+def parse_data_commands(data=None, filename=None, debug=0, outputdir=None,
+                        cache_dir=None):
+    """
+    Parse data commands from a string or a file.
+
+    If cache_dir is specified (or the PYOMO_DAT_CACHE_DIR environment
+    variable is set), the parsed commands are stored in that
+    directory and reused when data with the same contents is parsed
+    again.
+    """
+    if data is None:
+        if filename is None:
+            return None
+        with open(filename, 'r') as INPUT:
+            data = INPUT.read()
+    if cache_dir is None:
+        cache_dir = os.environ.get('PYOMO_DAT_CACHE_DIR', None)
+
+    cache_file = None
+    if cache_dir and not debug:
+        cache_file = _cache_filename(cache_dir, data)
+        info = _load_cached(cache_file)
+        if info is not None:
+            return info
+
+    info = None
+    if not debug:
+        info = _fast_parse(data, outputdir)
+    if info is None:
+        info = _ply_parse(data, debug, outputdir)
+    if cache_file is not None:
+        _store_cached(cache_file, info)
+    return info
+
 if __name__ == '__main__':
     parse_data_commands(filename=sys.argv[1], debug=100)
@@ -9,6 +9,7 @@
 #  ___________________________________________________________________________
 
 def load():
+    import pyomo.dataportal.plugins.columnar
     import pyomo.dataportal.plugins.csv_table
     import pyomo.dataportal.plugins.datacommands
     import pyomo.dataportal.plugins.db_table
@@ -0,0 +1,359 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+#
+# Data managers for binary, columnar files.  Each symbol (a set, an
+# indexed parameter or a scalar value) is stored as a group of
+# columns:
+#
+#   index0, index1, ...   The set members or the parameter indices,
+#                         one column per index position
+#   value                 The parameter values (omitted for sets)
+#
+# A scalar value is stored as a value column with a single entry and
+# no index columns.  Columns are converted to Python values with
+# tolist(), so loading data does not parse any text.
+#
+
+import os.path
+import struct
+import zipfile
+
+import six
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+# pandas and PyTables are slow to import, so they are imported the
+# first time the HDF5 interface is used
+pandas = None
+hdf5_available = None
+
+def _import_hdf5():
+    global pandas, hdf5_available
+    if hdf5_available is None:
+        try:
+            import pandas
+            import tables
+            hdf5_available = True
+        except ImportError:
+            hdf5_available = False
+    return hdf5_available
+
+from pyutilib.misc import Options
+
+from pyomo.dataportal.factory import DataManagerFactory
+
+
+def _data_to_columns(name, data):
+    """
+    Convert the data for a symbol into a tuple (index, value) of
+    lists, where index is a list of index columns and value is the
+    list of values (or None for a set).
+    """
+    if type(data) in (list, tuple, set, frozenset):
+        members = list(data)
+        value = None
+    elif type(data) is dict and list(data.keys()) == [None]:
+        return [], [data[None]]
+    else:
+        members = list(data.keys())
+        value = [data[key] for key in members]
+    dimen = set(len(m) if type(m) is tuple else 1 for m in members)
+    if len(dimen) > 1:
+        raise ValueError(
+            "Cannot store the data for '%s' in a columnar file: the "
+            "indices have different dimensions" % (name,))
+    if not dimen or dimen.pop() == 1:
+        index = [members]
+    else:
+        index = [list(col) for col in zip(*members)]
+    return index, value
+
+def _column_array(name, values):
+    """
+    Convert a list of values into a NumPy array.  Raises ValueError if
+    the values cannot be stored in a typed column.
+    """
+    types = set(val.__class__ for val in values)
+    if types <= set([bool]):
+        dtype = bool
+    elif types <= set(six.integer_types):
+        dtype = numpy.int64
+    elif types <= set(six.integer_types + (float,)):
+        dtype = numpy.float64
+    elif types <= set(six.string_types):
+        dtype = six.text_type
+    else:
+        raise ValueError(
+            "Cannot store the data for '%s' in a columnar file: a "
+            "column contains values of types %s"
+            % (name, sorted(t.__name__ for t in types)))
+    return numpy.array(values, dtype=dtype)
+
+def _columns_to_data(index, value):
+    """
+    Convert index and value columns (NumPy arrays or pandas Series)
+    into DataPortal data.
+    """
+    if not index:
+        return {None: value.tolist()[0]}
+    index = [col.tolist() for col in index]
+    if len(index) == 1:
+        keys = index[0]
+    else:
+        keys = list(zip(*index))
+    if value is None:
+        return {None: keys}
+    return dict(zip(keys, value.tolist()))
+
+
+class _ColumnarDictionary(object):
+    """
+    Base class for data managers that store each symbol as a group of
+    columns.  Derived classes implement _open_columns(), which returns
+    an object with a symbols() method and a columns(name) method, and
+    _write_columns().
+    """
+
+    def __init__(self):
+        self._info = {}
+        self.options = Options()
+
+    def available(self):
+        return True
+
+    def initialize(self, **kwds):
+        self.filename = kwds.pop('filename')
+        self.add_options(**kwds)
+
+    def add_options(self, **kwds):
+        self.options.update(kwds)
+
+    def open(self):
+        if self.filename is None:
+            raise IOError("No filename specified")
+
+    def close(self):
+        pass
+
+    def read(self):
+        """
+        Load the columns for the selected symbols.
+        """
+        if not os.path.exists(self.filename):
+            raise IOError("Cannot find file '%s'" % self.filename)
+        source = self._open_columns()
+        try:
+            symbols = source.symbols()
+            if self.options.data is None:
+                names = symbols
+            elif type(self.options.data) in (list, tuple):
+                names = self.options.data
+            else:
+                names = [self.options.data]
+            self._info = {}
+            for name in names:
+                if name not in symbols:
+                    raise IOError(
+                        "Data value for '%s' is not available in file '%s'"
+                        % (name, self.filename))
+                self._info[name] = _columns_to_data(*source.columns(name))
+        finally:
+            source.close()
+
+    def write(self, data):
+        """
+        Write the selected symbols to the file.
+        """
+        if self.options.data is None:
+            names = list(data.keys())
+        elif type(self.options.data) in (list, tuple):
+            names = self.options.data
+        else:
+            names = [self.options.data]
+        columns = {}
+        for name in names:
+            index, value = _data_to_columns(name, data[name])
+            columns[name] = (
+                [_column_array(name, col) for col in index],
+                None if value is None else _column_array(name, value))
+        self._write_columns(columns)
+
+    def process(self, model, data, default):
+        """
+        Set the data for the selected components
+        """
+        if not self.options.namespace in data:
+            data[self.options.namespace] = {}
+        for key in self._info:
+            data[self.options.namespace][key] = self._info[key]
+
+    def clear(self):
+        self._info = {}
+
+
+class _NPZColumns(object):
+    """
+    The columns stored in a NumPy .npz archive.  The columns for a
+    symbol are stored in entries named '<symbol>/index0', ... and
+    '<symbol>/value'.
+
+    Entries that are stored without compression (the default for
+    numpy.savez) are memory-mapped rather than read into memory.
+    """
+
+    def __init__(self, filename, mmap=True):
+        self._filename = filename
+        self._npz = numpy.load(filename)
+        self._offsets = self._stored_offsets() if mmap else {}
+        self._symbols = {}
+        for key in self._npz.files:
+            name, _, column = key.rpartition('/')
+            self._symbols.setdefault(name, []).append(column)
+
+    def _stored_offsets(self):
+        """
+        Return a dict mapping the names of uncompressed entries to the
+        offsets of their data in the archive.
+        """
+        offsets = {}
+        with open(self._filename, 'rb') as INPUT:
+            for info in zipfile.ZipFile(INPUT).infolist():
+                if info.compress_type != zipfile.ZIP_STORED or \
+                        not info.filename.endswith('.npy'):
+                    continue
+                # Skip the local file header (30 bytes, followed by
+                # the file name and the extra field)
+                INPUT.seek(info.header_offset + 26)
+                n, m = struct.unpack('<HH', INPUT.read(4))
+                offsets[info.filename[:-4]] = info.header_offset + 30 + n + m
+        return offsets
+
+    def symbols(self):
+        return self._symbols
+
+    def _column(self, key):
+        if key not in self._offsets:
+            return self._npz[key]
+        with open(self._filename, 'rb') as INPUT:
+            INPUT.seek(self._offsets[key])
+            version = numpy.lib.format.read_magic(INPUT)
+            if version == (1, 0):
+                header = numpy.lib.format.read_array_header_1_0(INPUT)
+            else:
+                header = numpy.lib.format.read_array_header_2_0(INPUT)
+            shape, fortran_order, dtype = header
+            offset = INPUT.tell()
+        if dtype.hasobject or not shape or 0 in shape:
+            return self._npz[key]
+        return numpy.memmap(self._filename, dtype=dtype, mode='r',
+                            shape=shape, offset=offset,
+                            order='F' if fortran_order else 'C')
+
+    def columns(self, name):
+        columns = self._symbols[name]
+        index = [self._column('%s/index%d' % (name, i))
+                 for i in range(sum(1 for c in columns if c != 'value'))]
+        if 'value' in columns:
+            value = self._column('%s/value' % (name,))
+        else:
+            value = None
+        return index, value
+
+    def close(self):
+        self._npz.close()
+
+
+@DataManagerFactory.register("npz", "NumPy columnar file interface")
+class NPZDictionary(_ColumnarDictionary):
+    """
+    A data manager for NumPy .npz archives.  Only the columns for the
+    selected symbols are read, and uncompressed columns are
+    memory-mapped (set the 'mmap' option to False to disable this).
+    Set the 'compress' option to write a compressed archive.
+    """
+
+    def available(self):
+        return numpy_available
+
+    def requirements(self):
+        return "numpy"
+
+    def _open_columns(self):
+        return _NPZColumns(self.filename, mmap=self.options.mmap is not False)
+
+    def _write_columns(self, columns):
+        arrays = {}
+        for name, (index, value) in six.iteritems(columns):
+            for i, col in enumerate(index):
+                arrays['%s/index%d' % (name, i)] = col
+            if value is not None:
+                arrays['%s/value' % (name,)] = value
+        if self.options.compress:
+            numpy.savez_compressed(self.filename, **arrays)
+        else:
+            numpy.savez(self.filename, **arrays)
+
+
+class _HDF5Columns(object):
+    """
+    The columns stored in an HDF5 file written by pandas.  Each symbol
+    is stored as a DataFrame with the index and value columns.
+    """
+
+    def __init__(self, filename):
+        self._store = pandas.HDFStore(filename, mode='r')
+        self._symbols = set(key.lstrip('/') for key in self._store.keys())
+
+    def symbols(self):
+        return self._symbols
+
+    def columns(self, name):
+        df = self._store[name]
+        index = [df[c] for c in df.columns if c != 'value']
+        value = df['value'] if 'value' in df.columns else None
+        return index, value
+
+    def close(self):
+        self._store.close()
+
+
+@DataManagerFactory.register("h5", "HDF5 columnar file interface")
+class HDF5Dictionary(_ColumnarDictionary):
+    """
+    A data manager for HDF5 files, which are read and written with
+    pandas (and PyTables).  Only the columns for the selected symbols
+    are read.
+    """
+
+    def available(self):
+        return _import_hdf5()
+
+    def requirements(self):
+        return "pandas, tables"
+
+    def _open_columns(self):
+        _import_hdf5()
+        return _HDF5Columns(self.filename)
+
+    def _write_columns(self, columns):
+        _import_hdf5()
+        with pandas.HDFStore(self.filename, mode='w') as store:
+            for name, (index, value) in six.iteritems(columns):
+                df = pandas.DataFrame()
+                for i, col in enumerate(index):
+                    df['index%d' % (i,)] = col
+                if value is not None:
+                    df['value'] = value
+                store.put(name, df, format='fixed')
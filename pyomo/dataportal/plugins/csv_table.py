@@ -10,6 +10,9 @@
 
 import os.path
 import csv
+import itertools
+
+from six import next
 
 from pyomo.dataportal import TableData
 from pyomo.dataportal.factory import DataManagerFactory
@@ -17,46 +20,112 @@ from pyomo.dataportal.factory import DataManagerFactory
 
 @DataManagerFactory.register("csv", "CSV file interface")
 class CSVTable(TableData):
+    """
+    A data manager for CSV files.
+
+    By default, the entire file is read before the data is processed.
+    If the 'chunksize' option is specified, then the file is read
+    in chunks of rows and sets and tables of parameters are
+    converted as each chunk is read.  The 'engine' option selects
+    the parser used in this mode: 'csv' (the default) uses the
+    Python csv module, and 'pandas' uses the C parser in pandas.
+    """
 
     def __init__(self):
         TableData.__init__(self)
+        self.FILE = None
 
     def open(self):
         if self.filename is None:                       #pragma:nocover
             raise IOError("No filename specified")
 
     def close(self):
-        self.FILE.close()
+        if self.FILE is not None:
+            self.FILE.close()
 
     def read(self):
-        from pyomo.core.base.param import Param
         if not os.path.exists(self.filename):           #pragma:nocover
             raise IOError("Cannot find file '%s'" % self.filename)
+        if self.options.chunksize is not None:
+            return self._read_chunks(int(self.options.chunksize))
         self.FILE = open(self.filename, 'r')
         tmp=[]
         for tokens in csv.reader(self.FILE):
-            if tokens != ['']:
+            if tokens and tokens != ['']:
                 tmp.append(tokens)
         self.FILE.close()
         if len(tmp) == 0:
             raise IOError("Empty *.csv file")
         elif len(tmp) == 1:
-            if not self.options.param is None:
-                if type(self.options.param) in (list, tuple):
-                    p = self.options.param[0]
-                else:
-                    p = self.options.param
-                if isinstance(p, Param):
-                    self.options.model = p.model()
-                    p = p.local_name
-                self._info = ["param",p,":=",tmp[0][0]]
-            elif len(self.options.symbol_map) == 1:
-                self._info = ["param",self.options.symbol_map[self.options.symbol_map.keys()[0]],":=",tmp[0][0]]
-            else:
-                raise IOError("Data looks like a parameter, but multiple parameter names have been specified: %s" % str(self.options.symbol_map))
+            self._set_value(tmp[0][0])
         else:
             self._set_data(tmp[0], tmp[1:])
 
+    def _read_chunks(self, chunksize):
+        if self.options.engine in (None, 'csv'):
+            chunks = self._csv_chunks(chunksize)
+        elif self.options.engine == 'pandas':
+            chunks = self._pandas_chunks(chunksize)
+        else:
+            raise ValueError("Unknown CSV engine '%s'" % self.options.engine)
+        rows = next(chunks, [])
+        if len(rows) == 0:
+            raise IOError("Empty *.csv file")
+        headers = rows[0]
+        rows = rows[1:]
+        if len(rows) == 0:
+            rows = next(chunks, [])
+            if len(rows) == 0:
+                self._set_value(headers[0])
+                return
+        self._stream_data(headers, itertools.chain((rows,), chunks))
+
+    def _csv_chunks(self, chunksize):
+        self.FILE = open(self.filename, 'r')
+        try:
+            rows = []
+            for tokens in csv.reader(self.FILE):
+                if tokens and tokens != ['']:
+                    rows.append(tokens)
+                    if len(rows) == chunksize:
+                        yield rows
+                        rows = []
+            if rows:
+                yield rows
+        finally:
+            self.FILE.close()
+
+    def _pandas_chunks(self, chunksize):
+        import pandas
+        #
+        # Read all values as strings so that they are converted in
+        # the same way as values read with the csv module
+        #
+        reader = pandas.read_csv(self.filename,
+                                 header=None,
+                                 dtype=str,
+                                 na_filter=False,
+                                 skip_blank_lines=True,
+                                 chunksize=chunksize)
+        for frame in reader:
+            yield frame.values.tolist()
+
+    def _set_value(self, value):
+        from pyomo.core.base.param import Param
+        if not self.options.param is None:
+            if type(self.options.param) in (list, tuple):
+                p = self.options.param[0]
+            else:
+                p = self.options.param
+            if isinstance(p, Param):
+                self.options.model = p.model()
+                p = p.local_name
+            self._info = ["param",p,":=",value]
+        elif len(self.options.symbol_map) == 1:
+            self._info = ["param",self.options.symbol_map[self.options.symbol_map.keys()[0]],":=",value]
+        else:
+            raise IOError("Data looks like a parameter, but multiple parameter names have been specified: %s" % str(self.options.symbol_map))
+
     def write(self, data):
         if self.options.set is None and self.options.param is None:
             raise IOError("Unspecified model component")
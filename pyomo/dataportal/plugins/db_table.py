@@ -49,18 +49,45 @@ from pyomo.dataportal import TableData
 from pyomo.dataportal.factory import DataManagerFactory
 
 
+def _convert_row(row):
+    """
+    Convert the values in a row returned by a database query
+    """
+    ans = []
+    for data in row:
+        if isinstance(data,Decimal):
+            ans.append(float(data))
+        elif data is None:
+            ans.append('.')
+        elif isinstance(data, str) or isinstance(data, basestring):
+            nulidx = data.find('\x00')
+            if nulidx > -1:
+                data = data[:nulidx]
+            ans.append(data)
+        else:
+            ans.append(data)
+    return ans
+
 # format=
 # using=
 # query=
 # user=
 # password=
 # table=
+# batchsize=
 
 class db_Table(TableData):
 
     def __init__(self):
         TableData.__init__(self)
         self.using = None
+        #
+        # A dictionary of open connections (keyed by the connection
+        # options) that is shared with other data managers.  The
+        # DataPortal sets this so that connections are reused by
+        # multiple load() calls.
+        #
+        self.connection_pool = None
 
     def open(self):
         if self.filename is None:
@@ -75,11 +102,22 @@ class db_Table(TableData):
         self.db = None
         if self._data is not None:
             self.db = self._data
-        else:
-            try:
+        elif self.connection_pool is not None:
+            key = self._connection_key()
+            self.db = self.connection_pool.get(key, None)
+            if self.db is None:
                 self.db = self.connect(self.filename, self.options)
-            except Exception:
-                raise
+                if self.db is not None:
+                    self.connection_pool[key] = self.db
+        else:
+            self.db = self.connect(self.filename, self.options)
+
+    def _connection_key(self):
+        return (self.options.using,
+                self.filename,
+                self.options.user,
+                self.options.password,
+                self.options.database)
 
     def read(self):
         #
@@ -88,7 +126,6 @@ class db_Table(TableData):
         if self.db is None:
             return
         cursor = self.db.cursor()
-        tmp = []
         if self.options.query is None:
             if self.options.table is None:
                 raise IOError("Must specify 'query' or 'table' option!")
@@ -98,10 +135,9 @@ class db_Table(TableData):
 
         try:
             cursor.execute(self.options.query)
-            rows = cursor.fetchall()
-            for col in cursor.description:
-                tmp.append(col[0])
-            tmp = [tmp]
+            headers = [col[0] for col in cursor.description]
+            if self.options.batchsize is None:
+                rows = cursor.fetchall()
         except sqlite3.OperationalError:
             import logging
             logging.getLogger('pyomo.core').error(
@@ -121,22 +157,17 @@ the ODBC connector for this data source is not correctly installed,
 or that there is a bug in the ODBC connector.
 """ % (self.filename, self.options.query) )
             raise
+        if self.options.batchsize is not None:
+            #
+            # Fetch and convert the rows in batches
+            #
+            self._stream_data(
+                headers,
+                self._fetch_batches(cursor, int(self.options.batchsize)))
+            return
+        tmp = [headers]
         for row in rows:
-            #print("DATA %s" % str(list(row))) # XXX
-            ttmp=[]
-            for data in list(row):
-                if isinstance(data,Decimal):
-                    ttmp.append(float(data))
-                elif data is None:
-                    ttmp.append('.')
-                elif isinstance(data, str) or isinstance(data, basestring):
-                    nulidx = data.find('\x00')
-                    if nulidx > -1:
-                        data = data[:nulidx]
-                    ttmp.append(data)
-                else:
-                    ttmp.append(data)
-            tmp.append(ttmp)
+            tmp.append(_convert_row(row))
         #print('FINAL %s' % str(tmp)) # XXX
         #
         # Process data from the table
@@ -156,8 +187,16 @@ or that there is a bug in the ODBC connector.
             #print("OPTIONS %s" % str(self.options))
             self._set_data(tmp[0], tmp[1:])
 
+    def _fetch_batches(self, cursor, batchsize):
+        while True:
+            rows = cursor.fetchmany(batchsize)
+            if not rows:
+                break
+            yield [_convert_row(row) for row in rows]
+
     def close(self):
-        if self._data is None and not self.db is None:
+        if self._data is None and not self.db is None \
+                and self.connection_pool is None:
             del self.db
 
     def connect(self, connection, options, kwds={}):
@@ -585,7 +585,8 @@ def _process_include(cmd, _model, _data, _default, options=None):
     Lineno = 0
 
     try:
-        scenarios = parse_data_commands(filename=cmd[1])
+        cache_dir = None if options is None else options.cache_dir
+        scenarios = parse_data_commands(filename=cmd[1], cache_dir=cache_dir)
     except IOError:
         raise
         err = sys.exc_info()[1]
@@ -12,9 +12,12 @@
 #
 
 import os
+import shutil
 from os.path import abspath, dirname
 pyomo_dir=dirname(dirname(abspath(__file__)))+os.sep+".."
 
+from six.moves import cPickle as pickle
+
 import pyutilib.common
 import pyutilib.th as unittest
 
@@ -27,6 +30,17 @@ try:
 except ImportError:
     yaml_available=False
 
+try:
+    import pandas
+    pandas_available=True
+except ImportError:
+    pandas_available=False
+
+try:
+    import numpy
+except ImportError:
+    pass
+
 currdir=dirname(abspath(__file__))+os.sep
 example_dir=pyomo_dir+os.sep+".."+os.sep+"examples"+os.sep+"pyomo"+os.sep+"tutorials"+os.sep+"tab"+os.sep
 tutorial_dir=pyomo_dir+os.sep+".."+os.sep+"examples"+os.sep+"pyomo"+os.sep+"tutorials"+os.sep
@@ -51,6 +65,18 @@ try:
     yaml_interface = DataManagerFactory('yaml').available()
 except:
     yaml_interface = False
+try:
+    sqlite3_interface = DataManagerFactory('sqlite3').available()
+except:
+    sqlite3_interface = False
+try:
+    npz_interface = DataManagerFactory('npz').available()
+except:
+    npz_interface = False
+try:
+    h5_interface = DataManagerFactory('h5').available()
+except:
+    h5_interface = False
 
 
 
@@ -461,6 +487,71 @@ class PyomoDataPortal(unittest.TestCase):
         self.assertEqual(sorted(md.items('ns1')), [('A', [7,9,11]), ('a',1), ('e',{7:70, 9:90, 11:110})])
 
 
+class TestDataPortalBase(unittest.TestCase):
+
+    def setUp(self):
+        with open(currdir+'base.dat', 'w') as OUTPUT:
+            OUTPUT.write("set A := a b c;\n"
+                         "param p := a 1 b 2 c 3;\n"
+                         "param q := a 1 b 1 c 1;\n"
+                         "param r default 0 := a 4;\n")
+        with open(currdir+'overlay.dat', 'w') as OUTPUT:
+            OUTPUT.write("param p := b 20;\n")
+        self.model = AbstractModel()
+        self.model.A = Set()
+        self.model.p = Param(self.model.A)
+        self.model.q = Param(self.model.A)
+        self.model.r = Param(self.model.A)
+
+    def tearDown(self):
+        os.remove(currdir+'base.dat')
+        os.remove(currdir+'overlay.dat')
+
+    def test_overlay(self):
+        base = DataPortal(model=self.model, filename=currdir+'base.dat')
+        data = DataPortal(base=base, filename=currdir+'overlay.dat')
+        self.assertIs(data._model, self.model)
+        self.assertEqual(data['p'], {'a':1, 'b':20, 'c':3})
+        self.assertEqual(base['p'], {'a':1, 'b':2, 'c':3})
+        # Data that is not modified is shared
+        self.assertIs(data._data[None]['q'], base._data[None]['q'])
+        self.assertIsNot(data._data[None]['p'], base._data[None]['p'])
+        self.assertEqual(data._default, {'r':0})
+
+        instance = self.model.create_instance(data)
+        self.assertEqual(instance.p['b'], 20)
+        self.assertEqual(instance.r['b'], 0)
+        instance = self.model.create_instance(base)
+        self.assertEqual(instance.p['b'], 2)
+
+    def test_overlay_load(self):
+        base = DataPortal(model=self.model)
+        base.load(filename=currdir+'base.dat')
+        data = DataPortal(base=base)
+        data.load(filename=currdir+'overlay.dat')
+        with open(currdir+'overlay2.dat', 'w') as OUTPUT:
+            OUTPUT.write("set A := a b c d;\nparam p := c 30;\n")
+        data.load(filename=currdir+'overlay2.dat')
+        os.remove(currdir+'overlay2.dat')
+        self.assertEqual(data['p'], {'a':1, 'b':20, 'c':30})
+        self.assertEqual(data['A'], ['a', 'b', 'c', 'd'])
+        self.assertEqual(base['p'], {'a':1, 'b':2, 'c':3})
+        self.assertEqual(base['A'], ['a', 'b', 'c'])
+        data['q'] = {'a': 5}
+        self.assertEqual(base['q'], {'a':1, 'b':1, 'c':1})
+
+    def test_overlay_matches_load(self):
+        # Layering data gives the same result as loading all of the
+        # data into one DataPortal
+        data = DataPortal(model=self.model)
+        data.load(filename=currdir+'base.dat')
+        data.load(filename=currdir+'overlay.dat')
+        base = DataPortal(model=self.model, filename=currdir+'base.dat')
+        overlay = DataPortal(base=base, filename=currdir+'overlay.dat')
+        self.assertEqual(overlay._data, data._data)
+        self.assertEqual(overlay._default, data._default)
+
+
 class TestOnlyTextPortal(unittest.TestCase):
 
     suffix = '.tab'
@@ -606,6 +697,58 @@ class TestOnlyCsvPortal(TestOnlyTextPortal):
         return {'filename':os.path.abspath(tutorial_dir+os.sep+'csv'+os.sep+name+self.suffix)}
 
 
+class TestOnlyCsvStreamingPortal(TestOnlyCsvPortal):
+
+    def create_options(self, name):
+        options = TestOnlyCsvPortal.create_options(self, name)
+        options['chunksize'] = 2
+        return options
+
+    def test_stream_matches_read(self):
+        # Streaming a table gives the same data as reading the
+        # whole file
+        fname = currdir+'stream.csv'
+        with open(fname, 'w') as OUTPUT:
+            OUTPUT.write('I,J,P,Q\n')
+            for i in range(7):
+                OUTPUT.write('A%s,%s,%s,%s\n' % (i%3, i, i*1.5, i if i%2 else '.'))
+                if i == 3:
+                    OUTPUT.write('\n')
+        try:
+            dp = DataPortal()
+            dp.load(filename=fname, param=('P','Q'), index='S')
+            streamed = DataPortal()
+            streamed.load(filename=fname, param=('P','Q'), index='S',
+                          chunksize=2)
+            for name in ('S', 'P', 'Q'):
+                self.assertEqual(dp.data(name), streamed.data(name))
+            self.assertEqual(len(streamed.data('Q')), 3)
+            self.assertEqual(streamed.data('P')[('A1',4)], 6.0)
+            streamed = DataPortal()
+            streamed.load(filename=fname, set='T', chunksize=2)
+            self.assertEqual(len(streamed.data('T')), 7)
+            self.assertEqual(streamed.data('T')[1], ('A1',1,1.5,1))
+        finally:
+            os.remove(fname)
+
+    def test_unknown_engine(self):
+        dp = DataPortal()
+        options = self.create_options('A')
+        options['engine'] = 'unknown'
+        self.assertRaisesRegexp(ValueError, "Unknown CSV engine 'unknown'",
+                                dp.load, set='A', **options)
+
+
+@unittest.skipIf(not pandas_available, "Pandas is not available")
+class TestOnlyCsvPandasPortal(TestOnlyCsvPortal):
+
+    def create_options(self, name):
+        options = TestOnlyCsvPortal.create_options(self, name)
+        options['chunksize'] = 2
+        options['engine'] = 'pandas'
+        return options
+
+
 class TestOnlyXmlPortal(TestOnlyTextPortal):
 
     suffix = '.xml'
@@ -990,6 +1133,14 @@ class TestCsvPortal(TestTextPortal):
         return {'filename':os.path.abspath(tutorial_dir+os.sep+'csv'+os.sep+name+self.suffix)}
 
 
+class TestCsvStreamingPortal(TestCsvPortal):
+
+    def create_options(self, name):
+        options = TestCsvPortal.create_options(self, name)
+        options['chunksize'] = 2
+        return options
+
+
 class TestXmlPortal(TestTextPortal):
 
     suffix = '.xml'
@@ -1632,5 +1783,262 @@ class TestTableCmd(unittest.TestCase):
         os.remove(currdir+'loadComplex.dat')
 
 
+class TestDatParser(unittest.TestCase):
+
+    def test_fast_parse(self):
+        # The fast path returns the same commands as the PLY parser
+        from pyomo.dataportal import parse_datacmds
+        for name in sorted(os.listdir(currdir)):
+            if not name.endswith('.dat'):
+                continue
+            with open(currdir+name) as INPUT:
+                data = INPUT.read()
+            try:
+                expected = parse_datacmds._ply_parse(data)
+            except IOError:
+                continue
+            info = parse_datacmds._fast_parse(data)
+            if info is not None:
+                self.assertEqual(info, expected, name)
+
+    def test_simple_statements(self):
+        from pyomo.dataportal.parse_datacmds import _simple_statement
+        self.assertEqual(_simple_statement('param p := a 1 b -2.5e+3 '),
+                         ['param', 'p', ':=', 'a', '1', 'b', '-2.5e+3'])
+        self.assertEqual(_simple_statement('param : x y := # comment\n1 2 3'),
+                         ['param', ':', 'x', 'y', ':=', '1', '2', '3'])
+        self.assertEqual(_simple_statement('set A : B C := 1 2'),
+                         ['set', 'A', ':', 'B', 'C', ':=', '1', '2'])
+        self.assertEqual(_simple_statement('\ndata'), [])
+        self.assertEqual(_simple_statement('\nend'), [])
+        self.assertIsNone(_simple_statement('set A[1] := 1 2'))
+        self.assertIsNone(_simple_statement('param p := a "b c"'))
+        self.assertIsNone(_simple_statement('param p := (a,1) 2'))
+        self.assertIsNone(_simple_statement('param p := a : b'))
+        self.assertIsNone(_simple_statement('param p : = a'))
+        self.assertIsNone(_simple_statement('set A B := 1'))
+        self.assertIsNone(_simple_statement('load x.tab param=p'))
+        self.assertIsNone(_simple_statement('param p := include 1'))
+
+    def test_mixed_statements(self):
+        from pyomo.dataportal import parse_datacmds
+        data = """
+data;
+set A := a b c;   # a comment; with a semicolon
+param p := a 1 b 2 c 3;
+param q := "a" 'x;y' b "z w";
+set B[1] := 1 2;
+table t(A) : A q := a 1 ;
+end;
+"""
+        expected = parse_datacmds._ply_parse(data)
+        self.assertEqual(parse_datacmds._fast_parse(data), expected)
+        self.assertEqual(len(expected[None]), 5)
+        # Namespaces are always parsed with PLY
+        self.assertIsNone(parse_datacmds._fast_parse(
+            "namespace ns { param p := 1; }"))
+
+    def test_syntax_error(self):
+        from pyomo.dataportal.parse_datacmds import parse_data_commands
+        with self.assertRaisesRegexp(IOError, "Syntax error"):
+            parse_data_commands(data="param p := 1;\nset := 1 2;\n")
+        with self.assertRaisesRegexp(IOError, "Syntax error"):
+            parse_data_commands(data="param p := 1;\nparam q := 2")
+
+    def test_cache(self):
+        from pyomo.dataportal import parse_datacmds
+        cache_dir = currdir+'dat_cache'
+        data = "param p := a 1 b 2;\nset A := a b;\n"
+        try:
+            info = parse_datacmds.parse_data_commands(
+                data=data, cache_dir=cache_dir)
+            cache_file = parse_datacmds._cache_filename(cache_dir, data)
+            self.assertTrue(os.path.exists(cache_file))
+            # Cached results are returned without parsing the data
+            with open(cache_file, 'wb') as OUTPUT:
+                pickle.dump({None: [['set', 'A', ':=', 'x']]}, OUTPUT)
+            self.assertEqual(
+                parse_datacmds.parse_data_commands(
+                    data=data, cache_dir=cache_dir),
+                {None: [['set', 'A', ':=', 'x']]})
+            # A corrupt cache file is ignored
+            with open(cache_file, 'wb') as OUTPUT:
+                OUTPUT.write(b'not a pickle')
+            self.assertEqual(
+                parse_datacmds.parse_data_commands(
+                    data=data, cache_dir=cache_dir),
+                info)
+            # Modified data does not use the cache
+            self.assertNotEqual(
+                parse_datacmds._cache_filename(cache_dir, data+"\n"),
+                cache_file)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def test_cache_option(self):
+        cache_dir = currdir+'dat_cache'
+        model = AbstractModel()
+        model.A = Set()
+        try:
+            for i in range(2):
+                data = DataPortal()
+                data.load(filename=currdir+'data1.dat', cache_dir=cache_dir)
+                instance = model.create_instance(data)
+                self.assertEqual(instance.A.data(), set([1, 2, 3]))
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+@unittest.skipIf(not sqlite3_interface, "No sqlite3 interface available")
+class TestSqlite3Portal(unittest.TestCase):
+
+    def setUp(self):
+        import sqlite3
+        self.filename = currdir+'portal.sqlite'
+        con = sqlite3.connect(self.filename)
+        con.execute("CREATE TABLE demand (node TEXT, t INTEGER, "
+                    "d REAL, c REAL)")
+        con.executemany("INSERT INTO demand VALUES (?,?,?,?)",
+                        [('n%s' % (i%3,), i, i*1.5, None if i%2 else i)
+                         for i in range(10)])
+        con.commit()
+        con.close()
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def load(self, dp, **kwds):
+        dp.load(filename=self.filename, using='sqlite3',
+                query="SELECT node, t, d, c FROM demand", **kwds)
+
+    def test_batches(self):
+        # Fetching rows in batches gives the same data as fetching
+        # all rows at once
+        dp = DataPortal()
+        self.load(dp, param=('d','c'), index='S')
+        batched = DataPortal()
+        self.load(batched, param=('d','c'), index='S', batchsize=3)
+        for name in ('S', 'd', 'c'):
+            self.assertEqual(dp.data(name), batched.data(name))
+        self.assertEqual(len(batched.data('S')), 10)
+        self.assertEqual(len(batched.data('c')), 5)
+        self.assertEqual(batched.data('d')[('n1',4)], 6.0)
+
+    def test_batches_set(self):
+        dp = DataPortal()
+        self.load(dp, set='S', batchsize=4)
+        self.assertEqual(len(dp.data('S')), 10)
+        self.assertIn(('n1',4,6.0,4), dp.data('S'))
+
+    def test_connection_pool(self):
+        # Connections are not pooled by default
+        dp = DataPortal()
+        self.load(dp, param='d', select=('node','t','d'))
+        self.assertIsNone(dp._connection_pool)
+        dp.close_connections()
+
+        dp = DataPortal(pool_connections=True)
+        self.load(dp, param='d', select=('node','t','d'))
+        self.assertEqual(len(dp._connection_pool), 1)
+        con = list(dp._connection_pool.values())[0]
+        self.load(dp, param='c', select=('node','t','c'), batchsize=2)
+        self.assertEqual(len(dp._connection_pool), 1)
+        self.assertIs(list(dp._connection_pool.values())[0], con)
+        self.assertEqual(len(dp.data('d')), 10)
+        self.assertEqual(len(dp.data('c')), 5)
+        dp.close_connections()
+        self.assertEqual(len(dp._connection_pool), 0)
+
+
+class ColumnarPortalTests(object):
+
+    suffix = None
+
+    def setUp(self):
+        self.filename = currdir+'columnar.'+self.suffix
+        model = ConcreteModel()
+        model.A = Set(initialize=['a','b','c'])
+        model.B = Set(initialize=[(1,'x'),(2,'y')], dimen=2)
+        model.p = Param(model.A, initialize={'a':1.5, 'b':2.5, 'c':3.5})
+        model.q = Param(model.B, initialize={(1,'x'):1, (2,'y'):2})
+        model.s = Param(initialize='value')
+        self.model = model
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_store_load(self):
+        m = self.model
+        DataPortal().store(data=(m.A, m.B, m.p, m.q, m.s),
+                           filename=self.filename)
+        dp = DataPortal()
+        dp.load(filename=self.filename)
+        self.assertEqual(set(dp.data('A')), set(['a','b','c']))
+        self.assertEqual(set(dp.data('B')), set([(1,'x'),(2,'y')]))
+        self.assertEqual(dp.data('p'), {'a':1.5, 'b':2.5, 'c':3.5})
+        self.assertEqual(dp.data('q'), {(1,'x'):1, (2,'y'):2})
+        self.assertIs(type(dp.data('q')[1,'x']), int)
+        self.assertEqual(dp.data('s'), 'value')
+
+    def test_load_selected(self):
+        m = self.model
+        DataPortal().store(data=(m.A, m.p, m.q), filename=self.filename)
+        model = AbstractModel()
+        model.A = Set()
+        model.p = Param(model.A)
+        dp = DataPortal()
+        dp.load(filename=self.filename, param=model.p, model=model)
+        self.assertEqual(list(dp.keys()), ['p'])
+        dp.load(filename=self.filename, set=model.A)
+        instance = model.create_instance(dp)
+        self.assertEqual(instance.p['b'], 2.5)
+        self.assertRaisesRegexp(
+            IOError, "Data value for 'r' is not available",
+            dp.load, filename=self.filename, param='r')
+
+    def test_mixed_types(self):
+        m = ConcreteModel()
+        m.A = Set(initialize=[1,'a'])
+        self.assertRaisesRegexp(
+            ValueError, "a column contains values of types \\['int', 'str'\\]",
+            DataPortal().store, data=m.A, filename=self.filename)
+
+
+@unittest.skipIf(not npz_interface, "No NPZ interface available")
+class TestNpzPortal(ColumnarPortalTests, unittest.TestCase):
+
+    suffix = 'npz'
+
+    def test_memory_mapped(self):
+        from pyomo.dataportal.plugins.columnar import _NPZColumns
+        DataPortal().store(data=self.model.p, filename=self.filename)
+        columns = _NPZColumns(self.filename)
+        index, value = columns.columns('p')
+        self.assertIsInstance(value, numpy.memmap)
+        self.assertEqual(sorted(value.tolist()), [1.5, 2.5, 3.5])
+        columns.close()
+
+    def test_compressed(self):
+        from pyomo.dataportal.plugins.columnar import _NPZColumns
+        DataPortal().store(data=self.model.p, filename=self.filename,
+                           compress=True)
+        columns = _NPZColumns(self.filename)
+        index, value = columns.columns('p')
+        self.assertNotIsInstance(value, numpy.memmap)
+        columns.close()
+        dp = DataPortal()
+        dp.load(filename=self.filename)
+        self.assertEqual(dp.data('p'), {'a':1.5, 'b':2.5, 'c':3.5})
+
+
+@unittest.skipIf(not h5_interface, "No HDF5 interface available")
+class TestHDF5Portal(ColumnarPortalTests, unittest.TestCase):
+
+    suffix = 'h5'
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -8,6 +8,7 @@
 #  This software is distributed under the 3-clause BSD License.
 #  ___________________________________________________________________________
 
+import os as _os
 import sys as _sys
 if _sys.version_info[0] >= 3:
     import importlib
@@ -56,42 +57,140 @@ _optional_packages = set([
     'pyomo.contrib.multistart',
     'pyomo.contrib.petsc',
 ])
+#
+# When the PYOMO_LAZY_PLUGINS environment variable is set (to anything
+# other than 0, false or no), only these packages are imported by
+# pyomo.environ.  The solvers, transformations and problem writers of
+# the other packages are registered from the static manifest in
+# pyomo.environ.manifest, and the plugins of a package are loaded the
+# first time one of its names is used.  Other plugins of these packages
+# (e.g., modeling components) are only available after the package has
+# been imported.
+#
+_eager_packages = [
+    'pyomo.common',
+    'pyomo.opt',
+    'pyomo.core',
+    'pyomo.dataportal',
+]
+
+
+def _lazy_plugins_enabled():
+    return _os.environ.get('PYOMO_LAZY_PLUGINS', '').strip().lower() \
+        not in ('', '0', 'false', 'no')
+
+def _load_plugins(name):
+    pname = name+'.plugins'
+    try:
+        _do_import(pname)
+    except ImportError:
+        if name in _optional_packages:
+            return False
+        exctype, err, tb = _sys.exc_info()  # BUG?
+        import traceback
+        msg = "pyomo.environ failed to import %s:\nOriginal %s: %s\n"\
+              "Traceback:\n%s" \
+              % (pname, exctype.__name__, err,
+                 ''.join(traceback.format_tb(tb)),)
+        # clear local variables to remove circular references
+        exctype = err = tb = None
+        # TODO: Should this just log an error and re-raise the
+        # original exception?
+        raise ImportError(msg)
+
+    pkg = _sys.modules[pname]
+    pkg.load()
+    return True
+
+
+class _LazyPlugin(object):
+    """A placeholder for a plugin in a package that has not been
+    loaded."""
+
+    __slots__ = ('package',)
+
+    def __init__(self, package):
+        self.package = package
+
+
+class _LazyRegistry(dict):
+    """
+    A replacement for the dictionaries of classes and documentation
+    strings of a Factory.  Looking up a name that is registered with a
+    placeholder loads the plugins of the corresponding package.
+    """
+
+    def __getitem__(self, name):
+        val = dict.__getitem__(self, name)
+        if val.__class__ is _LazyPlugin:
+            _load_lazy_package(val.package)
+            val = dict.__getitem__(self, name)
+        return val
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+_lazy_registries = []
+_loaded_packages = set()
+
+def _load_lazy_package(name):
+    if name in _loaded_packages:
+        return
+    _loaded_packages.add(name)
+    try:
+        _load_plugins(name)
+    finally:
+        #
+        # Remove the placeholders that were not replaced (e.g.,
+        # because an optional package could not be imported)
+        #
+        for registry in _lazy_registries:
+            for key, val in list(dict.items(registry)):
+                if (val.__class__ is _LazyPlugin) and (val.package == name):
+                    dict.__delitem__(registry, key)
+
+def _register_lazy_plugins():
+    from pyomo.environ import manifest
+    from pyomo.opt import SolverFactory, WriterFactory
+    from pyomo.core.base.plugin import TransformationFactory
+    for factory, plugins in ((SolverFactory, manifest.solvers),
+                             (TransformationFactory, manifest.transformations),
+                             (WriterFactory, manifest.writers)):
+        if factory._cls.__class__ is not _LazyRegistry:
+            factory._cls = _LazyRegistry(factory._cls)
+            factory._doc = _LazyRegistry(factory._doc)
+            _lazy_registries.append(factory._cls)
+            _lazy_registries.append(factory._doc)
+        for package, names in plugins.items():
+            if package in _loaded_packages:
+                continue
+            placeholder = _LazyPlugin(package)
+            for name in names:
+                if name not in factory._cls:
+                    dict.__setitem__(factory._cls, name, placeholder)
+                    dict.__setitem__(factory._doc, name, placeholder)
 
 
 def _import_packages():
+    if _lazy_plugins_enabled():
+        for name in _eager_packages:
+            _load_plugins(name)
+            _loaded_packages.add(name)
+        _register_lazy_plugins()
+        return
     #
     # Import required packages
     #
     for name in _packages:
-        pname = name+'.plugins'
-        try:
-            _do_import(pname)
-        except ImportError:
-            exctype, err, tb = _sys.exc_info()  # BUG?
-            import traceback
-            msg = "pyomo.environ failed to import %s:\nOriginal %s: %s\n"\
-                  "Traceback:\n%s" \
-                  % (pname, exctype.__name__, err,
-                     ''.join(traceback.format_tb(tb)),)
-            # clear local variables to remove circular references
-            exctype = err = tb = None
-            # TODO: Should this just log an error and re-raise the
-            # original exception?
-            raise ImportError(msg)
-
-        pkg = _sys.modules[pname]
-        pkg.load()
+        _load_plugins(name)
     #
     # Import optional packages
     #
     for name in _optional_packages:
-        pname = name+'.plugins'
-        try:
-            _do_import(pname)
-        except ImportError:
-            continue
-        pkg = _sys.modules[pname]
-        pkg.load()
+        _load_plugins(name)
 
 _import_packages()
 
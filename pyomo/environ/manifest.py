@@ -0,0 +1,166 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+#
+# The names of the solvers, transformations and problem writers
+# registered by the plugins of each package imported by pyomo.environ.
+#
+# When lazy plugin loading is enabled (see pyomo.environ), these names
+# are registered with the corresponding factory before the package is
+# imported, and the package plugins are loaded the first time one of
+# the names is used.  This manifest must be updated when a plugin is
+# added to or removed from one of these packages (the tests in
+# pyomo.environ.tests check that it matches the registered plugins).
+#
+
+solvers = {
+    'pyomo.neos': (
+        '_neos',
+    ),
+    'pyomo.solvers': (
+        '_cbc_shell',
+        '_cplex_shell',
+        '_gams_direct',
+        '_gams_shell',
+        '_glpk_shell',
+        '_glpk_shell_4_42',
+        '_glpk_shell_old',
+        '_gurobi_shell',
+        '_mock_asl',
+        '_mock_cbc',
+        '_mock_cplex',
+        '_mock_glpk',
+        '_mock_pico',
+        '_mock_xpress',
+        '_pico_shell',
+        '_xpress_shell',
+        'asl',
+        'baron',
+        'cbc',
+        'conopt',
+        'cplex',
+        'cplex_direct',
+        'cplex_persistent',
+        'gams',
+        'glpk',
+        'gurobi',
+        'gurobi_direct',
+        'gurobi_persistent',
+        'ipopt',
+        'pico',
+        'ps',
+        'py',
+        'scip',
+        'xpress',
+    ),
+    'pyomo.mpec': (
+        'mpec_minlp',
+        'mpec_nlp',
+        'path',
+    ),
+    'pyomo.bilevel': (
+        'bilevel_blp_global',
+        'bilevel_blp_local',
+        'bilevel_bqp',
+        'bilevel_ld',
+    ),
+    'pyomo.contrib.gdpbb': (
+        'gdpbb',
+    ),
+    'pyomo.contrib.gdpopt': (
+        'gdpopt',
+    ),
+    'pyomo.contrib.mindtpy': (
+        'mindtpy',
+    ),
+    'pyomo.contrib.multistart': (
+        'multistart',
+    ),
+    'pyomo.contrib.trustregion': (
+        'contrib.gjh',
+        'trustregion',
+    ),
+}
+
+transformations = {
+    'pyomo.core': (
+        'core.add_slack_variables',
+        'core.compile_linear',
+        'core.expand_connectors',
+        'core.fix_discrete',
+        'core.nonnegative_vars',
+        'core.radix_linearization',
+        'core.relax_discrete',
+        'core.relax_integrality',
+        'core.scale_model',
+    ),
+    'pyomo.duality': (
+        'duality.linear_dual',
+    ),
+    'pyomo.gdp': (
+        'gdp.bigm',
+        'gdp.bilinear',
+        'gdp.chull',
+        'gdp.cuttingplane',
+        'gdp.fix_disjuncts',
+        'gdp.reclassify',
+        'gdp.varmover',
+    ),
+    'pyomo.mpec': (
+        'mpec.nl',
+        'mpec.simple_disjunction',
+        'mpec.simple_nonlinear',
+        'mpec.standard_form',
+    ),
+    'pyomo.dae': (
+        'dae.collocation',
+        'dae.finite_difference',
+    ),
+    'pyomo.bilevel': (
+        'bilevel.linear_dual',
+        'bilevel.linear_mpec',
+    ),
+    'pyomo.network': (
+        'network.expand_arcs',
+    ),
+    'pyomo.contrib.example': (
+        'contrib.example.xfrm',
+    ),
+    'pyomo.contrib.gdp_bounds': (
+        'contrib.compute_disj_var_bounds',
+    ),
+    'pyomo.contrib.preprocessing': (
+        'contrib.aggregate_vars',
+        'contrib.constraints_to_var_bounds',
+        'contrib.deactivate_trivial_constraints',
+        'contrib.detect_fixed_vars',
+        'contrib.induced_linearity',
+        'contrib.init_vars_midpoint',
+        'contrib.init_vars_zero',
+        'contrib.integer_to_binary',
+        'contrib.propagate_eq_var_bounds',
+        'contrib.propagate_fixed_vars',
+        'contrib.propagate_zero_sum',
+        'contrib.remove_zero_terms',
+        'contrib.strip_var_bounds',
+        'core.tighten_constraints_from_vars',
+    ),
+}
+
+writers = {
+    'pyomo.repn': (
+        'bar',
+        'cpxlp',
+        'gams',
+        'lp',
+        'mps',
+        'nl',
+    ),
+}
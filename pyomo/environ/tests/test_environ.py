@@ -11,6 +11,7 @@
 # Unit Tests for pyomo.base.misc
 #
 
+import os
 import sys
 import pyutilib.th as unittest
 from pyutilib.subprocess import run_command
@@ -26,6 +27,66 @@ class TestPyomoEnviron(unittest.TestCase):
             self.fail("Importing pyomo.core automatically imports "
                       "pyomo.environ and it should not.")
 
+    def test_lazy_plugins(self):
+        script = """
+import sys
+import pyomo.environ
+from pyomo.environ import SolverFactory, TransformationFactory
+from pyomo.opt import WriterFactory
+assert 'pyomo.gdp' not in sys.modules
+assert 'pyomo.solvers.plugins' not in sys.modules
+assert 'pyomo.repn.plugins' not in sys.modules
+assert 'gdp.bigm' in TransformationFactory
+assert 'glpk' in list(SolverFactory)
+assert 'pyomo.gdp' not in sys.modules
+xfrm = TransformationFactory('gdp.bigm')
+assert type(xfrm).__module__ == 'pyomo.gdp.plugins.bigm'
+assert 'pyomo.dae' not in sys.modules
+assert TransformationFactory.doc('dae.collocation')
+assert 'pyomo.dae' in sys.modules
+assert type(WriterFactory('lp')).__module__ == 'pyomo.repn.plugins.cpxlp'
+assert type(SolverFactory('glpk')).__module__ == \\
+    'pyomo.solvers.plugins.solvers.GLPK'
+assert TransformationFactory('core.relax_integrality') is not None
+assert TransformationFactory('no.such.transformation') is None
+"""
+        env = dict(os.environ)
+        env['PYOMO_LAZY_PLUGINS'] = '1'
+        rc, output = run_command([sys.executable, '-c', script], env=env)
+        if rc:
+            self.fail("Lazy plugin loading failed:\n%s" % (output,))
+
+    def test_manifest(self):
+        import pyomo.environ
+        from pyomo.environ import manifest
+        from pyomo.opt import SolverFactory, WriterFactory
+        from pyomo.core.base.plugin import TransformationFactory
+        packages = pyomo.environ._packages + \
+                   list(pyomo.environ._optional_packages)
+        for factory, plugins in (
+                (SolverFactory, manifest.solvers),
+                (TransformationFactory, manifest.transformations),
+                (WriterFactory, manifest.writers)):
+            registered = {}
+            for name in factory:
+                module = factory.get_class(name).__module__
+                if '.tests.' in module:
+                    continue
+                matches = [p for p in packages
+                           if module == p or module.startswith(p + '.')]
+                if matches:
+                    registered[name] = max(matches, key=len)
+            expected = {}
+            for package, names in plugins.items():
+                # Optional packages whose dependencies are missing
+                # fail to import, so their plugins are not registered
+                if package + '.plugins' not in sys.modules:
+                    self.assertIn(package, pyomo.environ._optional_packages)
+                    continue
+                for name in names:
+                    expected[name] = package
+            self.assertEqual(registered, expected)
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -350,6 +350,10 @@ class OptSolver(object):
         # multiple methods.
         self._smap_id = None
 
+        # the wall-clock times (start, presolve completion, solve
+        # completion, postsolve completion) of the last call to solve
+        self._last_solve_times = None
+
         # These are ephimeral options that can be set by the user during
         # the call to solve, but will be reset to defaults if not given
         self._load_solutions = True
@@ -633,6 +637,10 @@ class OptSolver(object):
                         result._smap = _model.solutions.symbol_map[self._smap_id]
                         _model.solutions.delete_symbol_map(self._smap_id)
             postsolve_completion_time = time.time()
+            self._last_solve_times = (initial_time,
+                                      presolve_completion_time,
+                                      solve_completion_time,
+                                      postsolve_completion_time)
 
             if self._report_timing:
                 print("      %6.2f seconds required for postsolve"
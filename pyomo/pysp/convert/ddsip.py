@@ -708,6 +708,59 @@ def _convert_external_setup_without_cleanup(
             stochastic_rhs_count,
             stochastic_matrix_count)
 
+_struct_check_msg = \
+    ("The structure indicated in file '%s' does not match "
+     "that for scenario %s indicated in file '%s'. This "
+     "suggests one or more locations of stachastic data "
+     "have not been annotated. If you feel this message is "
+     "in error, please report this issue to the PySP "
+     "developers.")
+
+#
+# The consistency checks applied to the files generated for
+# each scenario. Each entry contains the file suffix along
+# with the error message to report when the scenario file
+# differs from that of the reference scenario (formatted
+# with the reference filename, scenario name, and scenario
+# filename).
+#
+_consistency_checks = (
+    ("rhs.sc.struct", _struct_check_msg),
+    ("cost.sc.struct", _struct_check_msg),
+    ("matrix.sc.struct", _struct_check_msg),
+    ("lp.det",
+     "One or more deterministic parts of the problem found "
+     "in file '%s' do not match those for scenario %s found "
+     "in file %s. This suggests that one or more locations "
+     "of stochastic data have not been been annotated on the "
+     "reference Pyomo model. If this seems like a tolerance "
+     "issue or a developer error, please report this issue "
+     "to the PySP developers."))
+
+def _convert_external_compare(worker,
+                              scenario,
+                              scenario_directory,
+                              reference_scenario_name):
+    """Compare the files generated for a scenario against
+    those of the reference scenario. Returns None if all
+    checks pass. Otherwise, returns a tuple containing the
+    position of the first failed check in
+    _consistency_checks along with the error message."""
+    for i, (suffix, msg) in enumerate(_consistency_checks):
+        reference_filename = os.path.join(
+            scenario_directory,
+            reference_scenario_name+"."+suffix)
+        scenario_filename = os.path.join(
+            scenario_directory,
+            scenario.name+"."+suffix)
+        if not filecmp.cmp(scenario_filename,
+                           reference_filename,
+                           shallow=False):
+            return (i, msg % (reference_filename,
+                              scenario.name,
+                              scenario_filename))
+    return None
+
 def convert_external(output_directory,
                      firststage_var_suffix,
                      scenario_tree_manager,
@@ -715,7 +768,8 @@ def convert_external(output_directory,
                      io_options=None,
                      disable_consistency_checks=False,
                      keep_scenario_files=False,
-                     verbose=False):
+                     verbose=False,
+                     output_times=False):
     import pyomo.environ
     import pyomo.solvers.plugins.smanager.phpyro
 
@@ -736,6 +790,7 @@ def convert_external(output_directory,
     if not os.path.exists(scenario_directory):
         os.mkdir(scenario_directory)
 
+    start_time = time.time()
     counts = scenario_tree_manager.invoke_function(
         "_convert_external_setup",
         thisfile,
@@ -744,6 +799,9 @@ def convert_external(output_directory,
                        firststage_var_suffix,
                        enforce_derived_nonanticipativity,
                        io_options))
+    if output_times:
+        print("Scenario file generation time=%.2f seconds"
+              % (time.time() - start_time))
 
     reference_scenario = scenario_tree.scenarios[0]
     reference_scenario_name = reference_scenario.name
@@ -846,74 +904,33 @@ def convert_external(output_directory,
                   "prohibitively slow or can not be executed on "
                   "your system, disable it by activating the "
                   "disable_consistency_check option.")
-        has_diff = False
-        try:
-            if not os.system('diff --help > /dev/null'):
-                has_diff = True
-            else:
-                has_diff = False
-        except:
-            has_diff = False
-
-        if verbose:
-            print(" - Checking structure in stochastic files...")
-        for basename in ["rhs.sc.struct", "cost.sc.struct", "matrix.sc.struct"]:
-            reference_struct_filename = os.path.join(
-                scenario_directory,
-                reference_scenario.name+"."+basename)
-            for scenario in scenario_tree.scenarios:
-                scenario_struct_filename = \
-                    os.path.join(scenario_directory,
-                                 scenario.name+"."+basename)
-                if has_diff:
-                    rc = os.system('diff -q '+scenario_struct_filename+' '+
-                                   reference_struct_filename)
-                else:
-                    rc = not filecmp.cmp(scenario_struct_filename,
-                                         reference_struct_filename,
-                                         shallow=False)
-                if rc:
-                    raise ValueError(
-                        "The structure indicated in file '%s' does not match "
-                        "that for scenario %s indicated in file '%s'. This "
-                        "suggests one or more locations of stachastic data "
-                        "have not been annotated. If you feel this message is "
-                        "in error, please report this issue to the PySP "
-                        "developers."
-                        % (reference_struct_filename,
-                           scenario.name,
-                           scenario_struct_filename))
-
-        if verbose:
-            print(" - Checking deterministic sections in the core "
-                  "problem file...")
-        reference_lp_det_filename = \
-            os.path.join(scenario_directory,
-                         reference_scenario.name+".lp.det")
-
+        start_time = time.time()
+        #
+        # Each scenario compares its own files against those
+        # for the reference scenario, so this stage is
+        # distributed in the same way as file generation.
+        # Failures are reported in the order of the checks
+        # listed in _consistency_checks, and then in scenario
+        # order.
+        #
+        failures = scenario_tree_manager.invoke_function(
+            "_convert_external_compare",
+            thisfile,
+            invocation_type=InvocationType.PerScenario,
+            function_args=(scenario_directory,
+                           reference_scenario.name))
+        first_failure = None
         for scenario in scenario_tree.scenarios:
-            scenario_lp_det_filename = \
-                os.path.join(scenario_directory,
-                             scenario.name+".lp.det")
-            if has_diff:
-                rc = os.system('diff -q '+scenario_lp_det_filename+' '+
-                               reference_lp_det_filename)
-            else:
-                rc = not filecmp.cmp(scenario_lp_det_filename,
-                                     reference_lp_det_filename,
-                                     shallow=False)
-            if rc:
-                raise ValueError(
-                    "One or more deterministic parts of the problem found "
-                    "in file '%s' do not match those for scenario %s found "
-                    "in file %s. This suggests that one or more locations "
-                    "of stochastic data have not been been annotated on the "
-                    "reference Pyomo model. If this seems like a tolerance "
-                    "issue or a developer error, please report this issue "
-                    "to the PySP developers."
-                    % (reference_lp_det_filename,
-                       scenario.name,
-                       scenario_lp_det_filename))
+            failure = failures[scenario.name]
+            if (failure is not None) and \
+               ((first_failure is None) or \
+                (failure[0] < first_failure[0])):
+                first_failure = failure
+        if first_failure is not None:
+            raise ValueError(first_failure[1])
+        if output_times:
+            print("Scenario file consistency check time=%.2f seconds"
+                  % (time.time() - start_time))
 
     if not keep_scenario_files:
         if verbose:
@@ -1095,7 +1112,8 @@ def run_convertddsip(options):
             disable_consistency_checks=\
             options.disable_consistency_checks,
             keep_scenario_files=options.keep_scenario_files,
-            verbose=options.verbose)
+            verbose=options.verbose,
+            output_times=options.output_times)
 
     end_time = time.time()
 
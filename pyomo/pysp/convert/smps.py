@@ -17,6 +17,8 @@ import shutil
 import filecmp
 import logging
 import itertools
+import hashlib
+import json
 from collections import namedtuple
 
 from pyomo.opt import WriterFactory
@@ -26,10 +28,13 @@ from pyomo.core.base.block import (Block,
                                    SortComponents)
 from pyomo.core.base.objective import Objective
 from pyomo.core.base.var import Var, _VarData
+from pyomo.core.base.param import Param
+from pyomo.core.base.misc import sorted_robust
 from pyomo.core.base.constraint import Constraint, _ConstraintData
 from pyomo.core.base.sos import SOSConstraint
 from pyomo.core.base.suffix import ComponentMap
 from pyomo.repn import generate_standard_repn
+from pyomo.repn.util import LinearCanonicalForms
 from pyomo.pysp.scenariotree.manager import InvocationType
 from pyomo.pysp.embeddedsp import (EmbeddedSP,
                                    TableDistribution)
@@ -48,7 +53,7 @@ from pyomo.pysp.scenariotree.manager import \
      ScenarioTreeManagerClientPyro)
 from pyomo.pysp.util.misc import launch_command
 
-from six import iteritems, itervalues
+from six import iteritems, itervalues, string_types
 
 thisfile = os.path.abspath(__file__)
 
@@ -268,13 +273,14 @@ def build_repns(model):
                                           compute_values=False)
             block._repn[objective_object] = repn
 
+        canonical_form = LinearCanonicalForms(compute_values=False)
         for constraint_data in block.component_data_objects(
                 Constraint,
                 active=True,
                 descend_into=False):
 
             if constraint_data._linear_canonical_form:
-                repn = constraint_data.canonical_form(compute_values=False)
+                repn = canonical_form(constraint_data)
             else:
                 repn = generate_standard_repn(constraint_data.body,
                                               compute_values=False)
@@ -283,7 +289,191 @@ def build_repns(model):
 
     return repn_cache
 
-def _convert_external_setup(worker, scenario, *args, **kwds):
+def _scenario_files(basename, file_format, scenario_name):
+    """Return the list of per-scenario file names generated
+    during conversion of a single scenario."""
+    return [basename+".row."+scenario_name,
+            basename+".col."+scenario_name,
+            basename+".tim."+scenario_name,
+            basename+".sto.struct."+scenario_name,
+            basename+".sto."+scenario_name,
+            basename+"."+file_format+".det."+scenario_name,
+            basename+".setup."+file_format+"."+scenario_name,
+            basename+"."+file_format+"."+scenario_name,
+            basename+"."+file_format+".symbols."+scenario_name]
+
+def _fingerprint_repr(val):
+    """Return a string describing an annotation value that
+    does not depend on object ids. Components (and other
+    named objects) are described by their names."""
+    if isinstance(val, (tuple, list)):
+        return "(%s)" % (", ".join(_fingerprint_repr(v) for v in val))
+    name = getattr(val, "name", None)
+    if isinstance(name, string_types):
+        return "%s(%s)" % (type(val).__name__, name)
+    if (val is None) or isinstance(val, (bool, float) + string_types) or \
+       (type(val).__repr__ is not object.__repr__):
+        return repr(val)
+    attrs = set(getattr(val, "__dict__", ()))
+    for cls in type(val).__mro__:
+        attrs.update(getattr(cls, "__slots__", ()))
+    return "%s(%s)" % (type(val).__name__,
+                       ", ".join("%s=%s" % (attr, _fingerprint_repr(
+                           getattr(val, attr, None)))
+                                 for attr in sorted(attrs)))
+
+def _scenario_fingerprint(scenario, *args):
+    """Compute a digest of the data defining a scenario
+    instance. This includes the scenario probability, the
+    stage layout of the scenario tree (the variables and cost
+    of each node the scenario passes through), the component
+    structure of the instance, the values of all Param
+    components, the domain, bounds and fixed state of all
+    variables, the canonical form of all active constraints
+    and objectives, and the contents of the stochastic
+    annotations. Any extra arguments (e.g., output format and
+    io options) are included in the digest as well."""
+    instance = scenario._instance
+    digest = hashlib.md5()
+    digest.update(repr(args).encode())
+    digest.update(repr(scenario.probability).encode())
+    for tree_node in scenario._node_list:
+        digest.update(("%s %s %r\n" % (tree_node.name,
+                                       tree_node.stage.name,
+                                       tree_node._cost_variable))
+                      .encode())
+        for variable_id in sorted_robust(tree_node._variable_ids):
+            name, index = tree_node._variable_ids[variable_id]
+            digest.update(("%s %s %r %r\n"
+                           % (variable_id, name, index,
+                              variable_id in
+                              tree_node._derived_variable_ids))
+                          .encode())
+        for cost_data, _ in tree_node._cost_variable_datas:
+            if (cost_data.model() is instance) and \
+               (cost_data.type() is not Var):
+                digest.update(("%s\n" % (cost_data.expr,)).encode())
+    for component in instance.component_objects(
+            descend_into=True,
+            sort=SortComponents.deterministic):
+        digest.update(("%s %s %d\n" % (component.type().__name__,
+                                       component.name,
+                                       len(component))).encode())
+    for param in instance.component_objects(
+            Param,
+            descend_into=True,
+            sort=SortComponents.deterministic):
+        digest.update(("%r\n" % (param.default(),)).encode())
+        values = param.extract_values_sparse()
+        for index in sorted_robust(values):
+            digest.update(("%r %r\n" % (index, value(values[index])))
+                          .encode())
+    for var in instance.component_data_objects(
+            Var,
+            descend_into=True,
+            sort=SortComponents.deterministic):
+        digest.update(("%s %r %r %r\n" % (var.domain,
+                                          var.lb, var.ub,
+                                          var.value if var.fixed else None))
+                      .encode())
+    for ctype in (Objective, Constraint):
+        for data in instance.component_data_objects(
+                ctype,
+                active=True,
+                descend_into=True,
+                sort=SortComponents.deterministic):
+            if ctype is Objective:
+                digest.update(("%s %r\n" % (data.name, data.sense))
+                              .encode())
+                repn = generate_standard_repn(data.expr)
+            else:
+                digest.update(("%s %r %r %r\n" % (data.name,
+                                                  data.equality,
+                                                  value(data.lower),
+                                                  value(data.upper)))
+                              .encode())
+                repn = generate_standard_repn(data.body)
+            digest.update(("%r\n" % (repn.constant,)).encode())
+            for var, coef in zip(repn.linear_vars, repn.linear_coefs):
+                digest.update(("%s %r\n" % (var.name, coef)).encode())
+            for (var1, var2), coef in zip(repn.quadratic_vars,
+                                          repn.quadratic_coefs):
+                digest.update(("%s %s %r\n" % (var1.name, var2.name, coef))
+                              .encode())
+            if repn.nonlinear_expr is not None:
+                digest.update(("%s\n" % (repn.nonlinear_expr,)).encode())
+    for annotation_type in (StochasticConstraintBoundsAnnotation,
+                            StochasticConstraintBodyAnnotation,
+                            StochasticObjectiveAnnotation,
+                            StochasticVariableBoundsAnnotation):
+        for name, annotation in sorted(
+                locate_annotations(instance, annotation_type),
+                key=lambda x: x[0]):
+            digest.update(("%s %s %s\n" % (annotation_type.__name__,
+                                            name,
+                                            _fingerprint_repr(
+                                                annotation.default)))
+                          .encode())
+            for component, val in sorted(
+                    (component.name, _fingerprint_repr(val)) for
+                    component, val in annotation.expand_entries(
+                        expand_containers=False)):
+                digest.update(("%s %s\n" % (component, val)).encode())
+    return digest.hexdigest()
+
+def _convert_external_setup(worker,
+                            scenario,
+                            output_directory,
+                            basename,
+                            file_format,
+                            enforce_derived_nonanticipativity,
+                            io_options,
+                            incremental=False):
+    """Generate the per-scenario SMPS files for a single
+    scenario. Returns the problem statistics for the scenario.
+
+    When incremental is True, a manifest storing a digest of
+    the scenario data is written alongside the scenario files
+    and the conversion is skipped when a previous manifest
+    matches the current scenario data."""
+    manifest_filename = None
+    if incremental:
+        fingerprint = _scenario_fingerprint(
+            scenario,
+            file_format,
+            enforce_derived_nonanticipativity,
+            sorted((k, repr(v)) for k, v in iteritems(io_options)))
+        manifest_filename = os.path.join(
+            output_directory,
+            basename+".manifest."+scenario.name)
+        if os.path.exists(manifest_filename) and \
+           all(os.path.exists(os.path.join(output_directory, fname))
+               for fname in _scenario_files(basename,
+                                            file_format,
+                                            scenario.name)):
+            with open(manifest_filename) as f:
+                manifest = json.load(f)
+            if manifest["fingerprint"] == fingerprint:
+                return tuple(manifest["counts"])
+        _safe_remove_file(manifest_filename)
+
+    counts = _convert_external_setup_with_cleanup(
+        worker,
+        scenario,
+        output_directory,
+        basename,
+        file_format,
+        enforce_derived_nonanticipativity,
+        io_options)
+
+    if manifest_filename is not None:
+        with open(manifest_filename, "w") as f:
+            json.dump({"fingerprint": fingerprint,
+                       "counts": list(counts)}, f)
+
+    return counts
+
+def _convert_external_setup_with_cleanup(worker, scenario, *args, **kwds):
     reference_model = scenario._instance
     #
     # We will be tweaking the repn objects on objectives
@@ -1048,6 +1238,81 @@ def _convert_external_setup_without_cleanup(
             stochastic_rhs_count,
             stochastic_matrix_count)
 
+#
+# The consistency checks applied to the files generated for
+# each scenario. Each entry contains the file suffix shared
+# by the per-scenario files and the reference scenario files
+# copied to the output directory, along with the error
+# message to report when the files differ (formatted
+# with the reference filename, scenario name, and scenario
+# filename).
+#
+_consistency_checks = (
+    (".row",
+     "The row ordering indicated in file '%s' does not match "
+     "that for scenario %s indicated in file '%s'. This "
+     "suggests that one or more locations of stochastic data "
+     "have not been annotated. If you feel this message is "
+     "in error, please report this issue to the PySP "
+     "developers."),
+    (".col",
+     "The column ordering indicated in file '%s' does not "
+     "match that for scenario %s indicated in file '%s'. "
+     "This suggests that the set of variables on the model "
+     "changes across scenarios. This is not allowed by the "
+     "SMPS format. If you feel this is a developer error, "
+     "please report this issue to the PySP developers."),
+    (".tim",
+     "Main .tim file '%s' does not match .tim file for "
+     "scenario %s located at '%s'. This indicates there was "
+     "a problem translating the reference model to SMPS "
+     "format. Please make sure the problem structure is "
+     "identical over all scenarios (e.g., no. of variables, "
+     "no. of constraints), or report this issue to the PySP "
+     "developers if you feel that it is a developer error."),
+    (".sto.struct",
+     "The structure of stochastic entries indicated in file "
+     "'%s' does not match that for scenario %s indicated in "
+     "file '%s'. This suggests that the set of variables "
+     "appearing in some expression declared as stochastic is "
+     "changing across scenarios. If you feel this is a "
+     "developer error, please report this issue to the PySP "
+     "developers."),
+    (".%(core_format)s.det",
+     "One or more deterministic parts of the problem found "
+     "in file '%s' do not match those for scenario %s found "
+     "in file %s. This suggests that one or more locations "
+     "of stochastic data have not been been annotated on the "
+     "reference Pyomo model. If this seems like a tolerance "
+     "issue or a developer error, please report this issue "
+     "to the PySP developers."))
+
+def _convert_external_compare(worker,
+                              scenario,
+                              scenario_directory,
+                              output_directory,
+                              basename,
+                              file_format):
+    """Compare the files generated for a scenario against
+    those of the reference scenario. Returns None if all
+    checks pass. Otherwise, returns a tuple containing the
+    position of the first failed check in
+    _consistency_checks along with the error message."""
+    for i, (suffix, msg) in enumerate(_consistency_checks):
+        suffix = suffix % {'core_format': file_format}
+        reference_filename = os.path.join(output_directory,
+                                          basename+suffix)
+        scenario_filename = os.path.join(
+            scenario_directory,
+            basename+suffix+"."+scenario.name)
+        if not filecmp.cmp(scenario_filename,
+                           reference_filename,
+                           shallow=False):
+            return (i, msg % (reference_filename,
+                              scenario.name,
+                              scenario_filename))
+    return None
+
 def convert_external(output_directory,
                      basename,
                      scenario_tree_manager,
@@ -1057,13 +1322,20 @@ def convert_external(output_directory,
                      disable_consistency_checks=False,
                      keep_scenario_files=False,
                      keep_auxiliary_files=False,
-                     verbose=False):
+                     verbose=False,
+                     incremental=False,
+                     output_times=False):
     import pyomo.environ
     import pyomo.solvers.plugins.smanager.phpyro
 
     if io_options is None:
         io_options = {}
 
+    # incremental conversion relies on the per-scenario
+    # files from previous runs
+    if incremental:
+        keep_scenario_files = True
+
     if not os.path.exists(output_directory):
         os.makedirs(output_directory)
 
@@ -1083,6 +1355,7 @@ def convert_external(output_directory,
     if not os.path.exists(scenario_directory):
         os.mkdir(scenario_directory)
 
+    start_time = time.time()
     counts = scenario_tree_manager.invoke_function(
         "_convert_external_setup",
         thisfile,
@@ -1091,7 +1364,12 @@ def convert_external(output_directory,
                        basename,
                        core_format,
                        enforce_derived_nonanticipativity,
-                       io_options))
+                       io_options),
+        function_kwds={'incremental': incremental})
+    if output_times:
+        print("Scenario file generation time=%.2f seconds"
+              % (time.time() - start_time))
+    start_time = time.time()
 
     reference_scenario = scenario_tree.scenarios[0]
     reference_scenario_name = reference_scenario.name
@@ -1191,6 +1469,9 @@ def convert_external(output_directory,
                 shutil.copyfileobj(fsrc, fdst)
         fdst.write('ENDATA\n')
     input_files["sto"] = sto_filename
+    if output_times:
+        print("SMPS file assembly time=%.2f seconds"
+              % (time.time() - start_time))
 
     if verbose:
         print("\nSMPS Conversion Complete")
@@ -1223,138 +1504,35 @@ def convert_external(output_directory,
                   "prohibitively slow or can not be executed on "
                   "your system, disable it by activating the "
                   "disable_consistency_check option.")
-        has_diff = False
-        try:
-            if not os.system('diff --help > /dev/null'):
-                has_diff = True
-            else:
-                has_diff = False
-        except:
-            has_diff = False
-        if verbose:
-            print(" - Checking row and column ordering...")
-        for scenario in scenario_tree.scenarios:
-            scenario_core_row_filename = \
-                os.path.join(scenario_directory,
-                             basename+".row."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_core_row_filename+' '+
-                               core_row_filename)
-            else:
-                rc = not filecmp.cmp(scenario_core_row_filename,
-                                     core_row_filename,
-                                     shallow=False)
-            if rc:
-                raise ValueError(
-                    "The row ordering indicated in file '%s' does not match "
-                    "that for scenario %s indicated in file '%s'. This "
-                    "suggests that one or more locations of stochastic data "
-                    "have not been annotated. If you feel this message is "
-                    "in error, please report this issue to the PySP "
-                    "developers."
-                    % (core_row_filename,
-                       scenario.name,
-                       scenario_core_row_filename))
-
-            scenario_core_col_filename = \
-                os.path.join(scenario_directory,
-                             basename+".col."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_core_col_filename+' '+
-                               core_col_filename)
-            else:
-                rc = not filecmp.cmp(scenario_core_col_filename,
-                                     core_col_filename,
-                                     shallow=False)
-            if rc:
-                raise ValueError(
-                    "The column ordering indicated in file '%s' does not "
-                    "match that for scenario %s indicated in file '%s'. "
-                    "This suggests that the set of variables on the model "
-                    "changes across scenarios. This is not allowed by the "
-                    "SMPS format. If you feel this is a developer error, "
-                    "please report this issue to the PySP developers."
-                    % (core_col_filename,
-                       scenario.name,
-                       scenario_core_col_filename))
-
-        if verbose:
-            print(" - Checking time-stage classifications...")
-        for scenario in scenario_tree.scenarios:
-            scenario_tim_filename = \
-                os.path.join(scenario_directory,
-                             basename+".tim."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_tim_filename+' '+
-                               tim_filename)
-            else:
-                rc = not filecmp.cmp(scenario_tim_filename,
-                                     tim_filename,
-                                     shallow=False)
-            if rc:
-                raise ValueError(
-                    "Main .tim file '%s' does not match .tim file for "
-                    "scenario %s located at '%s'. This indicates there was "
-                    "a problem translating the reference model to SMPS "
-                    "format. Please make sure the problem structure is "
-                    "identical over all scenarios (e.g., no. of variables, "
-                    "no. of constraints), or report this issue to the PySP "
-                    "developers if you feel that it is a developer error."
-                    % (tim_filename,
-                       scenario.name,
-                       scenario_tim_filename))
-
-        if verbose:
-            print(" - Checking sparse locations of stochastic elements...")
-        for scenario in scenario_tree.scenarios:
-            scenario_sto_struct_filename = \
-                os.path.join(scenario_directory,
-                             basename+".sto.struct."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_sto_struct_filename+' '+
-                               sto_struct_filename)
-            else:
-                rc = not filecmp.cmp(scenario_sto_struct_filename,
-                                     sto_struct_filename,
-                                     shallow=False)
-            if rc:
-                raise ValueError(
-                    "The structure of stochastic entries indicated in file "
-                    "'%s' does not match that for scenario %s indicated in "
-                    "file '%s'. This suggests that the set of variables "
-                    "appearing in some expression declared as stochastic is "
-                    "changing across scenarios. If you feel this is a "
-                    "developer error, please report this issue to the PySP "
-                    "developers." % (sto_struct_filename,
-                                     scenario.name,
-                                     scenario_sto_struct_filename))
-
-        if verbose:
-            print(" - Checking deterministic sections in the core "
-                  "problem file...")
+        start_time = time.time()
+        #
+        # Each scenario compares its own files against those
+        # for the reference scenario, so this stage is
+        # distributed in the same way as file generation.
+        # Failures are reported in the order of the checks
+        # listed in _consistency_checks, and then in scenario
+        # order.
+        #
+        failures = scenario_tree_manager.invoke_function(
+            "_convert_external_compare",
+            thisfile,
+            invocation_type=InvocationType.PerScenario,
+            function_args=(scenario_directory,
+                           output_directory,
+                           basename,
+                           core_format))
+        first_failure = None
         for scenario in scenario_tree.scenarios:
-            scenario_core_det_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+".det."+scenario.name)
-            if has_diff:
-                rc = os.system('diff -q '+scenario_core_det_filename+' '+
-                               core_det_filename)
-            else:
-                rc = not filecmp.cmp(scenario_core_det_filename,
-                                     core_det_filename,
-                                     shallow=False)
-            if rc:
-                raise ValueError(
-                    "One or more deterministic parts of the problem found "
-                    "in file '%s' do not match those for scenario %s found "
-                    "in file %s. This suggests that one or more locations "
-                    "of stochastic data have not been been annotated on the "
-                    "reference Pyomo model. If this seems like a tolerance "
-                    "issue or a developer error, please report this issue "
-                    "to the PySP developers."
-                    % (core_det_filename,
-                       scenario.name,
-                       scenario_core_det_filename))
+            failure = failures[scenario.name]
+            if (failure is not None) and \
+               ((first_failure is None) or \
+                (failure[0] < first_failure[0])):
+                first_failure = failure
+        if first_failure is not None:
+            raise ValueError(first_failure[1])
+        if output_times:
+            print("Scenario file consistency check time=%.2f seconds"
+                  % (time.time() - start_time))
 
     if not keep_auxiliary_files:
         _safe_remove_file(core_row_filename)
@@ -1366,61 +1544,16 @@ def convert_external(output_directory,
         if verbose:
             print("Cleaning temporary per-scenario files")
         for scenario in scenario_tree.scenarios:
-
-            scenario_core_row_filename = \
-                os.path.join(scenario_directory,
-                             basename+".row."+scenario.name)
-            assert os.path.exists(scenario_core_row_filename)
-            _safe_remove_file(scenario_core_row_filename)
-
-            scenario_core_col_filename = \
-                os.path.join(scenario_directory,
-                             basename+".col."+scenario.name)
-            assert os.path.exists(scenario_core_col_filename)
-            _safe_remove_file(scenario_core_col_filename)
-
-            scenario_tim_filename = \
-                os.path.join(scenario_directory,
-                             basename+".tim."+scenario.name)
-            assert os.path.exists(scenario_tim_filename)
-            _safe_remove_file(scenario_tim_filename)
-
-            scenario_sto_struct_filename = \
-                os.path.join(scenario_directory,
-                             basename+".sto.struct."+scenario.name)
-            assert os.path.exists(scenario_sto_struct_filename)
-            _safe_remove_file(scenario_sto_struct_filename)
-
-            scenario_sto_filename = \
+            for fname in _scenario_files(basename,
+                                         core_format,
+                                         scenario.name):
+                fname = os.path.join(scenario_directory, fname)
+                assert os.path.exists(fname)
+                _safe_remove_file(fname)
+            # left behind by a previous incremental conversion
+            _safe_remove_file(
                 os.path.join(scenario_directory,
-                             basename+".sto."+scenario.name)
-            assert os.path.exists(scenario_sto_filename)
-            _safe_remove_file(scenario_sto_filename)
-
-            scenario_core_det_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+".det."+scenario.name)
-            assert os.path.exists(scenario_core_det_filename)
-            _safe_remove_file(scenario_core_det_filename)
-
-            scenario_core_setup_filename = \
-                os.path.join(scenario_directory,
-                             basename+".setup."+core_format+"."+scenario.name)
-            assert os.path.exists(scenario_core_setup_filename)
-            _safe_remove_file(scenario_core_setup_filename)
-
-            scenario_core_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+"."+scenario.name)
-            assert os.path.exists(scenario_core_filename)
-            _safe_remove_file(scenario_core_filename)
-
-            scenario_core_filename = \
-                os.path.join(scenario_directory,
-                             basename+"."+core_format+".symbols."+scenario.name)
-            assert os.path.exists(scenario_core_filename)
-            _safe_remove_file(scenario_core_filename)
-
+                             basename+".manifest."+scenario.name))
 
         # only delete this directory if it is empty,
         # it might have previously existed and contains
@@ -2180,6 +2313,22 @@ def convertsmps_register_options(options=None):
             ),
             doc=None,
             visibility=0))
+    safe_register_unique_option(
+        options,
+        "incremental",
+        PySPConfigValue(
+            False,
+            domain=bool,
+            description=(
+                "Reuse the per-scenario SMPS files from a previous "
+                "conversion into the same output directory for any "
+                "scenario whose data (parameter values, variable "
+                "bounds, and probability) has not changed. Only "
+                "the files for modified scenarios are regenerated. "
+                "Implies keep_scenario_files."
+            ),
+            doc=None,
+            visibility=0))
     safe_register_common_option(options, "scenario_tree_manager")
     ScenarioTreeManagerClientSerial.register_options(options)
     ScenarioTreeManagerClientPyro.register_options(options)
@@ -2231,7 +2380,9 @@ def run_convertsmps(options):
             options.disable_consistency_checks,
             keep_scenario_files=options.keep_scenario_files,
             keep_auxiliary_files=options.keep_auxiliary_files,
-            verbose=options.verbose)
+            verbose=options.verbose,
+            incremental=options.incremental,
+            output_times=options.output_times)
 
     end_time = time.time()
 
@@ -61,6 +61,8 @@ from pyomo.pysp.phutils import (create_block_symbol_maps,
                                 extract_solve_times,
                                 _OLD_OUTPUT)
 from pyomo.pysp.util.misc import load_external_module
+from pyomo.pysp.scenariotree.tree_structure import save_scenario_weights
+from pyomo.pysp.util.timing_trace import get_timing_trace
 from pyomo.pysp import phsolverserverutils
 
 from pyomo.opt.parallel.local import SolverManager_Serial
@@ -1835,6 +1837,9 @@ class ProgressiveHedging(_PHBase):
         self._max_iterations = 0
         self._async_mode = False
         self._async_buffer_length = 1
+        # do I rebalance the scenario bundles between PH iterations,
+        # based on the solve times recorded in the prior iteration?
+        self._rebalance_bundles = False
 
         # it may be the case that some plugins think they can do a
         # better job of weight updates than PH - and it might even be
@@ -1871,6 +1876,9 @@ class ProgressiveHedging(_PHBase):
         self._output_continuous_variable_stats = True
         self._output_solver_results = False
         self._output_scenario_tree_solution = False
+        # name of the file to which scenario weights (solve times)
+        # are written upon termination.
+        self._output_scenario_weights = None
 
         #
         # PH performance diagnostic parameters and related timing
@@ -1931,6 +1939,7 @@ class ProgressiveHedging(_PHBase):
         self._nu                                  = options.nu
         self._async_mode                          = options.async_mode
         self._async_buffer_length                 = options.async_buffer_length
+        self._rebalance_bundles                   = options.rebalance_bundles
         self._rho                                 = options.default_rho
         self._rho_setter_file                     = options.rho_cfgfile
         self._xhat_method                         = options.xhat_method
@@ -1989,6 +1998,7 @@ class ProgressiveHedging(_PHBase):
         self._linearize_nonbinary_penalty_terms   = options.linearize_nonbinary_penalty_terms
         self._breakpoint_strategy                 = options.breakpoint_strategy
         self._output_scenario_tree_solution       = options.output_scenario_tree_solution
+        self._output_scenario_weights             = options.output_scenario_weights
         self._phpyro_transmit_leaf_stage_solution = options.phpyro_transmit_leaf_stage_solution
 
         self._or_convergers                          = options.or_convergers
@@ -2067,6 +2077,8 @@ class ProgressiveHedging(_PHBase):
             raise ValueError("Value of the nu parameter in PH must be on the interval (0, 2); value specified=" + str(self._nu))
         if (self._mipgap is not None) and ((self._mipgap < 0.0) or (self._mipgap > 1.0)):
             raise ValueError("Value of the mipgap parameter in PH must be on the unit interval; value specified=" + str(self._mipgap))
+        if self._rebalance_bundles and self._async_mode:
+            raise ValueError("Scenario bundles can not be rebalanced when PH is executed in asynchronous mode")
 
         #
         # validate the linearization (number of pieces) and breakpoint
@@ -2297,6 +2309,12 @@ class ProgressiveHedging(_PHBase):
                                pyomo.solvers.plugins.\
                                smanager.phpyro.SolverManager_PHPyro)
 
+        if self._rebalance_bundles:
+            if isPHPyro:
+                raise ValueError("Scenario bundles can not be rebalanced when using the PHPyro solver manager")
+            if not self._scenario_tree.contains_bundles():
+                raise ValueError("Scenario bundles can not be rebalanced - no scenario bundles are defined!")
+
         initialization_action_handles = []
 
         if isPHPyro:
@@ -2317,16 +2335,7 @@ class ProgressiveHedging(_PHBase):
 
             # populate the solver map in the case of serial PH.
             for subproblem in self._scenario_tree.subproblems:
-                object_solver = self._solver_map[subproblem.name] = SolverFactory(self._solver_type, solver_io=self._solver_io)
-                if object_solver == None:
-                    raise ValueError("Unknown solver type=" + self._solver_type + " specified in call to PH constructor")
-                if len(self._scenario_solver_options) > 0:
-                    if self._verbose:
-                        print("Initializing sub-problem solver with options="+str(self._scenario_solver_options))
-                    for option_key,option_value in iteritems(self._scenario_solver_options):
-                        self._solver_map[subproblem.name].options[option_key] = option_value
-                if self._output_times:
-                    object_solver._report_timing = True
+                self._create_subproblem_solver(subproblem.name)
 
             # gather the scenario tree instances into
             # the self._instances dictionary and
@@ -2698,6 +2707,146 @@ class ProgressiveHedging(_PHBase):
                   % (self._init_end_time - self._init_start_time))
             print("")
 
+    #
+    # constructs the solver plugin for a (scenario or bundle)
+    # sub-problem in the case of serial PH.
+    #
+
+    def _create_subproblem_solver(self, subproblem_name):
+
+        object_solver = self._solver_map[subproblem_name] = SolverFactory(self._solver_type, solver_io=self._solver_io)
+        if object_solver == None:
+            raise ValueError("Unknown solver type=" + self._solver_type + " specified in call to PH constructor")
+        if len(self._scenario_solver_options) > 0:
+            if self._verbose:
+                print("Initializing sub-problem solver with options="+str(self._scenario_solver_options))
+            for option_key,option_value in iteritems(self._scenario_solver_options):
+                object_solver.options[option_key] = option_value
+        if self._output_times:
+            object_solver._report_timing = True
+        return object_solver
+
+    #
+    # returns a map from scenario name to the solve time recorded
+    # for the sub-problem containing the scenario during the most
+    # recent round of solves. the solve time of a bundle is divided
+    # evenly among its scenarios. scenarios with an undefined solve
+    # time are omitted.
+    #
+
+    def get_scenario_weights(self, use_pyomo_solve_time=False):
+
+        if use_pyomo_solve_time:
+            solve_times = self._pyomo_solve_times
+        else:
+            solve_times = self._solve_times
+
+        scenario_weights = {}
+        if self._scenario_tree.contains_bundles():
+            for scenario_bundle in self._scenario_tree._scenario_bundles:
+                solve_time = solve_times.get(scenario_bundle._name)
+                if isinstance(solve_time, UndefinedData) or \
+                   (solve_time is None):
+                    continue
+                for scenario_name in scenario_bundle._scenario_names:
+                    scenario_weights[scenario_name] = \
+                        float(solve_time) / len(scenario_bundle._scenario_names)
+        else:
+            for scenario in self._scenario_tree._scenarios:
+                solve_time = solve_times.get(scenario._name)
+                if isinstance(solve_time, UndefinedData) or \
+                   (solve_time is None):
+                    continue
+                scenario_weights[scenario._name] = float(solve_time)
+
+        return scenario_weights
+
+    #
+    # replaces the current scenario bundles with the same number of
+    # bundles whose total weights are balanced (see
+    # ScenarioTree.create_balanced_bundles), along with their binding
+    # instances and solvers. this is intended to be called between
+    # PH iterations, using the weights returned by
+    # get_scenario_weights(), to reduce idle time waiting on the
+    # slowest bundle solves. only supported for serial PH.
+    #
+
+    def rebalance_bundles(self, scenario_weights=None):
+
+        import pyomo.solvers.plugins.smanager.phpyro
+        from pyomo.solvers.plugins.solvers.persistent_solver import \
+            PersistentSolver
+
+        if isinstance(self._solver_manager,
+                      pyomo.solvers.plugins.smanager.\
+                      phpyro.SolverManager_PHPyro):
+            raise RuntimeError("Scenario bundles can not be rebalanced when "
+                               "using the PHPyro solver manager")
+        if not self._scenario_tree.contains_bundles():
+            raise RuntimeError("Scenario bundles can not be rebalanced - "
+                               "no scenario bundles are defined!")
+
+        start_time = time.time()
+
+        num_bundles = len(self._scenario_tree._scenario_bundles)
+
+        self._destory_bundle_binding_instances()
+        for scenario_bundle in list(self._scenario_tree._scenario_bundles):
+            self._scenario_tree.remove_bundle(scenario_bundle._name)
+            del self._solver_map[scenario_bundle._name]
+            for bundle_dict in (self._gaps,
+                                self._solution_status,
+                                self._solve_times,
+                                self._pyomo_solve_times,
+                                self._solver_results):
+                bundle_dict.pop(scenario_bundle._name, None)
+
+        bundle_weights = self._scenario_tree.create_balanced_bundles(
+            num_bundles,
+            scenario_weights=scenario_weights)
+
+        # cached solutions are stored by bundle, so regroup the fixed
+        # variable information by the new bundles. the solver results
+        # for the old bundles can not be loaded into the new binding
+        # instances, so only the scenario tree solution is restored
+        # from the cache.
+        for cache_id, cache in iteritems(self._cached_solutions):
+            fixed_results = {}
+            for solver_results, bundle_fixed_results in itervalues(cache):
+                fixed_results.update(bundle_fixed_results)
+            cache.clear()
+            for scenario_bundle in self._scenario_tree._scenario_bundles:
+                cache[scenario_bundle._name] = \
+                    (None,
+                     dict((scenario_name, fixed_results[scenario_name])
+                          for scenario_name in scenario_bundle._scenario_names
+                          if scenario_name in fixed_results))
+
+        for scenario_bundle in self._scenario_tree._scenario_bundles:
+            self._create_subproblem_solver(scenario_bundle._name)
+
+        self._form_bundle_binding_instances()
+
+        if isinstance(self._solver_map[next(iterkeys(self._solver_map))], PersistentSolver):
+            for scenario_bundle in self._scenario_tree.bundles:
+                self._solver_map[scenario_bundle.name].set_instance(
+                    self._bundle_binding_instance_map[scenario_bundle.name],
+                    symbolic_solver_labels=self._symbolic_solver_labels,
+                    output_fixed_variable_bounds=self._write_fixed_variables)
+
+        print("Rebalanced scenario bundles:")
+        for scenario_bundle in self._scenario_tree._scenario_bundles:
+            print("  %s: weight=%.2f scenarios=%s"
+                  % (scenario_bundle._name,
+                     bundle_weights[scenario_bundle._name],
+                     scenario_bundle._scenario_names))
+
+        if self._output_times:
+            print("Scenario bundle rebalancing time=%.2f seconds"
+                  % (time.time() - start_time))
+
+        return bundle_weights
+
     #
     #
     #
@@ -2738,7 +2887,11 @@ class ProgressiveHedging(_PHBase):
         if not isinstance(self._solver_manager,
                           pyomo.solvers.plugins.smanager.\
                           phpyro.SolverManager_PHPyro):
-            self._preprocess_scenario_instances(subproblems=subproblems)
+            with get_timing_trace().span(
+                    "preprocess",
+                    category="preprocess",
+                    iteration=self._current_iteration):
+                self._preprocess_scenario_instances(subproblems=subproblems)
 
         # STEP -1: clear the auxilliary dictionaries (gaps, solve_times,
         #          pyomo_solve_times, solution_status)
@@ -2775,6 +2928,12 @@ class ProgressiveHedging(_PHBase):
         bundle_action_handle_map = {} # maps bundle names to action handles
         action_handle_bundle_map = {} # maps action handles to bundle names
 
+        # the serial solver manager solves each subproblem when it
+        # is queued, so the solve phases can be recorded here
+        trace = get_timing_trace()
+        record_solver = trace.enabled and \
+            isinstance(self._solver_manager, SolverManager_Serial)
+
         common_solve_kwds = {
             'tee':self._output_solver_log,
             'keepfiles':self._keep_solver_files,
@@ -2852,6 +3011,10 @@ class ProgressiveHedging(_PHBase):
                                 self._bundle_binding_instance_map[scenario_bundle._name],
                                 opt=bundle_solver,
                                 **common_solve_kwds)
+                    if record_solver:
+                        trace.record_solver(bundle_solver,
+                                            lane=scenario_bundle._name,
+                                            iteration=self._current_iteration)
 
                 bundle_action_handle_map[scenario_bundle._name] = new_action_handle
                 action_handle_bundle_map[new_action_handle] = scenario_bundle._name
@@ -2907,6 +3070,10 @@ class ProgressiveHedging(_PHBase):
                             self._solver_manager.queue(instance,
                                                        opt=scenario_solver,
                                                        **common_solve_kwds)
+                    if record_solver:
+                        trace.record_solver(scenario_solver,
+                                            lane=scenario._name,
+                                            iteration=self._current_iteration)
 
                 scenario_action_handle_map[scenario._name] = new_action_handle
                 action_handle_scenario_map[new_action_handle] = scenario._name
@@ -2937,6 +3104,7 @@ class ProgressiveHedging(_PHBase):
         subproblems = []
 
         result_load_times = []
+        trace = get_timing_trace()
 
         # loop for the solver results, reading them and
         # loading them into instances as they are available.
@@ -3012,6 +3180,14 @@ class ProgressiveHedging(_PHBase):
                     end_time = time.time()
                     if self._output_times:
                         result_load_times.append(end_time-start_time)
+                    trace.record("process results",
+                                 start_time,
+                                 end_time-start_time,
+                                 category="load",
+                                 lane=bundle_name,
+                                 iteration=self._current_iteration,
+                                 solve_time=self._solve_times[bundle_name],
+                                 pyomo_solve_time=self._pyomo_solve_times[bundle_name])
 
                 else:
 
@@ -3075,6 +3251,14 @@ class ProgressiveHedging(_PHBase):
                     end_time = time.time()
                     if self._output_times:
                         result_load_times.append(end_time-start_time)
+                    trace.record("process results",
+                                 start_time,
+                                 end_time-start_time,
+                                 category="load",
+                                 lane=bundle_name,
+                                 iteration=self._current_iteration,
+                                 solve_time=self._solve_times[bundle_name],
+                                 pyomo_solve_time=self._pyomo_solve_times[bundle_name])
 
                 if self._verbose:
                     print("Successfully loaded solution for bundle=%s"
@@ -3160,6 +3344,14 @@ class ProgressiveHedging(_PHBase):
 
                     if self._output_times:
                         result_load_times.append(end_time-start_time)
+                    trace.record("process results",
+                                 start_time,
+                                 end_time-start_time,
+                                 category="load",
+                                 lane=scenario_name,
+                                 iteration=self._current_iteration,
+                                 solve_time=self._solve_times[scenario_name],
+                                 pyomo_solve_time=self._pyomo_solve_times[scenario_name])
 
                 else:
 
@@ -3223,6 +3415,14 @@ class ProgressiveHedging(_PHBase):
 
                     if self._output_times:
                         result_load_times.append(end_time-start_time)
+                    trace.record("process results",
+                                 start_time,
+                                 end_time-start_time,
+                                 category="load",
+                                 lane=scenario_name,
+                                 iteration=self._current_iteration,
+                                 solve_time=self._solve_times[scenario_name],
+                                 pyomo_solve_time=self._pyomo_solve_times[scenario_name])
 
                 if self._verbose:
                     print("Successfully loaded solution for scenario=%s "
@@ -3268,6 +3468,12 @@ class ProgressiveHedging(_PHBase):
         if self._output_times:
             print("Time queueing subproblems=%0.2f seconds"
                   % (queue_subproblems_end_time-queue_subproblems_start_time))
+        trace = get_timing_trace()
+        trace.record("queue subproblems",
+                     queue_subproblems_start_time,
+                     queue_subproblems_end_time-queue_subproblems_start_time,
+                     category="communication",
+                     iteration=self._current_iteration)
 
         if subproblems is None:
             if self._scenario_tree.contains_bundles():
@@ -3287,6 +3493,11 @@ class ProgressiveHedging(_PHBase):
         if self._output_times:
             print("Time waiting for subproblems=%0.2f seconds"
                   % (wait_subproblems_end_time-wait_subproblems_start_time))
+        trace.record("wait for subproblems",
+                     wait_subproblems_start_time,
+                     wait_subproblems_end_time-wait_subproblems_start_time,
+                     category="communication",
+                     iteration=self._current_iteration)
 
         # do some error checking and reporting
         if len(self._solve_times) > 0:
@@ -3349,6 +3560,11 @@ class ProgressiveHedging(_PHBase):
         if self._output_times:
             print("Aggregate sub-problem solve time=%.2f seconds"
                   % (iteration_end_time - iteration_start_time))
+        trace.record("solve subproblems",
+                     iteration_start_time,
+                     iteration_end_time - iteration_start_time,
+                     category="iteration",
+                     iteration=self._current_iteration)
 
         if len(failures):
             print(" ** At least one sub-problem failed to solve! ** ")
@@ -3452,6 +3668,11 @@ class ProgressiveHedging(_PHBase):
 
         if self._output_times:
             print("Variable statistics compute time=%.2f seconds" % (end_time - start_time))
+        get_timing_trace().record("update variable statistics",
+                                  start_time,
+                                  end_time - start_time,
+                                  category="iteration",
+                                  iteration=current_iteration)
 
     def update_weights(self):
 
@@ -3560,6 +3781,11 @@ class ProgressiveHedging(_PHBase):
 
         if self._output_times:
             print("Weight update time=%.2f seconds" % (end_time - start_time))
+        get_timing_trace().record("update weights",
+                                  start_time,
+                                  end_time - start_time,
+                                  category="iteration",
+                                  iteration=self._current_iteration)
 
     def update_weights_for_scenario(self, scenario):
 
@@ -4368,6 +4594,11 @@ class ProgressiveHedging(_PHBase):
                 if i == self._max_iterations:
                     print("Halting PH - reached maximal iteration count="
                           +str(self._max_iterations))
+                elif self._rebalance_bundles:
+                    # balance the bundles for the next iteration using
+                    # the solve times recorded in this one.
+                    self.rebalance_bundles(
+                        scenario_weights=self.get_scenario_weights())
 
                 # garbage-collect if it wasn't disabled entirely.
                 if re_enable_gc:
@@ -4476,6 +4707,12 @@ class ProgressiveHedging(_PHBase):
 
         self._solve_end_time = time.time()
 
+        if self._output_scenario_weights is not None:
+            save_scenario_weights(self._output_scenario_weights,
+                                  self.get_scenario_weights())
+            print("Scenario weights written to file="
+                  +self._output_scenario_weights)
+
         print("PH complete")
 
         if _OLD_OUTPUT:
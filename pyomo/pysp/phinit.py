@@ -187,6 +187,11 @@ def construct_ph_options_parser(usage_string):
       dest="async_buffer_length",
       type=int,
       default=1)
+    phOpts.add_argument("--rebalance-bundles",
+      help="Between PH iterations, replace the scenario bundles with the same number of bundles whose total solve times (as recorded during the most recent iteration) are balanced. Requires scenario bundles and serial (non-PHPyro) solves. Default is False.",
+      action="store_true",
+      dest="rebalance_bundles",
+      default=False)
     phOpts.add_argument('--rho-cfgfile',
       help="The name of python script containing a ph_rhosetter_callback function to compute and update PH rho values. Default is None.",
       action="store",
@@ -462,6 +467,12 @@ def construct_ph_options_parser(usage_string):
       action="store_true",
       dest="output_scenario_tree_solution",
       default=False)
+    outputOpts.add_argument('--output-scenario-weights',
+      help="The name of a JSON file to which the solve time of each scenario (or its share of the solve time of its bundle) during the final PH iteration is written upon termination. The file can be used as scenario weights when creating balanced bundles. Default is None, indicating no file is written.",
+      action="store",
+      dest="output_scenario_weights",
+      type=str,
+      default=None)
     outputOpts.add_argument('--output-solver-logs',
       help="Output solver logs during scenario sub-problem solves",
       action="store_true",
@@ -572,6 +583,12 @@ def construct_ph_options_parser(usage_string):
       action="store_true",
       dest="traceback",
       default=False)
+    otherOpts.add_argument('--output-timing-trace',
+      help="Record the time spent in each PH iteration and scenario sub-problem (preprocessing, writing, solving, loading results, and communication) and write it to the given file. A CSV file is written if the filename ends with '.csv'; otherwise the file uses the Chrome tracing JSON format. Default is None.",
+      action="store",
+      dest="output_timing_trace",
+      type=str,
+      default=None)
     otherOpts.add_argument('--compile-scenario-instances',
       help="Replace all linear constraints on scenario instances with a more memory efficient sparse matrix representation. Default is False.",
       action="store_true",
@@ -1337,7 +1354,8 @@ def main(args=None):
                           error_label="runph: ",
                           disable_gc=options.disable_gc,
                           profile_count=options.profile,
-                          traceback=options.traceback)
+                          traceback=options.traceback,
+                          timing_trace=options.output_timing_trace)
 
 @pyomo_command('runph', 'Optimize with the PH solver (primal search)')
 def PH_main(args=None):
@@ -34,7 +34,8 @@ from pyomo.pysp.scenariotree.tree_structure_model import \
     (CreateAbstractScenarioTreeModel,
      ScenarioTreeModelFromNetworkX)
 from pyomo.pysp.scenariotree.tree_structure import \
-    ScenarioTree
+    (ScenarioTree,
+     load_scenario_weights)
 
 import six
 
@@ -323,6 +324,11 @@ class ScenarioTreeInstanceFactory(object):
         self._scenario_tree_model = None
         self._scenario_tree = None
         self._data_directory = None
+        # DataPortal objects with the data for the interior nodes of
+        # the scenario tree (node-based data), keyed by the tuple of
+        # data files along the path from the root node. Scenarios
+        # share the data for their common nodes.
+        self._node_data = {}
         try:
             self._init(model, scenario_tree, data)
         except:
@@ -528,6 +534,7 @@ class ScenarioTreeInstanceFactory(object):
                 shutil.rmtree(tmpdir, True)
             archive.close()
         self._archives = []
+        self._node_data = {}
         self._closed = True
 
     #
@@ -683,13 +690,28 @@ class ScenarioTreeInstanceFactory(object):
                                                    self.data_directory()))
                         data_files.append(node_data_filename)
 
-                    scenario_data = DataPortal(model=self._model_object)
-                    for data_file in data_files:
+                    # The data for each node is layered on top of
+                    # the data for its parent, which is loaded once
+                    # and shared by all scenarios below that node
+                    scenario_data = None
+                    for i, data_file in enumerate(data_files):
+                        key = tuple(data_files[:i+1])
+                        if key in self._node_data:
+                            if verbose:
+                                print("Node data for scenario=%s shared "
+                                      "from file=%s"
+                                      % (scenario_name, data_file))
+                            scenario_data = self._node_data[key]
+                            continue
                         if verbose:
                             print("Node data for scenario=%s partially "
                                   "loading from file=%s"
                                   % (scenario_name, data_file))
+                        scenario_data = DataPortal(model=self._model_object,
+                                                   base=scenario_data)
                         scenario_data.load(filename=data_file)
+                        if i < len(data_files) - 1:
+                            self._node_data[key] = scenario_data
 
                     scenario_instance = self._model_object.create_instance(
                         scenario_data,
@@ -782,6 +804,8 @@ class ScenarioTreeInstanceFactory(object):
                                bundles=None,
                                random_bundles=None,
                                random_seed=None,
+                               balanced_bundles=None,
+                               bundle_weights=None,
                                verbose=True):
 
         scenario_tree_model = self._scenario_tree_model
@@ -905,6 +929,35 @@ class ScenarioTreeInstanceFactory(object):
             scenario_tree.create_random_bundles(random_bundles,
                                                 random_seed)
 
+        #
+        # create balanced bundles, if requested
+        #
+        if (balanced_bundles is not None) and \
+           (balanced_bundles > 0):
+            if bundles is not None:
+                raise ValueError("Cannot specify both balanced "
+                                 "bundles and a bundles specification")
+            if (random_bundles is not None) and \
+               (random_bundles > 0):
+                raise ValueError("Cannot specify both balanced "
+                                 "bundles and random bundles")
+
+            num_scenarios = len(scenario_tree._scenarios)
+            if balanced_bundles > num_scenarios:
+                raise ValueError("Cannot create more balanced bundles "
+                                 "than there are scenarios!")
+
+            if isinstance(bundle_weights, six.string_types):
+                bundle_weights = load_scenario_weights(bundle_weights)
+
+            if verbose:
+                print("Creating "+str(balanced_bundles)+
+                      " balanced bundles")
+
+            scenario_tree.create_balanced_bundles(
+                balanced_bundles,
+                scenario_weights=bundle_weights)
+
         scenario_tree._scenario_instance_factory = self
 
         return scenario_tree
@@ -487,6 +487,32 @@ class ScenarioTreeSolveResults(object):
             results[attr_name] = getattr(self, attr_name)[object_name]
         return results
 
+    def get_scenario_weights(self, scenario_tree, use_pyomo_solve_time=False):
+        """Return a dictionary mapping scenario names to
+        the recorded solve time of the subproblem containing
+        each scenario. The solve time of a bundle is divided
+        evenly among its scenarios. Scenarios with an
+        undefined solve time are omitted. The result can be
+        used as scenario weights when creating balanced
+        bundles."""
+        times = self.pyomo_solve_time if use_pyomo_solve_time else \
+                self.solve_time
+        scenario_weights = {}
+        for object_name, solve_time in iteritems(times):
+            if isinstance(solve_time, UndefinedData) or \
+               (solve_time is None):
+                continue
+            if self.solve_type == 'bundles':
+                scenario_names = \
+                    scenario_tree.get_bundle(object_name).scenario_names
+                for scenario_name in scenario_names:
+                    scenario_weights[scenario_name] = \
+                        float(solve_time) / len(scenario_names)
+            else:
+                assert self.solve_type == 'scenarios'
+                scenario_weights[object_name] = float(solve_time)
+        return scenario_weights
+
     def pprint(self, output_times=False, filter_names=None):
         """Print a summary of the solve results included in this object."""
 
@@ -1197,6 +1223,10 @@ class ScenarioTreeManagerClient(ScenarioTreeManager,
                                    "scenario_bundle_specification")
         safe_declare_common_option(options,
                                    "create_random_bundles")
+        safe_declare_common_option(options,
+                                   "create_balanced_bundles")
+        safe_declare_common_option(options,
+                                   "scenario_bundle_weights")
 
         #
         # various
@@ -1235,6 +1265,8 @@ class ScenarioTreeManagerClient(ScenarioTreeManager,
                 bundles=self._options.scenario_bundle_specification,
                 random_bundles=self._options.create_random_bundles,
                 random_seed=self._options.scenario_tree_random_seed,
+                balanced_bundles=self._options.create_balanced_bundles,
+                bundle_weights=self._options.scenario_bundle_weights,
                 verbose=self._options.verbose)
 
     def _generate_scenario_tree(self):
@@ -1278,6 +1310,9 @@ class ScenarioTreeManagerClient(ScenarioTreeManager,
                     bundles=self._options.scenario_bundle_specification,
                     random_bundles=self._options.create_random_bundles,
                     random_seed=self._options.scenario_tree_random_seed,
+                    balanced_bundles=\
+                       self._options.create_balanced_bundles,
+                    bundle_weights=self._options.scenario_bundle_weights,
                     verbose=self._options.verbose)
 
             # print the input tree for validation/information
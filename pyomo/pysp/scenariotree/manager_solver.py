@@ -26,12 +26,14 @@ from pyomo.opt import (SolverFactory,
                        SolutionStatus)
 from pyomo.opt.base.solvers import OptSolver
 from pyomo.opt.parallel import SolverManagerFactory
+from pyomo.opt.parallel.local import SolverManager_Serial
 from pyomo.pysp.util.config import (PySPConfigValue,
                                     PySPConfigBlock,
                                     safe_declare_common_option,
                                     safe_register_common_option)
 from pyomo.pysp.util.configured_object import \
     PySPConfiguredObject
+from pyomo.pysp.util.timing_trace import get_timing_trace
 from pyomo.pysp.scenariotree.preprocessor import \
     ScenarioTreePreprocessor
 from pyomo.pysp.scenariotree.server_pyro \
@@ -113,18 +115,25 @@ class ScenarioTreeManagerSolver(PySPConfiguredObject):
 
         assert object_type in ('bundles', 'scenarios')
 
+        trace = get_timing_trace()
+
         # queue the solves
-        _async_solve_result = self._queue_object_solves(
-            object_type,
-            objects,
-            ephemeral_solver_options,
-            disable_warmstart)
-
-        result = self.manager.AsyncResultCallback(
-            lambda: self._process_solve_results(
+        with trace.span("queue "+object_type, category="communication"):
+            _async_solve_result = self._queue_object_solves(
                 object_type,
-                _async_solve_result.complete(),
-                check_status))
+                objects,
+                ephemeral_solver_options,
+                disable_warmstart)
+
+        def _complete_solves():
+            with trace.span("wait for "+object_type,
+                            category="communication"):
+                solve_results = _async_solve_result.complete()
+            return self._process_solve_results(object_type,
+                                               solve_results,
+                                               check_status)
+
+        result = self.manager.AsyncResultCallback(_complete_solves)
         if not async_call:
             result = result.complete()
         return result
@@ -387,6 +396,7 @@ class ScenarioTreeManagerSolver(PySPConfiguredObject):
 
         manager_results = ScenarioTreeSolveResults(object_type)
         failures = []
+        trace = get_timing_trace()
         for object_name in solve_results:
 
             results = solve_results[object_name]
@@ -443,6 +453,17 @@ class ScenarioTreeManagerSolver(PySPConfiguredObject):
                          object_name,
                          time.time() - start_load))
 
+            if trace.enabled:
+                trace.record(
+                    "process results",
+                    start_load,
+                    time.time() - start_load,
+                    category="load",
+                    lane=object_name,
+                    solve_time=manager_results.solve_time.get(object_name),
+                    pyomo_solve_time=\
+                        manager_results.pyomo_solve_time.get(object_name))
+
         if len(failures) > 0:
             print(" ** At least one of the %s failed to solve! ** "
                   % (object_type))
@@ -652,7 +673,9 @@ class _ScenarioTreeManagerSolverWorker(ScenarioTreeManagerSolver,
                     self.manager.scenario_tree.get_scenario(scenario_name).\
                         _instance_objective.deactivate()
             if self.preprocessor is not None:
-                self.preprocessor.preprocess_bundles(bundles=objects)
+                with get_timing_trace().span("preprocess bundles",
+                                             category="preprocess"):
+                    self.preprocessor.preprocess_bundles(bundles=objects)
                 modify_kwds_func = self.preprocessor.modify_bundle_solver_keywords
         else:
             if objects is None:
@@ -664,7 +687,9 @@ class _ScenarioTreeManagerSolverWorker(ScenarioTreeManagerSolver,
                     self.manager.scenario_tree.get_scenario(scenario_name).\
                         _instance_objective.activate()
             if self.preprocessor is not None:
-                self.preprocessor.preprocess_scenarios(scenarios=objects)
+                with get_timing_trace().span("preprocess scenarios",
+                                             category="preprocess"):
+                    self.preprocessor.preprocess_scenarios(scenarios=objects)
                 modify_kwds_func = self.preprocessor.modify_scenario_solver_keywords
         assert solver_dict is not None
         assert instance_dict is not None
@@ -696,6 +721,12 @@ class _ScenarioTreeManagerSolverWorker(ScenarioTreeManagerSolver,
         if ephemeral_solver_options is not None:
             common_kwds['options'].update(ephemeral_solver_options)
 
+        # the serial solver manager solves each subproblem when
+        # it is queued, so the solve phases can be recorded here
+        trace = get_timing_trace()
+        record_solver = trace.enabled and \
+            isinstance(self._solver_manager, SolverManager_Serial)
+
         # maps action handles to subproblem names
         action_handle_data = {}
         for object_name in objects:
@@ -720,6 +751,8 @@ class _ScenarioTreeManagerSolverWorker(ScenarioTreeManagerSolver,
                     self._solver_manager.queue(instance,
                                                opt=opt,
                                                **solve_kwds)
+            if record_solver:
+                trace.record_solver(opt, lane=object_name)
 
             action_handle_data[new_action_handle] = object_name
 
@@ -750,6 +783,77 @@ class ScenarioTreeManagerSolverClientSerial(
     def _close_impl(self):
         super(ScenarioTreeManagerSolverClientSerial, self)._close_impl()
 
+    def rebalance_bundles(self, scenario_weights=None, num_bundles=None):
+        """Replace the current scenario bundles with bundles
+        whose total weights are balanced using a bin-packing
+        heuristic. This can be called between iterations of
+        an algorithm to reduce load imbalance across bundle
+        solves.
+
+        Args:
+            scenario_weights (dict): A dictionary mapping
+                scenario names to weights (e.g., the result
+                of calling get_scenario_weights on the
+                results from a previous solve). The default
+                value of None indicates that the size of each
+                scenario instance should be used.
+            num_bundles (int): The number of bundles to
+                create. The default value of None indicates
+                that the current number of bundles should be
+                used.
+
+        Returns:
+            A dictionary mapping the new bundle names to \
+            their total weight.
+        """
+        from pyomo.solvers.plugins.solvers.persistent_solver import \
+            PersistentSolver
+
+        scenario_tree = self.manager.scenario_tree
+        if num_bundles is None:
+            num_bundles = len(scenario_tree._scenario_bundles)
+            if num_bundles == 0:
+                raise ValueError(
+                    "Unable to rebalance bundles. No bundles exist "
+                    "and the num_bundles keyword was not specified.")
+
+        for bundle in list(scenario_tree._scenario_bundles):
+            if self._preprocessor is not None:
+                self._preprocessor.remove_bundle(bundle)
+            self.manager._release_bundle(bundle.name)
+            scenario_tree.remove_bundle(bundle.name)
+            del self._bundle_solvers[bundle.name]
+
+        bundle_weights = scenario_tree.create_balanced_bundles(
+            num_bundles,
+            scenario_weights=scenario_weights)
+
+        for bundle in scenario_tree._scenario_bundles:
+            self.manager._init_bundle(bundle.name,
+                                      bundle.scenario_names)
+            solver = self._bundle_solvers[bundle.name] = \
+                SolverFactory(self.get_option("solver"),
+                              solver_io=self.get_option("solver_io"))
+            if isinstance(solver, PersistentSolver) and \
+               self.get_option("disable_advanced_preprocessing"):
+                raise ValueError("Advanced preprocessing can not be disabled "
+                                 "when persistent solvers are used")
+            if self._preprocessor is not None:
+                self._preprocessor.add_bundle(
+                    bundle,
+                    self.manager._bundle_binding_instance_map[bundle.name],
+                    solver)
+
+        if self.get_option("verbose"):
+            print("Rebalanced scenario bundles:")
+            for bundle in scenario_tree._scenario_bundles:
+                print("  %s: weight=%.2f scenarios=%s"
+                      % (bundle.name,
+                         bundle_weights[bundle.name],
+                         bundle.scenario_names))
+
+        return bundle_weights
+
     #
     # Abstract methods for ScenarioTreeManagerSolver:
     #
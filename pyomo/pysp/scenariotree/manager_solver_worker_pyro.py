@@ -17,6 +17,8 @@ from pyomo.opt import (SolverFactory,
 from pyomo.pysp.util.configured_object import PySPConfiguredObject
 from pyomo.pysp.util.config import (PySPConfigBlock,
                                     safe_declare_common_option)
+from pyomo.pysp.scenariotree.tree_structure import \
+    shared_memory_available
 from pyomo.pysp.scenariotree.manager_worker_pyro import \
     ScenarioTreeManagerWorkerPyro
 from pyomo.pysp.scenariotree.manager_solver import \
@@ -39,6 +41,8 @@ class ScenarioTreeManagerSolverWorkerPyro(_ScenarioTreeManagerSolverWorker,
     def _declare_options(cls, options=None):
         if options is None:
             options = PySPConfigBlock()
+        safe_declare_common_option(options,
+                                   "pyro_solution_exchange")
         return options
 
     def __init__(self,
@@ -56,6 +60,13 @@ class ScenarioTreeManagerSolverWorkerPyro(_ScenarioTreeManagerSolverWorker,
         manager = self._server._worker_map[base_worker_name]
         super(ScenarioTreeManagerSolverWorkerPyro, self).\
             __init__(manager, options)
+        if (self.get_option("pyro_solution_exchange") == \
+            "shared_memory") and \
+           (not shared_memory_available):
+            raise ValueError(
+                "The 'shared_memory' solution exchange format "
+                "requires the multiprocessing.shared_memory "
+                "module (Python 3.8 or later)")
 
     #
     # Abstract methods for ScenarioTreeManager:
@@ -102,6 +113,15 @@ class ScenarioTreeManagerSolverWorkerPyro(_ScenarioTreeManagerSolverWorker,
             if objects is None:
                 objects = self.manager.scenario_tree._scenario_map
 
+        solution_exchange = self.get_option("pyro_solution_exchange")
+        if solution_exchange == "dict":
+            _copy_solution = lambda scenario: scenario.copy_solution()
+        else:
+            use_shared_memory = (solution_exchange == "shared_memory")
+            _copy_solution = lambda scenario: \
+                scenario.copy_solution_arrays(
+                    use_shared_memory=use_shared_memory)
+
         results = {}
         for object_name in objects:
 
@@ -115,13 +135,13 @@ class ScenarioTreeManagerSolverWorkerPyro(_ScenarioTreeManagerSolverWorker,
                     for scenario_name in self.manager.scenario_tree.\
                             get_bundle(object_name).scenario_names:
                         scenario_tree_results[scenario_name] = \
-                            self.manager.scenario_tree.\
-                                get_scenario(scenario_name).copy_solution()
+                            _copy_solution(self.manager.scenario_tree.\
+                                           get_scenario(scenario_name))
                 else:
                     assert object_type == 'scenarios'
                     scenario_tree_results = \
-                        self.manager.scenario_tree.\
-                            get_scenario(object_name).copy_solution()
+                        _copy_solution(self.manager.scenario_tree.\
+                                       get_scenario(object_name))
 
             # Convert enums to strings to avoid difficult
             # behavior related to certain Pyro serializer
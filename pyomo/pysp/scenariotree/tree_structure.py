@@ -14,10 +14,16 @@ __all__ = ('ScenarioTreeNode',
            'ScenarioTreeBundle',
            'ScenarioTree')
 
+import os
 import sys
+import time
+import atexit
 import random
 import copy
 import math
+import array
+import heapq
+import json
 import logging
 
 try:
@@ -26,7 +32,7 @@ except ImportError:                         #pragma:nocover
     from ordereddict import OrderedDict
 
 from pyomo.core import (value, minimize, maximize,
-                        Var, Expression, Block,
+                        Var, Expression, Block, Constraint,
                         CounterLabeler, IntegerSet,
                         Objective, SOSConstraint, Set,
                         ComponentUID)
@@ -34,6 +40,7 @@ from pyomo.core.base.suffix import ComponentMap
 from pyomo.core.base.block import (_BlockData,
                                    generate_cuid_names)
 from pyomo.core.base.sos import _SOSConstraintData
+from pyomo.core.base.misc import sorted_robust
 from pyomo.repn import generate_standard_repn
 from pyomo.pysp.phutils import (BasicSymbolMap,
                                 indexToString,
@@ -48,6 +55,39 @@ from six.moves import xrange
 
 logger = logging.getLogger('pyomo.pysp')
 
+try:
+    from multiprocessing import shared_memory
+    from multiprocessing import resource_tracker
+    shared_memory_available = True
+except ImportError:                         #pragma:nocover
+    shared_memory_available = False
+
+# Shared memory blocks created by copy_solution_arrays that may not
+# have been read yet, mapped to the time they were created. A block
+# that is never read is unlinked by the process that created it once
+# it is older than _shared_memory_timeout seconds, or when that
+# process exits.
+_shared_memory_blocks = OrderedDict()
+_shared_memory_timeout = 600.0
+
+def _release_shared_memory_blocks(timeout=None):
+    now = time.time()
+    while len(_shared_memory_blocks) > 0:
+        name, created = next(iteritems(_shared_memory_blocks))
+        if (timeout is not None) and (now - created < timeout):
+            break
+        del _shared_memory_blocks[name]
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except OSError:
+            # already read and unlinked by the receiver
+            continue
+        shm.close()
+        shm.unlink()
+
+if shared_memory_available:
+    atexit.register(_release_shared_memory_blocks)
+
 class _CUIDLabeler(object):
     def __init__(self):
         self._cuid_map = ComponentMap()
@@ -66,6 +106,38 @@ class _CUIDLabeler(object):
             self._cuid_map[obj] = cuid
             return cuid
 
+def scenario_model_size(instance):
+    """Return a rough measure of the size of a scenario
+    instance (the number of variables plus the number of
+    active constraints)."""
+    return sum(1 for _ in instance.component_data_objects(
+                   Var, descend_into=True)) + \
+           sum(1 for _ in instance.component_data_objects(
+                   Constraint, active=True, descend_into=True))
+
+def save_scenario_weights(filename, scenario_weights):
+    """Save a dictionary mapping scenario name to a weight
+    (e.g., a recorded solve time) to a JSON file that can be
+    used to create balanced bundles."""
+    with open(filename, 'w') as f:
+        json.dump(dict((str(name), float(weight))
+                       for name, weight in iteritems(scenario_weights)),
+                  f,
+                  indent=2,
+                  sort_keys=True)
+
+def load_scenario_weights(filename):
+    """Load a dictionary of scenario weights saved with
+    save_scenario_weights."""
+    with open(filename) as f:
+        scenario_weights = json.load(f)
+    if not isinstance(scenario_weights, dict):
+        raise ValueError(
+            "Scenario weights file %s must contain a JSON "
+            "object mapping scenario names to weights"
+            % (filename))
+    return scenario_weights
+
 class ScenarioTreeNode(object):
 
     """ Constructor
@@ -114,6 +186,10 @@ class ScenarioTreeNode(object):
         #
         # maps id -> (name, index)
         self._variable_ids = {}
+        # a fixed ordering of the keys in _variable_ids that is
+        # used when packing scenario solutions into arrays (see
+        # the variable_order property)
+        self._variable_order = ()
         # maps (name,index) -> id
         self._name_index_to_id = {}
         # maps id -> list of (vardata,probability) across all scenarios
@@ -199,6 +275,19 @@ class ScenarioTreeNode(object):
     def scenarios(self):
         return self._scenarios
 
+    @property
+    def variable_order(self):
+        """A tuple of the scenario tree ids for all variables
+        (standard and derived) at this node sorted in a
+        deterministic order. Every process that builds this
+        scenario tree produces the same ordering."""
+        # scenario tree ids are only ever added to a node, so
+        # a change in length is enough to detect a stale cache
+        if len(self._variable_order) != len(self._variable_ids):
+            self._variable_order = \
+                tuple(sorted_robust(self._variable_ids))
+        return self._variable_order
+
     @property
     def conditional_probability(self):
         return self._conditional_probability
@@ -1145,8 +1234,146 @@ class Scenario(object):
                         for scenario_tree_id in tree_node_stale))
         return solution
 
+    def copy_solution_arrays(self, use_shared_memory=False):
+        """Return a copy of the current solution where the
+        variable values and the fixed/stale flags are packed
+        into flat arrays following the variable_order of each
+        node in the scenario's node list. Nodes without a
+        stored solution are omitted from the arrays. Missing
+        variable values are stored as NaN.
+
+        If use_shared_memory is True, the arrays are written
+        into a multiprocessing.shared_memory block and only the
+        name of that block is placed on the returned
+        solution. Whoever calls set_solution with the result
+        unlinks the block after reading it. A block that is
+        never read is unlinked by this process after
+        _shared_memory_timeout seconds, or when it exits."""
+
+        solution = {}
+        solution['objective'] = self._objective
+        solution['cost'] = self._cost
+        solution['stage costs'] = copy.deepcopy(self._stage_costs)
+        solution['weight term cost'] = self._weight_term_cost
+        solution['proximal term cost'] = self._proximal_term_cost
+        nodes = []
+        x = []
+        flags = []
+        for tree_node in self._node_list:
+            tree_node_x = self._x[tree_node._name]
+            if len(tree_node_x) == 0:
+                continue
+            nodes.append(tree_node._name)
+            tree_node_fixed = self._fixed[tree_node._name]
+            tree_node_stale = self._stale[tree_node._name]
+            variable_order = tree_node.variable_order
+            assert len(variable_order) == len(tree_node_x)
+            for variable_id in variable_order:
+                x.append(tree_node_x[variable_id])
+                flags.append((variable_id in tree_node_fixed) | \
+                             ((variable_id in tree_node_stale) << 1))
+        solution['nodes'] = tuple(nodes)
+        if use_shared_memory and (len(x) > 0):
+            if not shared_memory_available:
+                raise RuntimeError(
+                    "Shared memory solution exchange requires the "
+                    "multiprocessing.shared_memory module "
+                    "(Python 3.8 or later)")
+            _release_shared_memory_blocks(_shared_memory_timeout)
+            nan = float('nan')
+            x = array.array('d', (nan if val is None else val
+                                  for val in x))
+            flags = array.array('B', flags)
+            xbytes = x.itemsize * len(x)
+            shm = shared_memory.SharedMemory(
+                create=True,
+                size=xbytes + len(flags))
+            shm.buf[:xbytes] = x.tobytes()
+            shm.buf[xbytes:xbytes+len(flags)] = flags.tobytes()
+            # The block usually outlives this process's interest
+            # in it (the reader unlinks it), so it is tracked by
+            # _shared_memory_blocks rather than by the resource
+            # tracker, which would otherwise report it as leaked
+            # when this process exits. The tracker only watches
+            # blocks on POSIX, where it records the name with a
+            # leading slash.
+            if os.name == 'posix':
+                resource_tracker.unregister('/' + shm.name,
+                                            "shared_memory")
+            _shared_memory_blocks[shm.name] = time.time()
+            shm.close()
+            solution['x'] = None
+            solution['flags'] = None
+            solution['shared memory'] = (shm.name, len(x))
+        else:
+            # NOTE: This function is frequently called to generate
+            #       a set of results that is transmitted over the wire
+            #       with Pyro. Some of the serializers used by Pyro4
+            #       do not support array.array objects (or NaN), so
+            #       the values are sent as tuples with None marking
+            #       missing values.
+            solution['x'] = tuple(x)
+            solution['flags'] = tuple(flags)
+            solution['shared memory'] = None
+        return solution
+
+    def set_solution_arrays(self, solution):
+        """Load a solution created by copy_solution_arrays."""
+
+        if solution['shared memory'] is not None:
+            shm_name, size = solution['shared memory']
+            _shared_memory_blocks.pop(shm_name, None)
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                x = array.array('d')
+                xbytes = x.itemsize * size
+                x.frombytes(shm.buf[:xbytes])
+                flags = array.array('B')
+                flags.frombytes(shm.buf[xbytes:xbytes+size])
+            finally:
+                shm.close()
+                shm.unlink()
+        else:
+            x = solution['x']
+            flags = solution['flags']
+
+        self._objective = solution['objective']
+        self._cost = solution['cost']
+        assert set(solution['stage costs'].keys()) == set(self._stage_costs.keys())
+        self._stage_costs = copy.deepcopy(solution['stage costs'])
+        self._weight_term_cost = solution['weight term cost']
+        self._proximal_term_cost = solution['proximal term cost']
+        nodes = set(solution['nodes'])
+        pos = 0
+        for tree_node in self._node_list:
+            tree_node_x = self._x[tree_node._name] = {}
+            tree_node_fixed = self._fixed[tree_node._name] = set()
+            tree_node_stale = self._stale[tree_node._name] = set()
+            if tree_node._name not in nodes:
+                continue
+            variable_order = tree_node.variable_order
+            end = pos + len(variable_order)
+            vals = list(x[pos:end])
+            tree_node_x.update(zip(variable_order, vals))
+            for variable_id, val in zip(variable_order, vals):
+                # NaN marks a missing value in shared memory
+                if (val is not None) and (val != val):
+                    tree_node_x[variable_id] = None
+            for variable_id, flag in zip(variable_order, flags[pos:end]):
+                if flag & 1:
+                    tree_node_fixed.add(variable_id)
+                if flag & 2:
+                    tree_node_stale.add(variable_id)
+            pos = end
+        assert pos == len(x)
+
     def set_solution(self, solution):
 
+        if 'nodes' in solution:
+            # created by copy_solution_arrays
+            self.set_solution_arrays(solution)
+            return
+
         self._objective = solution['objective']
         self._cost = solution['cost']
         assert set(solution['stage costs'].keys()) == set(self._stage_costs.keys())
@@ -2457,6 +2684,78 @@ class ScenarioTree(object):
         finally:
             random.setstate(random_state)
 
+    #
+    # create bundles whose total weights are as close to equal as
+    # possible, using the longest-processing-time-first
+    # heuristic for bin-packing. weights are typically recorded
+    # subproblem solve times. scenarios without a weight are
+    # assigned the average of the known weights. if no weights
+    # are provided, the model size of the scenario instances is
+    # used when they exist, otherwise all scenarios are given
+    # equal weight.
+    #
+
+    def create_balanced_bundles(self,
+                                num_bundles,
+                                scenario_weights=None):
+
+        num_scenarios = len(self._scenarios)
+        if (num_bundles < 1) or (num_bundles > num_scenarios):
+            raise ValueError(
+                "The number of balanced bundles must be between 1 "
+                "and the number of scenarios (%s). Invalid value: %s"
+                % (num_scenarios, num_bundles))
+
+        if scenario_weights is None:
+            scenario_weights = {}
+            for scenario in self._scenarios:
+                if scenario._instance is not None:
+                    scenario_weights[scenario.name] = \
+                        scenario_model_size(scenario._instance)
+        weights = {}
+        for scenario in self._scenarios:
+            if scenario.name in scenario_weights:
+                weight = float(scenario_weights[scenario.name])
+                if weight < 0:
+                    raise ValueError(
+                        "Scenario weights must be nonnegative. "
+                        "Invalid weight for scenario %s: %s"
+                        % (scenario.name, weight))
+                weights[scenario.name] = weight
+        if len(weights) > 0:
+            default_weight = sum(itervalues(weights)) / len(weights)
+        else:
+            default_weight = 1.0
+        for scenario in self._scenarios:
+            weights.setdefault(scenario.name, default_weight)
+
+        bundle_names = ["Bundle"+str(i)
+                        for i in xrange(1, num_bundles+1)]
+        bundles = OrderedDict()
+        for bundle_name in bundle_names:
+            bundles[bundle_name] = []
+
+        # heap entries are (load, size, bundle index) so that
+        # ties are broken by placing scenarios in the bundle
+        # with the fewest scenarios (every bundle receives at
+        # least one scenario)
+        heap = [(0.0, 0, i) for i in xrange(num_bundles)]
+        for scenario_name in sorted(weights,
+                                    key=lambda name: (-weights[name],
+                                                      name)):
+            load, size, bundle_index = heapq.heappop(heap)
+            bundles[bundle_names[bundle_index]].append(scenario_name)
+            heapq.heappush(heap, (load + weights[scenario_name],
+                                  size + 1,
+                                  bundle_index))
+
+        self._construct_scenario_bundles(bundles)
+
+        return dict((bundle_name,
+                     sum(weights[scenario_name]
+                         for scenario_name in bundles[bundle_name]))
+                    for bundle_name in bundle_names)
+
     #
     # a utility function to pretty-print the static/non-cost
     # information associated with a scenario tree
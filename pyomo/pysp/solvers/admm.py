@@ -36,6 +36,7 @@ from pyomo.pysp.util.config import (PySPConfigValue,
                                     _domain_must_be_str)
 from pyomo.pysp.util.misc import (parse_command_line,
                                   launch_command)
+from pyomo.pysp.util.timing_trace import get_timing_trace
 from pyomo.pysp.scenariotree.manager import \
     (InvocationType,
      ScenarioTreeManager,
@@ -826,17 +827,24 @@ class ADMMSolver(SPSolver, PySPConfiguredObject):
                 self.get_option("rho_strategy"),
                 self._options)
             rho_strategy.initialize(sp, x, y, z, rho)
+            trace = get_timing_trace()
             for i in xrange(max_iterations):
 
-                objective = \
-                    admm.run_x_update(x, y, z, rho)
-                (unscaled_primal_residual,
-                 unscaled_dual_residual,
-                 x_scale,
-                 z_scale) = \
-                    admm.run_z_update(x, y, z, rho)
-                y_scale = \
-                    admm.run_y_update(x, y, z, rho)
+                with trace.span("x update", category="iteration",
+                                iteration=i):
+                    objective = \
+                        admm.run_x_update(x, y, z, rho)
+                with trace.span("z update", category="iteration",
+                                iteration=i):
+                    (unscaled_primal_residual,
+                     unscaled_dual_residual,
+                     x_scale,
+                     z_scale) = \
+                        admm.run_z_update(x, y, z, rho)
+                with trace.span("y update", category="iteration",
+                                iteration=i):
+                    y_scale = \
+                        admm.run_y_update(x, y, z, rho)
 
                 # we've completed another iteration
                 self.iterations += 1
@@ -916,6 +924,8 @@ def runadmm_register_options(options=None):
                                "profile")
     safe_register_common_option(options,
                                "traceback")
+    safe_register_common_option(options,
+                               "output_timing_trace")
     safe_register_common_option(options,
                                 "output_solver_log")
     safe_register_common_option(options,
@@ -1011,7 +1021,8 @@ Method of Multipliers (ADMM) solver."""
                           error_label="runadmm: ",
                           disable_gc=options.disable_gc,
                           profile_count=options.profile,
-                          traceback=options.traceback)
+                          traceback=options.traceback,
+                          timing_trace=options.output_timing_trace)
 
 SPSolverFactory.register_solver("admm", ADMMSolver)
 
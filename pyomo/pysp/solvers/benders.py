@@ -26,6 +26,7 @@ import os
 import sys
 import logging
 import time
+import math
 import itertools
 
 try:
@@ -51,6 +52,7 @@ from pyomo.pysp.util.config import (PySPConfigValue,
                                     safe_declare_unique_option,
                                     _domain_percent,
                                     _domain_nonnegative,
+                                    _domain_nonnegative_integer,
                                     _domain_positive_integer,
                                     _domain_must_be_str,
                                     _domain_unit_interval,
@@ -58,6 +60,7 @@ from pyomo.pysp.util.config import (PySPConfigValue,
                                     _domain_tuple_of_str_or_dict)
 from pyomo.pysp.util.misc import (parse_command_line,
                                   launch_command)
+from pyomo.pysp.util.timing_trace import get_timing_trace
 from pyomo.pysp.scenariotree.manager import \
     (InvocationType,
      ScenarioTreeManager,
@@ -70,6 +73,7 @@ from pyomo.pysp.solvers.spsolver import (SPSolver,
                                          SPSolverResults,
                                          SPSolverFactory)
 
+from six import iteritems, itervalues
 from six.moves import xrange
 
 thisfile = os.path.abspath(__file__)
@@ -381,6 +385,32 @@ class BendersOptimalityCut(object):
         self.ssc = ssc
         self.duals = duals
 
+class _BendersCutPoolEntry(object):
+    """Stores the information used to manage a cut that has
+    been added to the master problem. The cut is represented
+    as alpha >= constant + sum(coefs[i] * x[i]) (or <= for
+    maximization problems), where alpha is the sum over the
+    cut variables identified by ignore_cut_bundles."""
+    __slots__ = ("constraint", "constant", "coefs", "norm",
+                 "ignore_cut_bundles", "age", "pending")
+    def __init__(self,
+                 constraint,
+                 constant,
+                 coefs,
+                 norm,
+                 ignore_cut_bundles):
+        self.constraint = constraint
+        self.constant = constant
+        self.coefs = coefs
+        self.norm = norm
+        self.ignore_cut_bundles = ignore_cut_bundles
+        # the number of consecutive iterations over which
+        # this cut has been non-binding
+        self.age = 0
+        # the cut has not yet been pushed to a persistent
+        # master solver
+        self.pending = True
+
 class BendersAlgorithm(PySPConfiguredObject):
 
     @classmethod
@@ -577,6 +607,52 @@ class BendersAlgorithm(PySPConfiguredObject):
                 visibility=0),
             ap_group=_benders_group_label)
 
+        safe_declare_unique_option(
+            options,
+            "cut_pool_max_age",
+            PySPConfigValue(
+                0,
+                domain=_domain_nonnegative_integer,
+                description=(
+                    "The number of consecutive iterations a cut can "
+                    "remain non-binding on the master problem before "
+                    "it is removed from the cut pool. Default is 0, "
+                    "which disables removal of cuts."
+                ),
+                doc=None,
+                visibility=0),
+            ap_group=_benders_group_label)
+        safe_declare_unique_option(
+            options,
+            "cut_pool_slack_tolerance",
+            PySPConfigValue(
+                1e-6,
+                domain=_domain_nonnegative,
+                description=(
+                    "The slack above which a cut is considered "
+                    "non-binding when aging the cut pool. Default "
+                    "is 1e-6."
+                ),
+                doc=None,
+                visibility=0),
+            ap_group=_benders_group_label)
+        safe_declare_unique_option(
+            options,
+            "cut_pool_parallel_tolerance",
+            PySPConfigValue(
+                0.0,
+                domain=_domain_nonnegative,
+                description=(
+                    "Cuts whose coefficient vectors have a cosine "
+                    "similarity of at least 1 minus this value are "
+                    "considered parallel, and only the tightest of "
+                    "them is kept in the cut pool. Default is 0, "
+                    "which disables removal of parallel cuts."
+                ),
+                doc=None,
+                visibility=0),
+            ap_group=_benders_group_label)
+
         ScenarioTreeManagerSolverFactory.register_options(
             options,
             options_prefix="subproblem_",
@@ -635,6 +711,7 @@ class BendersAlgorithm(PySPConfiguredObject):
         # each iteration within the solve() method.
         self.master = None
         self.cut_pool = []
+        self._cut_pool_entries = []
         self._num_first_stage_constraints = None
 
         super(BendersAlgorithm, self).__init__(*args, **kwds)
@@ -660,9 +737,8 @@ class BendersAlgorithm(PySPConfiguredObject):
         self._master_solver = SolverFactory(
             self.get_option("master_solver"),
             solver_io=self.get_option("master_solver_io"))
-        if isinstance(self._master_solver, PersistentSolver):
-            raise TypeError("BendersAlgorithm does not yet support "
-                            "PersistentSolver types for the master problem")
+        self._master_solver_persistent = \
+            isinstance(self._master_solver, PersistentSolver)
         if len(self.get_option("master_solver_options")):
             if type(self.get_option("master_solver_options")) is tuple:
                 self._master_solver.set_options(
@@ -984,6 +1060,13 @@ class BendersAlgorithm(PySPConfiguredObject):
 
         self.master = master
         self.cut_pool = []
+        self._cut_pool_entries = []
+
+        if self._master_solver_persistent:
+            self._master_solver.set_instance(
+                master,
+                symbolic_solver_labels=\
+                self.get_option("master_symbolic_solver_labels"))
 
     def add_cut(self, benders_cut, ignore_cut_bundles=False):
         """
@@ -992,6 +1075,14 @@ class BendersAlgorithm(PySPConfiguredObject):
         can be used generate the cut using the single master
         alpha cut variable rather than over the possibly many
         bundle cut groups.
+
+        If the cut_pool_parallel_tolerance option is nonzero,
+        the cut is compared against those already in the cut
+        pool. When a parallel cut exists and one of the two cuts
+        is at least as tight as the other at both of their xhat
+        points, only the tighter cut is kept. Returns False if
+        the cut was not added for this reason, and True
+        otherwise.
         """
 
         if self.master is None:
@@ -1002,8 +1093,6 @@ class BendersAlgorithm(PySPConfiguredObject):
         # for now, until someone figures out feasibility cuts
         assert benders_cut.__class__ is BendersOptimalityCut
 
-        self.cut_pool.append(benders_cut)
-
         scenario_tree = self._manager.scenario_tree
         objective_sense = self._manager.objective_sense
         master = self.master
@@ -1017,6 +1106,42 @@ class BendersAlgorithm(PySPConfiguredObject):
         bundle_alpha = master.find_component(
             "PYSP_BENDERS_BUNDLE_ALPHA_SSC")
 
+        constant = None
+        coefs = None
+        norm = None
+        if self.get_option("cut_pool_parallel_tolerance") > 0:
+            constant, coefs, norm = \
+                self._compute_cut_coefficients(benders_cut,
+                                               ignore_cut_bundles)
+            dominated = []
+            for index, entry in enumerate(self._cut_pool_entries):
+                if (entry.coefs is None) or \
+                   (entry.ignore_cut_bundles != ignore_cut_bundles):
+                    continue
+                if not self._cuts_are_parallel(coefs, norm,
+                                               entry.coefs, entry.norm,
+                                               ignore_cut_bundles):
+                    continue
+                # The cuts are only near-parallel, so compare them
+                # where each of them was generated rather than by
+                # their constants
+                sign = 1.0 if (objective_sense == minimize) else -1.0
+                differences = \
+                    [sign * (self._cut_value(constant, coefs, point) -
+                             self._cut_value(entry.constant,
+                                             entry.coefs,
+                                             point))
+                     for point in (benders_cut.xhat,
+                                   self.cut_pool[index].xhat)]
+                if all(diff <= 0 for diff in differences):
+                    return False
+                if all(diff >= 0 for diff in differences):
+                    dominated.append(index)
+            for index in reversed(dominated):
+                self._remove_cut(index)
+
+        self.cut_pool.append(benders_cut)
+
         xhat = benders_cut.xhat
         cut_expression = 0.0
         if not ignore_cut_bundles:
@@ -1055,11 +1180,126 @@ class BendersAlgorithm(PySPConfiguredObject):
             cut_expression -= master_alpha
 
         if objective_sense == minimize:
-            benders_cuts.append(
-                _GeneralConstraintData((None,cut_expression,0.0)))
+            cut = _GeneralConstraintData((None,cut_expression,0.0))
+        else:
+            cut = _GeneralConstraintData((0.0,cut_expression,None))
+        benders_cuts.append(cut)
+        self._cut_pool_entries.append(
+            _BendersCutPoolEntry(cut,
+                                 constant,
+                                 coefs,
+                                 norm,
+                                 ignore_cut_bundles))
+
+        return True
+
+    def _compute_cut_coefficients(self, benders_cut, ignore_cut_bundles):
+        """
+        Compute the constant and the first-stage variable
+        coefficients of a cut in the form alpha >= constant +
+        sum(coefs[i] * x[i]). Also returns the norm of the
+        complete coefficient vector, which includes a unit
+        coefficient for each cut variable.
+        """
+        scenario_tree = self._manager.scenario_tree
+        master = self.master
+        xhat = benders_cut.xhat
+        if not ignore_cut_bundles:
+            num_alpha = len(getattr(master, "PYSP_BENDERS_CUT_BUNDLES_SSC"))
+        else:
+            num_alpha = 1
+        constant = 0.0
+        coefs = dict((variable_id, 0.0) for variable_id in xhat)
+        for scenario in scenario_tree.scenarios:
+            if scenario.name in master._scenarios_included:
+                continue
+            probability = scenario.probability
+            scenario_duals = benders_cut.duals[scenario.name]
+            constant += probability * benders_cut.ssc[scenario.name]
+            for variable_id in xhat:
+                dual = probability * scenario_duals[variable_id]
+                constant -= dual * xhat[variable_id]
+                coefs[variable_id] += dual
+        norm = math.sqrt(num_alpha + sum(c**2 for c in itervalues(coefs)))
+        return constant, coefs, norm
+
+    def _cut_value(self, constant, coefs, xhat):
+        """
+        Evaluate the right-hand side of a cut in the form
+        alpha >= constant + sum(coefs[i] * x[i]) at xhat.
+        """
+        return constant + sum(coef * xhat[variable_id]
+                              for variable_id, coef in iteritems(coefs))
+
+    def _cuts_are_parallel(self, coefs1, norm1, coefs2, norm2,
+                           ignore_cut_bundles):
+        """
+        Check whether the cosine similarity of the complete
+        coefficient vectors for two cuts is within the
+        cut_pool_parallel_tolerance option of 1.
+        """
+        if not ignore_cut_bundles:
+            dot = len(getattr(self.master, "PYSP_BENDERS_CUT_BUNDLES_SSC"))
         else:
-            benders_cuts.append(
-                _GeneralConstraintData((0.0,cut_expression,None)))
+            dot = 1
+        for variable_id, coef in iteritems(coefs1):
+            dot += coef * coefs2.get(variable_id, 0.0)
+        return dot >= \
+            (1.0 - self.get_option("cut_pool_parallel_tolerance")) * \
+            norm1 * norm2
+
+    def _remove_cut(self, index):
+        """
+        Remove the cut at the given position of the cut pool
+        from the master problem.
+        """
+        entry = self._cut_pool_entries[index]
+        if self._master_solver_persistent and \
+           (not entry.pending):
+            self._master_solver.remove_constraint(entry.constraint)
+        del self._cut_pool_entries[index]
+        del self.cut_pool[index]
+        del self.master.find_component("PYSP_BENDERS_CUTS_SSC")[index]
+
+    def _age_cuts(self):
+        """
+        Update the age of each cut in the cut pool using the
+        current master solution, and remove any cuts that have
+        been non-binding for more than cut_pool_max_age
+        consecutive iterations. Returns the number of cuts that
+        were removed.
+        """
+        max_age = self.get_option("cut_pool_max_age")
+        if max_age == 0:
+            return 0
+        slack_tolerance = self.get_option("cut_pool_slack_tolerance")
+        minimizing = (self._manager.objective_sense == minimize)
+        removed = 0
+        for index in xrange(len(self._cut_pool_entries)-1, -1, -1):
+            entry = self._cut_pool_entries[index]
+            body = value(entry.constraint.body, exception=False)
+            if body is None:
+                continue
+            slack = -body if minimizing else body
+            if slack > slack_tolerance:
+                entry.age += 1
+                if entry.age > max_age:
+                    self._remove_cut(index)
+                    removed += 1
+            else:
+                entry.age = 0
+        return removed
+
+    def _push_cuts_to_master_solver(self):
+        """
+        Add any cuts that have not yet been added to a
+        persistent master solver in a single pass.
+        """
+        if self._master_solver_persistent:
+            for entry in self._cut_pool_entries:
+                if entry.pending:
+                    self._master_solver.add_constraint(entry.constraint)
+                    entry.pending = False
 
     def extract_master_xhat(self):
 
@@ -1085,8 +1325,14 @@ class BendersAlgorithm(PySPConfiguredObject):
         common_kwds = {
             'load_solutions':False,
             'tee':self.get_option("master_output_solver_log"),
-            'keepfiles':self.get_option("master_keep_solver_files"),
-            'symbolic_solver_labels':self.get_option("master_symbolic_solver_labels")}
+            'keepfiles':self.get_option("master_keep_solver_files")}
+        if self._master_solver_persistent:
+            # cuts are sent to the solver in bulk just before
+            # the solve rather than one at a time
+            self._push_cuts_to_master_solver()
+        else:
+            common_kwds['symbolic_solver_labels'] = \
+                self.get_option("master_symbolic_solver_labels")
 
         if (not self.get_option("master_disable_warmstart")) and \
            (self._master_solver.warm_start_capable()):
@@ -1099,6 +1345,18 @@ class BendersAlgorithm(PySPConfiguredObject):
 
         return results
 
+    def _update_master_alpha_vars(self):
+        """
+        Notify a persistent master solver that the cut
+        variables have been fixed or freed.
+        """
+        if self._master_solver_persistent:
+            self._master_solver.update_var(
+                self.master.find_component("PYSP_BENDERS_ALPHA_SSC"))
+            for vardata in self.master.find_component(
+                    "PYSP_BENDERS_BUNDLE_ALPHA_SSC").values():
+                self._master_solver.update_var(vardata)
+
     def solve(self, **kwds):
         """
         Run the algorithm. If one or both of the keywords max_iterations and
@@ -1200,6 +1458,7 @@ class BendersAlgorithm(PySPConfiguredObject):
                 # use the master objective as a lower bound
                 master_alpha.fix(0.0)
                 master_bundles_alpha.fix(0.0)
+                self._update_master_alpha_vars()
 
             start_time_master = time.time()
             results_master = self.solve_master()
@@ -1217,6 +1476,12 @@ class BendersAlgorithm(PySPConfiguredObject):
                        str(results_master.solution(0).status)))
             master.solutions.load_from(results_master)
             stop_time_master = time.time()
+            trace = get_timing_trace()
+            trace.record("master solve",
+                         start_time_master,
+                         stop_time_master - start_time_master,
+                         category="iteration",
+                         iteration=i)
 
             if master_alpha.fixed:
                 assert i == 1
@@ -1225,7 +1490,12 @@ class BendersAlgorithm(PySPConfiguredObject):
                     float('-inf') if (objective_sense is minimize) else float('inf')
                 master_alpha.free()
                 master_bundles_alpha.free()
+                self._update_master_alpha_vars()
             else:
+                num_removed_cuts = self._age_cuts()
+                if num_removed_cuts and self.get_option("verbose"):
+                    print("Removed %s inactive cuts from the cut pool"
+                          % (num_removed_cuts))
                 current_master_bound = value(master_objective)
                 # account for any optimality gap
                 solution0 = results_master.solution(0)
@@ -1246,9 +1516,11 @@ class BendersAlgorithm(PySPConfiguredObject):
             self.master_bound_history[i] = current_master_bound
 
             new_xhat = self.extract_master_xhat()
-            new_cut_info, solve_results = \
-                self.generate_cut(new_xhat,
-                                  return_solve_results=True)
+            with trace.span("generate cut", category="iteration",
+                            iteration=i):
+                new_cut_info, solve_results = \
+                    self.generate_cut(new_xhat,
+                                      return_solve_results=True)
 
             # compute the true objective at xhat by
             # replacing the current value of the master cut
@@ -1369,6 +1641,8 @@ def runbenders_register_options(options=None):
                                "profile")
     safe_register_common_option(options,
                                "traceback")
+    safe_register_common_option(options,
+                               "output_timing_trace")
     safe_register_common_option(options,
                                 "output_solver_log")
     safe_register_common_option(options,
@@ -1454,7 +1728,8 @@ def main(args=None):
                           error_label="runbenders: ",
                           disable_gc=options.disable_gc,
                           profile_count=options.profile,
-                          traceback=options.traceback)
+                          traceback=options.traceback,
+                          timing_trace=options.output_timing_trace)
 
 SPSolverFactory.register_solver("benders", BendersSolver)
 
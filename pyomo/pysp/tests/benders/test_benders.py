@@ -23,6 +23,9 @@ from pyomo.pysp.util.misc import (_get_test_nameserver,
                                   _poll,
                                   _kill)
 from pyomo.environ import *
+from pyomo.pysp.scenariotree.manager import ScenarioTreeManagerFactory
+from pyomo.pysp.solvers.benders import (BendersAlgorithm,
+                                        BendersOptimalityCut)
 
 from six import StringIO
 
@@ -202,6 +205,124 @@ class _RunBendersPyroTesterBase(_RunBendersTesterBase):
         self._run_cmd(cmd)
         self._cleanup()
 
+class TestBendersCutPool(unittest.TestCase):
+
+    def setUp(self):
+        farmer_examples_dir = join(pysp_examples_dir, "farmer")
+        options = ScenarioTreeManagerFactory.register_options()
+        options.scenario_tree_manager = "serial"
+        options.model_location = join(farmer_examples_dir, "models")
+        options.scenario_tree_location = \
+            join(farmer_examples_dir, "scenariodata")
+        self.sp = ScenarioTreeManagerFactory(options)
+        self.sp.initialize()
+        self.benders_options = BendersAlgorithm.register_options()
+        rootnode = self.sp.scenario_tree.findRootNode()
+        self.variable_ids = list(rootnode._standard_variable_ids)
+        self.xhat = dict((variable_id, 1.0)
+                         for variable_id in self.variable_ids)
+
+    def tearDown(self):
+        self.sp.close()
+
+    def _make_cut(self, ssc, dual, xhat=None):
+        if xhat is None:
+            xhat = self.xhat
+        scenario_names = [scenario.name for scenario
+                          in self.sp.scenario_tree.scenarios]
+        return BendersOptimalityCut(
+            xhat,
+            dict((name, ssc) for name in scenario_names),
+            dict((name, dict((variable_id, dual)
+                             for variable_id in self.variable_ids))
+                 for name in scenario_names))
+
+    def test_no_pool_management(self):
+        with BendersAlgorithm(self.sp, self.benders_options) as benders:
+            benders.initialize_subproblems()
+            benders.build_master_problem()
+            self.assertEqual(benders.add_cut(self._make_cut(10.0, 1.0)),
+                             True)
+            self.assertEqual(benders.add_cut(self._make_cut(10.0, 1.0)),
+                             True)
+            self.assertEqual(len(benders.cut_pool), 2)
+            self.assertEqual(benders._age_cuts(), 0)
+            self.assertEqual(len(benders.cut_pool), 2)
+
+    def test_parallel_cuts(self):
+        self.benders_options.cut_pool_parallel_tolerance = 1e-8
+        with BendersAlgorithm(self.sp, self.benders_options) as benders:
+            benders.initialize_subproblems()
+            benders.build_master_problem()
+            cuts = benders.master.find_component("PYSP_BENDERS_CUTS_SSC")
+            cut = self._make_cut(10.0, 1.0)
+            self.assertEqual(benders.add_cut(cut), True)
+            self.assertEqual(len(benders.cut_pool), 1)
+            # a weaker parallel cut is discarded
+            self.assertEqual(benders.add_cut(self._make_cut(5.0, 1.0)),
+                             False)
+            self.assertEqual(len(benders.cut_pool), 1)
+            self.assertIs(benders.cut_pool[0], cut)
+            # a tighter parallel cut replaces the existing cut
+            cut = self._make_cut(20.0, 1.0)
+            self.assertEqual(benders.add_cut(cut), True)
+            self.assertEqual(len(benders.cut_pool), 1)
+            self.assertIs(benders.cut_pool[0], cut)
+            self.assertEqual(len(cuts), 1)
+            # a cut that is not parallel is kept
+            self.assertEqual(benders.add_cut(self._make_cut(20.0, -1.0)),
+                             True)
+            self.assertEqual(len(benders.cut_pool), 2)
+            self.assertEqual(len(cuts), 2)
+
+    def test_near_parallel_cuts(self):
+        self.benders_options.cut_pool_parallel_tolerance = 0.01
+        n = len(self.variable_ids)
+        xhat2 = dict((variable_id, 2.0)
+                     for variable_id in self.variable_ids)
+        with BendersAlgorithm(self.sp, self.benders_options) as benders:
+            benders.initialize_subproblems()
+            benders.build_master_problem()
+            self.assertEqual(benders.add_cut(self._make_cut(10.0, 1.0)),
+                             True)
+            # the second cut is tighter at xhat2 but weaker at
+            # xhat, so neither cut dominates the other
+            self.assertEqual(
+                benders.add_cut(self._make_cut(10.0 + 1.05*n, 1.1, xhat2)),
+                True)
+            self.assertEqual(len(benders.cut_pool), 2)
+            # this cut is tighter than both at both points
+            cut = self._make_cut(10.0 + 1.2*n, 1.1, xhat2)
+            self.assertEqual(benders.add_cut(cut), True)
+            self.assertEqual(len(benders.cut_pool), 1)
+            self.assertIs(benders.cut_pool[0], cut)
+
+    def test_cut_aging(self):
+        self.benders_options.cut_pool_max_age = 1
+        with BendersAlgorithm(self.sp, self.benders_options) as benders:
+            benders.initialize_subproblems()
+            benders.build_master_problem()
+            master = benders.master
+            cuts = master.find_component("PYSP_BENDERS_CUTS_SSC")
+            master_variable = master.find_component(
+                "MASTER_BLEND_VAR_" +
+                str(self.sp.scenario_tree.findRootNode().name))
+            bundle_alpha = master.find_component(
+                "PYSP_BENDERS_BUNDLE_ALPHA_SSC")
+            benders.add_cut(self._make_cut(10.0, 1.0))
+            benders.add_cut(self._make_cut(0.0, -1.0))
+            for variable_id in self.variable_ids:
+                master_variable[variable_id].value = 0.0
+            # the first cut is binding, the second is not
+            bundle_alpha[0].value = 10.0 - len(self.variable_ids)
+            self.assertEqual(benders._age_cuts(), 0)
+            self.assertEqual(len(benders.cut_pool), 2)
+            self.assertEqual(benders._age_cuts(), 1)
+            self.assertEqual(len(benders.cut_pool), 1)
+            self.assertEqual(len(cuts), 1)
+            self.assertEqual(benders.cut_pool[0].ssc,
+                             self._make_cut(10.0, 1.0).ssc)
+
 @unittest.nottest
 def create_test_classes(basename,
                         model_location,
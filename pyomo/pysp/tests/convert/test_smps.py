@@ -198,6 +198,108 @@ class TestConvertSMPSSimple(unittest.TestCase):
                       ignore_errors=True)
         os.remove(outfile)
 
+class TestConvertSMPSIncremental(unittest.TestCase):
+
+    def setUp(self):
+        from pyomo.pysp.scenariotree.manager import \
+            ScenarioTreeManagerFactory
+        farmer_examples_dir = join(pysp_examples_dir, "farmer")
+        options = ScenarioTreeManagerFactory.register_options()
+        options.scenario_tree_manager = "serial"
+        options.model_location = join(farmer_examples_dir, "smps_model")
+        options.scenario_tree_location = \
+            join(farmer_examples_dir, "scenariodata")
+        self.sp = ScenarioTreeManagerFactory(options)
+        self.sp.initialize()
+        class_name, test_name = self.id().split('.')[-2:]
+        self.output_directory = join(thisdir, class_name+"."+test_name)
+
+    def tearDown(self):
+        self.sp.close()
+        shutil.rmtree(self.output_directory, ignore_errors=True)
+
+    def _convert(self):
+        from pyomo.pysp.convert.smps import convert_external
+        convert_external(self.output_directory,
+                         'farmer',
+                         self.sp,
+                         core_format='lp',
+                         incremental=True)
+        files = {}
+        scenario_dir = join(self.output_directory, 'scenario_files')
+        for fname in os.listdir(scenario_dir):
+            with open(join(scenario_dir, fname)) as f:
+                files[fname] = f.read()
+        return files
+
+    def test_changed_coefficient(self):
+        files = self._convert()
+        self.assertEqual(self._convert(), files)
+        for scenario in self.sp.scenario_tree.scenarios:
+            model = scenario._instance
+            crops = list(model.CROPS)
+            model.ConstrainTotalAcreage.set_value(
+                2*model.DevotedAcreage[crops[0]] +
+                sum(model.DevotedAcreage[i] for i in crops[1:]) <=
+                model.TOTAL_ACREAGE)
+        new_files = self._convert()
+        for scenario in self.sp.scenario_tree.scenarios:
+            fname = 'farmer.lp.' + scenario.name
+            self.assertNotEqual(new_files[fname], files[fname])
+            self.assertNotEqual(
+                new_files['farmer.manifest.' + scenario.name],
+                files['farmer.manifest.' + scenario.name])
+
+    def test_changed_annotation(self):
+        from pyomo.pysp.convert.smps import _scenario_fingerprint
+        scenario = self.sp.scenario_tree.scenarios[0]
+        model = scenario._instance
+        fingerprint = _scenario_fingerprint(scenario)
+        self.assertEqual(_scenario_fingerprint(scenario), fingerprint)
+        crop = list(model.CROPS)[0]
+        model.stoch_matrix.declare(model.LimitAmountSold[crop],
+                                   variables=[model.QuantitySubQuotaSold[crop]])
+        self.assertNotEqual(_scenario_fingerprint(scenario), fingerprint)
+
+    def test_changed_stage_assignment(self):
+        files = self._convert()
+        # Move QuantityPurchased to the first stage
+        farmer_examples_dir = join(pysp_examples_dir, "farmer")
+        scenario_tree_location = self.output_directory + ".scenariodata"
+        self.addCleanup(shutil.rmtree, scenario_tree_location,
+                        ignore_errors=True)
+        shutil.copytree(join(farmer_examples_dir, "scenariodata"),
+                        scenario_tree_location)
+        fname = join(scenario_tree_location, "ScenarioStructure.dat")
+        with open(fname) as f:
+            structure = f.read()
+        structure = structure.replace(
+            "QuantitySuperQuotaSold[*]\n"
+            "                                   QuantityPurchased[*];",
+            "QuantitySuperQuotaSold[*];")
+        structure = structure.replace(
+            "DevotedAcreage[*];",
+            "DevotedAcreage[*] QuantityPurchased[*];")
+        with open(fname, "w") as f:
+            f.write(structure)
+        self.sp.close()
+        from pyomo.pysp.scenariotree.manager import \
+            ScenarioTreeManagerFactory
+        options = ScenarioTreeManagerFactory.register_options()
+        options.scenario_tree_manager = "serial"
+        options.model_location = join(farmer_examples_dir, "smps_model")
+        options.scenario_tree_location = scenario_tree_location
+        self.sp = ScenarioTreeManagerFactory(options)
+        self.sp.initialize()
+        new_files = self._convert()
+        for scenario in self.sp.scenario_tree.scenarios:
+            self.assertNotEqual(
+                new_files['farmer.manifest.' + scenario.name],
+                files['farmer.manifest.' + scenario.name])
+            for suffix in ('col', 'tim'):
+                fname = 'farmer.%s.%s' % (suffix, scenario.name)
+                self.assertNotEqual(new_files[fname], files[fname])
+
 class _SMPSTesterBase(object):
 
     baseline_basename = None
@@ -376,6 +478,31 @@ class _SMPSTesterBase(object):
                    self.options['--output-directory'])
         self._cleanup()
 
+    def test_scenarios_LP_incremental(self):
+        self._setup(self.options)
+        self.options['--core-format'] = 'lp'
+        self.options['--incremental'] = None
+        cmd = self._get_cmd()
+        self._run_cmd(cmd)
+        scenario_dir = join(self.options['--output-directory'],
+                            'scenario_files')
+        mtimes = dict((fname, os.path.getmtime(join(scenario_dir, fname)))
+                      for fname in os.listdir(scenario_dir))
+        self.assertTrue(any(fname.startswith(self.baseline_basename+
+                                             ".manifest.")
+                            for fname in mtimes))
+        # nothing changed, so no scenario files should be rewritten
+        self._run_cmd(cmd)
+        for fname in os.listdir(scenario_dir):
+            self.assertEqual(os.path.getmtime(join(scenario_dir, fname)),
+                             mtimes[fname])
+        for fname in mtimes:
+            if fname.startswith(self.baseline_basename+".manifest."):
+                os.remove(join(scenario_dir, fname))
+        self._diff(os.path.join(baselinedir, self.baseline_basename+'_LP_baseline'),
+                   self.options['--output-directory'])
+        self._cleanup()
+
 _pyomo_ns_host = '127.0.0.1'
 _pyomo_ns_port = None
 _pyomo_ns_process = None
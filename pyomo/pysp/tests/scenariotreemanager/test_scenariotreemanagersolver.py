@@ -742,6 +742,33 @@ class TestScenarioTreeManagerSolverSerial(
         sp.initialize()
         return sp
 
+    def test_rebalance_bundles(self):
+        problem = _SP_Bundles_Feasible
+        with self._init(problem.get_factory()) as sp:
+            with ScenarioTreeManagerSolverFactory(sp, _default_test_options) as manager:
+                results = manager.solve_bundles()
+                weights = results.get_scenario_weights(sp.scenario_tree)
+                self.assertEqual(sorted(weights), ["s0","s1","s2"])
+                weights = {'s0': 3.0, 's1': 2.0, 's2': 1.0}
+                loads = manager.rebalance_bundles(scenario_weights=weights,
+                                                  num_bundles=2)
+                self.assertEqual(loads, {'Bundle1': 3.0, 'Bundle2': 3.0})
+                self.assertEqual(
+                    sp.scenario_tree.get_bundle('Bundle1').scenario_names,
+                    ['s0'])
+                self.assertEqual(
+                    sorted(sp.scenario_tree.get_bundle('Bundle2').\
+                           scenario_names),
+                    ['s1', 's2'])
+                results = manager.solve_bundles()
+                self.assertEqual(sorted(results.objective),
+                                 ['Bundle1', 'Bundle2'])
+                for scenario in sp.scenario_tree.scenarios:
+                    self.assertAlmostEqual(scenario._x['r']['x'], 1.0)
+                    self.assertAlmostEqual(
+                        scenario._x[scenario.name]['Y:#1'],
+                        float(scenario.name[1:]))
+
 @unittest.skipIf(not has_networkx, "Networkx is not available")
 @unittest.skipIf(not has_dill, "Dill is not available")
 @unittest.skipIf(not (using_pyro3 or using_pyro4), "Pyro or Pyro4 is not available")
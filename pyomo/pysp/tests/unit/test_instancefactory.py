@@ -432,8 +432,12 @@ class Test(unittest.TestCase):
             self.assertTrue(factory.model_directory() is None)
             self.assertTrue(factory.scenario_tree_directory() is None)
             self._check_factory(factory)
+            # the data for the root node is loaded once
+            self.assertEqual(list(factory._node_data.keys()),
+                             [(join(testdatadir, "root.dat"),)])
         self.assertEqual(factory._closed, True)
         self.assertEqual(len(factory._archives), 0)
+        self.assertEqual(factory._node_data, {})
 
     # model: model callback
     # scenario_tree: Pyomo scenario tree model
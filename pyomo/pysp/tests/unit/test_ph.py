@@ -14,6 +14,7 @@
 
 import os
 import sys
+import json
 import subprocess
 import time
 from os.path import abspath, dirname
@@ -2589,5 +2590,119 @@ class TestPHParallel(unittest.TestCase):
             self.fail("Differences identified relative to all baseline output file alternatives")
         _remove(this_test_file_directory+"networkflow1ef10_linearized_cplex_with_bundles_with_phpyro.out")
 
+#
+# A stand-in for a sub-problem solver that reports a fixed solve time
+# for each scenario in the sub-problem, so that bundle rebalancing
+# can be tested without a solver installed. Variables are assigned
+# a scenario-specific value, so that PH does not converge.
+#
+
+_scenario_solve_times = {'BelowAverageScenario': 5.0,
+                         'AverageScenario': 1.0,
+                         'AboveAverageScenario': 1.0}
+
+class _RecordedTimeSolver(object):
+
+    def __init__(self, **kwds):
+        self.options = pyutilib.misc.Options()
+        self._report_timing = False
+
+    def warm_start_capable(self):
+        return False
+
+    def solve(self, instance, **kwds):
+        from pyomo.core import Var
+        from pyomo.core.base.label import NumericLabeler
+        from pyomo.core.base.symbol_map import SymbolMap
+        from pyomo.opt import (SolverResults,
+                               SolverStatus,
+                               TerminationCondition,
+                               SolutionStatus,
+                               Solution)
+        symbol_map = SymbolMap()
+        labeler = NumericLabeler('x')
+        solution = Solution()
+        solution.status = SolutionStatus.optimal
+        solve_time = 0.0
+        for scenario_name in sorted(_scenario_solve_times):
+            scenario_instance = instance.component(scenario_name)
+            if scenario_instance is None:
+                continue
+            solve_time += _scenario_solve_times[scenario_name]
+            for vardata in scenario_instance.component_data_objects(Var):
+                if not vardata.fixed:
+                    solution.variable[symbol_map.getSymbol(vardata, labeler)] = \
+                        {'Value': _scenario_solve_times[scenario_name]}
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        results.solver.time = solve_time
+        results.solution.insert(solution)
+        results._smap = symbol_map
+        return results
+
+class TestPHRebalanceBundles(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import pyomo.environ
+
+    def setUp(self):
+        pyomo.opt.SolverFactory.register('_recorded_time')(_RecordedTimeSolver)
+        self.weights_file = this_test_file_directory+"ph_rebalance_bundles_weights.json"
+
+    def tearDown(self):
+        pyomo.opt.SolverFactory.unregister('_recorded_time')
+        _remove(self.weights_file)
+
+    def _get_options(self, *args):
+        parser = pyomo.pysp.phinit.construct_ph_options_parser("")
+        options = parser.parse_args(
+            ["--model-directory="+pysp_examples_dir+"farmer"+os.sep+"models",
+             "--instance-directory="+pysp_examples_dir+"farmer"+os.sep+"scenariodata",
+             "--solver=_recorded_time",
+             "--default-rho=1",
+             "--scenario-tree-seed=0"] + list(args))
+        options._ef_options = parser._ef_options
+        options._ef_options.import_argparse(options)
+        return options
+
+    def test_rebalance_bundles(self):
+        options = self._get_options("--max-iterations=2",
+                                    "--create-random-bundles=2",
+                                    "--rebalance-bundles",
+                                    "--output-scenario-weights="+self.weights_file)
+        with pyomo.pysp.phinit.PHFromScratchManagedContext(options) as ph:
+            ph.solve()
+            # the bundles were rebalanced after iteration 1 using
+            # the recorded solve times, so the slow scenario is
+            # solved on its own
+            self.assertEqual(
+                sorted(sorted(bundle._scenario_names)
+                       for bundle in ph._scenario_tree._scenario_bundles),
+                [['AboveAverageScenario', 'AverageScenario'],
+                 ['BelowAverageScenario']])
+            self.assertEqual(
+                sorted(ph._solver_map),
+                sorted(bundle._name
+                       for bundle in ph._scenario_tree._scenario_bundles))
+            self.assertEqual(
+                sorted(ph._bundle_binding_instance_map),
+                sorted(ph._solver_map))
+            for bundle in ph._scenario_tree._scenario_bundles:
+                self.assertEqual(
+                    sorted(ph._bundle_scenario_instance_map[bundle._name]),
+                    sorted(bundle._scenario_names))
+
+        with open(self.weights_file) as f:
+            self.assertEqual(json.load(f), _scenario_solve_times)
+
+    def test_rebalance_bundles_requires_bundles(self):
+        options = self._get_options("--max-iterations=2",
+                                    "--rebalance-bundles")
+        with self.assertRaisesRegexp(ValueError, "no scenario bundles"):
+            with pyomo.pysp.phinit.PHFromScratchManagedContext(options) as ph:
+                pass
+
 if __name__ == "__main__":
     unittest.main()
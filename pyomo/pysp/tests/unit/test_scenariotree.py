@@ -7,12 +7,21 @@
 #  rights in this software.
 #  This software is distributed under the 3-clause BSD License.
 #  ___________________________________________________________________________
+import os
+import json
+import tempfile
+
 import pyutilib.th as unittest
 
 from pyomo.pysp.scenariotree.tree_structure_model import \
     (ScenarioTreeModelFromNetworkX,
      CreateConcreteTwoStageScenarioTreeModel)
-from pyomo.pysp.scenariotree.tree_structure import ScenarioTree
+from pyomo.pysp.scenariotree import tree_structure
+from pyomo.pysp.scenariotree.tree_structure import \
+    (ScenarioTree,
+     shared_memory_available,
+     save_scenario_weights,
+     load_scenario_weights)
 from pyomo.core import (ConcreteModel,
                         Set,
                         Var,
@@ -357,6 +366,170 @@ class TestScenarioTree(unittest.TestCase):
                 self.assertEqual(
                     (name,index) in root._name_index_to_id, True)
 
+    def _get_solution_exchange_tree(self):
+        st_model = CreateConcreteTwoStageScenarioTreeModel(1)
+        st_model.StageVariables['Stage1'].add("x[*]")
+        st_model.StageDerivedVariables['Stage1'].add("y[*]")
+        st_model.StageVariables['Stage2'].add("z[*]")
+        st_model.StageCost['Stage1'] = "FirstStageCost"
+        st_model.StageCost['Stage2'] = "SecondStageCost"
+
+        scenario_tree = ScenarioTree(scenariotreeinstance=st_model)
+
+        model = ConcreteModel()
+        model.s = Set(initialize=[1,2,3])
+        model.x = Var(model.s, initialize=lambda m,i: i)
+        model.y = Var(model.s)
+        model.z = Var(model.s, initialize=lambda m,i: -0.5*i)
+        model.FirstStageCost = Expression(expr=1.0)
+        model.SecondStageCost = Expression(expr=2.0)
+        model.obj = Objective(expr=0.0)
+        model.x[2].fix()
+        model.z[3].stale = True
+        model.y[1].value = 1.5
+
+        scenario_tree.linkInInstances({'Scenario1': model})
+        return scenario_tree, model
+
+    def test_variable_order(self):
+        scenario_tree, model = self._get_solution_exchange_tree()
+        root = scenario_tree.findRootNode()
+        self.assertEqual(len(root.variable_order), 6)
+        self.assertEqual(set(root.variable_order),
+                         set(root._variable_ids))
+        self.assertEqual(list(root.variable_order),
+                         sorted(root._variable_ids))
+        # the cached ordering is updated when new ids are added
+        root._variable_ids['zzz'] = ('w', None)
+        self.assertEqual(len(root.variable_order), 7)
+        self.assertEqual(root.variable_order[-1], 'zzz')
+
+    def test_solution_arrays(self):
+        scenario_tree, model = self._get_solution_exchange_tree()
+        scenario = scenario_tree.get_scenario('Scenario1')
+        scenario.update_solution_from_instance()
+        solution = scenario.copy_solution()
+        self.assertEqual(
+            sum(len(x) for x in solution['x'].values()), 9)
+
+        packed = scenario.copy_solution_arrays()
+        self.assertEqual(len(packed['x']), 9)
+        self.assertEqual(len(packed['flags']), 9)
+        self.assertEqual(packed['shared memory'], None)
+        self.assertEqual(packed['nodes'],
+                         tuple(n.name for n in scenario.node_list))
+        # the payload survives serializers that only handle
+        # builtin types
+        self.assertIs(type(packed['x']), tuple)
+        self.assertIs(type(packed['flags']), tuple)
+        packed = json.loads(json.dumps(packed))
+
+        scenario.set_solution(packed)
+        self.assertEqual(scenario.copy_solution(), solution)
+        root = scenario_tree.findRootNode()
+        x2_id = root._name_index_to_id['x',2]
+        self.assertEqual(scenario._fixed[root.name], set([x2_id]))
+        y2_id = root._name_index_to_id['y',2]
+        self.assertIs(scenario._x[root.name][y2_id], None)
+
+    def test_solution_arrays_partial(self):
+        scenario_tree, model = self._get_solution_exchange_tree()
+        scenario = scenario_tree.get_scenario('Scenario1')
+        scenario.update_solution_from_instance(stages=['Stage1'])
+        solution = scenario.copy_solution()
+        packed = scenario.copy_solution_arrays()
+        self.assertEqual(len(packed['nodes']), 1)
+        self.assertEqual(len(packed['x']), 6)
+        scenario.update_solution_from_instance()
+        scenario.set_solution(packed)
+        self.assertEqual(scenario.copy_solution(), solution)
+
+    @unittest.skipIf(not shared_memory_available,
+                     "Requires multiprocessing.shared_memory")
+    def test_solution_arrays_shared_memory(self):
+        scenario_tree, model = self._get_solution_exchange_tree()
+        scenario = scenario_tree.get_scenario('Scenario1')
+        scenario.update_solution_from_instance()
+        solution = scenario.copy_solution()
+        packed = scenario.copy_solution_arrays(use_shared_memory=True)
+        self.assertEqual(packed['x'], None)
+        self.assertEqual(packed['flags'], None)
+        self.assertEqual(packed['shared memory'][1], 9)
+        scenario.set_solution(packed)
+        self.assertEqual(scenario.copy_solution(), solution)
+        self.assertNotIn(packed['shared memory'][0],
+                         tree_structure._shared_memory_blocks)
+
+    @unittest.skipIf(not shared_memory_available,
+                     "Requires multiprocessing.shared_memory")
+    def test_solution_arrays_shared_memory_unread(self):
+        # a block that is never read is unlinked by its creator
+        scenario_tree, model = self._get_solution_exchange_tree()
+        scenario = scenario_tree.get_scenario('Scenario1')
+        scenario.update_solution_from_instance()
+        packed = scenario.copy_solution_arrays(use_shared_memory=True)
+        name = packed['shared memory'][0]
+        self.assertIn(name, tree_structure._shared_memory_blocks)
+        tree_structure._release_shared_memory_blocks(
+            tree_structure._shared_memory_timeout)
+        self.assertIn(name, tree_structure._shared_memory_blocks)
+        tree_structure._release_shared_memory_blocks()
+        self.assertNotIn(name, tree_structure._shared_memory_blocks)
+        with self.assertRaises(OSError):
+            tree_structure.shared_memory.SharedMemory(name=name)
+
+    def _get_bundling_tree(self):
+        st_model = CreateConcreteTwoStageScenarioTreeModel(5)
+        st_model.StageVariables['Stage1'].add("x")
+        st_model.StageVariables['Stage2'].add("y")
+        st_model.StageCost['Stage1'] = "FirstStageCost"
+        st_model.StageCost['Stage2'] = "SecondStageCost"
+        return ScenarioTree(scenariotreeinstance=st_model)
+
+    def test_create_balanced_bundles(self):
+        scenario_tree = self._get_bundling_tree()
+        names = [s.name for s in scenario_tree.scenarios]
+        weights = dict(zip(names, [7.0, 5.0, 4.0, 3.0, 1.0]))
+        loads = scenario_tree.create_balanced_bundles(
+            2, scenario_weights=weights)
+        self.assertEqual(loads, {'Bundle1': 10.0, 'Bundle2': 10.0})
+        self.assertEqual(len(scenario_tree.bundles), 2)
+        self.assertEqual(
+            sorted(scenario_tree.get_bundle('Bundle1').scenario_names +
+                   scenario_tree.get_bundle('Bundle2').scenario_names),
+            sorted(names))
+        for bundle in scenario_tree.bundles:
+            self.assertAlmostEqual(
+                bundle.probability,
+                sum(scenario_tree.get_scenario(name).probability
+                    for name in bundle.scenario_names))
+
+    def test_create_balanced_bundles_default_weights(self):
+        scenario_tree = self._get_bundling_tree()
+        # missing weights are assigned the average weight
+        loads = scenario_tree.create_balanced_bundles(
+            3, scenario_weights={'Scenario1': 2.0})
+        self.assertEqual(sorted(loads.values()), [2.0, 4.0, 4.0])
+        self.assertEqual(
+            sorted(len(b.scenario_names) for b in scenario_tree.bundles),
+            [1, 2, 2])
+        with self.assertRaises(ValueError):
+            scenario_tree.create_balanced_bundles(6)
+        with self.assertRaises(ValueError):
+            scenario_tree.create_balanced_bundles(0)
+
+    def test_scenario_weights_file(self):
+        weights = {'Scenario1': 1.5, 'Scenario2': 2}
+        with tempfile.NamedTemporaryFile(suffix=".json",
+                                         delete=False) as f:
+            filename = f.name
+        try:
+            save_scenario_weights(filename, weights)
+            self.assertEqual(load_scenario_weights(filename),
+                             {'Scenario1': 1.5, 'Scenario2': 2.0})
+        finally:
+            os.remove(filename)
+
 @unittest.skipIf(not has_networkx, "Requires networkx module")
 class TestScenarioTreeFromNetworkX(unittest.TestCase):
 
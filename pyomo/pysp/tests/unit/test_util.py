@@ -7,7 +7,11 @@
 #  This software is distributed under the BSD License.
 #  _________________________________________________________________________
 
+import os
+import csv
+import json
 import uuid
+import tempfile
 
 import pyutilib.th as unittest
 
@@ -32,6 +36,12 @@ from pyomo.pysp.scenariotree.util import \
      scenario_tree_id_to_nzint64,
      scenario_tree_id_to_puint64,
      scenario_tree_id_to_nzuint64)
+from pyomo.pysp.util.timing_trace import \
+    (TimingTrace,
+     get_timing_trace,
+     enable_timing_trace,
+     disable_timing_trace)
+from pyomo.pysp.util.misc import launch_command
 
 @unittest.category('smoke','nightly','expensive')
 class TestScenarioTreeIDToInteger(unittest.TestCase):
@@ -166,5 +176,135 @@ class TestScenarioTreeIDToInteger(unittest.TestCase):
         v = scenario_tree_id_to_nzuint64(self._name, str(uuid.uuid4()))
         self.assertTrue(0 <= v <= 2**64 -1)
 
+class _DummySolver(object):
+    _last_solve_times = (1.0, 2.0, 4.0, 7.0)
+
+@unittest.category('smoke','nightly','expensive')
+class TestTimingTrace(unittest.TestCase):
+
+    def _tempfile(self, suffix):
+        fd, fname = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        self.addCleanup(os.remove, fname)
+        return fname
+
+    def test_disabled(self):
+        trace = get_timing_trace()
+        self.assertEqual(trace.enabled, False)
+        with trace.span("a", lane="s1", iteration=0):
+            pass
+        trace.record("b", 0.0, 1.0)
+        trace.record_solver(_DummySolver())
+        self.assertIs(disable_timing_trace(), None)
+
+    def test_enable_disable(self):
+        trace = enable_timing_trace()
+        try:
+            self.assertEqual(trace.enabled, True)
+            self.assertIs(get_timing_trace(), trace)
+            self.assertIs(enable_timing_trace(), trace)
+            get_timing_trace().record("a", 0.0, 1.0)
+        finally:
+            self.assertIs(disable_timing_trace(), trace)
+        self.assertEqual(get_timing_trace().enabled, False)
+        self.assertEqual(len(trace.events), 1)
+
+    def test_record(self):
+        trace = TimingTrace()
+        with trace.span("a", category="iteration", iteration=1):
+            pass
+        trace.record("b", 1.0, 2.0, lane="s1", solve_time=0.5)
+        trace.record_solver(_DummySolver(), lane="s2", iteration=3)
+        trace.record_solver(object(), lane="s3")
+        self.assertEqual(len(trace.events), 5)
+        name, category, start, duration, lane, args = trace.events[0]
+        self.assertEqual(name, "a")
+        self.assertEqual(category, "iteration")
+        self.assertEqual(lane, "main")
+        self.assertTrue(duration >= 0)
+        self.assertEqual(args, {"iteration": 1})
+        self.assertEqual(trace.events[1],
+                         ("b", "pysp", 1.0, 2.0, "s1", {"solve_time": 0.5}))
+        self.assertEqual(
+            [event[:5] for event in trace.events[2:]],
+            [("write", "write", 1.0, 1.0, "s2"),
+             ("solver", "solver", 2.0, 2.0, "s2"),
+             ("load", "load", 4.0, 3.0, "s2")])
+        trace.clear()
+        self.assertEqual(len(trace.events), 0)
+
+    def test_write_chrome_trace(self):
+        trace = TimingTrace()
+        trace.record("a", trace._start_time + 1.0, 0.5, lane="s1",
+                     iteration=2, status=object)
+        trace.record("b", trace._start_time, 0.25)
+        fname = self._tempfile(".json")
+        trace.write(fname)
+        with open(fname) as f:
+            data = json.load(f)
+        events = data["traceEvents"]
+        complete = [e for e in events if e["ph"] == "X"]
+        self.assertEqual(len(complete), 2)
+        self.assertEqual(complete[0]["name"], "a")
+        self.assertAlmostEqual(complete[0]["ts"], 1.0e6)
+        self.assertAlmostEqual(complete[0]["dur"], 0.5e6)
+        self.assertEqual(complete[0]["args"]["iteration"], 2)
+        self.assertEqual(complete[0]["args"]["status"], str(object))
+        self.assertEqual(complete[1]["tid"], 0)
+        self.assertNotEqual(complete[0]["tid"], complete[1]["tid"])
+        lane_names = dict((e["tid"], e["args"]["name"])
+                          for e in events
+                          if e["name"] == "thread_name")
+        self.assertEqual(lane_names,
+                         {0: "main", complete[0]["tid"]: "s1"})
+
+    def test_write_csv(self):
+        trace = TimingTrace()
+        trace.record("a", trace._start_time + 1.0, 0.5, lane="s1",
+                     iteration=2)
+        trace.record("b", trace._start_time, 0.25, solve_time=0.1)
+        fname = self._tempfile(".csv")
+        trace.write(fname)
+        with open(fname) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["name", "category", "lane", "start",
+                                   "duration", "iteration", "solve_time"])
+        self.assertEqual(rows[1], ["a", "pysp", "s1", "1.000000",
+                                   "0.500000", "2", ""])
+        self.assertEqual(rows[2], ["b", "pysp", "main", "0.000000",
+                                   "0.250000", "", "0.1"])
+
+    def test_launch_command(self):
+        outer_fname = self._tempfile(".csv")
+        inner_fname = self._tempfile(".csv")
+        def inner(options):
+            get_timing_trace().record("inner", 0.0, 1.0)
+            return 0
+        def outer(options):
+            get_timing_trace().record("outer", 0.0, 1.0)
+            # a nested command leaves the enclosing trace enabled
+            launch_command(inner, options, timing_trace=inner_fname)
+            self.assertEqual(get_timing_trace().enabled, True)
+            get_timing_trace().record("after", 0.0, 1.0)
+            return 0
+        def disables(options):
+            get_timing_trace().record("disabled", 0.0, 1.0)
+            disable_timing_trace()
+            return 0
+        launch_command(outer, None, timing_trace=outer_fname)
+        self.assertEqual(get_timing_trace().enabled, False)
+        with open(outer_fname) as f:
+            self.assertEqual([row[0] for row in csv.reader(f)],
+                             ["name", "outer", "inner", "after"])
+        with open(inner_fname) as f:
+            self.assertEqual([row[0] for row in csv.reader(f)],
+                             ["name", "outer", "inner"])
+        # the trace is written even if the command disabled it
+        launch_command(disables, None, timing_trace=outer_fname)
+        self.assertEqual(get_timing_trace().enabled, False)
+        with open(outer_fname) as f:
+            self.assertEqual([row[0] for row in csv.reader(f)],
+                             ["name", "disabled"])
+
 if __name__ == "__main__":
     unittest.main()
@@ -767,6 +767,45 @@ safe_declare_unique_option(
         visibility=0),
     ap_group=_scenario_tree_options_group_title)
 
+safe_declare_unique_option(
+    common_block,
+    "create_balanced_bundles",
+    PySPConfigValue(
+        0,
+        domain=_domain_nonnegative_integer,
+        description=(
+            "Specification to create the indicated number of "
+            "scenario bundles whose total weights are balanced "
+            "(to the degree possible) using a bin-packing "
+            "heuristic. Scenario weights are read from the file "
+            "given by the scenario_bundle_weights option. "
+            "Default is 0, indicating no scenario bundles will "
+            "be created."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_scenario_tree_options_group_title)
+
+safe_declare_unique_option(
+    common_block,
+    "scenario_bundle_weights",
+    PySPConfigValue(
+        None,
+        domain=None,
+        description=(
+            "The name of a JSON file mapping scenario names to "
+            "weights (typically subproblem solve times recorded "
+            "during a previous run) used when creating balanced "
+            "bundles. Scenarios missing from the file are "
+            "assigned the average weight. If not specified, all "
+            "scenarios are given equal weight. If scripting, this "
+            "option can alternatively be assigned a dictionary "
+            "mapping scenario names to weights."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_scenario_tree_options_group_title)
+
 safe_declare_unique_option(
     common_block,
     "scenario_tree_manager",
@@ -893,6 +932,38 @@ safe_declare_unique_option(
         visibility=0),
     ap_group=_pyro_options_group_title)
 
+def _domain_solution_exchange(val):
+    val = str(val)
+    if val not in ('dict', 'array', 'shared_memory'):
+        raise ValueError(
+            "Expected one of 'dict', 'array', or 'shared_memory'. "
+            "Invalid value: %s" % (val))
+    return val
+
+safe_declare_unique_option(
+    common_block,
+    "pyro_solution_exchange",
+    PySPConfigValue(
+        "dict",
+        domain=_domain_solution_exchange,
+        description=(
+            "The format used by scenario tree workers to return "
+            "subproblem solutions to the client. Choices are "
+            "'dict', 'array', and 'shared_memory'. The default, "
+            "'dict', transmits nested dictionaries mapping "
+            "scenario tree ids to values. The 'array' format "
+            "packs all values for a scenario into a flat array "
+            "using a fixed variable ordering defined by the "
+            "scenario tree. The 'shared_memory' format writes "
+            "these arrays into shared memory blocks and only "
+            "transmits the block names, which requires all "
+            "scenario tree servers to run on the same host as "
+            "the client and Python 3.8 or later."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_pyro_options_group_title)
+
 safe_declare_unique_option(
     common_block,
     "pyro_shutdown_workers",
@@ -1968,6 +2039,25 @@ safe_declare_unique_option(
         visibility=0),
     ap_group=_other_options_group_title)
 
+safe_declare_unique_option(
+    common_block,
+    "output_timing_trace",
+    PySPConfigValue(
+        None,
+        domain=_domain_must_be_str,
+        description=(
+            "Record the time spent in each algorithm iteration and "
+            "subproblem (preprocessing, writing, solving, loading "
+            "results, and communication) and write it to the given "
+            "file. A CSV file is written if the filename ends with "
+            "'.csv'; otherwise the file uses the Chrome tracing "
+            "JSON format (viewable at chrome://tracing or "
+            "https://ui.perfetto.dev). Disabled by default."
+        ),
+        doc=None,
+        visibility=0),
+    ap_group=_other_options_group_title)
+
 safe_declare_unique_option(
     common_block,
     "traceback",
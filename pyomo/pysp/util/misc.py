@@ -41,6 +41,9 @@ from pyomo.common.plugin import (ExtensionPoint,
                                SingletonPlugin)
 from pyomo.pysp.util.config import PySPConfigBlock
 from pyomo.pysp.util.configured_object import PySPConfiguredObject
+from pyomo.pysp.util.timing_trace import (get_timing_trace,
+                                          enable_timing_trace,
+                                          disable_timing_trace)
 
 import six
 
@@ -281,7 +284,8 @@ def launch_command(command,
                    disable_gc=False,
                    profile_count=0,
                    log_level=logging.INFO,
-                   traceback=False):
+                   traceback=False,
+                   timing_trace=None):
     # This is not the effective level, but the
     # level on the current logger. We want to
     # return the logger to its original state
@@ -294,6 +298,28 @@ def launch_command(command,
     if cmd_kwds is None:
         cmd_kwds = {}
 
+    #
+    # Record a timing trace of the command and write it to
+    # the requested file (even if the command fails)
+    #
+    if timing_trace is not None:
+        _command = command
+        def command(*args, **kwds):
+            # Only disable a trace enabled here, so that an
+            # enclosing launch_command keeps recording. The trace
+            # is written even if the command disabled it.
+            was_enabled = get_timing_trace().enabled
+            trace = enable_timing_trace()
+            try:
+                return _command(*args, **kwds)
+            finally:
+                if (not was_enabled) and \
+                   (get_timing_trace() is trace):
+                    disable_timing_trace()
+                trace.write(timing_trace)
+                print("Timing trace written to file: %s"
+                      % (timing_trace))
+
     #
     # Control the garbage collector - more critical than I would like
     # at the moment.
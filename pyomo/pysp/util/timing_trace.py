@@ -0,0 +1,245 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+__all__ = ("TimingTrace",
+           "get_timing_trace",
+           "enable_timing_trace",
+           "disable_timing_trace")
+
+import os
+import csv
+import json
+import time
+
+import six
+
+#
+# A lightweight recorder for timed events in PySP algorithms
+# (iterations, subproblem preprocessing, solver calls, result
+# loading, communication). The recorded events can be written
+# in the Chrome tracing format (load the file in
+# chrome://tracing or https://ui.perfetto.dev) or as CSV.
+#
+# Tracing is disabled by default, in which case
+# get_timing_trace() returns a shared object whose methods do
+# nothing, so instrumented code only pays for an attribute
+# lookup and a function call.
+#
+
+class _NullSpan(object):
+    __slots__ = ()
+    def __enter__(self):
+        return self
+    def __exit__(self, *args):
+        return False
+
+_null_span = _NullSpan()
+
+class _NullTimingTrace(object):
+    """The timing trace used when tracing is disabled."""
+
+    enabled = False
+
+    def span(self, name, category="pysp", lane=None, **args):
+        return _null_span
+
+    def record(self, name, start, duration,
+               category="pysp", lane=None, **args):
+        pass
+
+    def record_solver(self, solver, lane=None, **args):
+        pass
+
+_null_trace = _NullTimingTrace()
+
+class _Span(object):
+    __slots__ = ("_trace", "_name", "_category", "_lane", "_args", "_start")
+
+    def __init__(self, trace, name, category, lane, args):
+        self._trace = trace
+        self._name = name
+        self._category = category
+        self._lane = lane
+        self._args = args
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, *args):
+        self._trace.record(self._name,
+                           self._start,
+                           time.time() - self._start,
+                           category=self._category,
+                           lane=self._lane,
+                           **self._args)
+        return False
+
+class TimingTrace(object):
+    """Records timed events and exports them as a Chrome
+    tracing JSON file or a CSV file.
+
+    Each event has a name, a category (e.g., 'iteration',
+    'solve', 'load'), a start time, a duration, a lane and a
+    dictionary of extra arguments. Lanes become separate rows
+    in the trace viewer and are typically the names of
+    scenarios or bundles. Events without a lane are placed on
+    the 'main' lane.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._start_time = time.time()
+        self._events = []
+
+    @property
+    def events(self):
+        """The list of recorded events as tuples of the form
+        (name, category, start, duration, lane, args)."""
+        return self._events
+
+    def span(self, name, category="pysp", lane=None, **args):
+        """Return a context manager that records an event
+        spanning the body of a with block."""
+        return _Span(self, name, category, lane, args)
+
+    def record(self, name, start, duration,
+               category="pysp", lane=None, **args):
+        """Record an event that has already completed. The
+        start time should be obtained from time.time()."""
+        if lane is None:
+            lane = "main"
+        self._events.append((name,
+                             category,
+                             start,
+                             duration,
+                             str(lane),
+                             args))
+
+    def record_solver(self, solver, lane=None, **args):
+        """Record the write, solver and load phases of the
+        most recent call to solve on a solver plugin. Nothing
+        is recorded if the solver does not report these
+        times (e.g., persistent solvers)."""
+        times = getattr(solver, "_last_solve_times", None)
+        if times is None:
+            return
+        start, presolve_end, solve_end, postsolve_end = times
+        self.record("write", start, presolve_end - start,
+                    category="write", lane=lane, **args)
+        self.record("solver", presolve_end, solve_end - presolve_end,
+                    category="solver", lane=lane, **args)
+        self.record("load", solve_end, postsolve_end - solve_end,
+                    category="load", lane=lane, **args)
+
+    def clear(self):
+        """Remove all recorded events."""
+        self._events = []
+
+    def write(self, filename):
+        """Write the trace to a file. A CSV file is written
+        if the filename ends with .csv; otherwise a Chrome
+        tracing JSON file is written."""
+        if filename.endswith(".csv"):
+            self.write_csv(filename)
+        else:
+            self.write_chrome_trace(filename)
+
+    def write_chrome_trace(self, filename):
+        """Write the trace as a JSON file in the Chrome
+        tracing (trace event) format."""
+        pid = os.getpid()
+        lanes = {"main": 0}
+        trace_events = []
+        for name, category, start, duration, lane, args in self._events:
+            if lane not in lanes:
+                lanes[lane] = len(lanes)
+            trace_events.append(
+                {"name": name,
+                 "cat": category,
+                 "ph": "X",
+                 "ts": (start - self._start_time) * 1.0e6,
+                 "dur": duration * 1.0e6,
+                 "pid": pid,
+                 "tid": lanes[lane],
+                 "args": dict((str(key), _json_value(val))
+                              for key, val in six.iteritems(args))})
+        for lane, tid in six.iteritems(lanes):
+            trace_events.append(
+                {"name": "thread_name",
+                 "ph": "M",
+                 "pid": pid,
+                 "tid": tid,
+                 "args": {"name": lane}})
+            trace_events.append(
+                {"name": "thread_sort_index",
+                 "ph": "M",
+                 "pid": pid,
+                 "tid": tid,
+                 "args": {"sort_index": tid}})
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": trace_events,
+                       "displayTimeUnit": "ms"},
+                      f)
+
+    def write_csv(self, filename):
+        """Write the trace as a CSV file with one row per
+        event. Times are reported in seconds relative to the
+        creation of the trace."""
+        arg_names = set()
+        for event in self._events:
+            arg_names.update(event[5])
+        arg_names = sorted(arg_names)
+        mode = "wb" if six.PY2 else "w"
+        kwds = {} if six.PY2 else {"newline": ""}
+        with open(filename, mode, **kwds) as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "category", "lane",
+                             "start", "duration"] + arg_names)
+            for name, category, start, duration, lane, args in \
+                    self._events:
+                writer.writerow(
+                    [name, category, lane,
+                     "%.6f" % (start - self._start_time),
+                     "%.6f" % (duration)] +
+                    [args.get(arg_name, "") for arg_name in arg_names])
+
+def _json_value(val):
+    if (val is None) or \
+       isinstance(val, (bool, float) + six.integer_types +
+                  six.string_types):
+        return val
+    return str(val)
+
+_current_trace = _null_trace
+
+def get_timing_trace():
+    """Return the active timing trace. If tracing is not
+    enabled, the returned object ignores all events."""
+    return _current_trace
+
+def enable_timing_trace():
+    """Enable timing traces and return the active trace. If
+    tracing is already enabled, the existing trace is
+    returned."""
+    global _current_trace
+    if not _current_trace.enabled:
+        _current_trace = TimingTrace()
+    return _current_trace
+
+def disable_timing_trace():
+    """Disable timing traces and return the trace that was
+    active (or None if tracing was not enabled)."""
+    global _current_trace
+    trace = _current_trace
+    _current_trace = _null_trace
+    return trace if trace.enabled else None
@@ -14,7 +14,6 @@ __all__ = ("_LinearConstraintData", "MatrixConstraint",
 import time
 import logging
 import array
-import collections
 from weakref import ref as weakref_ref
 
 from pyomo.core.base.set_types import Any
@@ -22,6 +21,7 @@ from pyomo.core.base import (SortComponents,
                              Var,
                              Constraint)
 from pyomo.core.base.numvalue import (is_fixed,
+                                      is_constant,
                                       value,
                                       ZeroConstant)
 from pyomo.core.base.plugin import ModelComponentFactory
@@ -31,10 +31,17 @@ from pyomo.core.base.constraint import (Constraint,
                                         _ConstraintData)
 from pyomo.core.expr.numvalue import native_numeric_types
 from pyomo.repn import generate_standard_repn
+from pyomo.repn.standard_repn import StandardRepn
 
-from six import iteritems
+import six
+from six import iteritems, itervalues
 from six.moves import xrange
 
+if six.PY3:
+    from collections.abc import Mapping as collections_Mapping
+else:
+    from collections import Mapping as collections_Mapping
+
 logger = logging.getLogger('pyomo.core')
 
 def _label_bytes(x):
@@ -50,12 +57,19 @@ def _label_bytes(x):
 # Compile a Pyomo constructed model in-place, storing the compiled
 # sparse constraint object on the model under constraint_name.
 #
+# Coefficients and bounds that depend on mutable parameters (or on
+# fixed variables) are stored with their current values; the
+# expressions are kept on the MatrixConstraint so that the values can
+# be updated by calling its refresh() method. When preserve_names is
+# True, the rows keep the names of the constraints they replace.
+#
 def compile_block_linear_constraints(parent_block,
                                      constraint_name,
                                      skip_trivial_constraints=False,
                                      single_precision_storage=False,
                                      verbose=False,
-                                     descend_into=True):
+                                     descend_into=True,
+                                     preserve_names=True):
 
     if verbose:
         print("")
@@ -75,13 +89,22 @@ def compile_block_linear_constraints(parent_block,
     SparseMat_Vals = []
     Ranges = []
     RangeTypes = []
+    RowNames = [] if preserve_names else None
+    MutableVals = {}
+    MutableRanges = {}
 
-    def _get_bound(exp):
+    def _get_range(exp, constant):
         if exp is None:
-            return None
-        if is_fixed(exp):
-            return value(exp)
-        raise ValueError("non-fixed bound: " + str(exp))
+            return 0
+        if not is_fixed(exp):
+            raise ValueError("non-fixed bound: " + str(exp))
+        if (exp.__class__ in native_numeric_types) and \
+           (constant.__class__ in native_numeric_types):
+            return exp - constant
+        exp = exp - constant
+        if not is_constant(exp):
+            MutableRanges[len(Ranges)] = exp
+        return value(exp)
 
     start_time = time.time()
     if verbose:
@@ -155,6 +178,8 @@ def compile_block_linear_constraints(parent_block,
             else:
 
                 singleton = isinstance(constraint, SimpleConstraint)
+                # names are generated for all indices at once
+                name_buffer = {}
 
                 # Note that as we may be removing items from the _data
                 # dictionary, we need to make a copy of the items list
@@ -170,7 +195,8 @@ def compile_block_linear_constraints(parent_block,
                             constraint_data_to_remove.append((constraint, index))
                             constraint_containers_to_check.add((block, constraint))
 
-                        repn = generate_standard_repn(constraint_data.body)
+                        repn = generate_standard_repn(constraint_data.body,
+                                                      compute_values=False)
 
                         assert repn.nonlinear_expr is None
 
@@ -186,7 +212,13 @@ def compile_block_linear_constraints(parent_block,
                             referenced_variable_symbols.update(
                                 row_variable_symbols)
                             assert repn.linear_coefs is not None
-                            row_coefficients = repn.linear_coefs
+                            for coef in repn.linear_coefs:
+                                if coef.__class__ not in native_numeric_types:
+                                    if not is_constant(coef):
+                                        MutableVals[len(SparseMat_Vals) +
+                                                    len(row_coefficients)] = coef
+                                    coef = value(coef)
+                                row_coefficients.append(coef)
 
                         SparseMat_pRows.append(SparseMat_pRows[-1] + \
                                                len(row_variable_symbols))
@@ -196,12 +228,15 @@ def compile_block_linear_constraints(parent_block,
                         nnz += len(row_variable_symbols)
                         nrows += 1
 
-                        L = _get_bound(constraint_data.lower)
-                        U = _get_bound(constraint_data.upper)
-                        constant = value(repn.constant)
-
-                        Ranges.append(L - constant if (L is not None) else 0)
-                        Ranges.append(U - constant if (U is not None) else 0)
+                        L = constraint_data.lower
+                        U = constraint_data.upper
+                        Ranges.append(_get_range(L, repn.constant))
+                        Ranges.append(_get_range(U, repn.constant))
+                        if preserve_names:
+                            RowNames.append(constraint_data.getname(
+                                fully_qualified=True,
+                                name_buffer=name_buffer,
+                                relative_to=parent_block))
                         if (L is not None) and \
                            (U is not None) and \
                            (not constraint_data.equality):
@@ -312,6 +347,10 @@ def compile_block_linear_constraints(parent_block,
         print("Time to convert compiled constraint data to "
               "array storage: %.2f seconds" % (stop_time-start_time))
 
+    if verbose:
+        print("Mutable coefficients: %s" % (len(MutableVals)))
+        print("Mutable bounds: %s" % (len(MutableRanges)))
+
     parent_block.add_component(constraint_name,
                                MatrixConstraint(nrows, ncols, nnz,
                                                 SparseMat_pRows,
@@ -319,7 +358,10 @@ def compile_block_linear_constraints(parent_block,
                                                 SparseMat_Vals,
                                                 Ranges,
                                                 RangeTypes,
-                                                ColumnIndexToVarObject))
+                                                ColumnIndexToVarObject,
+                                                row_names=RowNames,
+                                                mutable_vals=MutableVals,
+                                                mutable_ranges=MutableRanges))
 
 #class _LinearConstraintData(_ConstraintData,LinearCanonicalRepn):
 #
@@ -409,6 +451,9 @@ class _LinearMatrixConstraintData(_LinearConstraintData):
 
     __slots__ = ('_index')
 
+    # writers use canonical_form() rather than the body expression
+    _linear_canonical_form = True
+
     def __init__(self, index, component=None):
         #
         # These lines represent in-lining of the
@@ -481,7 +526,7 @@ class _LinearMatrixConstraintData(_LinearConstraintData):
             L <= f(x) (<= U)
             (U >=) f(x) >= L
         """
-        raise self.lower - self()
+        return self.lower - self()
 
     def uslack(self):
         """
@@ -489,7 +534,7 @@ class _LinearMatrixConstraintData(_LinearConstraintData):
             (L <=) f(x) <= U
             U >= f(x) (>= L)
         """
-        self.upper - self()
+        return self.upper - self()
 
     #
     # Override some default implementations on ComponentData
@@ -498,6 +543,50 @@ class _LinearMatrixConstraintData(_LinearConstraintData):
     def index(self):
         return self._index
 
+    def getname(self, fully_qualified=False, name_buffer=None, relative_to=None):
+        """
+        Return the name of the constraint compiled into this row (if
+        names were preserved) or the name of this row in the
+        MatrixConstraint. The name of a compiled constraint includes
+        the names of the sub-blocks between the compiled block and the
+        constraint, even when fully_qualified is False.
+        """
+        comp = self.parent_component()
+        if comp._row_names is None:
+            return super(_LinearMatrixConstraintData, self).getname(
+                fully_qualified, name_buffer, relative_to)
+        ans = comp._row_names[self._index]
+        if fully_qualified:
+            pb = comp.parent_block()
+            if relative_to is None:
+                relative_to = comp.model()
+            if pb is not None and pb is not relative_to:
+                ans = pb.getname(fully_qualified, name_buffer, relative_to) + \
+                      "." + ans
+        if name_buffer is not None:
+            name_buffer[id(self)] = ans
+        return ans
+
+    #
+    # Methods that writers expect when the
+    # _linear_canonical_form flag is True
+    #
+
+    def canonical_form(self, compute_values=True):
+        """
+        Build a canonical representation of the body of this
+        constraint. Fixed variables are moved into the constant.
+        """
+        comp = self.parent_component()
+        return _build_canonical_form(comp._prows,
+                                     comp._jcols,
+                                     comp._vals,
+                                     comp._varmap,
+                                     None,
+                                     comp._mutable_vals,
+                                     self._index,
+                                     compute_values)
+
     #
     # Abstract Interface (LinearCanonicalRepn)
     #
@@ -619,9 +708,38 @@ class _LinearMatrixConstraintData(_LinearConstraintData):
         raise NotImplementedError("MatrixConstraint row elements can not "
                                   "be updated")
 
+def _build_canonical_form(prows, jcols, vals, varmap, fixed,
+                          mutable_vals, row, compute_values):
+    """
+    Build the StandardRepn for a row of a MatrixConstraint. The fixed
+    argument is a list of the fixed flags of the variables in varmap,
+    or None to check the variables themselves.
+    """
+    variables = []
+    coefficients = []
+    constant = 0
+    for p in xrange(prows[row], prows[row+1]):
+        j = jcols[p]
+        coef = vals[p]
+        if (not compute_values) and (p in mutable_vals):
+            coef = mutable_vals[p]
+        if fixed[j] if (fixed is not None) else varmap[j].fixed:
+            if compute_values:
+                constant += coef * varmap[j].value
+            else:
+                constant += coef * varmap[j]
+        else:
+            variables.append(varmap[j])
+            coefficients.append(coef)
+    repn = StandardRepn()
+    repn.linear_vars = tuple(variables)
+    repn.linear_coefs = tuple(coefficients)
+    repn.constant = constant
+    return repn
+
 @ModelComponentFactory.register(
                    "A set of constraint expressions in Ax=b form.")
-class MatrixConstraint(collections.Mapping,
+class MatrixConstraint(collections_Mapping,
                        IndexedConstraint):
 
     #
@@ -645,7 +763,10 @@ class MatrixConstraint(collections.Mapping,
                  vals,
                  ranges,
                  range_types,
-                 varmap):
+                 varmap,
+                 row_names=None,
+                 mutable_vals=None,
+                 mutable_ranges=None):
 
         assert len(prows) == nrows + 1
         assert len(jcols) == nnz
@@ -653,6 +774,7 @@ class MatrixConstraint(collections.Mapping,
         assert len(ranges) == 2 * nrows
         assert len(range_types) == nrows
         assert len(varmap) == ncols
+        assert (row_names is None) or (len(row_names) == nrows)
 
         IndexedConstraint.__init__(self,
                                    Any)
@@ -663,6 +785,13 @@ class MatrixConstraint(collections.Mapping,
         self._ranges = ranges
         self._range_types = range_types
         self._varmap = varmap
+        # the names of the compiled constraints (or None)
+        self._row_names = row_names
+        self._row_index = None
+        # maps positions in vals (or ranges) to the expressions
+        # that define them
+        self._mutable_vals = mutable_vals if mutable_vals else {}
+        self._mutable_ranges = mutable_ranges if mutable_ranges else {}
 
     def construct(self, data=None):
         """
@@ -692,6 +821,64 @@ class MatrixConstraint(collections.Mapping,
     def __iter__(self):
         return iter(i for i in xrange(len(self)))
 
+    def find_row(self, name):
+        """
+        Return the row created for the compiled constraint with the
+        given name. The name is relative to the block on which this
+        MatrixConstraint is stored (e.g., 'c[1]' or 'b.c[1]').
+        Raises KeyError if no such row exists.
+        """
+        if self._row_names is None:
+            raise KeyError("The names of the compiled constraints were "
+                           "not preserved on MatrixConstraint '%s'"
+                           % (self.name))
+        if self._row_index is None:
+            self._row_index = dict((row_name, i) for i, row_name
+                                   in enumerate(self._row_names))
+        return self._data[self._row_index[name]]
+
+    def refresh(self):
+        """
+        Update the stored coefficients and bounds that depend on
+        mutable parameters or fixed variables using their current
+        values.
+        """
+        vals = self._vals
+        for p, expr in iteritems(self._mutable_vals):
+            vals[p] = value(expr)
+        ranges = self._ranges
+        for p, expr in iteritems(self._mutable_ranges):
+            ranges[p] = value(expr)
+
+    def canonical_forms(self, compute_values=True):
+        """
+        Build canonical representations of the bodies of all rows.
+        Returns a list with one representation per row, equal to those
+        returned by the canonical_form() method of each row.
+        """
+        prows = list(self._prows)
+        jcols = list(self._jcols)
+        vals = list(self._vals)
+        varmap = self._varmap
+        fixed = [v.fixed for v in varmap]
+        mutable_vals = self._mutable_vals
+        nrows = len(self._range_types)
+        if any(fixed) or \
+           ((not compute_values) and (len(mutable_vals) > 0)):
+            return [_build_canonical_form(prows, jcols, vals, varmap, fixed,
+                                          mutable_vals, i, compute_values)
+                    for i in xrange(nrows)]
+        repns = []
+        for i in xrange(nrows):
+            start = prows[i]
+            stop = prows[i+1]
+            repn = StandardRepn()
+            repn.linear_vars = tuple(varmap[j] for j in jcols[start:stop])
+            repn.linear_coefs = tuple(vals[start:stop])
+            repn.constant = 0
+            repns.append(repn)
+        return repns
+
     #
     # Remove methods that allow modifying this constraint
     #
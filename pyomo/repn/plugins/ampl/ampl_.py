@@ -35,13 +35,14 @@ from pyomo.core.expr.numvalue import (NumericConstant,
                                       native_numeric_types,
                                       value)
 from pyomo.core.base import *
-from pyomo.core.base import SymbolMap, Block
+from pyomo.core.base import NumericSymbolMap, Block
 from pyomo.core.base.var import Var
 from pyomo.core.base import _ExpressionData, Expression, SortComponents
 from pyomo.core.base import var
 from pyomo.core.base import param
 import pyomo.core.base.suffix
 from pyomo.repn.standard_repn import StandardRepn, generate_standard_repn
+from pyomo.repn.util import LinearCanonicalForms
 
 import pyomo.core.kernel.suffix
 from pyomo.core.kernel.block import IBlock
@@ -687,8 +688,9 @@ class ProblemWriter_nl(AbstractProblemWriter):
         overall_timer = StopWatch()
         subsection_timer = StopWatch()
 
-        # create the symbol_map
-        symbol_map = SymbolMap()
+        # create the symbol_map (the NL symbols are the positions of
+        # the objectives, constraints and variables in the file)
+        symbol_map = NumericSymbolMap()
 
         name_labeler = self._name_labeler
         # These will get updated when symbolic_solver_labels
@@ -880,7 +882,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 obj_ID = trivial_labeler(active_objective)
                 Objectives_dict[obj_ID] = (active_objective, wrapped_repn)
                 self_ampl_obj_id[obj_ID] = n_objs
-                symbol_map.addSymbols([(active_objective, "o%d"%n_objs)])
+                symbol_map.addSymbolArray('o', [active_objective])
 
                 n_objs += 1
                 if repn.is_nonlinear():
@@ -895,7 +897,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
                 "on model %s, but currently only handles a single objective."
                 % (model.name))
         elif n_objs == 1:
-            symbol_map.alias(symbol_map.bySymbol["o0"](),"__default_objective__")
+            symbol_map.alias(symbol_map.getObject("o0"),"__default_objective__")
 
         if show_section_timing:
             subsection_timer.report("Generate objective representation")
@@ -920,6 +922,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
         ccons_nd = 0
         ccons_nzlb = 0
 
+        canonical_form = LinearCanonicalForms()
         for block in all_blocks_list:
             all_repns = list()
 
@@ -948,7 +951,7 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         max_rowname_len = len(conname)
 
                 if constraint_data._linear_canonical_form:
-                    repn = constraint_data.canonical_form()
+                    repn = canonical_form(constraint_data)
                     linear_vars = repn.linear_vars
                     nonlinear_vars = repn.nonlinear_vars
                 else:
@@ -1095,9 +1098,9 @@ class ProblemWriter_nl(AbstractProblemWriter):
             (con_ID,row_id) for row_id,con_ID in \
             enumerate(itertools.chain(nonlin_con_order_list,lin_con_order_list)))
         # populate the symbol_map
-        symbol_map.addSymbols(
-            [(Constraints_dict[con_ID][0],"c%d"%row_id) for row_id,con_ID in \
-             enumerate(itertools.chain(nonlin_con_order_list,lin_con_order_list))])
+        symbol_map.addSymbolArray(
+            'c', [Constraints_dict[con_ID][0] for con_ID in \
+                  itertools.chain(nonlin_con_order_list,lin_con_order_list)])
 
         if show_section_timing:
             subsection_timer.report("Generate constraint representations")
@@ -1198,8 +1201,8 @@ class ProblemWriter_nl(AbstractProblemWriter):
         self_ampl_var_id.update((var_ID,column_id)
                                 for column_id,var_ID in enumerate(full_var_list))
         # populate the symbol_map
-        symbol_map.addSymbols([(Vars_dict[var_ID],"v%d"%column_id)
-                               for column_id,var_ID in enumerate(full_var_list)])
+        symbol_map.addSymbolArray(
+            'v', [Vars_dict[var_ID] for var_ID in full_var_list])
 
         if show_section_timing:
             subsection_timer.report("Partition variable types")
@@ -1336,8 +1339,6 @@ class ProblemWriter_nl(AbstractProblemWriter):
                         "Solver does not support SOS level %s constraints" % (level))
                 modelSOS.count_constraint(soscondata)
 
-        symbol_map_byObject = symbol_map.byObject
-
         var_sosno_suffix = modelSOS.sosno
         var_ref_suffix = modelSOS.ref
         sosconstraint_sosno_vals = set(var_sosno_suffix.vals)
@@ -1408,6 +1409,9 @@ class ProblemWriter_nl(AbstractProblemWriter):
                     "components to exist on a single model. To avoid this "
                     "error please use only one of these methods to define "
                     "special ordered sets.")
+        if suffix_dict:
+            # the string symbols are only created if there are suffixes
+            symbol_map_byObject = symbol_map.byObject
         # do a sort to make sure NL file output is deterministic
         # across python versions
         for suffix_name in sorted(suffix_dict):
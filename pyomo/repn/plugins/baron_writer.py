@@ -36,6 +36,8 @@ from pyomo.core.base.set_types import *
 import pyomo.core.base.suffix
 import pyomo.core.kernel.suffix
 from pyomo.core.kernel.block import IBlock
+from pyomo.repn import generate_standard_repn
+from pyomo.repn.util import LinearCanonicalForms
 
 logger = logging.getLogger('pyomo.core')
 
@@ -147,6 +149,55 @@ def expression_to_string(expr, variables, labeler=None, smap=None):
     return visitor.dfs_postorder_stack(expr)
 
 
+def repn_to_string(repn, variables, smap):
+    """
+    Return the BARON string for a linear or quadratic StandardRepn.
+    The ids of the variables in the expression are added to the
+    variables set.
+    """
+    terms = []
+    for coef, var in zip(repn.linear_coefs, repn.linear_vars):
+        variables.add(id(var))
+        name = smap.getSymbol(var)
+        if coef == 1:
+            terms.append(' + ' + name)
+        elif coef == -1:
+            terms.append(' - ' + name)
+        elif coef < 0:
+            terms.append(' - %s * %s' % (-coef, name))
+        else:
+            terms.append(' + %s * %s' % (coef, name))
+    for coef, (var1, var2) in zip(repn.quadratic_coefs,
+                                  repn.quadratic_vars):
+        variables.add(id(var1))
+        variables.add(id(var2))
+        if var1 is var2:
+            name = '%s ^ 2' % (smap.getSymbol(var1),)
+        else:
+            name = '%s * %s' % (smap.getSymbol(var1), smap.getSymbol(var2))
+        if coef == 1:
+            terms.append(' + ' + name)
+        elif coef == -1:
+            terms.append(' - ' + name)
+        elif coef < 0:
+            terms.append(' - %s * %s' % (-coef, name))
+        else:
+            terms.append(' + %s * %s' % (coef, name))
+    constant = repn.constant
+    if not terms:
+        return str(constant)
+    if constant < 0:
+        terms.append(' - %s' % (-constant,))
+    elif constant:
+        terms.append(' + %s' % (constant,))
+    # Drop the leading ' + ' (or the space before a leading ' - ')
+    if terms[0][1] == '+':
+        terms[0] = terms[0][3:]
+    else:
+        terms[0] = terms[0][1:]
+    return ''.join(terms)
+
+
 
 # TODO: The to_string function is handy, but the fact that
 #       it calls .name under the hood for all components
@@ -204,10 +255,40 @@ class ProblemWriter_bar(AbstractProblemWriter):
 
         referenced_variable_ids = set()
 
+        canonical_form = LinearCanonicalForms()
+
+        def _body_to_string(expr, variables, constraint_data=None):
+            """
+            Return the BARON string for a constraint body (or objective)
+            and whether that string contains any variables, and add the
+            ids of the variables in the body to the variables set.
+            Linear and quadratic expressions are written from their
+            StandardRepn; only nonlinear expressions use ToBaronVisitor.
+            """
+            if constraint_data is not None and \
+               constraint_data._linear_canonical_form:
+                repn = canonical_form(constraint_data)
+            else:
+                repn = generate_standard_repn(expr, quadratic=True)
+                if repn.nonlinear_expr is None:
+                    # The repn drops variables with a zero
+                    # coefficient, but every variable in the
+                    # expression is declared (and labeled in the
+                    # order the visitor would have used)
+                    for var in EXPR.identify_variables(
+                            expr, include_fixed=False):
+                        variables.add(id(var))
+                        symbol_map.getSymbol(var)
+            if repn.nonlinear_expr is None:
+                return (repn_to_string(repn, variables, symbol_map),
+                        bool(repn.linear_vars or repn.quadratic_vars))
+            body = expression_to_string(expr, variables, smap=symbol_map)
+            return body, len(variables) > 0
+
         def _skip_trivial(constraint_data):
             if skip_trivial_constraints:
                 if constraint_data._linear_canonical_form:
-                    repn = constraint_data.canonical_form()
+                    repn = canonical_form(constraint_data)
                     if (repn.variables is None) or \
                        (len(repn.variables) == 0):
                         return True
@@ -417,13 +498,13 @@ class ProblemWriter_bar(AbstractProblemWriter):
                                                l_eqns):
 
             variables = set()
-            #print(symbol_map.byObject.keys())
-            eqn_body = expression_to_string(constraint_data.body, variables, smap=symbol_map)
-            #print(symbol_map.byObject.keys())
+            eqn_body, has_variables = _body_to_string(
+                constraint_data.body, variables, constraint_data)
             referenced_variable_ids.update(variables)
 
-            if len(variables) == 0:
-                assert not skip_trivial_constraints
+            if not has_variables:
+                assert (len(variables) > 0) or \
+                    (not skip_trivial_constraints)
                 eqn_body += " + 0 * ONE_VAR_CONST__ "
 
             # 7/29/14 CLH:
@@ -507,9 +588,8 @@ class ProblemWriter_bar(AbstractProblemWriter):
                     output_file.write("maximize ")
 
                 variables = set()
-                #print(symbol_map.byObject.keys())
-                obj_string = expression_to_string(objective_data.expr, variables, smap=symbol_map)
-                #print(symbol_map.byObject.keys())
+                obj_string, _ = _body_to_string(objective_data.expr,
+                                                variables)
                 referenced_variable_ids.update(variables)
 
 
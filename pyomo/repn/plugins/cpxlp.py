@@ -14,7 +14,9 @@
 
 import logging
 import math
+import multiprocessing
 import operator
+import os
 
 from six import iterkeys, iteritems, StringIO
 from six.moves import xrange
@@ -29,6 +31,7 @@ from pyomo.core.base import \
      SOSConstraint, Objective,
      ComponentMap, is_fixed)
 from pyomo.repn import generate_standard_repn
+from pyomo.repn.util import LinearCanonicalForms
 
 logger = logging.getLogger('pyomo.core')
 
@@ -45,6 +48,38 @@ def _get_bound(exp):
         return value(exp)
     raise ValueError("non-fixed bound or weight: " + str(exp))
 
+#
+# The state shared with the worker processes used by the parallel
+# mode of the LP writer.  It is set by the parent process before the
+# worker pool is created, so (with the 'fork' start method) the
+# workers inherit the model, the constraint list and the variable
+# symbol dictionary without pickling them.
+#
+_parallel_state = None
+
+def _print_constraint_chunk(chunk):
+    """
+    Generate the repns and the formatted rows for the constraints
+    in a chunk of the constraint list.  Returns the list of (degree,
+    body, offset) tuples for the constraints in the chunk and the
+    ids of the variables referenced by the chunk.
+    """
+    writer, constraints, get_repn, print_args, skip_trivial_constraints \
+        = _parallel_state
+    writer._referenced_variable_ids = {}
+    rows = []
+    for constraint_data, block_repn, gen_con_repn in \
+            constraints[chunk[0]:chunk[1]]:
+        repn = get_repn(constraint_data, block_repn, gen_con_repn)
+        degree = repn.polynomial_degree()
+        if degree == 0 and skip_trivial_constraints:
+            rows.append((degree, None, None))
+            continue
+        body = []
+        offset = writer._print_expr_canonical(repn, body, *print_args)
+        rows.append((degree, "".join(body), offset))
+    return rows, list(writer._referenced_variable_ids)
+
 
 @WriterFactory.register('cpxlp', 'Generate the corresponding CPLEX LP file')
 @WriterFactory.register('lp', 'Generate the corresponding CPLEX LP file')
@@ -129,6 +164,11 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
         force_objective_constant = \
             io_options.pop("force_objective_constant", False)
 
+        # The number of worker processes used to generate the
+        # constraint rows.  The file is identical to the one written
+        # serially (the default).
+        processes = io_options.pop("processes", 1)
+
         if len(io_options):
             raise ValueError(
                 "ProblemWriter_cpxlp passed unrecognized io_options:\n\t" +
@@ -172,7 +212,8 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                     column_order=column_order,
                     skip_trivial_constraints=skip_trivial_constraints,
                     force_objective_constant=force_objective_constant,
-                    include_all_variable_bounds=include_all_variable_bounds)
+                    include_all_variable_bounds=include_all_variable_bounds,
+                    processes=processes)
 
         self._referenced_variable_ids.clear()
 
@@ -388,7 +429,8 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                         column_order=None,
                         skip_trivial_constraints=False,
                         force_objective_constant=False,
-                        include_all_variable_bounds=False):
+                        include_all_variable_bounds=False,
+                        processes=1):
 
         eq_string_template = self.eq_string_template
         leq_string_template = self.leq_string_template
@@ -569,6 +611,7 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
 
         supports_quadratic_constraint = solver_capability('quadratic_constraint')
 
+        canonical_form = LinearCanonicalForms()
         def constraint_generator():
             for block in all_blocks:
 
@@ -590,31 +633,89 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                         assert not constraint_data.equality
                         continue # non-binding, so skip
 
-                    if constraint_data._linear_canonical_form:
-                        repn = constraint_data.canonical_form()
-                    elif gen_con_repn:
-                        repn = generate_standard_repn(constraint_data.body)
-                        block_repn[constraint_data] = repn
-                    else:
-                        repn = block_repn[constraint_data]
+                    yield constraint_data, block_repn, gen_con_repn
 
-                    yield constraint_data, repn
+        def get_repn(constraint_data, block_repn, gen_con_repn):
+            if constraint_data._linear_canonical_form:
+                repn = canonical_form(constraint_data)
+            elif gen_con_repn:
+                repn = generate_standard_repn(constraint_data.body)
+                block_repn[constraint_data] = repn
+            else:
+                repn = block_repn[constraint_data]
+            return repn
 
         if row_order is not None:
             sorted_constraint_list = list(constraint_generator())
             sorted_constraint_list.sort(key=lambda x: row_order[x[0]])
             def yield_all_constraints():
-                for data, repn in sorted_constraint_list:
-                    yield data, repn
+                for data in sorted_constraint_list:
+                    yield data
         else:
             yield_all_constraints = constraint_generator
 
+        print_args = (object_symbol_dictionary,
+                      variable_symbol_dictionary,
+                      False,
+                      column_order)
+
+        def yield_all_rows():
+            """
+            Yield (constraint_data, degree, body, offset) for the
+            constraints, where body is the formatted constraint body
+            (or None for a skipped trivial constraint).
+            """
+            if processes <= 1 or not hasattr(os, 'fork'):
+                for constraint_data, block_repn, gen_con_repn \
+                        in yield_all_constraints():
+                    repn = get_repn(constraint_data, block_repn, gen_con_repn)
+                    degree = repn.polynomial_degree()
+                    if degree == 0 and skip_trivial_constraints:
+                        yield constraint_data, degree, None, None
+                        continue
+                    body = []
+                    offset = print_expr_canonical(repn, body, *print_args)
+                    yield constraint_data, degree, "".join(body), offset
+                return
+            #
+            # Parallel mode: the constraints are partitioned into
+            # chunks that are formatted by a pool of worker
+            # processes.  The chunks are returned (and written) in
+            # order, so the file is identical to the serial one.
+            # Note that the repns generated by the workers are not
+            # stored in block._repn.
+            #
+            global _parallel_state
+            constraints = list(yield_all_constraints())
+            chunk_size = max(1000, len(constraints) // (4*processes) + 1)
+            chunks = [(i, i+chunk_size)
+                      for i in xrange(0, len(constraints), chunk_size)]
+            var_by_id = dict((id(vardata), vardata)
+                             for vardata in variable_list)
+            referenced_variable_ids = self._referenced_variable_ids
+            _parallel_state = (self, constraints, get_repn, print_args,
+                               skip_trivial_constraints)
+            try:
+                context = multiprocessing.get_context('fork')
+            except AttributeError:
+                # Python 2 always uses fork on POSIX systems
+                context = multiprocessing
+            pool = context.Pool(processes)
+            try:
+                for (start, stop), (rows, var_ids) in zip(
+                        chunks, pool.imap(_print_constraint_chunk, chunks)):
+                    for var_id in var_ids:
+                        referenced_variable_ids[var_id] = var_by_id[var_id]
+                    for constraint, row in zip(constraints[start:stop], rows):
+                        yield (constraint[0],) + row
+            finally:
+                pool.terminate()
+                _parallel_state = None
+
         # FIXME: This is a hack to get nested blocks working...
-        for constraint_data, repn in yield_all_constraints():
+        for constraint_data, degree, body, offset in yield_all_rows():
             have_nontrivial = True
 
-            degree = repn.polynomial_degree()
-
             #
             # Write constraint
             #
@@ -648,12 +749,7 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                 alias_symbol_func(symbol_map, constraint_data, label)
                 output.append(label)
                 output.append(':\n')
-                offset = print_expr_canonical(repn,
-                                              output,
-                                              object_symbol_dictionary,
-                                              variable_symbol_dictionary,
-                                              False,
-                                              column_order)
+                output.append(body)
                 bound = constraint_data.lower
                 bound = _get_bound(bound) - offset
                 output.append(eq_string_template
@@ -668,12 +764,7 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                     alias_symbol_func(symbol_map, constraint_data, label)
                     output.append(label)
                     output.append(':\n')
-                    offset = print_expr_canonical(repn,
-                                                  output,
-                                                  object_symbol_dictionary,
-                                                  variable_symbol_dictionary,
-                                                  False,
-                                                  column_order)
+                    output.append(body)
                     bound = constraint_data.lower
                     bound = _get_bound(bound) - offset
                     output.append(geq_string_template
@@ -689,12 +780,7 @@ class ProblemWriter_cpxlp(AbstractProblemWriter):
                     alias_symbol_func(symbol_map, constraint_data, label)
                     output.append(label)
                     output.append(':\n')
-                    offset = print_expr_canonical(repn,
-                                                  output,
-                                                  object_symbol_dictionary,
-                                                  variable_symbol_dictionary,
-                                                  False,
-                                                  column_order)
+                    output.append(body)
                     bound = constraint_data.upper
                     bound = _get_bound(bound) - offset
                     output.append(leq_string_template
@@ -27,6 +27,7 @@ from pyomo.core.base.component import ActiveComponent
 from pyomo.core.kernel.base import ICategorizedObject
 from pyomo.opt import ProblemFormat
 from pyomo.opt.base import AbstractProblemWriter, WriterFactory
+from pyomo.repn import generate_standard_repn
 from pyomo.repn.util import valid_expr_ctypes_minlp, \
     valid_active_ctypes_minlp
 
@@ -251,6 +252,65 @@ def split_long_line(line):
     return new_lines
 
 
+def repn_to_string(repn, smap):
+    """
+    Return the GAMS string for a linear or quadratic StandardRepn.
+
+    The terms are collected in a list and joined once, and a line
+    break is inserted before a term whenever the current line would
+    approach the GAMS line length limit, so the result never needs to
+    be passed to split_long_line.
+    """
+    terms = []
+    for coef, var in zip(repn.linear_coefs, repn.linear_vars):
+        name = smap.getSymbol(var)
+        if coef == 1:
+            terms.append(' + ' + name)
+        elif coef == -1:
+            terms.append(' - ' + name)
+        elif coef < 0:
+            terms.append(' - %s*%s' % (-coef, name))
+        else:
+            terms.append(' + %s*%s' % (coef, name))
+    for coef, (var1, var2) in zip(repn.quadratic_coefs,
+                                  repn.quadratic_vars):
+        if var1 is var2:
+            name = 'power(%s, 2)' % (smap.getSymbol(var1),)
+        else:
+            name = '%s*%s' % (smap.getSymbol(var1), smap.getSymbol(var2))
+        if coef == 1:
+            terms.append(' + ' + name)
+        elif coef == -1:
+            terms.append(' - ' + name)
+        elif coef < 0:
+            terms.append(' - %s*%s' % (-coef, name))
+        else:
+            terms.append(' + %s*%s' % (coef, name))
+    constant = repn.constant
+    if not terms:
+        return str(constant)
+    if constant < 0:
+        terms.append(' - %s' % (-constant,))
+    elif constant:
+        terms.append(' + %s' % (constant,))
+    # Drop the leading ' + ' (or the space before a leading ' - ')
+    if terms[0][1] == '+':
+        terms[0] = terms[0][3:]
+    else:
+        terms[0] = terms[0][1:]
+    line_length = 0
+    for i, term in enumerate(terms):
+        line_length += len(term)
+        # leave room for the equation name and bound on the first and
+        # last lines
+        if line_length > 75000:
+            # the space will be the first character in the next line,
+            # so that the line doesn't start with the comment character
+            terms[i] = '\n' + term
+            line_length = len(term)
+    return ''.join(terms)
+
+
 def _get_bound(exp):
     if exp is None:
         return None
@@ -480,6 +540,51 @@ class ProblemWriter_gams(AbstractProblemWriter):
 
         tc = StorageTreeChecker(model)
 
+        # Set if a constraint body without variables was written with
+        # the ONE_VAR_CONST__ dummy variable
+        one_var_const = []
+
+        def body_to_string(body, is_objective=False):
+            """
+            Return the GAMS string for a constraint body or objective
+            (or None for a trivial constraint that should be skipped)
+            and a flag that is True if the expression is linear.
+            Linear and quadratic expressions are written from their
+            StandardRepn; only nonlinear expressions use ToGamsVisitor.
+            """
+            degree = body.polynomial_degree()
+            is_linear = degree in linear_degree
+            repn = None
+            if degree is not None and degree <= 2:
+                try:
+                    repn = generate_standard_repn(body,
+                                                  quadratic=(degree == 2))
+                except ValueError:
+                    # Unsupported component types are reported by the
+                    # visitor below
+                    pass
+            if repn is None or repn.nonlinear_expr is not None:
+                body_str = expression_to_string(body, tc, smap=symbolMap)
+                if len(body_str) > 80000:
+                    body_str = split_long_line(body_str)
+                return body_str, is_linear
+            # Declare every variable in the expression (in the order
+            # that ToGamsVisitor would), including the ones that
+            # cancel out of the repn
+            for var in EXPR.identify_variables(body, include_fixed=False):
+                var_label(var)
+            body_str = repn_to_string(repn, symbolMap)
+            if is_objective or repn.linear_vars or repn.quadratic_vars:
+                return body_str, is_linear
+            if skip_trivial_constraints:
+                return None, is_linear
+            # GAMS rejects equations without variables, so add a dummy
+            # variable term
+            one_var_const.append(True)
+            if not repn.constant:
+                return '0*ONE_VAR_CONST__', is_linear
+            return body_str + ' + 0*ONE_VAR_CONST__', is_linear
+
         # Walk through the model and generate the constraint definition
         # for all active constraints.  Any Vars / Expressions that are
         # encountered will be added to the var_list due to the labeler
@@ -495,16 +600,19 @@ class ProblemWriter_gams(AbstractProblemWriter):
             con_body = as_numeric(con.body)
             if skip_trivial_constraints and con_body.is_fixed():
                 continue
-            if linear:
-                if con_body.polynomial_degree() not in linear_degree:
-                    linear = False
 
             cName = symbolMap.getSymbol(con, con_labeler)
+            body_str, is_linear = body_to_string(con_body)
+            if body_str is None:
+                symbolMap.removeSymbol(con)
+                continue
+            if not is_linear:
+                linear = False
             if con.equality:
                 constraint_names.append('%s' % cName)
                 ConstraintIO.write('%s.. %s =e= %s ;\n' % (
                     constraint_names[-1],
-                    expression_to_string(con_body, tc, smap=symbolMap),
+                    body_str,
                     _get_bound(con.upper)
                 ))
             else:
@@ -513,13 +621,13 @@ class ProblemWriter_gams(AbstractProblemWriter):
                     ConstraintIO.write('%s.. %s =l= %s ;\n' % (
                         constraint_names[-1],
                         _get_bound(con.lower),
-                        expression_to_string(con_body, tc, smap=symbolMap)
+                        body_str
                     ))
                 if con.has_ub():
                     constraint_names.append('%s_hi' % cName)
                     ConstraintIO.write('%s.. %s =l= %s ;\n' % (
                         constraint_names[-1],
-                        expression_to_string(con_body, tc, smap=symbolMap),
+                        body_str,
                         _get_bound(con.upper)
                     ))
 
@@ -531,14 +639,15 @@ class ProblemWriter_gams(AbstractProblemWriter):
                 "GAMS writer requires exactly one active objective (found %s)"
                 % (len(obj)))
         obj = obj[0]
-        if linear:
-            if obj.expr.polynomial_degree() not in linear_degree:
-                linear = False
         oName = symbolMap.getSymbol(obj, con_labeler)
+        body_str, is_linear = body_to_string(as_numeric(obj.expr),
+                                             is_objective=True)
+        if not is_linear:
+            linear = False
         constraint_names.append(oName)
         ConstraintIO.write('%s.. GAMS_OBJECTIVE =e= %s ;\n' % (
             oName,
-            expression_to_string(obj.expr, tc, smap=symbolMap)
+            body_str
         ))
 
         # Categorize the variables that we found
@@ -560,13 +669,14 @@ class ProblemWriter_gams(AbstractProblemWriter):
             output_file.write(";\n\nPOSITIVE VARIABLES\n\t")
             output_file.write("\n\t".join(categorized_vars.positive))
         output_file.write(";\n\nVARIABLES\n\tGAMS_OBJECTIVE\n\t")
+        if one_var_const:
+            output_file.write("ONE_VAR_CONST__\n\t")
         output_file.write("\n\t".join(categorized_vars.reals))
         output_file.write(";\n\n")
 
-        for line in ConstraintIO.getvalue().splitlines():
-            if len(line) > 80000:
-                line = split_long_line(line)
-            output_file.write(line + "\n")
+        # Long lines were already split when the constraints were
+        # generated
+        output_file.write(ConstraintIO.getvalue())
 
         output_file.write("\n")
 
@@ -29,6 +29,7 @@ from pyomo.core.base import \
      SOSConstraint, Objective,
      ComponentMap, is_fixed)
 from pyomo.repn import generate_standard_repn
+from pyomo.repn.util import LinearCanonicalForms
 
 logger = logging.getLogger('pyomo.core')
 
@@ -417,6 +418,7 @@ class ProblemWriter_mps(AbstractProblemWriter):
         assert objective_label is not None
 
         # Constraints
+        canonical_form = LinearCanonicalForms()
         def constraint_generator():
             for block in all_blocks:
 
@@ -440,7 +442,7 @@ class ProblemWriter_mps(AbstractProblemWriter):
                         continue # non-binding, so skip
 
                     if constraint_data._linear_canonical_form:
-                        repn = constraint_data.canonical_form()
+                        repn = canonical_form(constraint_data)
                     elif gen_con_repn:
                         repn = generate_standard_repn(constraint_data.body)
                         block_repn[constraint_data] = repn
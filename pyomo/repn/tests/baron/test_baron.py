@@ -136,6 +136,27 @@ class Test(unittest.TestCase):
         model.obj = Objective(expr=model.x)
         self._check_baseline(model)
 
+    def test_zero_coefficient_variables(self):
+        m = ConcreteModel()
+        m.x = Var(initialize=1)
+        m.y = Var(initialize=1)
+        m.p = Param(initialize=0, mutable=True)
+        m.c = Constraint(expr=m.x + m.p*m.x*m.y >= 1)
+        m.d = Constraint(expr=m.p*m.y == 1)
+        m.o = Objective(expr=m.x)
+        test_fname = self._get_fnames()[1]
+        self._cleanup(test_fname)
+        m.write(test_fname, format="bar",
+                io_options={"symbolic_solver_labels": True})
+        with open(test_fname) as f:
+            output = f.read()
+        self._cleanup(test_fname)
+        # Variables that only appear with a zero coefficient are
+        # still declared
+        self.assertIn("VARIABLES x, y;", output)
+        self.assertIn("c: x >= 1;", output)
+        self.assertIn("d: 0 + 0 * ONE_VAR_CONST__  == 1;", output)
+
     def test_trig_generates_exception(self):
         m = ConcreteModel()
         m.x = Var(bounds=(0,2*3.1415))
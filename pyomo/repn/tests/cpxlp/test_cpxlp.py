@@ -235,6 +235,38 @@ class TestCPXLP_writer(unittest.TestCase):
             model.write, test_fname, format='lp')
         self._cleanup(test_fname)
 
+    @unittest.skipIf(not hasattr(os, 'fork'), "fork is not available")
+    def test_parallel(self):
+        model = ConcreteModel()
+        model.I = RangeSet(3000)
+        model.x = Var(model.I, bounds=(0, None))
+        model.y = Var()
+        model.c = Constraint(model.I, rule=lambda m, i:
+                             m.x[i] + 2*m.x[i % 3000 + 1] >= i % 5)
+        model.e = Constraint(model.I, rule=lambda m, i:
+                             (m.x[i] - m.y == 1) if i % 7 else
+                             inequality(-1, m.x[i]**2 + 3*m.y, 2))
+        model.t = Constraint(expr=model.y - model.y <= 1)
+        model.obj = Objective(expr=sum(model.x.values()))
+        row_order = ComponentMap(
+            (c, -i) for i, c in enumerate(model.component_data_objects(
+                Constraint)))
+
+        baseline_fname, test_fname = self._get_fnames()
+        for kwds in ({}, {"skip_trivial_constraints": True},
+                     {"row_order": row_order}):
+            for processes in (1, 3):
+                self._cleanup(test_fname)
+                io_options = {"processes": processes}
+                io_options.update(kwds)
+                model.write(test_fname, format='lp', io_options=io_options)
+                with open(test_fname) as FILE:
+                    output = FILE.read()
+                self._cleanup(test_fname)
+                if processes == 1:
+                    serial = output
+                else:
+                    self.assertEqual(output, serial)
 
 
 if __name__ == "__main__":
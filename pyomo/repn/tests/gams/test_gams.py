@@ -18,9 +18,12 @@ from six import StringIO
 import pyutilib.th as unittest
 from pyomo.core.base import NumericLabeler, SymbolMap
 from pyomo.environ import (Block, ConcreteModel, Connector, Constraint,
-                           Objective, TransformationFactory, Var, exp, log)
+                           Objective, Param, TransformationFactory, Var, exp,
+                           log)
+from pyomo.repn import generate_standard_repn
 from pyomo.repn.plugins.gams_writer import (StorageTreeChecker,
                                             expression_to_string,
+                                            repn_to_string,
                                             split_long_line)
 
 thisdir = os.path.dirname(os.path.abspath(__file__))
@@ -237,6 +240,64 @@ class Test(unittest.TestCase):
         self.assertEqual(split_long_line(line),
             pat * 5714 + "1000\n * 2000 * x")
 
+    def test_repn_to_string(self):
+        m = ConcreteModel()
+        m.x = Var()
+        m.y = Var()
+        m.z = Var()
+        m.p = Param(initialize=3, mutable=True)
+        smap = SymbolMap(NumericLabeler('x'))
+        repn = generate_standard_repn(
+            -m.x + m.p*m.y - 0.5*m.z + m.x*m.y + m.z**2 - 2)
+        self.assertEqual(repn_to_string(repn, smap),
+                         "- x1 + 3*x2 - 0.5*x3 + x1*x2 + power(x3, 2) - 2")
+        m.y.fix(1)
+        repn = generate_standard_repn(m.x*m.y + m.y)
+        self.assertEqual(repn_to_string(repn, smap), "x1 + 1")
+        m.x.fix(2)
+        repn = generate_standard_repn(m.x*m.y + m.y)
+        self.assertEqual(repn_to_string(repn, smap), "3")
+
+    def test_long_linear_constraint(self):
+        m = ConcreteModel()
+        m.x = Var(range(20000))
+        m.c = Constraint(expr=sum(m.x[i] for i in m.x) >= 1)
+        m.o = Objective(expr=m.x[0])
+        os = StringIO()
+        m.write(os, format="gams")
+        for line in os.getvalue().splitlines():
+            self.assertLessEqual(len(line), 80000)
+        con = os.getvalue().split('c1_lo.. ')[1].split(';')[0]
+        self.assertIn('\n + ', con)
+        self.assertEqual(con.replace('\n', '').split(' =l= ')[1].strip(),
+                         ' + '.join('x%d' % (i+1) for i in range(20000)))
+
+    def test_constant_rows(self):
+        m = ConcreteModel()
+        m.x = Var(initialize=1)
+        m.y = Var(initialize=1)
+        m.p = Param(initialize=0, mutable=True)
+        m.c = Constraint(expr=m.x - m.x == 1)
+        m.d = Constraint(expr=m.x + m.p*m.x*m.y >= 1)
+        m.o = Objective(expr=m.x)
+        os = StringIO()
+        m.write(os, format="gams")
+        output = os.getvalue()
+        # Variables that cancel out are still declared
+        self.assertIn("\tONE_VAR_CONST__\n\tx1\n\tx2;", output)
+        self.assertIn("c1.. 0*ONE_VAR_CONST__ =e= 1.0 ;", output)
+        self.assertIn("c2_lo.. 1.0 =l= x1 ;", output)
+        # The model type follows the degree of the expressions
+        self.assertIn("USING nlp", output)
+
+        os = StringIO()
+        m.write(os, format="gams",
+                io_options=dict(skip_trivial_constraints=True))
+        output = os.getvalue()
+        self.assertNotIn("ONE_VAR_CONST__", output)
+        self.assertNotIn("c1..", output)
+        self.assertIn("c2_lo.. 1.0 =l= x1 ;", output)
+
     def test_solver_arg(self):
         m = ConcreteModel()
         m.x = Var()
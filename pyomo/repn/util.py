@@ -10,6 +10,44 @@
 
 from pyomo.core.base import Var, Param, Expression, Objective, Block, \
     Constraint, Suffix
+from pyomo.core.kernel.matrix_constraint import _MatrixConstraintData
+from pyomo.repn.beta.matrix import _LinearMatrixConstraintData
 
 valid_expr_ctypes_minlp = {Var, Param, Expression, Objective}
 valid_active_ctypes_minlp = {Block, Constraint, Objective, Suffix}
+
+
+class LinearCanonicalForms(object):
+    """
+    Returns the canonical form of constraints whose
+    _linear_canonical_form flag is True.
+
+    The rows of a kernel matrix_constraint (or of a
+    MatrixConstraint created by the core.compile_linear
+    transformation) are computed together, from the stored
+    matrix, the first time one of its rows is requested.  The results are kept until this
+    object is discarded, so an instance should only be used
+    for the duration of a single write.
+    """
+
+    def __init__(self, compute_values=True):
+        self._compute_values = compute_values
+        self._matrix_repns = {}
+
+    def __call__(self, constraint_data):
+        cls = constraint_data.__class__
+        if cls is _MatrixConstraintData:
+            parent = constraint_data.parent
+            index = constraint_data.index
+        elif cls is _LinearMatrixConstraintData:
+            parent = constraint_data.parent_component()
+            index = constraint_data.index()
+        else:
+            return constraint_data.canonical_form(
+                compute_values=self._compute_values)
+        repns = self._matrix_repns.get(id(parent))
+        if repns is None:
+            repns = parent.canonical_forms(
+                compute_values=self._compute_values)
+            self._matrix_repns[id(parent)] = repns
+        return repns[index]
@@ -63,6 +63,9 @@ class CPLEXDirect(DirectSolver):
         self._wallclock_time = None
         self._pyomo_var_to_ndx_map = ComponentMap()
         self._ndx_count = 0
+        # While a block is being added, linear constraints are
+        # collected here and passed to CPLEX in a single call
+        self._linear_constraint_batch = None
 
     def _init(self):
         try:
@@ -280,19 +283,39 @@ class CPLEXDirect(DirectSolver):
                             "by overwriting its bounds in the CPLEX instance."
                             % (var.name, self._pyomo_model.name,))
 
+    def _add_block(self, block):
+        self._linear_constraint_batch = ([], [], [], [], [])
+        try:
+            DirectSolver._add_block(self, block)
+            lin_expr, senses, rhs, range_values, names = \
+                self._linear_constraint_batch
+            if len(names) > 0:
+                if 'R' not in senses:
+                    range_values = []
+                self._solver_model.linear_constraints.add(
+                    lin_expr=lin_expr,
+                    senses=senses,
+                    rhs=rhs,
+                    range_values=range_values,
+                    names=names)
+        finally:
+            self._linear_constraint_batch = None
+
     def _add_constraint(self, con):
         if not con.active:
             return None
 
-        if is_fixed(con.body):
-            if self._skip_trivial_constraints:
+        # check the flag first to avoid building the body of
+        # constraints stored in matrix form
+        if self._skip_trivial_constraints:
+            if is_fixed(con.body):
                 return None
 
         conname = self._symbol_map.getSymbol(con, self._labeler)
 
         if con._linear_canonical_form:
             cplex_expr, referenced_vars = self._get_expr_from_pyomo_repn(
-                con.canonical_form(),
+                self._get_canonical_form(con),
                 self._max_constraint_degree)
         else:
             cplex_expr, referenced_vars = self._get_expr_from_pyomo_expr(
@@ -331,7 +354,17 @@ class CPLEXDirect(DirectSolver):
             raise ValueError("Constraint does not have a lower "
                              "or an upper bound: {0} \n".format(con))
 
-        if len(cplex_expr.q_coefficients) == 0:
+        if (len(cplex_expr.q_coefficients) == 0) and \
+           (self._linear_constraint_batch is not None):
+            lin_expr, senses, rhs, range_values, names = \
+                self._linear_constraint_batch
+            lin_expr.append([cplex_expr.variables,
+                             cplex_expr.coefficients])
+            senses.append(my_sense)
+            rhs.extend(my_rhs)
+            range_values.append(my_range[0] if my_range else 0.0)
+            names.append(conname)
+        elif len(cplex_expr.q_coefficients) == 0:
             self._solver_model.linear_constraints.add(
                 lin_expr=[[cplex_expr.variables,
                            cplex_expr.coefficients]],
@@ -18,6 +18,7 @@ import pyomo.common
 import pyomo.opt.base.solvers
 from pyomo.core.kernel.component_map import ComponentMap
 from pyomo.core.kernel.component_set import ComponentSet
+from pyomo.repn.util import LinearCanonicalForms
 from pyomo.opt.base.formats import ResultsFormat
 from pyutilib.misc import Options
 
@@ -76,6 +77,11 @@ class DirectOrPersistentSolver(OptSolver):
         self._objective = None
         """The pyomo Objective object currently being used with the solver."""
 
+        self._canonical_forms = None
+        """While a block is being added, a LinearCanonicalForms object used to build the canonical form of
+        linear constraints. The rows of a kernel matrix_constraint are then built together from its stored
+        matrix rather than one row at a time."""
+
         self.results = None
         """A results object return from the solve method."""
 
@@ -207,16 +213,20 @@ class DirectOrPersistentSolver(OptSolver):
 
         for sub_block in block.block_data_objects(descend_into=True,
                                                   active=True):
-            for con in sub_block.component_data_objects(
-                    ctype=pyomo.core.base.constraint.Constraint,
-                    descend_into=False,
-                    active=True,
-                    sort=True):
-                if (not con.has_lb()) and \
-                   (not con.has_ub()):
-                    assert not con.equality
-                    continue  # non-binding, so skip
-                self._add_constraint(con)
+            self._canonical_forms = LinearCanonicalForms()
+            try:
+                for con in sub_block.component_data_objects(
+                        ctype=pyomo.core.base.constraint.Constraint,
+                        descend_into=False,
+                        active=True,
+                        sort=True):
+                    if (not con.has_lb()) and \
+                       (not con.has_ub()):
+                        assert not con.equality
+                        continue  # non-binding, so skip
+                    self._add_constraint(con)
+            finally:
+                self._canonical_forms = None
 
             for con in sub_block.component_data_objects(
                     ctype=pyomo.core.base.sos.SOSConstraint,
@@ -236,6 +246,12 @@ class DirectOrPersistentSolver(OptSolver):
                                      "support multiple objectives.")
                 self._set_objective(obj)
 
+    def _get_canonical_form(self, con):
+        """Return the canonical form of a constraint whose _linear_canonical_form flag is True."""
+        if self._canonical_forms is None:
+            return con.canonical_form()
+        return self._canonical_forms(con)
+
     """ This method should be implemented by subclasses."""
     def _set_objective(self, obj):
         raise NotImplementedError("This method should be implemented "
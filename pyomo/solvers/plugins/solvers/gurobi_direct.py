@@ -259,6 +259,12 @@ class GurobiDirect(DirectSolver):
                             % (var.name, self._pyomo_model.name,))
 
     def _add_block(self, block):
+        # Gurobi queues the rows added with addConstr until the
+        # model is updated, so a block is still passed to Gurobi
+        # in one update. The rows are not added with addMConstrs
+        # because it requires gurobipy 9 and does not return the
+        # per-row Constr objects that are mapped to the Pyomo
+        # constraints.
         DirectOrPersistentSolver._add_block(self, block)
         self._solver_model.update()
 
@@ -266,15 +272,17 @@ class GurobiDirect(DirectSolver):
         if not con.active:
             return None
 
-        if is_fixed(con.body):
-            if self._skip_trivial_constraints:
+        # check the flag first to avoid building the body of
+        # constraints stored in matrix form
+        if self._skip_trivial_constraints:
+            if is_fixed(con.body):
                 return None
 
         conname = self._symbol_map.getSymbol(con, self._labeler)
 
         if con._linear_canonical_form:
             gurobi_expr, referenced_vars = self._get_expr_from_pyomo_repn(
-                con.canonical_form(),
+                self._get_canonical_form(con),
                 self._max_constraint_degree)
         #elif isinstance(con, LinearCanonicalRepn):
         #    gurobi_expr, referenced_vars = self._get_expr_from_pyomo_repn(
@@ -19,6 +19,13 @@ try:
 except ImportError:
     cplexpy_available = False
 
+try:
+    import numpy
+    import scipy
+    numpy_and_scipy_available = True
+except ImportError:
+    numpy_and_scipy_available = False
+
 diff_tol = 1e-4
 
 class CPLEXDirectTests(unittest.TestCase):
@@ -143,5 +150,112 @@ class CPLEXDirectTests(unittest.TestCase):
             self.assertEqual(results.solution.status,
                              SolutionStatus.optimal)
 
+class _RecordedCall(object):
+    """A stand-in for the objects of the CPLEX Python API
+    (e.g., Cplex().linear_constraints) that records each method
+    call made on them by attribute path."""
+
+    def __init__(self, calls, path=()):
+        self._calls = calls
+        self._path = path
+
+    def __getattr__(self, name):
+        return _RecordedCall(self._calls, self._path + (name,))
+
+    def __call__(self, *args, **kwds):
+        self._calls.append(('.'.join(self._path), args, kwds))
+        return _RecordedCall(self._calls, self._path + ('()',))
+
+class _RecordingCplexModule(object):
+
+    infinity = 1.0e20
+
+    def __init__(self):
+        self.calls = []
+
+    def Cplex(self):
+        return _RecordedCall(self.calls)
+
+    def get_calls(self, path):
+        return [(args, kwds) for path_, args, kwds in self.calls
+                if path_ == path]
+
+@unittest.skipIf(not numpy_and_scipy_available,
+                 "numpy or scipy is not available")
+class CPLEXDirectBatchTests(unittest.TestCase):
+    """Tests that the linear constraints of a block are passed
+    to CPLEX in a single call, using a stand-in for the cplex
+    module that records the calls made on the CPLEX model."""
+
+    def _get_solver(self):
+        from pyomo.solvers.plugins.solvers.cplex_persistent import \
+            CPLEXPersistent
+        opt = CPLEXPersistent()
+        opt._cplex = _RecordingCplexModule()
+        return opt
+
+    def test_matrix_constraint(self):
+        import pyomo.kernel as pmo
+        m = pmo.block()
+        m.x = pmo.variable_list(pmo.variable() for i in range(3))
+        m.c = pmo.matrix_constraint(numpy.array([[1.0, 0.0, 2.0],
+                                                 [0.0, 3.0, 0.0]]),
+                                    lb=numpy.array([0.0, -1.0]),
+                                    ub=numpy.array([numpy.inf, 1.0]),
+                                    x=m.x)
+        m.d = pmo.constraint(m.x[0] + m.x[1] == 4)
+        m.q = pmo.constraint(m.x[2]**2 <= 5)
+        m.o = pmo.objective(m.x[0])
+        opt = self._get_solver()
+        opt.set_instance(m)
+
+        var = opt._pyomo_var_to_ndx_map
+        con = opt._pyomo_con_to_solver_con_map
+        calls = opt._cplex.get_calls('linear_constraints.add')
+        self.assertEqual(len(calls), 1)
+        args, kwds = calls[0]
+        self.assertEqual(args, ())
+        self.assertEqual(kwds['names'], [con[m.c[0]], con[m.c[1]], con[m.d]])
+        self.assertEqual(
+            kwds['lin_expr'],
+            [[[var[m.x[0]], var[m.x[2]]], [1.0, 2.0]],
+             [[var[m.x[1]]], [3.0]],
+             [[var[m.x[0]], var[m.x[1]]], [1, 1]]])
+        self.assertEqual(kwds['senses'], ['G', 'R', 'E'])
+        self.assertEqual(kwds['rhs'], [0.0, 1.0, 4])
+        self.assertEqual(kwds['range_values'], [0.0, -2.0, 0.0])
+        # quadratic constraints are still added individually
+        self.assertEqual(
+            len(opt._cplex.get_calls('quadratic_constraints.add')), 1)
+
+        # constraints added later are passed to CPLEX one at a time
+        m.e = pmo.constraint(m.x[2] <= 7)
+        opt.add_constraint(m.e)
+        calls = opt._cplex.get_calls('linear_constraints.add')
+        self.assertEqual(len(calls), 2)
+        args, kwds = calls[1]
+        self.assertEqual(kwds['names'], [con[m.e]])
+        self.assertEqual(kwds['senses'], 'L')
+        self.assertEqual(kwds['rhs'], [7])
+        self.assertEqual(kwds['range_values'], [])
+
+    def test_no_range_constraints(self):
+        model = ConcreteModel()
+        model.x = Var([1, 2])
+        model.c = Constraint(expr=model.x[1] + 2*model.x[2] >= 1)
+        model.d = Constraint(expr=model.x[1] <= 3)
+        model.o = Objective(expr=model.x[1])
+        opt = self._get_solver()
+        opt.set_instance(model)
+
+        calls = opt._cplex.get_calls('linear_constraints.add')
+        self.assertEqual(len(calls), 1)
+        args, kwds = calls[0]
+        self.assertEqual(kwds['senses'], ['G', 'L'])
+        self.assertEqual(kwds['rhs'], [1, 3])
+        # range values are only passed when there are range
+        # constraints
+        self.assertEqual(kwds['range_values'], [])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,942 @@
+#  ___________________________________________________________________________
+#
+#  Pyomo: Python Optimization Modeling Objects
+#  Copyright 2017 National Technology and Engineering Solutions of Sandia, LLC
+#  Under the terms of Contract DE-NA0003525 with National Technology and
+#  Engineering Solutions of Sandia, LLC, the U.S. Government retains certain
+#  rights in this software.
+#  This software is distributed under the 3-clause BSD License.
+#  ___________________________________________________________________________
+
+"""A compact, versioned binary format for Pyomo models.
+
+A serialized model consists of a JSON header that describes the block
+hierarchy, followed by a buffer of NumPy arrays that hold the model
+data:
+
+  - Set members and component indices are stored once in a table of
+    keys, and components refer to them with arrays of integer ids
+  - Param values are stored as typed arrays
+  - Var values, bounds, fixed flags and domains are stored as arrays
+  - linear constraints with constant coefficients are stored as CSR
+    blocks
+  - all other expressions are stored in a postfix "tape" of integer
+    operation codes
+
+Arrays are read with numpy.frombuffer (or from a memory map when
+reading a file), so loading a model does not copy the array data.
+
+The supported components are Set, RangeSet, Param, Var, Expression,
+Constraint, ConstraintList, Objective, ObjectiveList and Block.  Var
+bounds are stored as values, and every RangeSet and SetOf is restored
+as a Set.
+"""
+
+import json
+import struct
+
+from six import iteritems, itervalues, string_types, integer_types
+from six.moves import xrange
+
+try:
+    import numpy
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
+from pyomo.core.base import (Block, Set, Param, Var, Expression,
+                             Constraint, ConstraintList, Objective,
+                             ObjectiveList, ConcreteModel)
+from pyomo.core.base.constraint import IndexedConstraint
+from pyomo.core.base.objective import IndexedObjective
+from pyomo.core.base.param import _NotValid
+from pyomo.core.base.set_types import Any, _virtual_sets
+from pyomo.core.expr import current as EXPR
+from pyomo.core.expr.numvalue import (native_numeric_types, value,
+                                      NumericConstant)
+from pyomo.repn.standard_repn import generate_standard_repn
+
+__all__ = ('serialize_model', 'deserialize_model',
+           'write_model', 'read_model')
+
+_MAGIC = b'PYOMOSER'
+FORMAT_VERSION = 1
+_prefix = struct.Struct('<8sIIQ')
+
+#
+# Operation codes used in expression tapes.  Each operation is stored
+# as a pair (code, argument).
+#
+_CONST = 0          # argument: index into the constant array
+_INT = 1            # argument: the integer value
+_VAR = 2            # argument: variable id
+_PARAM = 3          # argument: mutable parameter id
+_EXPR = 4           # argument: named expression id
+_SUM = 5            # argument: number of terms
+_PRODUCT = 6
+_RECIPROCAL = 7
+_NEGATION = 8
+_POWER = 9
+_ABS = 10
+_FUNCTION = 11      # argument: index into _functions
+_EXPR_IF = 12
+_EQUALITY = 13
+_INEQUALITY = 14    # argument: 1 if strict
+_RANGED = 15        # argument: 1 if the lower bound is strict, plus 2
+                    # if the upper bound is strict
+_LINEAR = 16        # argument: number of terms
+
+_functions = ('log', 'log10', 'sin', 'cos', 'tan', 'cosh', 'sinh', 'tanh',
+              'asin', 'acos', 'atan', 'exp', 'sqrt', 'asinh', 'acosh',
+              'atanh', 'ceil', 'floor')
+_function_ids = dict((name, i) for i, name in enumerate(_functions))
+
+_operators = {
+    EXPR.SumExpression: _SUM,
+    EXPR.NPV_SumExpression: _SUM,
+    EXPR._MutableSumExpression: _SUM,
+    EXPR.ProductExpression: _PRODUCT,
+    EXPR.NPV_ProductExpression: _PRODUCT,
+    EXPR.MonomialTermExpression: _PRODUCT,
+    EXPR.ReciprocalExpression: _RECIPROCAL,
+    EXPR.NPV_ReciprocalExpression: _RECIPROCAL,
+    EXPR.NegationExpression: _NEGATION,
+    EXPR.NPV_NegationExpression: _NEGATION,
+    EXPR.PowExpression: _POWER,
+    EXPR.NPV_PowExpression: _POWER,
+    EXPR.AbsExpression: _ABS,
+    EXPR.NPV_AbsExpression: _ABS,
+    EXPR.UnaryFunctionExpression: _FUNCTION,
+    EXPR.NPV_UnaryFunctionExpression: _FUNCTION,
+    EXPR.Expr_ifExpression: _EXPR_IF,
+    EXPR.EqualityExpression: _EQUALITY,
+    EXPR.InequalityExpression: _INEQUALITY,
+    EXPR.RangedExpression: _RANGED,
+    EXPR.LinearExpression: _LINEAR,
+    EXPR._MutableLinearExpression: _LINEAR,
+}
+
+_INT_MIN = -2**63
+_INT_MAX = 2**63 - 1
+
+
+def _domain_table():
+    """Return a dict mapping the names of the global virtual sets
+    (Reals, Binary, Any, ...) to the sets."""
+    return dict((s.name, s) for s in _virtual_sets)
+
+
+def _ordered_flag(s):
+    if not s.ordered:
+        return False
+    if s.ordered is Set.SortedOrder:
+        return 'sorted'
+    return 'insertion'
+
+
+class _ModelWriter(object):
+    """Collect the header and arrays for a serialized block."""
+
+    def __init__(self, root):
+        self.root = root
+        self.arrays = []
+        self.array_ids = {}
+        self.keys = []
+        self.key_ids = {}
+        self.set_ids = {}
+        self.var_ids = {}
+        self.param_ids = {}
+        self.expr_ids = {}
+        self.tape = []
+        self.consts = []
+        self.domains = dict((id(s), s.name) for s in _virtual_sets)
+        # Sets that are rebuilt automatically when the component that
+        # owns them is rebuilt (the cross product of the indexing sets
+        # of a multiply-indexed component, and the index of a
+        # ConstraintList or ObjectiveList)
+        self.skip_sets = set()
+        for comp in root.component_objects(descend_into=True):
+            if getattr(comp, '_implicit_subsets', None) is not None or \
+               isinstance(comp, (ConstraintList, ObjectiveList)):
+                self.skip_sets.add(id(comp._index))
+
+    def array(self, values, dtype):
+        """Record an array and return its id.  Integer ids are stored
+        with 32 bits when they fit, arrays that repeat a single value
+        are stored as that value, and identical arrays are stored
+        once."""
+        arr = numpy.array(values, dtype=dtype)
+        if dtype == '<i8' and len(arr) and \
+                -2**31 <= arr.min() and arr.max() < 2**31:
+            arr = arr.astype('<i4')
+        data = arr.tobytes()
+        if len(arr) > 1 and data == data[:arr.itemsize]*len(arr):
+            tag = (arr.dtype.str, len(arr), data[:arr.itemsize])
+            layout = [arr.dtype.str, len(arr), None, arr[0].item()]
+            arr = None
+        else:
+            tag = (arr.dtype.str, data)
+            layout = None
+        try:
+            return self.array_ids[tag]
+        except KeyError:
+            pass
+        ans = self.array_ids[tag] = len(self.arrays)
+        self.arrays.append((arr, layout))
+        return ans
+
+    def key_id(self, key):
+        tag = (key.__class__, key)
+        try:
+            return self.key_ids[tag]
+        except KeyError:
+            pass
+        if key.__class__ is tuple:
+            members = key
+        else:
+            members = (key,)
+        for x in members:
+            if x is not None and \
+               x.__class__ not in native_numeric_types and \
+               not isinstance(x, string_types):
+                raise ValueError(
+                    "Cannot serialize the index or set member %s: "
+                    "only numbers and strings are supported" % (key,))
+        ans = self.key_ids[tag] = len(self.keys)
+        self.keys.append(key)
+        return ans
+
+    def index_spec(self, comp):
+        if not comp.is_indexed():
+            return None
+        if comp._implicit_subsets is not None:
+            sets = comp._implicit_subsets
+        else:
+            sets = (comp._index,)
+        ans = []
+        for s in sets:
+            if id(s) not in self.set_ids:
+                # The indexing set is not part of the serialized
+                # block; the component will be indexed by Any.
+                return []
+            ans.append(self.set_ids[id(s)])
+        return ans
+
+    def values(self, vals):
+        """Store a list of values as a typed array, or in the header
+        if the values are not all numbers."""
+        types = set(val.__class__ for val in vals)
+        if not types:
+            kind = 'float'
+        elif types <= set([bool]):
+            kind = 'bool'
+        elif types <= set(integer_types) and \
+                all(_INT_MIN <= val <= _INT_MAX for val in vals):
+            kind = 'int'
+        elif types <= set(integer_types + (float,)):
+            kind = 'float'
+        else:
+            for val in vals:
+                if val is not None and \
+                   val.__class__ not in native_numeric_types and \
+                   not isinstance(val, string_types):
+                    raise ValueError(
+                        "Cannot serialize the value %s of type %s"
+                        % (val, type(val).__name__))
+            return {'list': list(vals)}
+        dtype = {'bool': '|u1', 'int': '<i8', 'float': '<f8'}[kind]
+        return {'kind': kind, 'array': self.array(vals, dtype)}
+
+    def numbers(self, vals):
+        """Store a list of numbers as an integer array if they are all
+        integers, and as a float array otherwise."""
+        for val in vals:
+            if val.__class__ not in integer_types or \
+               not _INT_MIN <= val <= _INT_MAX:
+                return self.array(vals, '<f8')
+        return self.array(vals, '<i8')
+
+    #
+    # Expressions
+    #
+
+    def expression(self, expr):
+        """Append the postfix tape for an expression and return the
+        position of the first operation after it."""
+        tape = self.tape
+        stack = [(expr, False)]
+        while stack:
+            node, exiting = stack.pop()
+            if exiting:
+                op = _operators[node.__class__]
+                if op is _SUM:
+                    tape.extend((op, node.nargs()))
+                elif op is _LINEAR:
+                    tape.extend((op, len(node.linear_vars)))
+                elif op is _FUNCTION:
+                    tape.extend((op, _function_ids[node.getname()]))
+                elif op is _INEQUALITY:
+                    tape.extend((op, int(node._strict)))
+                elif op is _RANGED:
+                    tape.extend((op, int(node._strict[0]) +
+                                 2*int(node._strict[1])))
+                else:
+                    tape.extend((op, 0))
+                continue
+            cls = node.__class__
+            if cls in native_numeric_types or cls is NumericConstant:
+                val = value(node)
+                if val.__class__ in integer_types and \
+                   _INT_MIN <= val <= _INT_MAX:
+                    tape.extend((_INT, int(val)))
+                else:
+                    tape.extend((_CONST, len(self.consts)))
+                    self.consts.append(float(val))
+            elif node.is_variable_type():
+                tape.extend((_VAR, self.leaf_id(self.var_ids, node)))
+            elif node.is_named_expression_type():
+                tape.extend((_EXPR, self.leaf_id(self.expr_ids, node)))
+            elif not node.is_expression_type():
+                tape.extend((_PARAM, self.leaf_id(self.param_ids, node)))
+            elif cls not in _operators or \
+                 (cls in (EXPR.UnaryFunctionExpression,
+                          EXPR.NPV_UnaryFunctionExpression) and
+                  node.getname() not in _function_ids):
+                raise ValueError(
+                    "Cannot serialize expressions of type %s"
+                    % (cls.__name__,))
+            else:
+                stack.append((node, True))
+                if _operators[cls] is _LINEAR:
+                    args = [node.constant] + list(node.linear_coefs) \
+                        + list(node.linear_vars)
+                else:
+                    args = node.args
+                for arg in reversed(args):
+                    stack.append((arg, False))
+        return len(tape) // 2
+
+    def leaf_id(self, ids, obj):
+        try:
+            return ids[id(obj)]
+        except KeyError:
+            raise ValueError(
+                "Cannot serialize a reference to '%s': the component "
+                "is not part of the serialized block" % (obj.name,))
+
+    def optional_expression(self, expr):
+        if expr is None:
+            return len(self.tape) // 2
+        return self.expression(expr)
+
+    #
+    # Components
+    #
+
+    def block(self, blk):
+        """Return the header entry for a block.  Components are
+        recorded in declaration order, and all variables, mutable
+        parameters and named expressions are numbered before any
+        expression is recorded."""
+        return {'components': [self.component(comp) for comp in
+                               blk.component_objects(descend_into=False)]}
+
+    def number(self, blk):
+        for comp in blk.component_objects((Var, Param, Expression),
+                                          descend_into=True):
+            if comp.type() is Var:
+                ids = self.var_ids
+            elif comp.type() is Expression:
+                ids = self.expr_ids
+            elif comp._mutable:
+                ids = self.param_ids
+            else:
+                continue
+            for data in itervalues(comp._data):
+                ids[id(data)] = len(ids)
+
+    def component(self, comp):
+        ctype = comp.type()
+        ans = {'name': comp.local_name, 'doc': comp.doc}
+        if isinstance(comp, Set):
+            if id(comp) in self.skip_sets:
+                ans['type'] = 'skip'
+                return ans
+            self.set_component(comp, ans)
+            self.set_ids[id(comp)] = len(self.set_ids)
+            return ans
+        ans['index'] = self.index_spec(comp)
+        keys = list(comp._data.keys())
+        ans['keys'] = self.array([self.key_id(k) for k in keys], '<i8')
+        data = [comp._data[k] for k in keys]
+        if ctype is Param:
+            self.param_component(comp, data, ans)
+        elif ctype is Var:
+            self.var_component(comp, data, ans)
+        elif ctype is Expression:
+            ans['type'] = 'Expression'
+            ans['tape'] = self.array(
+                [len(self.tape) // 2] +
+                [self.optional_expression(d.expr) for d in data], '<i8')
+        elif ctype is Constraint:
+            self.constraint_component(comp, data, ans)
+        elif ctype is Objective:
+            ans['type'] = 'ObjectiveList' \
+                if isinstance(comp, ObjectiveList) else 'Objective'
+            ans['active'] = comp.active
+            ans['data_active'] = self.array([d.active for d in data], '|u1')
+            ans['sense'] = self.array([d.sense for d in data], '<i1')
+            ans['tape'] = self.array(
+                [len(self.tape) // 2] +
+                [self.expression(d.expr) for d in data], '<i8')
+        elif ctype is Block and comp.__class__ in (
+                Block, Block._ComponentDataClass, ConcreteModel) or \
+                type(comp).__name__ in ('SimpleBlock', 'IndexedBlock'):
+            ans['type'] = 'Block'
+            ans['active'] = comp.active
+            ans['data_active'] = self.array([d.active for d in data], '|u1')
+            ans['blocks'] = [self.block(d) for d in data]
+        else:
+            raise ValueError(
+                "Cannot serialize component '%s' of type %s"
+                % (comp.name, type(comp).__name__))
+        return ans
+
+    def set_component(self, comp, ans):
+        if not comp.concrete:
+            raise ValueError(
+                "Cannot serialize the virtual set '%s'" % (comp.name,))
+        ans['type'] = 'Set'
+        ans['index'] = self.index_spec(comp)
+        ans['ordered'] = _ordered_flag(comp)
+        ans['dimen'] = comp.dimen
+        if comp.is_indexed():
+            keys = list(comp._data.keys())
+            data = [comp._data[k] for k in keys]
+        else:
+            keys = [None]
+            data = [comp]
+        ans['keys'] = self.array([self.key_id(k) for k in keys], '<i8')
+        ptr = [0]
+        members = []
+        for d in data:
+            members.extend(self.key_id(x) for x in d)
+            ptr.append(len(members))
+        ans['ptr'] = self.array(ptr, '<i8')
+        ans['members'] = self.array(members, '<i8')
+
+    def param_component(self, comp, data, ans):
+        ans['type'] = 'Param'
+        ans['mutable'] = comp._mutable
+        if comp.domain is not Any:
+            ans['domain'] = self.domain_name(comp, comp.domain)
+        default = comp.default()
+        if default is not _NotValid:
+            ans['default'] = self.values([default])
+        if comp._mutable or not comp.is_indexed():
+            data = [d.value for d in data]
+        ans['values'] = self.values(data)
+
+    def domain_name(self, comp, domain):
+        try:
+            return self.domains[id(domain)]
+        except KeyError:
+            raise ValueError(
+                "Cannot serialize the domain of '%s': only the global "
+                "virtual sets (Reals, Binary, ...) are supported"
+                % (comp.name,))
+
+    def var_component(self, comp, data, ans):
+        ans['type'] = 'Var'
+        nan = float('nan')
+        domains = []
+        domain_ids = {}
+        codes = []
+        for d in data:
+            name = self.domain_name(d, d.domain)
+            if name not in domain_ids:
+                domain_ids[name] = len(domains)
+                domains.append(name)
+            codes.append(domain_ids[name])
+        ans['domains'] = domains
+        ans['domain'] = self.array(codes, '<i2')
+        ans['value'] = self.array(
+            [nan if d.value is None else d.value for d in data], '<f8')
+        ans['lb'] = self.array(
+            [nan if d._lb is None else value(d._lb) for d in data], '<f8')
+        ans['ub'] = self.array(
+            [nan if d._ub is None else value(d._ub) for d in data], '<f8')
+        ans['fixed'] = self.array([d.fixed for d in data], '|u1')
+
+    def constraint_component(self, comp, data, ans):
+        ans['type'] = 'ConstraintList' \
+            if isinstance(comp, ConstraintList) else 'Constraint'
+        ans['active'] = comp.active
+        ans['data_active'] = self.array([d.active for d in data], '|u1')
+        nan = float('nan')
+        # Linear rows
+        linear = []
+        indptr = [0]
+        indices = []
+        coefs = []
+        constant = []
+        lower = []
+        upper = []
+        # Other rows (lower, body and upper bound tapes)
+        tape = [len(self.tape) // 2]
+        for d in data:
+            repn = self.linear_row(d)
+            linear.append(repn is not None)
+            if repn is None:
+                tape.append(self.optional_expression(d.lower))
+                tape.append(self.expression(d.body))
+                tape.append(self.optional_expression(d.upper))
+                continue
+            indices.extend(self.leaf_id(self.var_ids, v)
+                           for v in repn.linear_vars)
+            coefs.extend(repn.linear_coefs)
+            indptr.append(len(indices))
+            constant.append(repn.constant)
+            lb = d.lower
+            ub = d.upper
+            lower.append(nan if lb is None else value(lb))
+            upper.append(nan if ub is None else value(ub))
+        ans['equality'] = self.array([d.equality for d in data], '|u1')
+        ans['linear'] = self.array(linear, '|u1')
+        ans['indptr'] = self.array(indptr, '<i8')
+        ans['indices'] = self.array(indices, '<i8')
+        ans['coefs'] = self.numbers(coefs)
+        ans['constant'] = self.numbers(constant)
+        ans['lower'] = self.array(lower, '<f8')
+        ans['upper'] = self.array(upper, '<f8')
+        ans['tape'] = self.array(tape, '<i8')
+
+    def linear_row(self, con):
+        """Return the standard repn of a linear constraint whose
+        coefficients and bounds are all numbers, or None."""
+        for bound in (con.lower, con.upper):
+            if bound is not None and \
+               bound.__class__ not in native_numeric_types and \
+               bound.__class__ is not NumericConstant:
+                return None
+        body = con.body
+        if body.__class__ in native_numeric_types or \
+           body.polynomial_degree() != 1:
+            return None
+        repn = generate_standard_repn(body, compute_values=False,
+                                      quadratic=False)
+        if not repn.is_linear() or \
+           repn.constant.__class__ not in native_numeric_types:
+            return None
+        for coef in repn.linear_coefs:
+            if coef.__class__ not in native_numeric_types:
+                return None
+        return repn
+
+    def header(self):
+        self.number(self.root)
+        model = self.block(self.root)
+        return {'version': FORMAT_VERSION,
+                'name': self.root.name,
+                'keys': self.keys,
+                'ops': self.array(self.tape[0::2], '|u1'),
+                'args': self.array(self.tape[1::2], '<i8'),
+                'consts': self.array(self.consts, '<f8'),
+                'model': model}
+
+
+def _chunks(root):
+    """Yield the byte strings that make up a serialized block."""
+    if not numpy_available:
+        raise RuntimeError("Serializing Pyomo models requires numpy")
+    writer = _ModelWriter(root)
+    header = writer.header()
+    offset = 0
+    layout = []
+    for arr, fill in writer.arrays:
+        if arr is None:
+            layout.append(fill)
+            continue
+        layout.append([arr.dtype.str, len(arr), offset])
+        offset += -(-arr.nbytes // 8) * 8
+    header['arrays'] = layout
+    header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-len(header) % 8)
+    yield _prefix.pack(_MAGIC, FORMAT_VERSION, 0, len(header))
+    yield header
+    for arr, fill in writer.arrays:
+        if arr is None:
+            continue
+        yield arr.tobytes()
+        yield b'\0' * (-arr.nbytes % 8)
+
+
+def serialize_model(block):
+    """Return the serialized form of a block (and all of its
+    sub-blocks) as a bytes object."""
+    return b''.join(_chunks(block))
+
+
+def write_model(block, filename):
+    """Write a serialized block to a file."""
+    with open(filename, 'wb') as OUTPUT:
+        for chunk in _chunks(block):
+            OUTPUT.write(chunk)
+
+
+class _ModelReader(object):
+    """Rebuild a block from a serialized header and array buffer."""
+
+    def __init__(self, buf):
+        if len(buf) < _prefix.size:
+            raise ValueError("The data is not a serialized Pyomo model")
+        magic, version, _, size = _prefix.unpack(
+            buf[:_prefix.size].tobytes())
+        if magic != _MAGIC:
+            raise ValueError("The data is not a serialized Pyomo model")
+        if version > FORMAT_VERSION:
+            raise ValueError(
+                "Unsupported serialization format version %s (this "
+                "version of Pyomo reads versions up to %s)"
+                % (version, FORMAT_VERSION))
+        start = _prefix.size + size
+        self.header = json.loads(
+            buf[_prefix.size:start].tobytes().decode('utf-8'))
+        self.arrays = []
+        for layout in self.header['arrays']:
+            dtype, count, offset = layout[:3]
+            dtype = numpy.dtype(dtype)
+            if offset is None:
+                self.arrays.append(numpy.full(count, layout[3], dtype))
+                continue
+            offset += start
+            self.arrays.append(
+                buf[offset:offset + count*dtype.itemsize].view(dtype))
+        self.keys = [tuple(k) if k.__class__ is list else k
+                     for k in self.header['keys']]
+        self.sets = []
+        self.vars = []
+        self.params = []
+        self.exprs = []
+        self.domains = _domain_table()
+        self.deferred = []
+        self.consts = self.arrays[self.header['consts']].tolist()
+        self.ops = self.arrays[self.header['ops']].tolist()
+        self.args = self.arrays[self.header['args']].tolist()
+
+    def keylist(self, ans):
+        keys = self.keys
+        return [keys[i] for i in self.arrays[ans['keys']].tolist()]
+
+    def values(self, ans):
+        if 'list' in ans:
+            return ans['list']
+        vals = self.arrays[ans['array']].tolist()
+        if ans['kind'] == 'bool':
+            vals = [bool(v) for v in vals]
+        return vals
+
+    def index(self, ans):
+        spec = ans['index']
+        if spec is None:
+            return ()
+        if not spec:
+            return (Any,)
+        return tuple(self.sets[i] for i in spec)
+
+    def model(self):
+        model = ConcreteModel(name=self.header['name'])
+        self.populate(model, self.header['model'])
+        for fcn, args in self.deferred:
+            fcn(*args)
+        return model
+
+    def populate(self, blk, ans):
+        for comp in ans['components']:
+            getattr(self, 'build_' + comp['type'].lower())(blk, comp)
+
+    def build_skip(self, blk, ans):
+        pass
+
+    def build_set(self, blk, ans):
+        comp = Set(*self.index(ans), ordered=ans['ordered'],
+                   dimen=ans['dimen'], doc=ans['doc'])
+        if ans['ordered'] == 'sorted':
+            comp.ordered = Set.SortedOrder
+        blk.add_component(ans['name'], comp)
+        keys = self.keys
+        ptr = self.arrays[ans['ptr']].tolist()
+        members = self.arrays[ans['members']].tolist()
+        for i, key in enumerate(self.keylist(ans)):
+            s = comp[key] if comp.is_indexed() else comp
+            for j in xrange(ptr[i], ptr[i+1]):
+                s.add(keys[members[j]])
+        self.sets.append(comp)
+
+    def build_param(self, blk, ans):
+        kwds = {'mutable': ans['mutable'], 'doc': ans['doc']}
+        if 'domain' in ans:
+            kwds['within'] = self.domains[ans['domain']]
+        if 'default' in ans:
+            kwds['default'] = self.values(ans['default'])[0]
+        keys = self.keylist(ans)
+        vals = self.values(ans['values'])
+        if ans['index'] is None:
+            if keys:
+                kwds['initialize'] = vals[0]
+        else:
+            kwds['initialize'] = dict(zip(keys, vals))
+        comp = Param(*self.index(ans), **kwds)
+        blk.add_component(ans['name'], comp)
+        if ans['mutable']:
+            self.params.extend(comp[k] for k in keys)
+
+    def build_var(self, blk, ans):
+        comp = Var(*self.index(ans), dense=False, doc=ans['doc'])
+        blk.add_component(ans['name'], comp)
+        domains = [self.domains[name] for name in ans['domains']]
+        arrays = self.arrays
+        # The keys were valid indices of the serialized component, so
+        # the data are created without validating them again
+        data = []
+        for key in self.keylist(ans):
+            if key in comp._data:
+                data.append(comp._data[key])
+            else:
+                data.append(comp._getitem_when_not_present(key))
+        for v, val, lb, ub, fixed, domain in zip(
+                data,
+                arrays[ans['value']].tolist(),
+                arrays[ans['lb']].tolist(),
+                arrays[ans['ub']].tolist(),
+                arrays[ans['fixed']].tolist(),
+                arrays[ans['domain']].tolist()):
+            v.domain = domains[domain]
+            v.setlb(None if lb != lb else lb)
+            v.setub(None if ub != ub else ub)
+            v.value = None if val != val else val
+            v.fixed = bool(fixed)
+            self.vars.append(v)
+
+    def build_expression(self, blk, ans):
+        comp = Expression(*self.index(ans), doc=ans['doc'])
+        blk.add_component(ans['name'], comp)
+        data = []
+        for key in self.keylist(ans):
+            if key not in comp:
+                comp.add(key, None)
+            data.append(comp[key])
+        self.exprs.extend(data)
+        self.deferred.append((self.set_expressions, (ans, data)))
+
+    def set_expressions(self, ans, data):
+        ptr = self.arrays[ans['tape']].tolist()
+        for i, d in enumerate(data):
+            d.set_value(self.expression_tape(ptr[i], ptr[i+1]))
+
+    def build_constraint(self, blk, ans):
+        comp = Constraint(*self.index(ans), doc=ans['doc'])
+        blk.add_component(ans['name'], comp)
+        self.deferred.append((self.add_constraints, (comp, ans)))
+
+    def build_constraintlist(self, blk, ans):
+        comp = ConstraintList(doc=ans['doc'])
+        blk.add_component(ans['name'], comp)
+        self.deferred.append((self.add_constraints, (comp, ans)))
+
+    def add_constraints(self, comp, ans):
+        arrays = self.arrays
+        keys = self.keylist(ans)
+        linear = arrays[ans['linear']].tolist()
+        equality = arrays[ans['equality']].tolist()
+        indptr = arrays[ans['indptr']].tolist()
+        indices = arrays[ans['indices']].tolist()
+        coefs = arrays[ans['coefs']].tolist()
+        constant = arrays[ans['constant']].tolist()
+        lower = arrays[ans['lower']].tolist()
+        upper = arrays[ans['upper']].tolist()
+        tape = arrays[ans['tape']].tolist()
+        active = arrays[ans['data_active']].tolist()
+        is_list = ans['type'] == 'ConstraintList'
+        variables = self.vars
+        row = 0
+        other = 0
+        for i, key in enumerate(keys):
+            if linear[i]:
+                body = EXPR.LinearExpression()
+                body.constant = constant[row]
+                body.linear_coefs = coefs[indptr[row]:indptr[row+1]]
+                body.linear_vars = [variables[j] for j in
+                                    indices[indptr[row]:indptr[row+1]]]
+                lb = None if lower[row] != lower[row] else lower[row]
+                ub = None if upper[row] != upper[row] else upper[row]
+                row += 1
+            else:
+                lb, body, ub = [self.expression_tape(tape[j], tape[j+1])
+                                for j in xrange(other, other+3)]
+                other += 3
+            if equality[i]:
+                expr = (body, lb)
+            else:
+                expr = (lb, body, ub)
+            if is_list:
+                comp._index.add(key)
+            if comp.is_indexed():
+                IndexedConstraint.add(comp, key, expr)
+            else:
+                comp.add(key, expr)
+            if not active[i]:
+                comp[key].deactivate()
+        if not ans['active']:
+            comp.deactivate()
+
+    def build_objective(self, blk, ans):
+        comp = Objective(*self.index(ans), doc=ans['doc'])
+        blk.add_component(ans['name'], comp)
+        self.deferred.append((self.add_objectives, (comp, ans)))
+
+    def build_objectivelist(self, blk, ans):
+        comp = ObjectiveList(doc=ans['doc'])
+        blk.add_component(ans['name'], comp)
+        self.deferred.append((self.add_objectives, (comp, ans)))
+
+    def add_objectives(self, comp, ans):
+        arrays = self.arrays
+        tape = arrays[ans['tape']].tolist()
+        sense = arrays[ans['sense']].tolist()
+        active = arrays[ans['data_active']].tolist()
+        is_list = ans['type'] == 'ObjectiveList'
+        for i, key in enumerate(self.keylist(ans)):
+            expr = self.expression_tape(tape[i], tape[i+1])
+            if is_list:
+                comp._index.add(key)
+            if comp.is_indexed():
+                IndexedObjective.add(comp, key, expr)
+            else:
+                comp.add(key, expr)
+            comp[key].set_sense(sense[i])
+            if not active[i]:
+                comp[key].deactivate()
+        if not ans['active']:
+            comp.deactivate()
+
+    def build_block(self, blk, ans):
+        comp = Block(*self.index(ans), doc=ans['doc'])
+        blk.add_component(ans['name'], comp)
+        active = self.arrays[ans['data_active']].tolist()
+        for i, key in enumerate(self.keylist(ans)):
+            self.populate(comp[key], ans['blocks'][i])
+            if not active[i]:
+                comp[key].deactivate()
+        if not ans['active']:
+            comp.deactivate()
+
+    def expression_tape(self, start, end):
+        """Rebuild the expression stored in operations start to
+        end-1 of the tape."""
+        if start == end:
+            return None
+        ops = self.ops
+        args = self.args
+        stack = []
+        for i in xrange(start, end):
+            op = ops[i]
+            arg = args[i]
+            if op == _VAR:
+                stack.append(self.vars[arg])
+            elif op == _INT:
+                stack.append(arg)
+            elif op == _CONST:
+                stack.append(self.consts[arg])
+            elif op == _PARAM:
+                stack.append(self.params[arg])
+            elif op == _EXPR:
+                stack.append(self.exprs[arg])
+            elif op == _SUM:
+                terms = stack[len(stack)-arg:]
+                del stack[len(stack)-arg:]
+                # Build the sum directly rather than with repeated
+                # additions, which would copy the argument list
+                for x in terms:
+                    if x.__class__ not in native_numeric_types and \
+                       x.is_potentially_variable():
+                        stack.append(EXPR.SumExpression(terms))
+                        break
+                else:
+                    stack.append(EXPR.NPV_SumExpression(terms))
+            elif op == _LINEAR:
+                terms = stack[len(stack)-2*arg-1:]
+                del stack[len(stack)-2*arg-1:]
+                ans = EXPR.LinearExpression()
+                ans.constant = terms[0]
+                ans.linear_coefs = terms[1:arg+1]
+                ans.linear_vars = terms[arg+1:]
+                stack.append(ans)
+            elif op == _PRODUCT:
+                y = stack.pop()
+                x = stack[-1]
+                if x.__class__ in native_numeric_types and \
+                   y.__class__ not in native_numeric_types and \
+                   y.is_variable_type():
+                    stack[-1] = EXPR.MonomialTermExpression((x, y))
+                else:
+                    stack[-1] = x * y
+            elif op == _RECIPROCAL:
+                stack[-1] = 1 / stack[-1]
+            elif op == _NEGATION:
+                stack[-1] = -stack[-1]
+            elif op == _POWER:
+                y = stack.pop()
+                stack[-1] = stack[-1] ** y
+            elif op == _ABS:
+                stack[-1] = abs(stack[-1])
+            elif op == _FUNCTION:
+                stack[-1] = getattr(EXPR, _functions[arg])(stack[-1])
+            elif op == _EXPR_IF:
+                else_ = stack.pop()
+                then_ = stack.pop()
+                stack[-1] = EXPR.Expr_if(IF=stack[-1], THEN=then_,
+                                         ELSE=else_)
+            elif op == _EQUALITY:
+                y = stack.pop()
+                stack[-1] = EXPR.EqualityExpression((stack[-1], y))
+            elif op == _INEQUALITY:
+                y = stack.pop()
+                stack[-1] = EXPR.InequalityExpression(
+                    (stack[-1], y), bool(arg))
+            elif op == _RANGED:
+                z = stack.pop()
+                y = stack.pop()
+                stack[-1] = EXPR.RangedExpression(
+                    (stack[-1], y, z), (bool(arg & 1), bool(arg & 2)))
+            else:
+                raise ValueError(
+                    "Unknown operation code %s in the expression tape"
+                    % (op,))
+        assert len(stack) == 1
+        return stack[0]
+
+
+def deserialize_model(data):
+    """Rebuild a ConcreteModel from serialized data (a bytes-like
+    object or a NumPy uint8 array).  The arrays in the data are used
+    without copying them."""
+    if not numpy_available:
+        raise RuntimeError("Deserializing Pyomo models requires numpy")
+    if isinstance(data, numpy.ndarray):
+        buf = data.view(numpy.uint8).reshape(-1)
+    else:
+        buf = numpy.frombuffer(data, dtype=numpy.uint8)
+    return _ModelReader(buf).model()
+
+
+def read_model(filename, mmap=True):
+    """Read a serialized model from a file.  By default, the file is
+    memory-mapped rather than read into memory."""
+    if not numpy_available:
+        raise RuntimeError("Deserializing Pyomo models requires numpy")
+    if mmap:
+        return deserialize_model(
+            numpy.memmap(filename, dtype=numpy.uint8, mode='r'))
+    with open(filename, 'rb') as INPUT:
+        return deserialize_model(INPUT.read())
@@ -0,0 +1,154 @@
+"""Tests for the binary model serialization format."""
+import os
+import struct
+import tempfile
+
+import pyutilib.th as unittest
+from pyomo.environ import (Block, ConcreteModel, Constraint, ConstraintList,
+                           Expression, NonNegativeReals, Objective, Param,
+                           RangeSet, Set, Var, inequality, maximize,
+                           sin, value)
+from pyomo.core.expr.current import Expr_if, LinearExpression
+from pyomo.util.serialize import (numpy_available, serialize_model,
+                                  deserialize_model, write_model, read_model)
+
+
+def _make_model():
+    m = ConcreteModel()
+    m.I = Set(initialize=['a', 'b'])
+    m.J = RangeSet(3)
+    m.p = Param(m.I, initialize={'a': 1, 'b': 2.5})
+    m.q = Param(m.J, mutable=True, initialize=2)
+    m.s = Param(initialize='hello')
+    m.x = Var(m.I, m.J, within=NonNegativeReals, initialize=1)
+    m.y = Var(bounds=(1, 5))
+    m.y.fix(3)
+    m.e = Expression(expr=m.y**2 + sin(m.y) + abs(m.x['a', 1]))
+    m.c = Constraint(m.I, rule=lambda m, i:
+                     sum(m.p[i]*m.x[i, j] for j in m.J) == 4)
+    m.c2 = Constraint(m.I, rule=lambda m, i:
+                      sum(m.q[j]*m.x[i, j] for j in m.J) <= 4)
+    m.c2['b'].deactivate()
+    m.r = Constraint(expr=inequality(0, m.y + m.e, m.q[2]))
+    m.o = Objective(expr=m.e + Expr_if(IF=m.y >= 1, THEN=m.y, ELSE=0),
+                    sense=maximize)
+    m.b = Block(m.I)
+    m.b['a'].z = Var([1, 2])
+    m.b['a'].c = Constraint(expr=m.b['a'].z[1] >= m.x['a', 2] - 1/m.y)
+    m.b['b'].deactivate()
+    m.cl = ConstraintList()
+    m.cl.add(m.y <= 4)
+    m.cl.add(m.x['b', 1] + m.x['b', 2] >= 1)
+    return m
+
+
+@unittest.skipIf(not numpy_available, "numpy is not available")
+class TestSerialize(unittest.TestCase):
+    """Tests for serialize_model and deserialize_model."""
+
+    def assertSameModel(self, m, n):
+        # RangeSets are restored as Sets
+        self.assertEqual(
+            [(c.name, Set if c.type() is RangeSet else c.type())
+             for c in m.component_objects(descend_into=True)],
+            [(c.name, c.type()) for c in
+             n.component_objects(descend_into=True)])
+        for ctype in (Constraint, Objective, Expression):
+            for c in m.component_data_objects(ctype, descend_into=True):
+                d = n.find_component(c.name)
+                self.assertEqual(str(c.expr), str(d.expr))
+                self.assertEqual(c.active, d.active)
+        for v in m.component_data_objects(Var, descend_into=True):
+            w = n.find_component(v.name)
+            self.assertEqual((v.value, v.lb, v.ub, v.fixed, v.domain),
+                             (w.value, w.lb, w.ub, w.fixed, w.domain))
+
+    def test_round_trip(self):
+        m = _make_model()
+        n = deserialize_model(serialize_model(m))
+        self.assertSameModel(m, n)
+        self.assertEqual(sorted(n.I), ['a', 'b'])
+        self.assertEqual(list(n.J), [1, 2, 3])
+        self.assertEqual(n.p['b'], 2.5)
+        self.assertEqual(n.s.value, 'hello')
+        self.assertEqual(n.o.sense, maximize)
+        self.assertFalse(n.b['b'].active)
+        self.assertEqual(len(n.cl), 2)
+        # Expressions refer to the components of the new model
+        n.q[2] = 7
+        self.assertEqual(value(n.r.upper), 7)
+        self.assertEqual(value(m.r.upper), 2)
+
+    def test_linear_rows(self):
+        m = ConcreteModel()
+        m.x = Var([1, 2, 3])
+        m.c = Constraint(expr=2*m.x[1] + 3*m.x[2] - m.x[3] <= 10)
+        m.d = Constraint(expr=0.5*m.x[1] + 1 == 2)
+        n = deserialize_model(serialize_model(m))
+        self.assertIs(type(n.c.body), LinearExpression)
+        self.assertEqual(n.c.body.linear_coefs, [2, 3, -1])
+        self.assertEqual(n.c.body.linear_vars,
+                         [n.x[1], n.x[2], n.x[3]])
+        self.assertEqual(n.c.upper, 10)
+        self.assertIsNone(n.c.lower)
+        self.assertTrue(n.d.equality)
+        self.assertEqual(n.d.body.constant, 1)
+        self.assertEqual(n.d.body.linear_coefs, [0.5])
+        self.assertEqual(n.d.upper, 2)
+
+    def test_compact(self):
+        m = ConcreteModel()
+        m.I = Set(initialize=range(1000))
+        m.x = Var(m.I, bounds=(0, 1))
+        m.c = Constraint(m.I, rule=lambda m, i: m.x[i] + m.x[(i+1) % 1000]
+                         <= 1)
+        data = serialize_model(m)
+        # Constant arrays (bounds, flags) are stored as a single value
+        self.assertLess(len(data), 64*1000)
+
+    def test_files(self):
+        m = _make_model()
+        fd, fname = tempfile.mkstemp(suffix='.pyomo')
+        os.close(fd)
+        try:
+            write_model(m, fname)
+            with open(fname, 'rb') as INPUT:
+                self.assertEqual(INPUT.read(), serialize_model(m))
+            self.assertSameModel(m, read_model(fname))
+            self.assertSameModel(m, read_model(fname, mmap=False))
+        finally:
+            os.remove(fname)
+
+    def test_bad_data(self):
+        data = serialize_model(ConcreteModel())
+        self.assertRaisesRegexp(
+            ValueError, "not a serialized Pyomo model",
+            deserialize_model, b'PICKLE' + data[6:])
+        self.assertRaisesRegexp(
+            ValueError, "not a serialized Pyomo model",
+            deserialize_model, data[:4])
+        future = struct.pack('<8sI', b'PYOMOSER', 99) + data[12:]
+        self.assertRaisesRegexp(
+            ValueError, "Unsupported serialization format version 99",
+            deserialize_model, future)
+
+    def test_unsupported(self):
+        m = ConcreteModel()
+        m.x = Var()
+        m.o = Objective(expr=m.x)
+        other = ConcreteModel()
+        other.y = Var()
+        m.c = Constraint(expr=m.x >= other.y)
+        self.assertRaisesRegexp(
+            ValueError, "Cannot serialize a reference to 'y'",
+            serialize_model, m)
+
+        m = ConcreteModel()
+        m.p = Param(initialize=object())
+        self.assertRaisesRegexp(
+            ValueError, "Cannot serialize the value",
+            serialize_model, m)
+
+
+if __name__ == '__main__':
+    unittest.main()